@@ -16,6 +16,7 @@ class BaselineAgent(BaseMigrationAgent):
     This agent only has access to:
     - A restricted shell for running commands
     - An editor for modifying files
+    - A Maven build tool returning structured errors (if enabled)
 
     It must discover and implement all migration steps on its own.
     """
@@ -34,10 +35,10 @@ class BaselineAgent(BaseMigrationAgent):
         Get the list of tools for this agent.
 
         Returns:
-            List containing restricted shell and editor
+            List containing restricted shell, editor, and the Maven build tool if enabled
         """
         if not self.repository:
             raise ValueError("Repository must be set before getting tools")
 
         restricted_shell = create_restricted_shell(self.repository.path)
-        return [restricted_shell, editor]
+        return [restricted_shell, editor] + self.get_build_tools()
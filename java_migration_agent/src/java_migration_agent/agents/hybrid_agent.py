@@ -46,10 +46,10 @@ class HybridAgent(BaseMigrationAgent):
         Get the list of tools for this agent.
 
         Returns:
-            List containing restricted shell and editor
+            List containing restricted shell, editor, and the Maven build tool if enabled
         """
         if not self.repository:
             raise ValueError("Repository must be set before getting tools")
 
         restricted_shell = create_restricted_shell(self.repository.path)
-        return [restricted_shell, editor]
+        return [restricted_shell, editor] + self.get_build_tools()
@@ -17,6 +17,7 @@ class RAGAgent(BaseMigrationAgent):
     This agent has access to:
     - A restricted shell for running commands
     - An editor for modifying files
+    - A Maven build tool returning structured errors (if enabled)
     - A dependency version search tool that provides Java 17 compatible versions
 
     The search tool allows the agent to look up recommended versions for dependencies
@@ -37,10 +38,11 @@ class RAGAgent(BaseMigrationAgent):
         Get the list of tools for this agent.
 
         Returns:
-            List containing restricted shell, editor, and dependency search
+            List containing restricted shell, editor, dependency search, and the Maven build
+            tool if enabled
         """
         if not self.repository:
             raise ValueError("Repository must be set before getting tools")
 
         restricted_shell = create_restricted_shell(self.repository.path)
-        return [restricted_shell, editor, search_dependency_version]
+        return [restricted_shell, editor, search_dependency_version] + self.get_build_tools()
@@ -28,6 +28,15 @@ class AgentConfig:
     max_messages: int = 160
     shell_timeout: int = 300
     bypass_tool_consent: bool = True
+    maven_build_tool: bool = True
+    tool_telemetry: bool = True
+
+    # Conversation management: Compact older tool outputs (e.g. Maven logs) to bound the context
+    compact_tool_outputs: bool = True
+    max_context_tokens: int = 100000
+    keep_recent_tool_outputs: int = 2
+    compacted_tool_output_max_lines: int = 40
+    compact_tool_output_min_chars: int = 2000
 
     # System prompts for different agent types
     baseline_system_prompt: str = (
@@ -94,6 +103,11 @@ class ExperimentConfig:
     max_workers: int = 8
     require_maximal_migration: bool = True
 
+    def get_tool_log_file(self, repo_id: str) -> str:
+        """Get the tool telemetry JSONL file for a specific repository."""
+        repo_id = repo_id.replace("/", "__")  # Sanitize repo_id for filesystem
+        return os.path.join(self.output_dir, self.exp_id, f"{repo_id}.tools.jsonl")
+
     def get_repo_output_dir(self, repo_id: str) -> str:
         """Get output directory for a specific repository."""
         repo_id = repo_id.replace("/", "__")  # Sanitize repo_id for filesystem
@@ -3,5 +3,11 @@
 from java_migration_agent.core.base_agent import BaseMigrationAgent
 from java_migration_agent.core.repository import Repository
 from java_migration_agent.core.model_factory import create_bedrock_model
+from java_migration_agent.core.conversation_manager import ToolOutputCompactingConversationManager
 
-__all__ = ["BaseMigrationAgent", "Repository", "create_bedrock_model"]
+__all__ = [
+    "BaseMigrationAgent",
+    "Repository",
+    "create_bedrock_model",
+    "ToolOutputCompactingConversationManager",
+]
@@ -7,13 +7,21 @@ from abc import ABC, abstractmethod
 from typing import Optional, List, Any
 
 from strands import Agent
-from strands.agent.conversation_manager import NullConversationManager
+from strands.models import Model
+from strands.agent.conversation_manager import ConversationManager, NullConversationManager
 
 from java_migration_agent.config.settings import Config
+from java_migration_agent.core.conversation_manager import ToolOutputCompactingConversationManager
 from java_migration_agent.core.repository import Repository
 from java_migration_agent.core.model_factory import create_bedrock_model
 from java_migration_agent.evaluation.evaluator import Evaluator
-from java_migration_agent.hooks.agent_hooks import MessageLimitHook, MaxMessageLimitException
+from java_migration_agent.tools.build_tools import create_maven_build_tool
+from java_migration_agent.hooks.agent_hooks import (
+    ConversationCompactionHook,
+    MessageLimitHook,
+    MaxMessageLimitException,
+    ToolLoggingHook,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +48,7 @@ class BaseMigrationAgent(ABC):
         # Will be set when migrating a repo
         self.repository: Optional[Repository] = None
         self.agent: Optional[Agent] = None
+        self.tool_logging_hook: Optional[ToolLoggingHook] = None
         self.evaluator = Evaluator()
 
     @abstractmethod
@@ -52,6 +61,18 @@ class BaseMigrationAgent(ABC):
         """
         pass
 
+    def get_build_tools(self) -> List[Any]:
+        """
+        Get the structured Maven build tool, if enabled.
+
+        Returns:
+            List containing the Maven build tool, or an empty list
+        """
+        if not self.config.agent.maven_build_tool:
+            return []
+
+        return [create_maven_build_tool(self.repository.path, timeout=self.config.agent.shell_timeout)]
+
     def get_system_prompt(self) -> str:
         """
         Get the system prompt for this agent.
@@ -82,6 +103,34 @@ class BaseMigrationAgent(ABC):
         """
         pass
 
+    def create_conversation_manager(self) -> ConversationManager:
+        """
+        Create the conversation manager based on the agent configuration.
+
+        Returns:
+            Conversation manager compacting older tool outputs, or a no-op one if disabled
+        """
+        agent_config = self.config.agent
+        if not agent_config.compact_tool_outputs:
+            return NullConversationManager()
+
+        return ToolOutputCompactingConversationManager(
+            max_tokens=agent_config.max_context_tokens,
+            keep_recent=agent_config.keep_recent_tool_outputs,
+            max_lines=agent_config.compacted_tool_output_max_lines,
+            min_chars=agent_config.compact_tool_output_min_chars,
+            root_dir=self.repository.path if self.repository else "",
+        )
+
+    def create_model(self) -> Model:
+        """
+        Create the model driving the agent.
+
+        Returns:
+            Bedrock model from the model configuration
+        """
+        return create_bedrock_model(self.config.model)
+
     def create_agent(self) -> Agent:
         """
         Create a Strands agent with the appropriate configuration.
@@ -89,29 +138,53 @@ class BaseMigrationAgent(ABC):
         Returns:
             Configured Strands Agent
         """
-        model = create_bedrock_model(self.config.model)
+        model = self.create_model()
         tools = self.get_tools()
         system_prompt = self.get_system_prompt()
 
+        hooks = [MessageLimitHook(max_messages=self.config.agent.max_messages)]
+        if self.config.agent.compact_tool_outputs:
+            hooks.append(ConversationCompactionHook())
+        if self.tool_logging_hook:
+            hooks.append(self.tool_logging_hook)
+
         return Agent(
             model=model,
             tools=tools,
             system_prompt=system_prompt,
-            conversation_manager=NullConversationManager(),
-            hooks=[MessageLimitHook(max_messages=self.config.agent.max_messages)],
+            conversation_manager=self.create_conversation_manager(),
+            hooks=hooks,
         )
 
-    def migrate(self, repository: Repository) -> dict:
+    def get_raw_messages(self) -> List[dict]:
+        """
+        Get the agent's messages with raw tool outputs, e.g. to save the trajectory.
+
+        Returns:
+            Messages as they happened, before any tool output compaction
+        """
+        conversation_manager = getattr(self.agent, "conversation_manager", None)
+        if isinstance(conversation_manager, ToolOutputCompactingConversationManager):
+            return conversation_manager.get_raw_messages(self.agent.messages)
+        return self.agent.messages
+
+    def migrate(self, repository: Repository, evaluate: bool = True) -> dict:
         """
         Execute migration on a repository.
 
         Args:
             repository: Repository object to migrate
+            evaluate: Whether to evaluate the migration with MigrationBench
 
         Returns:
             Dictionary with migration results
         """
         self.repository = repository
+        if self.config.agent.tool_telemetry:
+            log_file = None
+            if self.config.experiment:
+                log_file = self.config.experiment.get_tool_log_file(repository.repo_id)
+            self.tool_logging_hook = ToolLoggingHook(log_file=log_file)
         self.agent = self.create_agent()
 
         # Prepare repository (subclasses can override)
@@ -129,33 +202,40 @@ class BaseMigrationAgent(ABC):
         try:
             # Run the agent
             _ = self.agent(user_input)
-            messages = self.agent.messages
+            messages = self.get_raw_messages()
         except MaxMessageLimitException as e:
             logger.warning(f"Message limit reached: {e}")
-            messages = self.agent.messages
+            messages = self.get_raw_messages()
         except Exception as e:
             logger.error(f"Error during migration: {e}")
-            messages = self.agent.messages if hasattr(self.agent, "messages") else []
+            messages = self.get_raw_messages() if hasattr(self.agent, "messages") else []
+
+        tool_telemetry = None
+        if self.tool_logging_hook:
+            self.tool_logging_hook.close()
+            tool_telemetry = self.tool_logging_hook.telemetry.summary()
 
         # Evaluate migration results
-        try:
-            max_success = self.evaluator.evaluate(
-                repo_path=repository.path,
-                github_url=repository.github_url,
-                require_maximal_migration=True,
-            )
-            min_success = self.evaluator.evaluate(
-                repo_path=repository.path,
-                github_url=repository.github_url,
-                require_maximal_migration=False,
-            )
-        except Exception as e:
-            logger.error(f"Error during evaluation: {e}")
+        if evaluate:
+            try:
+                max_success = self.evaluator.evaluate(
+                    repo_path=repository.path,
+                    github_url=repository.github_url,
+                    require_maximal_migration=True,
+                )
+                min_success = self.evaluator.evaluate(
+                    repo_path=repository.path,
+                    github_url=repository.github_url,
+                    require_maximal_migration=False,
+                )
+            except Exception as e:
+                logger.error(f"Error during evaluation: {e}")
 
         return {
             "messages": messages,
             "max_success": max_success,
             "min_success": min_success,
+            "tool_telemetry": tool_telemetry,
         }
 
     def save_results(self, repo_id: str, results: dict) -> None:
@@ -177,6 +257,7 @@ class BaseMigrationAgent(ABC):
         output_data = {
             "max_migration_success": results["max_success"],
             "min_migration_success": results["min_success"],
+            "tool_telemetry": results.get("tool_telemetry"),
             "trajectory": results["messages"],
         }
 
@@ -0,0 +1,202 @@
+"""Conversation manager that compacts large tool outputs to bound the context size."""
+
+import copy
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from strands.agent.conversation_manager import ConversationManager
+
+from java_migration_agent.utils.maven_log_utils import compact_output, is_compacted
+
+logger = logging.getLogger(__name__)
+
+# Rough characters per token, used for a cheap token estimate
+CHARS_PER_TOKEN = 4
+
+# Text items of a tool result, keyed by (tool use ID, item index)
+ToolResultItems = List[Tuple[Tuple[str, int], dict]]
+
+
+def estimate_tokens(messages: List[dict]) -> int:
+    """
+    Estimate the number of tokens in a list of messages.
+
+    Args:
+        messages: Conversation messages
+
+    Returns:
+        Estimated number of tokens
+    """
+    num_chars = 0
+    for message in messages:
+        for block in message.get("content", []):
+            if "text" in block:
+                num_chars += len(block["text"])
+            elif "toolUse" in block:
+                num_chars += len(json.dumps(block["toolUse"].get("input", {}), default=str))
+            elif "toolResult" in block:
+                for item in block["toolResult"].get("content", []):
+                    num_chars += len(item.get("text", "")) or len(json.dumps(item, default=str))
+            elif "reasoningContent" in block:
+                num_chars += len(json.dumps(block["reasoningContent"], default=str))
+    return num_chars // CHARS_PER_TOKEN
+
+
+class ToolOutputCompactingConversationManager(ConversationManager):
+    """
+    Keep only the error-relevant lines of older tool outputs.
+
+    The most recent tool results are kept verbatim, older ones larger than `min_chars` are
+    replaced by their compacted form (see `maven_log_utils.compact_output`). When the estimated
+    size still exceeds `max_tokens`, all tool results but the latest one are compacted, and
+    then shrunk further. Messages are never removed, so tool use/result pairs stay valid.
+
+    Only the messages sent to the model are compacted: The raw tool outputs are kept, so that
+    `get_raw_messages` returns the conversation as it happened, e.g. to save it.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 100000,
+        keep_recent: int = 2,
+        max_lines: int = 40,
+        min_chars: int = 2000,
+        root_dir: str = "",
+    ):
+        """
+        Initialize the conversation manager.
+
+        Args:
+            max_tokens: Token budget for the conversation
+            keep_recent: Number of most recent tool results kept verbatim
+            max_lines: Maximum number of lines kept in a compacted tool result
+            min_chars: Tool results shorter than this are never compacted
+            root_dir: Root directory of the repository, stripped from file paths
+        """
+        super().__init__()
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.max_lines = max_lines
+        self.min_chars = min_chars
+        self.root_dir = root_dir
+
+        # (tool use ID, item index) => raw text of a compacted tool result item
+        self.raw_texts: Dict[Tuple[str, int], str] = {}
+
+    @staticmethod
+    def _get_tool_result_texts(messages: List[dict]) -> List[ToolResultItems]:
+        """
+        Get all text items of tool results, in conversation order.
+
+        Args:
+            messages: Conversation messages
+
+        Returns:
+            Text items of each tool result, in conversation order
+        """
+        tool_results = []
+        for message in messages:
+            for block in message.get("content", []):
+                if "toolResult" in block:
+                    tool_result = block["toolResult"]
+                    tool_use_id = tool_result.get("toolUseId", "")
+                    items = [
+                        ((tool_use_id, index), item)
+                        for index, item in enumerate(tool_result.get("content", []))
+                        if "text" in item
+                    ]
+                    tool_results.append(items)
+        return tool_results
+
+    def get_raw_messages(self, messages: List[dict]) -> List[dict]:
+        """
+        Get a copy of the messages with raw tool outputs, as before any compaction.
+
+        Args:
+            messages: Conversation messages, possibly compacted
+
+        Returns:
+            Copy of the messages with compacted tool outputs restored
+        """
+        raw_messages = copy.deepcopy(messages)
+        for items in self._get_tool_result_texts(raw_messages):
+            for key, item in items:
+                if key in self.raw_texts:
+                    item["text"] = self.raw_texts[key]
+        return raw_messages
+
+    def _compact(self, tool_results: List[ToolResultItems], max_lines: int, min_chars: int) -> int:
+        """
+        Compact the given tool results in place, keeping their raw texts.
+
+        Args:
+            tool_results: Tool result text items to compact
+            max_lines: Maximum number of lines kept per tool result
+            min_chars: Tool results shorter than this are skipped
+
+        Returns:
+            Number of characters saved
+        """
+        saved = 0
+        for items in tool_results:
+            for key, item in items:
+                text = item["text"]
+                if len(text) < min_chars:
+                    continue
+
+                if is_compacted(text):
+                    # Already compacted: Only keep the header and fewer lines
+                    lines = text.splitlines()
+                    if len(lines) <= max_lines + 1:
+                        continue
+                    compacted = "\n".join(lines[: max_lines + 1] + ["... (more lines omitted)"])
+                else:
+                    compacted = compact_output(text, max_lines=max_lines, root_dir=self.root_dir)
+                if len(compacted) < len(text):
+                    self.raw_texts.setdefault(key, text)
+                    item["text"] = compacted
+                    saved += len(text) - len(compacted)
+        return saved
+
+    def apply_management(self, agent: Any, **kwargs: Any) -> None:
+        """
+        Compact older tool outputs and enforce the token budget.
+
+        Args:
+            agent: The agent whose messages are compacted in place
+            **kwargs: Unused
+        """
+        tool_results = self._get_tool_result_texts(agent.messages)
+        num_recent = min(self.keep_recent, len(tool_results))
+        older = tool_results[: len(tool_results) - num_recent]
+
+        saved = self._compact(older, self.max_lines, self.min_chars)
+
+        if estimate_tokens(agent.messages) > self.max_tokens:
+            saved += self._compact(tool_results[:-1], self.max_lines, self.min_chars)
+        if estimate_tokens(agent.messages) > self.max_tokens:
+            saved += self._compact(tool_results[:-1], max(self.max_lines // 4, 1), 0)
+
+        if saved:
+            logger.info(
+                f"Compacted tool outputs: saved {saved} chars, "
+                f"~{estimate_tokens(agent.messages)} tokens remaining"
+            )
+
+    def reduce_context(self, agent: Any, e: Optional[Exception] = None, **kwargs: Any) -> None:
+        """
+        Compact every tool output, including the most recent ones.
+
+        Args:
+            agent: The agent whose messages are compacted in place
+            e: The exception that triggered the reduction, if any
+            **kwargs: Unused
+
+        Raises:
+            Exception: `e`, if nothing could be reduced
+        """
+        tool_results = self._get_tool_result_texts(agent.messages)
+        saved = self._compact(tool_results, max(self.max_lines // 4, 1), 0)
+        if not saved and e:
+            raise e
@@ -1,9 +1,10 @@
 """Hooks for Strands agents."""
 
 from java_migration_agent.hooks.agent_hooks import (
+    ConversationCompactionHook,
     MessageLimitHook,
     MaxMessageLimitException,
     ToolLoggingHook,
 )
 
-__all__ = ["MessageLimitHook", "MaxMessageLimitException", "ToolLoggingHook"]
+__all__ = ["ConversationCompactionHook", "MessageLimitHook", "MaxMessageLimitException", "ToolLoggingHook"]
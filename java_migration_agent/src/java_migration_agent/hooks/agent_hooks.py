@@ -1,7 +1,9 @@
 """Hooks for monitoring and controlling agent behavior."""
 
-import json
-import logging
+import re
+import threading
+import time
+from typing import Dict, List, Optional
 
 from strands.experimental.hooks import (
     AfterModelInvocationEvent,
@@ -11,36 +13,73 @@ from strands.experimental.hooks import (
 )
 from strands.hooks import HookProvider, HookRegistry
 
+from java_migration_agent.telemetry import BufferedJsonlWriter, ToolTelemetry
+
 
 class ToolLoggingHook(HookProvider):
-    """Concise hook to log tool invocations to file."""
+    """
+    Hook to record tool invocations as telemetry.
+
+    Per-tool wall time, status and output size go into histograms (see `ToolTelemetry`), and
+    events are written to a JSONL file by a background `BufferedJsonlWriter`, so the agent
+    thread only does constant work per event.
+    """
 
-    def __init__(self, log_file: str = "tool_logs.log"):
+    def __init__(self, log_file: Optional[str] = "tool_logs.jsonl", telemetry: Optional[ToolTelemetry] = None):
         """
         Initialize the tool logging hook.
 
         Args:
-            log_file: Path to log file
+            log_file: Path to the JSONL event file, or None to only collect metrics
+            telemetry: Telemetry to record into (a new one is created if not provided)
         """
-        self.logger = logging.getLogger("ToolLogger")
-        if not self.logger.handlers:
-            handler = logging.FileHandler(log_file)
-            handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s"))
-            self.logger.addHandler(handler)
-            self.logger.setLevel(logging.INFO)
-
-    def get_turn_number(self, invocation_state) -> int:
+        self.telemetry = telemetry or ToolTelemetry()
+        self.writer = BufferedJsonlWriter(log_file) if log_file else None
+
+        self._lock = threading.Lock()
+        self._start_times: Dict[str, float] = {}
+        self._num_messages = 0
+        self._turn = 0
+
+    def get_turn_number(self, messages: List[dict]) -> int:
         """
-        Get the current turn number from invocation state.
+        Get the current turn number, counting user messages incrementally.
 
         Args:
-            invocation_state: State of the invocation
+            messages: Agent messages
 
         Returns:
             Turn number
         """
-        messages = invocation_state.get("messages", [])
-        return sum(1 for msg in messages if msg.get("role") == "user")
+        with self._lock:
+            if len(messages) < self._num_messages:
+                # Messages were replaced: Count from scratch
+                self._num_messages, self._turn = 0, 0
+            for message in messages[self._num_messages :]:
+                if message.get("role") == "user":
+                    self._turn += 1
+            self._num_messages = len(messages)
+            return self._turn
+
+    @staticmethod
+    def get_category(tool_use: dict) -> Optional[str]:
+        """
+        Get the telemetry category of a tool use.
+
+        Args:
+            tool_use: Tool use with name and input
+
+        Returns:
+            `maven` for Maven builds, otherwise None
+        """
+        if tool_use.get("name") == "maven_build":
+            return "maven"
+
+        tool_input = tool_use.get("input")
+        command = tool_input.get("command") if isinstance(tool_input, dict) else None
+        if isinstance(command, str) and re.search(r"\bmvnw?\b", command):
+            return "maven"
+        return None
 
     def register_hooks(self, registry: HookRegistry) -> None:
         """Register callbacks with the hook registry."""
@@ -49,25 +88,71 @@ class ToolLoggingHook(HookProvider):
 
     def log_before(self, event: BeforeToolInvocationEvent) -> None:
         """Log before tool invocation."""
-        data = {
-            "event": "BEFORE",
-            "turn": self.get_turn_number(dict(event.invocation_state)),
-            "tool_name": event.tool_use.get("name"),
-            "tool_use": dict(event.tool_use),
-        }
-        self.logger.info(json.dumps(data, default=str))
+        self._start_times[event.tool_use.get("toolUseId")] = time.perf_counter()
+
+        if self.writer:
+            self.writer.write(
+                {
+                    "event": "BEFORE",
+                    "time": time.time(),
+                    "turn": self.get_turn_number(event.agent.messages),
+                    "tool_name": event.tool_use.get("name"),
+                    "tool_use": dict(event.tool_use),
+                }
+            )
 
     def log_after(self, event: AfterToolInvocationEvent) -> None:
         """Log after tool invocation."""
-        data = {
-            "event": "AFTER",
-            "turn": self.get_turn_number(dict(event.invocation_state)),
-            "tool_name": event.tool_use.get("name"),
-            "tool_use": dict(event.tool_use),
-            "result": str(event.result),
-            "exception": str(event.exception) if event.exception else None,
-        }
-        self.logger.info(json.dumps(data, default=str))
+        tool_use_id = event.tool_use.get("toolUseId")
+        start_time = self._start_times.pop(tool_use_id, None)
+        wall_time = time.perf_counter() - start_time if start_time is not None else 0.0
+
+        result = event.result or {}
+        # Keep references to the texts only: They may be compacted in the messages later on
+        texts = [item.get("text") for item in result.get("content", []) if "text" in item]
+        status = result.get("status", "unknown") if event.exception is None else "exception"
+        output_chars = sum(len(text) for text in texts)
+
+        tool_name = event.tool_use.get("name")
+        self.telemetry.record(tool_name, wall_time, status, output_chars, self.get_category(event.tool_use))
+
+        if self.writer:
+            self.writer.write(
+                {
+                    "event": "AFTER",
+                    "time": time.time(),
+                    "turn": self.get_turn_number(event.agent.messages),
+                    "tool_name": tool_name,
+                    "tool_use_id": tool_use_id,
+                    "wall_time_seconds": wall_time,
+                    "status": status,
+                    "output_chars": output_chars,
+                    "result": texts,
+                    "exception": str(event.exception) if event.exception else None,
+                }
+            )
+
+    def close(self) -> None:
+        """Flush and close the event file."""
+        if self.writer:
+            self.writer.close()
+
+
+class ConversationCompactionHook(HookProvider):
+    """Hook to apply conversation management before every model invocation."""
+
+    def register_hooks(self, registry: HookRegistry) -> None:
+        """Register callbacks with the hook registry."""
+        registry.add_callback(BeforeModelInvocationEvent, self.apply_management)
+
+    def apply_management(self, event: BeforeModelInvocationEvent) -> None:
+        """
+        Let the agent's conversation manager compact the messages.
+
+        Args:
+            event: Before model invocation event
+        """
+        event.agent.conversation_manager.apply_management(event.agent)
 
 
 class MaxMessageLimitException(Exception):
@@ -76,6 +76,25 @@ def main():
         help="Maximum number of messages per conversation",
     )
 
+    parser.add_argument(
+        "--max-context-tokens",
+        type=int,
+        default=100000,
+        help="Token budget for the conversation; older tool outputs are compacted to fit",
+    )
+
+    parser.add_argument(
+        "--no-compact-tool-outputs",
+        action="store_true",
+        help="Keep full tool outputs in the conversation history",
+    )
+
+    parser.add_argument(
+        "--no-maven-build-tool",
+        action="store_true",
+        help="Do not give agents the structured `maven_build` tool",
+    )
+
     parser.add_argument(
         "--max-workers",
         type=int,
@@ -100,6 +119,9 @@ def main():
         ),
         agent=AgentConfig(
             max_messages=args.max_messages,
+            maven_build_tool=not args.no_maven_build_tool,
+            compact_tool_outputs=not args.no_compact_tool_outputs,
+            max_context_tokens=args.max_context_tokens,
         ),
         experiment=ExperimentConfig(
             exp_id=args.exp_id,
@@ -0,0 +1,6 @@
+"""Replay recorded trajectories without calling the model."""
+
+from java_migration_agent.replay.replay_model import ReplayModel, StructuredOutputNotRecordedError
+from java_migration_agent.replay.replayer import replay_trace
+
+__all__ = ["ReplayModel", "StructuredOutputNotRecordedError", "replay_trace"]
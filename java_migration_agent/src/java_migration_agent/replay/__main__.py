@@ -0,0 +1,6 @@
+"""Make the replay runnable with python -m java_migration_agent.replay"""
+
+from java_migration_agent.replay.replayer import main
+
+if __name__ == "__main__":
+    main()
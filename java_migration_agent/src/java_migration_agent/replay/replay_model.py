@@ -0,0 +1,196 @@
+"""Model replaying recorded assistant messages instead of calling Bedrock."""
+
+import json
+import logging
+import time
+from typing import Any, AsyncIterable, Dict, List, Optional
+
+from strands.models import Model
+from strands.tools.structured_output import convert_pydantic_to_tool_spec
+
+logger = logging.getLogger(__name__)
+
+
+class StructuredOutputNotRecordedError(ValueError):
+    """The next recorded assistant message has no structured output for the requested model."""
+
+
+def rewrite_paths(value: Any, path_map: Dict[str, str]) -> Any:
+    """
+    Rewrite recorded paths in a tool input to their local counterparts.
+
+    Args:
+        value: Tool input, possibly nested
+        path_map: Mapping of recorded path prefixes to local ones
+
+    Returns:
+        Tool input with all strings rewritten
+    """
+    if isinstance(value, str):
+        for recorded, local in path_map.items():
+            value = value.replace(recorded, local)
+        return value
+    if isinstance(value, dict):
+        return {key: rewrite_paths(item, path_map) for key, item in value.items()}
+    if isinstance(value, list):
+        return [rewrite_paths(item, path_map) for item in value]
+    return value
+
+
+class ReplayModel(Model):
+    """
+    Model streaming the recorded assistant messages of a trajectory, one per invocation.
+
+    Tool uses are replayed with their recorded inputs (paths rewritten to the local checkout),
+    so the agent runs the real tools while the model itself takes no time. Once the recorded
+    messages are exhausted, the model ends the turn.
+    """
+
+    def __init__(self, messages: List[dict], path_map: Optional[Dict[str, str]] = None):
+        """
+        Initialize the replay model.
+
+        Args:
+            messages: Recorded trajectory; only assistant messages are replayed
+            path_map: Mapping of recorded path prefixes to local ones
+        """
+        self.messages = [message for message in messages if message.get("role") == "assistant"]
+        self.path_map = path_map or {}
+        self.index = 0
+        self.model_time_seconds = 0.0
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether all recorded assistant messages have been replayed."""
+        return self.index >= len(self.messages)
+
+    def update_config(self, **model_config: Any) -> None:
+        """Ignore config updates: The replay has no configuration."""
+        del model_config
+
+    def get_config(self) -> dict:
+        """
+        Get the model configuration.
+
+        Returns:
+            Configuration with a placeholder model ID
+        """
+        return {"model_id": "replay"}
+
+    async def structured_output(
+        self,
+        output_model: Any,
+        prompt: Any,
+        system_prompt: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncIterable[dict]:
+        """
+        Replay a recorded structured output: The next assistant message using the output model's tool.
+
+        Args:
+            output_model: Pydantic model of the output
+            prompt: Current conversation, ignored
+            system_prompt: System prompt, ignored
+            **kwargs: Unused
+
+        Yields:
+            The structured output, as `{"output": ...}`
+
+        Raises:
+            StructuredOutputNotRecordedError: If the next recorded message has no tool use of the output model
+        """
+        start_time = time.perf_counter()
+        tool_name = convert_pydantic_to_tool_spec(output_model)["name"]
+        message = {} if self.exhausted else self.messages[self.index]
+        tool_inputs = [
+            block["toolUse"].get("input", {})
+            for block in message.get("content", [])
+            if "toolUse" in block and block["toolUse"].get("name") == tool_name
+        ]
+        if not tool_inputs:
+            raise StructuredOutputNotRecordedError(
+                f"The trajectory has no structured output `{tool_name}` at assistant message {self.index}"
+            )
+
+        self.index += 1
+        output = output_model(**rewrite_paths(tool_inputs[-1], self.path_map))
+        self.model_time_seconds += time.perf_counter() - start_time
+        yield {"output": output}
+
+    def get_events(self, message: dict) -> List[dict]:
+        """
+        Convert a recorded assistant message to stream events.
+
+        Args:
+            message: Recorded assistant message
+
+        Returns:
+            List of stream events
+        """
+        events = [{"messageStart": {"role": "assistant"}}]
+        has_tool_use = False
+        for block in message.get("content", []):
+            if "text" in block:
+                events.append({"contentBlockDelta": {"delta": {"text": block["text"]}}})
+            elif "toolUse" in block:
+                has_tool_use = True
+                tool_use = block["toolUse"]
+                tool_input = rewrite_paths(tool_use.get("input", {}), self.path_map)
+                events.append(
+                    {"contentBlockStart": {"start": {"toolUse": {"toolUseId": tool_use["toolUseId"], "name": tool_use["name"]}}}}
+                )
+                events.append({"contentBlockDelta": {"delta": {"toolUse": {"input": json.dumps(tool_input)}}}})
+            elif "reasoningContent" in block:
+                reasoning = block["reasoningContent"].get("reasoningText", {})
+                events.append({"contentBlockDelta": {"delta": {"reasoningContent": {"text": reasoning.get("text", "")}}}})
+                if reasoning.get("signature"):
+                    events.append(
+                        {"contentBlockDelta": {"delta": {"reasoningContent": {"signature": reasoning["signature"]}}}}
+                    )
+            else:
+                logger.debug(f"Skipping unsupported content block: {list(block)}")
+                continue
+            events.append({"contentBlockStop": {}})
+
+        events.append({"messageStop": {"stopReason": "tool_use" if has_tool_use else "end_turn"}})
+        events.append(
+            {
+                "metadata": {
+                    "usage": {"inputTokens": 0, "outputTokens": 0, "totalTokens": 0},
+                    "metrics": {"latencyMs": 0},
+                }
+            }
+        )
+        return events
+
+    async def stream(
+        self,
+        messages: Any,
+        tool_specs: Optional[list] = None,
+        system_prompt: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncIterable[dict]:
+        """
+        Stream the next recorded assistant message.
+
+        Args:
+            messages: Current conversation, ignored
+            tool_specs: Available tools, ignored
+            system_prompt: System prompt, ignored
+            **kwargs: Unused
+
+        Yields:
+            Stream events of the recorded message
+        """
+        start_time = time.perf_counter()
+        if self.exhausted:
+            logger.info("Recorded trajectory exhausted, ending the turn")
+            message = {"content": [{"text": "Replay finished."}]}
+        else:
+            message = self.messages[self.index]
+            self.index += 1
+        events = self.get_events(message)
+        self.model_time_seconds += time.perf_counter() - start_time
+
+        for event in events:
+            yield event
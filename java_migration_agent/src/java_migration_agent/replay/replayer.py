@@ -0,0 +1,187 @@
+"""Replay recorded migration trajectories against local checkouts to profile the framework."""
+
+import argparse
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from typing import Optional
+
+from java_migration_agent.config.settings import AgentConfig, Config
+from java_migration_agent.core.base_agent import BaseMigrationAgent
+from java_migration_agent.core.repository import Repository
+from java_migration_agent.replay.replay_model import ReplayModel, StructuredOutputNotRecordedError
+from java_migration_agent.traces.reader import read_trace
+from java_migration_agent.traces.store import AGENT_TYPE_PREFIXES, get_trace_info
+
+logger = logging.getLogger(__name__)
+
+_REPO_PATH_PATTERN = re.compile(r"located at (\S+) is currently")
+
+
+def get_recorded_repo_path(trajectory: list) -> Optional[str]:
+    """
+    Get the repository path used when the trajectory was recorded.
+
+    Args:
+        trajectory: Recorded messages
+
+    Returns:
+        Recorded repository path, or None if the first user message doesn't mention it
+    """
+    for message in trajectory:
+        if message.get("role") != "user":
+            continue
+        for block in message.get("content", []):
+            match = _REPO_PATH_PATTERN.search(block.get("text", ""))
+            if match:
+                return match.group(1).rstrip(".")
+        break
+    return None
+
+
+def replay_trace(
+    trace_file: str,
+    repo_dir: str,
+    agent_type: Optional[str] = None,
+    config: Optional[Config] = None,
+) -> dict:
+    """
+    Replay a recorded trajectory with the real tools running against a local checkout.
+
+    Args:
+        trace_file: Recorded trajectory JSON file
+        repo_dir: Local checkout of the repository, modified in place
+        agent_type: Agent type; inferred from the trace directory if not given
+        config: Agent configuration; defaults are used if not given
+
+    Returns:
+        Timing report: total, tool, build, model and framework overhead time in seconds
+    """
+    from java_migration_agent.main import AGENT_TYPES
+
+    _, trajectory = read_trace(trace_file)
+
+    trace_info = get_trace_info(trace_file)
+    repo_id = trace_info["repo_id"]
+    agent_type = agent_type or (trace_info["agent_type"] if trace_info["agent_type"] in AGENT_TYPES else "baseline")
+
+    repo_dir = os.path.abspath(repo_dir)
+    path_map = {}
+    recorded_path = get_recorded_repo_path(trajectory)
+    if recorded_path:
+        path_map[recorded_path] = repo_dir
+    else:
+        logger.warning(f"Unable to find the recorded repository path in {trace_file}")
+
+    model = ReplayModel(trajectory, path_map)
+    agent: BaseMigrationAgent = AGENT_TYPES[agent_type](config or Config(agent=AgentConfig(max_messages=len(trajectory) + 2)))
+    agent.create_model = lambda: model
+
+    repository = Repository.from_local(repo_dir, repo_id=repo_id)
+    start_time = time.perf_counter()
+    results = agent.migrate(repository, evaluate=False)
+    total_seconds = time.perf_counter() - start_time
+
+    tool_telemetry = results.get("tool_telemetry") or {}
+    tool_seconds = tool_telemetry.get("total_wall_time_seconds", 0.0)
+    build_seconds = tool_telemetry.get("categories", {}).get("maven", {}).get("wall_time_seconds", {}).get("sum", 0.0)
+
+    return {
+        "trace_file": trace_file,
+        "repo_id": repo_id,
+        "agent_type": agent_type,
+        "recorded_messages": len(trajectory),
+        "replayed_messages": len(results["messages"]),
+        "replayed_model_calls": model.index,
+        "total_seconds": total_seconds,
+        "tool_seconds": tool_seconds,
+        "build_seconds": build_seconds,
+        "model_seconds": model.model_time_seconds,
+        "framework_overhead_seconds": total_seconds - tool_seconds - model.model_time_seconds,
+        "tool_telemetry": tool_telemetry,
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Replay recorded migration trajectories without Bedrock to profile tools and framework overhead"
+    )
+    parser.add_argument("trace_files", nargs="+", help="Recorded trajectory JSON files")
+    parser.add_argument(
+        "--workdir",
+        type=str,
+        default=None,
+        help="Directory containing local checkouts, one per repository name (e.g. `EJServer`)",
+    )
+    parser.add_argument(
+        "--hf-dataset",
+        type=str,
+        default=None,
+        help="Clone repositories at their base commit from this HuggingFace dataset instead of --workdir",
+    )
+    parser.add_argument(
+        "--agent-type",
+        type=str,
+        default=None,
+        choices=sorted(set(AGENT_TYPE_PREFIXES.values())),
+        help="Agent type; inferred from the trace directory by default",
+    )
+    parser.add_argument(
+        "--in-place",
+        action="store_true",
+        help="Modify checkouts from --workdir in place instead of replaying on a copy",
+    )
+    parser.add_argument("--output", type=str, default=None, help="Output JSON file; defaults to stdout")
+
+    args = parser.parse_args()
+    if not args.workdir and not args.hf_dataset:
+        parser.error("One of --workdir or --hf-dataset is required")
+
+    reports = []
+    for trace_file in args.trace_files:
+        repo_id = get_trace_info(trace_file)["repo_id"]
+        repo_name = repo_id.split("/")[-1]
+
+        tmp_dir = None
+        if args.hf_dataset:
+            repo_dir = Repository.from_huggingface(args.hf_dataset, repo_id, exp_id="replay").path
+        else:
+            repo_dir = os.path.join(args.workdir, repo_name)
+            if not os.path.isdir(repo_dir):
+                logger.error(f"Checkout {repo_dir} does not exist, skipping {trace_file}")
+                continue
+            if not args.in_place:
+                tmp_dir = tempfile.mkdtemp(prefix="replay_")
+                repo_dir = shutil.copytree(repo_dir, os.path.join(tmp_dir, repo_name), symlinks=True)
+
+        try:
+            report = replay_trace(trace_file, repo_dir, agent_type=args.agent_type)
+            logger.info(
+                f"Replayed {repo_id}: total {report['total_seconds']:.2f}s, tools {report['tool_seconds']:.2f}s, "
+                f"build {report['build_seconds']:.2f}s, overhead {report['framework_overhead_seconds']:.2f}s"
+            )
+            reports.append(report)
+        except StructuredOutputNotRecordedError as e:
+            logger.warning(f"Skipped {trace_file}, structured output isn't recorded: {e}")
+            reports.append({"trace_file": trace_file, "repo_id": repo_id, "skipped": str(e)})
+        except Exception as e:
+            logger.error(f"Error replaying {trace_file}: {e}")
+        finally:
+            if tmp_dir:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    output = json.dumps(reports, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        logger.info(f"Replay report saved to {args.output}")
+    else:
+        print(output)
+
+    sys.exit(0 if len(reports) == len(args.trace_files) else 1)
@@ -0,0 +1,6 @@
+"""Telemetry for agent tool invocations."""
+
+from java_migration_agent.telemetry.metrics import Histogram, ToolMetrics, ToolTelemetry
+from java_migration_agent.telemetry.writer import BufferedJsonlWriter
+
+__all__ = ["BufferedJsonlWriter", "Histogram", "ToolMetrics", "ToolTelemetry"]
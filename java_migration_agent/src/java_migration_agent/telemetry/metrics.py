@@ -0,0 +1,163 @@
+"""Per-tool metrics with fixed-bucket histograms."""
+
+import bisect
+import threading
+from collections import defaultdict
+from typing import Dict, Optional, Sequence
+
+# Bucket upper bounds: Roughly 1-2-5 steps
+WALL_TIME_BUCKETS_SECONDS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+OUTPUT_SIZE_BUCKETS_CHARS = (100, 1000, 2000, 5000, 10000, 20000, 50000, 100000, 200000, 500000)
+
+
+class Histogram:
+    """Fixed-bucket histogram keeping count, sum, min and max."""
+
+    def __init__(self, buckets: Sequence[float]):
+        """
+        Initialize the histogram.
+
+        Args:
+            buckets: Sorted bucket upper bounds; larger values go to an overflow bucket
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        """
+        Add a value.
+
+        Args:
+            value: Value to record
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Estimate a percentile as the upper bound of the bucket containing it.
+
+        Args:
+            q: Percentile in [0, 100]
+
+        Returns:
+            Estimated value (capped by the observed max), or None if empty
+        """
+        if not self.count:
+            return None
+
+        rank = q / 100.0 * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank and count:
+                bound = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        """
+        Summarize the histogram.
+
+        Returns:
+            Dictionary with count, sum, mean, min, max, percentiles and bucket counts
+        """
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "buckets": {
+                (f"le_{bound}" if index < len(self.buckets) else "inf"): count
+                for index, (bound, count) in enumerate(zip(self.buckets + (None,), self.counts))
+                if count
+            },
+        }
+
+
+class ToolMetrics:
+    """Metrics for a single tool."""
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        self.wall_time_seconds = Histogram(WALL_TIME_BUCKETS_SECONDS)
+        self.output_chars = Histogram(OUTPUT_SIZE_BUCKETS_CHARS)
+        self.statuses: Dict[str, int] = defaultdict(int)
+
+    def to_dict(self) -> dict:
+        """
+        Summarize the tool metrics.
+
+        Returns:
+            Dictionary of histograms and status counts
+        """
+        return {
+            "calls": self.wall_time_seconds.count,
+            "statuses": dict(self.statuses),
+            "wall_time_seconds": self.wall_time_seconds.to_dict(),
+            "output_chars": self.output_chars.to_dict(),
+        }
+
+
+class ToolTelemetry:
+    """Thread-safe per-tool wall time, status and output size metrics."""
+
+    def __init__(self):
+        """Initialize empty telemetry."""
+        self._lock = threading.Lock()
+        self._tools: Dict[str, ToolMetrics] = defaultdict(ToolMetrics)
+        self._categories: Dict[str, ToolMetrics] = defaultdict(ToolMetrics)
+
+    def record(
+        self,
+        tool_name: str,
+        wall_time_seconds: float,
+        status: str,
+        output_chars: int,
+        category: Optional[str] = None,
+    ) -> None:
+        """
+        Record a tool invocation.
+
+        Args:
+            tool_name: Name of the tool
+            wall_time_seconds: Wall time of the invocation
+            status: Result status, e.g. `success` or `error`
+            output_chars: Size of the tool output in characters
+            category: Optional category across tools, e.g. `maven` for builds
+        """
+        with self._lock:
+            for metrics in (self._tools[tool_name], self._categories[category] if category else None):
+                if metrics is None:
+                    continue
+                metrics.wall_time_seconds.add(wall_time_seconds)
+                metrics.output_chars.add(output_chars)
+                metrics.statuses[status] += 1
+
+    def summary(self) -> dict:
+        """
+        Summarize all tools.
+
+        Returns:
+            Dictionary of tool name (and category) to its metrics summary, plus totals
+        """
+        with self._lock:
+            tools = {name: metrics.to_dict() for name, metrics in sorted(self._tools.items())}
+            categories = {name: metrics.to_dict() for name, metrics in sorted(self._categories.items())}
+
+        return {
+            "total_calls": sum(tool["calls"] for tool in tools.values()),
+            "total_wall_time_seconds": sum(tool["wall_time_seconds"]["sum"] for tool in tools.values()),
+            "tools": tools,
+            "categories": categories,
+        }
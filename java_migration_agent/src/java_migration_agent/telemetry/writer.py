@@ -0,0 +1,107 @@
+"""Background buffered JSONL writer."""
+
+import json
+import logging
+import os
+import queue
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class BufferedJsonlWriter:
+    """
+    Write JSON records to a JSONL file from a background thread.
+
+    `write` only enqueues the record, so callers on the agent thread never serialize or touch
+    the file. Records are serialized and flushed in batches of up to `max_batch` records, or
+    every `flush_interval` seconds.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0, max_batch: int = 256):
+        """
+        Initialize the writer and start its background thread.
+
+        Args:
+            path: Path to the JSONL file (appended to)
+            flush_interval: Maximum seconds between flushes
+            max_batch: Maximum number of records written per batch
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        dirname = os.path.dirname(os.path.abspath(path))
+        os.makedirs(dirname, exist_ok=True)
+
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"jsonl-writer:{os.path.basename(path)}", daemon=True)
+        self._thread.start()
+
+    def write(self, record: dict) -> None:
+        """
+        Enqueue a record to be written.
+
+        Args:
+            record: JSON serializable record (non-serializable values are converted with `str`)
+        """
+        if self._closed:
+            logger.warning(f"Dropping record, writer for {self.path} is closed")
+            return
+        self._queue.put(record)
+
+    def _run(self) -> None:
+        """Drain the queue into the file until closed."""
+        with open(self.path, "a") as f:
+            while True:
+                try:
+                    record = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+
+                batch = [record]
+                while len(batch) < self.max_batch:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = False
+                lines = []
+                for item in batch:
+                    if item is _STOP:
+                        stop = True
+                        continue
+                    try:
+                        lines.append(json.dumps(item, default=str))
+                    except Exception as e:
+                        logger.warning(f"Unable to serialize record: {e}")
+
+                if lines:
+                    f.write("\n".join(lines) + "\n")
+                    f.flush()
+                if stop:
+                    return
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """
+        Flush pending records and stop the background thread.
+
+        Args:
+            timeout: Maximum seconds to wait for pending records to be written
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def __enter__(self) -> "BufferedJsonlWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -1,7 +1,8 @@
 """Tools for Java migration agents."""
 
 from java_migration_agent.tools.shell_tools import create_restricted_shell
+from java_migration_agent.tools.build_tools import create_maven_build_tool
 from java_migration_agent.tools.dependency_tools import search_dependency_version
 from java_migration_agent.tools.pom_tools import PomUtils
 
-__all__ = ["create_restricted_shell", "search_dependency_version", "PomUtils"]
+__all__ = ["create_restricted_shell", "create_maven_build_tool", "search_dependency_version", "PomUtils"]
@@ -0,0 +1,155 @@
+"""Maven build tool returning structured build errors."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import subprocess
+from typing import Dict, Tuple
+
+from strands import tool
+
+from java_migration_agent.utils.maven_log_utils import extract_maven_errors
+
+logger = logging.getLogger(__name__)
+
+# Directories that don't affect the build result
+_EXCLUDED_DIRS = {".git", "target"}
+
+# Maximum number of errors returned to the agent
+MAX_ERRORS = 50
+
+
+def get_working_tree_key(root_dir: str) -> str:
+    """
+    Compute a key of the working tree based on file paths, sizes and modification times.
+
+    Args:
+        root_dir: Root directory of the repository
+
+    Returns:
+        Hex digest identifying the current working tree state
+    """
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(root_dir):
+        dirnames[:] = sorted(d for d in dirnames if d not in _EXCLUDED_DIRS)
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            digest.update(f"{os.path.relpath(path, root_dir)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def is_within_path(root_dir: str, path: str) -> bool:
+    """
+    Check whether a path resolves to within a root directory, following symlinks.
+
+    Args:
+        root_dir: Root directory
+        path: Absolute path, or path relative to the root directory
+
+    Returns:
+        True if the path is the root directory or below it
+    """
+    root_dir = os.path.realpath(root_dir)
+    path = os.path.realpath(os.path.join(root_dir, path))
+    return os.path.commonpath([root_dir, path]) == root_dir
+
+
+def get_maven_command(module: str = "", compile_only: bool = False) -> str:
+    """
+    Get the Maven command for a build scope.
+
+    Args:
+        module: Optional module path, built together with the modules it depends on
+        compile_only: Compile main and test sources without running the tests
+
+    Returns:
+        Maven command
+    """
+    command = "mvn clean test-compile" if compile_only else "mvn clean verify"
+    if module:
+        command += f" -pl {module} -am"
+    return command
+
+
+def create_maven_build_tool(allowed_path: str, timeout: int = 300):
+    """
+    Create a Maven build tool for a repository, caching results by working tree state.
+
+    Args:
+        allowed_path: Root directory of the repository
+        timeout: Build timeout in seconds
+
+    Returns:
+        A Strands tool that builds the repository and returns structured errors
+    """
+    allowed_path = os.path.abspath(allowed_path)
+    cache: Dict[Tuple[str, str], dict] = {}
+
+    @tool
+    def maven_build(module: str = "", compile_only: bool = False) -> str:
+        """
+        Build the Maven project and return the build errors in a structured form.
+
+        Results are cached: Building again without changing any file returns the previous result.
+
+        Args:
+            module: Optional module path relative to the repository root (e.g. 'core'); builds
+                only that module and the modules it depends on
+            compile_only: If true, only compile main and test sources (`mvn clean test-compile`)
+                instead of running `mvn clean verify`
+
+        Returns:
+            JSON with the command, success flag, and deduplicated errors (file, line, message, snippet)
+        """
+        module = module.strip()
+        if module and not re.fullmatch(r"[\w./:,-]+", module):
+            return f"Error: Invalid module '{module}'"
+        if module and not is_within_path(allowed_path, module):
+            return f"Error: Module '{module}' is outside the allowed path '{allowed_path}'"
+
+        command = get_maven_command(module, compile_only)
+        key = (get_working_tree_key(allowed_path), command)
+        if key in cache:
+            logger.info(f"Reusing cached build result for `{command}`")
+            return json.dumps(dict(cache[key], cached=True), indent=2)
+
+        try:
+            result = subprocess.run(
+                command,
+                shell=True,
+                cwd=allowed_path,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            return f"Error: Command timed out after {timeout} seconds"
+        except Exception as e:
+            return f"Error executing command: {str(e)}"
+
+        success = result.returncode == 0
+        output = result.stdout + result.stderr
+        errors = [] if success else extract_maven_errors(output, allowed_path)
+        for error in errors:
+            if error["file"] and is_within_path(allowed_path, error["file"]):
+                error["file"] = os.path.relpath(os.path.realpath(error["file"]), os.path.realpath(allowed_path))
+
+        data = {
+            "command": command,
+            "success": success,
+            "num_errors": len(errors),
+            "errors": errors[:MAX_ERRORS],
+        }
+        if not success and not errors:
+            data["output_tail"] = "\n".join(output.splitlines()[-20:])
+        # Key on the tree state after the build, as `clean` and generated sources may touch files
+        cache[(get_working_tree_key(allowed_path), command)] = data
+        return json.dumps(dict(data, cached=False), indent=2)
+
+    return maven_build
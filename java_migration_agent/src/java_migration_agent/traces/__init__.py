@@ -0,0 +1,7 @@
+"""Columnar trace store for analysing agent trajectories."""
+
+from java_migration_agent.traces.reader import iter_trajectory, read_trace
+from java_migration_agent.traces.store import COLUMNS, convert_traces, iter_rows, load_store
+from java_migration_agent.traces.query import QUERIES
+
+__all__ = ["iter_trajectory", "read_trace", "COLUMNS", "convert_traces", "iter_rows", "load_store", "QUERIES"]
@@ -0,0 +1,6 @@
+"""Make the trace store runnable with python -m java_migration_agent.traces"""
+
+from java_migration_agent.traces.cli import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Command line interface to convert traces and query the trace store."""
+
+import argparse
+import logging
+import time
+
+from java_migration_agent.traces.query import QUERIES
+from java_migration_agent.traces.store import convert_traces, load_store
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Convert agent trajectories to Parquet and query them")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    convert_parser = subparsers.add_parser("convert", help="Convert trace JSON files to a Parquet file")
+    convert_parser.add_argument("paths", nargs="+", help="Trace files or directories containing them")
+    convert_parser.add_argument("--output", type=str, required=True, help="Output Parquet file")
+    convert_parser.add_argument("--max-workers", type=int, default=8, help="Number of processes reading traces")
+
+    query_parser = subparsers.add_parser("query", help="Run an aggregate query over Parquet files")
+    query_parser.add_argument("query", choices=list(QUERIES.keys()), help="Query to run")
+    query_parser.add_argument("paths", nargs="+", help="Parquet files or directories containing them")
+    query_parser.add_argument("--limit", type=int, default=20, help="Maximum number of result rows, 0 for all")
+    query_parser.add_argument("--csv", type=str, default=None, help="Also write the result to this CSV file")
+
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    if args.action == "convert":
+        convert_traces(args.paths, args.output, max_workers=args.max_workers)
+    else:
+        result = QUERIES[args.query](load_store(args.paths), limit=args.limit)
+        print(result.to_pandas().to_string(index=False))
+        if args.csv:
+            import pyarrow.csv
+
+            pyarrow.csv.write_csv(result, args.csv)
+    logger.info(f"Done in {time.perf_counter() - start_time:.2f} seconds")
+
+
+if __name__ == "__main__":
+    main()
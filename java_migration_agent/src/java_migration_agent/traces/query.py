@@ -0,0 +1,168 @@
+"""Aggregate queries over the columnar trace store."""
+
+import logging
+import re
+from typing import Callable, Dict, List, Optional
+
+from java_migration_agent.traces.store import ROW_KIND_MESSAGE, ROW_KIND_TOOL_CALL
+
+logger = logging.getLogger(__name__)
+
+_COMMAND_SEPARATOR_PATTERN = re.compile(r"\s*(?:&&|\|\||;|\|)\s*")
+_SETUP_COMMANDS = ("cd", "export", "source")
+
+
+def normalize_command(command: Optional[str], num_words: int = 3) -> str:
+    """
+    Normalize a command for grouping: Skip setup steps like `cd` and `export`, keep the leading words.
+
+    Args:
+        command: Shell or tool command
+        num_words: Number of leading words kept
+
+    Returns:
+        Normalized command, e.g. `mvn clean verify` for `cd /repo && mvn clean verify -q`
+    """
+    steps = [step for step in _COMMAND_SEPARATOR_PATTERN.split(command or "") if step]
+    main_steps = [step for step in steps if step.split()[0] not in _SETUP_COMMANDS]
+    step = (main_steps or steps or [""])[0]
+    return " ".join(step.split()[:num_words])
+
+
+def _runs(table):
+    """One row per run with its run-level columns."""
+    import pyarrow.compute as pc
+
+    table = table.filter(pc.and_(pc.equal(table["kind"], ROW_KIND_MESSAGE), pc.equal(table["message_index"], 0)))
+    return table.select(["exp", "agent_type", "repo_id", "max_migration_success", "min_migration_success", "num_turns"])
+
+
+def _tool_calls(table):
+    """Tool call rows only."""
+    import pyarrow.compute as pc
+
+    return table.filter(pc.equal(table["kind"], ROW_KIND_TOOL_CALL))
+
+
+def _sorted(table, sort_keys: List[tuple], limit: int):
+    """Sort a table and keep its first `limit` rows."""
+    table = table.sort_by(sort_keys)
+    return table.slice(0, limit) if limit else table
+
+
+def query_summary(table, limit: int = 0):
+    """
+    Success rates and run lengths per experiment.
+
+    Args:
+        table: Trace store table
+        limit: Maximum number of result rows, 0 for all
+
+    Returns:
+        pyarrow.Table
+    """
+    import pyarrow.compute as pc
+
+    runs = _runs(table)
+    runs = runs.append_column("max_success", pc.cast(runs["max_migration_success"], "int32"))
+    runs = runs.append_column("min_success", pc.cast(runs["min_migration_success"], "int32"))
+    result = runs.group_by(["exp", "agent_type"]).aggregate(
+        [
+            ("repo_id", "count"),
+            ("max_success", "mean"),
+            ("min_success", "mean"),
+            ("num_turns", "mean"),
+            ("num_turns", "max"),
+        ]
+    )
+    return _sorted(result, [("exp", "ascending")], limit)
+
+
+def query_success_vs_turns(table, limit: int = 0, bucket_size: int = 10):
+    """
+    Success rates by number of turns, bucketed.
+
+    Args:
+        table: Trace store table
+        limit: Maximum number of result rows, 0 for all
+        bucket_size: Number of turns per bucket
+
+    Returns:
+        pyarrow.Table
+    """
+    import pyarrow.compute as pc
+
+    runs = _runs(table)
+    buckets = pc.multiply(pc.divide(runs["num_turns"], bucket_size), bucket_size)
+    runs = runs.append_column("turns_bucket", buckets)
+    runs = runs.append_column("max_success", pc.cast(runs["max_migration_success"], "int32"))
+    runs = runs.append_column("min_success", pc.cast(runs["min_migration_success"], "int32"))
+    result = runs.group_by(["agent_type", "turns_bucket"]).aggregate(
+        [("repo_id", "count"), ("max_success", "mean"), ("min_success", "mean")]
+    )
+    return _sorted(result, [("agent_type", "ascending"), ("turns_bucket", "ascending")], limit)
+
+
+def query_failing_commands(table, limit: int = 0, num_words: int = 3):
+    """
+    Most common failing commands: Tool errors and failed Maven builds.
+
+    Commands are normalized by `normalize_command`, so that e.g. all `mvn clean verify ...`
+    variants are counted together.
+
+    Args:
+        table: Trace store table
+        limit: Maximum number of result rows, 0 for all
+        num_words: Number of leading words of the command kept
+
+    Returns:
+        pyarrow.Table
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    calls = _tool_calls(table)
+    failed = pc.or_kleene(
+        pc.equal(calls["tool_status"], "error"),
+        pc.equal(calls["build_success"], False),
+    )
+    calls = calls.filter(pc.fill_null(failed, False))
+
+    prefixes = [normalize_command(command, num_words) for command in calls["command"].to_pylist()]
+    calls = calls.append_column("command_prefix", pa.array(prefixes, pa.string()))
+    result = calls.group_by(["tool_name", "command_prefix"]).aggregate([("tool_use_id", "count")])
+    return _sorted(result, [("tool_use_id_count", "descending")], limit)
+
+
+def query_tools(table, limit: int = 0):
+    """
+    Calls, error rates and output sizes per tool.
+
+    Args:
+        table: Trace store table
+        limit: Maximum number of result rows, 0 for all
+
+    Returns:
+        pyarrow.Table
+    """
+    import pyarrow.compute as pc
+
+    calls = _tool_calls(table)
+    calls = calls.append_column("is_error", pc.cast(pc.equal(calls["tool_status"], "error"), "int32"))
+    result = calls.group_by(["agent_type", "tool_name"]).aggregate(
+        [
+            ("tool_use_id", "count"),
+            ("is_error", "mean"),
+            ("output_chars", "mean"),
+            ("output_chars", "max"),
+        ]
+    )
+    return _sorted(result, [("agent_type", "ascending"), ("tool_use_id_count", "descending")], limit)
+
+
+QUERIES: Dict[str, Callable] = {
+    "summary": query_summary,
+    "success-vs-turns": query_success_vs_turns,
+    "failing-commands": query_failing_commands,
+    "tools": query_tools,
+}
@@ -0,0 +1,162 @@
+"""Incremental reader for trajectory JSON files."""
+
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+TRAJECTORY_KEY = "trajectory"
+
+_CHUNK_SIZE = 1 << 16
+_WHITESPACE = " \t\n\r"
+
+
+class _IncrementalJsonReader:
+    """
+    Decode JSON values one at a time from a text stream, keeping only a small buffer in memory.
+
+    Values are decoded with `json.JSONDecoder.raw_decode`; when a value is incomplete, more
+    input is read (doubling the read size) and decoding is retried.
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int = _CHUNK_SIZE):
+        """
+        Initialize the reader.
+
+        Args:
+            stream: Text stream to read from
+            chunk_size: Initial number of characters read at a time
+        """
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int) -> bool:
+        """Read more input, dropping the consumed part of the buffer; return False at EOF."""
+        if self.eof:
+            return False
+
+        chunk = self.stream.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or an empty string at EOF."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(self.chunk_size):
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """Consume the next non-whitespace character, which must be one of `chars`."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of `{chars}` at offset {self.pos}, got `{char}`")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next JSON value."""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._fill(size):
+                continue
+            size *= 2
+
+
+def iter_trajectory(
+    stream: TextIO, on_field: Optional[Callable[[str, Any], None]] = None
+) -> Iterator[dict]:
+    """
+    Iterate over the messages of a trajectory file without loading it in full.
+
+    Args:
+        stream: Text stream of a JSON object with a `trajectory` list, as written by `save_results`
+        on_field: Callback for the other top-level fields, e.g. the migration success flags
+
+    Yields:
+        Messages of the trajectory, in order
+    """
+    reader = _IncrementalJsonReader(stream)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == TRAJECTORY_KEY:
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.expect(",]") == "]":
+                        break
+        else:
+            value = reader.value()
+            if on_field is not None:
+                on_field(key, value)
+
+        if reader.expect(",}") == "}":
+            return
+
+
+def read_trace(trace_file: str) -> Tuple[Dict[str, Any], List[dict]]:
+    """
+    Read a whole trace file with the incremental reader.
+
+    Args:
+        trace_file: Trace JSON file
+
+    Returns:
+        Tuple of the top-level fields other than the trajectory, and the trajectory messages
+    """
+    fields: Dict[str, Any] = {}
+    with open(trace_file) as f:
+        messages = list(iter_trajectory(f, on_field=fields.__setitem__))
+    return fields, messages
+
+
+def find_trace_files(paths: List[str]) -> List[str]:
+    """
+    Find trace files under the given files or directories.
+
+    Args:
+        paths: Trace files or directories containing them (searched recursively)
+
+    Returns:
+        Sorted list of JSON trace files
+    """
+    trace_files = []
+    for path in paths:
+        if os.path.isfile(path):
+            trace_files.append(path)
+            continue
+        for dirpath, _, filenames in os.walk(path):
+            trace_files.extend(os.path.join(dirpath, name) for name in filenames if name.endswith(".json"))
+    return sorted(trace_files)
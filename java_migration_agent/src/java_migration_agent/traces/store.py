@@ -0,0 +1,281 @@
+"""Columnar trace store: One row per message or tool call, written to Parquet."""
+
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+from java_migration_agent.traces.reader import find_trace_files, iter_trajectory
+from java_migration_agent.utils.maven_log_utils import BUILD_FAILURE, BUILD_SUCCESS
+
+logger = logging.getLogger(__name__)
+
+ROW_KIND_MESSAGE = "message"
+ROW_KIND_TOOL_CALL = "tool_call"
+
+# Trace directories are named `{agent_type}-agent-...`, see `main.AGENT_TYPES`
+AGENT_TYPE_PREFIXES = {
+    "baseline": "baseline",
+    "pe": "pe",
+    "hybrid": "hybrid",
+    "pe-rag": "rag",
+}
+_MAVEN_COMMAND_PATTERN = re.compile(r"\bmvnw?\b")
+
+# Column name to Arrow type name, see `get_schema`
+COLUMNS = {
+    "exp": "string",
+    "agent_type": "string",
+    "repo_id": "string",
+    "max_migration_success": "bool",
+    "min_migration_success": "bool",
+    "num_messages": "int32",
+    "num_turns": "int32",
+    "kind": "string",
+    "message_index": "int32",
+    "turn": "int32",
+    "role": "string",
+    "text_chars": "int64",
+    "num_tool_uses": "int32",
+    "tool_use_id": "string",
+    "tool_name": "string",
+    "command": "string",
+    "input_chars": "int64",
+    "output_chars": "int64",
+    "tool_status": "string",
+    "is_maven": "bool",
+    "build_success": "bool",
+}
+
+
+def _import_pyarrow():
+    """Import pyarrow, which is only needed for the trace store."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "The 'pyarrow' package is required for the trace store. "
+            "Install it with: pip install -e '.[traces]'"
+        ) from e
+    return pyarrow
+
+
+def get_schema():
+    """
+    Get the Arrow schema of the trace store.
+
+    Returns:
+        pyarrow.Schema with the columns in `COLUMNS`
+    """
+    pa = _import_pyarrow()
+    return pa.schema([(name, pa.type_for_alias(type_name)) for name, type_name in COLUMNS.items()])
+
+
+def get_trace_info(trace_file: str) -> Dict[str, str]:
+    """
+    Get the experiment, agent type and repository ID of a trace file.
+
+    Args:
+        trace_file: Path like `.../baseline-agent-sonnet-4-5-max-verify/owner__repo.json`
+
+    Returns:
+        Dictionary with `exp`, `agent_type` and `repo_id`
+    """
+    exp = os.path.basename(os.path.dirname(os.path.abspath(trace_file)))
+    prefix = exp.split("-agent")[0]
+    return {
+        "exp": exp,
+        "agent_type": AGENT_TYPE_PREFIXES.get(prefix, prefix),
+        "repo_id": os.path.splitext(os.path.basename(trace_file))[0].replace("__", "/", 1),
+    }
+
+
+def get_command(tool_use: dict) -> Optional[str]:
+    """
+    Get a one-line command of a tool use.
+
+    Args:
+        tool_use: Tool use with name and input
+
+    Returns:
+        Shell command, or the editor command and path, or None
+    """
+    tool_input = tool_use.get("input")
+    if not isinstance(tool_input, dict):
+        return None
+
+    command = tool_input.get("command")
+    if tool_use.get("name") == "editor" and tool_input.get("path"):
+        command = f"{command} {tool_input['path']}"
+    elif tool_use.get("name") == "maven_build":
+        command = "maven_build " + " ".join(f"{key}={value}" for key, value in sorted(tool_input.items()))
+    return command if isinstance(command, str) else None
+
+
+def _get_text(content: List[dict]) -> str:
+    """Concatenate the text items of a message or tool result."""
+    return "\n".join(item["text"] for item in content if isinstance(item.get("text"), str))
+
+
+def iter_rows(trace_file: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the rows of a trace file: One per message, and one per tool call.
+
+    Tool call rows are emitted once their result is seen; run-level columns (success flags,
+    number of messages and turns) are filled in at the end, as they may follow the trajectory.
+
+    Args:
+        trace_file: Trace JSON file
+
+    Yields:
+        Rows as dictionaries keyed by `COLUMNS`
+    """
+    fields: Dict[str, Any] = {}
+    rows: List[Dict[str, Any]] = []
+    pending: Dict[str, Dict[str, Any]] = {}
+    turn = 0
+    num_messages = 0
+
+    with open(trace_file) as f:
+        for index, message in enumerate(iter_trajectory(f, on_field=fields.__setitem__)):
+            num_messages += 1
+            role = message.get("role")
+            if role == "user":
+                turn += 1
+            content = message.get("content", [])
+
+            tool_uses = [block["toolUse"] for block in content if "toolUse" in block]
+            rows.append(
+                {
+                    "kind": ROW_KIND_MESSAGE,
+                    "message_index": index,
+                    "turn": turn,
+                    "role": role,
+                    "text_chars": len(_get_text(content)),
+                    "num_tool_uses": len(tool_uses),
+                }
+            )
+
+            for tool_use in tool_uses:
+                command = get_command(tool_use)
+                pending[tool_use.get("toolUseId")] = {
+                    "kind": ROW_KIND_TOOL_CALL,
+                    "message_index": index,
+                    "turn": turn,
+                    "role": role,
+                    "tool_use_id": tool_use.get("toolUseId"),
+                    "tool_name": tool_use.get("name"),
+                    "command": command,
+                    "input_chars": len(str(tool_use.get("input", ""))),
+                    "is_maven": tool_use.get("name") == "maven_build"
+                    or bool(command and _MAVEN_COMMAND_PATTERN.search(command)),
+                }
+
+            for block in content:
+                if "toolResult" not in block:
+                    continue
+                tool_result = block["toolResult"]
+                row = pending.pop(tool_result.get("toolUseId"), None)
+                if row is None:
+                    continue
+
+                output = _get_text(tool_result.get("content", []))
+                row["output_chars"] = len(output)
+                row["tool_status"] = tool_result.get("status")
+                if row["is_maven"]:
+                    if BUILD_SUCCESS in output or '"success": true' in output:
+                        row["build_success"] = True
+                    elif BUILD_FAILURE in output or '"success": false' in output:
+                        row["build_success"] = False
+                rows.append(row)
+
+    # Tool uses without result, e.g. when the message limit was reached
+    rows.extend(pending.values())
+
+    run = dict(
+        get_trace_info(trace_file),
+        max_migration_success=fields.get("max_migration_success"),
+        min_migration_success=fields.get("min_migration_success"),
+        num_messages=num_messages,
+        num_turns=turn,
+    )
+    for row in rows:
+        yield {name: row.get(name, run.get(name)) for name in COLUMNS}
+
+
+def _get_rows(trace_file: str) -> List[Dict[str, Any]]:
+    """Get all rows of a trace file, logging errors."""
+    try:
+        return list(iter_rows(trace_file))
+    except Exception as e:
+        logger.error(f"Unable to read trace {trace_file}: {e}")
+        return []
+
+
+def convert_traces(paths: List[str], output_file: str, max_workers: int = 1, batch_size: int = 65536) -> int:
+    """
+    Convert trace files to a Parquet file.
+
+    Args:
+        paths: Trace files or directories containing them
+        output_file: Output Parquet file
+        max_workers: Number of processes reading trace files
+        batch_size: Number of rows buffered before writing a row group
+
+    Returns:
+        Number of rows written
+    """
+    pa = _import_pyarrow()
+    schema = get_schema()
+    trace_files = find_trace_files(paths)
+    logger.info(f"Converting {len(trace_files)} trace files to {output_file}")
+
+    if os.path.dirname(output_file):
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+    num_rows = 0
+    batch: List[Dict[str, Any]] = []
+    with pa.parquet.ParquetWriter(output_file, schema) as writer:
+        if max_workers > 1:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+            results = executor.map(_get_rows, trace_files, chunksize=16)
+        else:
+            executor = None
+            results = map(_get_rows, trace_files)
+
+        try:
+            for rows in results:
+                batch.extend(rows)
+                if len(batch) >= batch_size:
+                    writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+                    num_rows += len(batch)
+                    batch = []
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if batch:
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+            num_rows += len(batch)
+
+    logger.info(f"Wrote {num_rows} rows to {output_file}")
+    return num_rows
+
+
+def load_store(paths: List[str], columns: Optional[List[str]] = None):
+    """
+    Load converted Parquet files as one Arrow table.
+
+    Args:
+        paths: Parquet files or directories containing them
+        columns: Columns to read, all by default
+
+    Returns:
+        pyarrow.Table
+    """
+    _import_pyarrow()
+    import pyarrow.dataset as ds
+
+    return ds.dataset(paths, format="parquet", schema=get_schema()).to_table(columns=columns)
@@ -0,0 +1,169 @@
+"""Maven log utilities for condensing build outputs."""
+
+import functools
+import logging
+import re
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+BUILD_FAILURE = "[INFO] BUILD FAILURE"
+BUILD_SUCCESS = "[INFO] BUILD SUCCESS"
+
+# Lines worth keeping from a successful build or a non-Maven command output
+_SUMMARY_LINE_PATTERN = re.compile(r"^\[(INFO|WARNING)\] (BUILD |Tests run:|Reactor Summary|Total time)")
+_ERROR_LINE_PATTERN = re.compile(r"(\[ERROR\]|\[FATAL\]|error:|Exception|FAILED|FAILURE)")
+
+
+@functools.lru_cache(maxsize=64)
+def _get_maven_builder(root_dir: str):
+    """
+    Get a MavenBuilder from self_debug for parsing logs only.
+
+    Args:
+        root_dir: Root directory of the repository
+
+    Returns:
+        MavenBuilder instance, or None if self_debug is not installed
+    """
+    try:
+        from self_debug.lang.java.maven.builder import MavenBuilder
+    except ImportError:
+        logger.debug("self_debug is not installed, falling back to line-based log filtering")
+        return None
+
+    return MavenBuilder(jdk_path="", root_dir=root_dir, require_maven_installed=False)
+
+
+def is_maven_output(output: str) -> bool:
+    """
+    Check whether a command output looks like a Maven build log.
+
+    Args:
+        output: Command output
+
+    Returns:
+        True if the output contains a Maven build result line
+    """
+    return BUILD_FAILURE in output or BUILD_SUCCESS in output
+
+
+def extract_maven_errors(output: str, root_dir: str = "") -> List[dict]:
+    """
+    Extract deduplicated build errors from a Maven log.
+
+    Uses `MavenBuilder.extract_build_errors` from self_debug when available, otherwise
+    keeps the `[ERROR]` lines of the log.
+
+    Args:
+        output: Maven stdout and stderr
+        root_dir: Root directory of the repository
+
+    Returns:
+        List of errors with `file`, `line`, `column`, `message` and `snippet` keys
+    """
+    errors = []
+    maven_builder = _get_maven_builder(root_dir)
+    if maven_builder is not None:
+        from self_debug.common.utils import CmdData
+
+        try:
+            build_errors = maven_builder.extract_build_errors(CmdData(stdout=output, return_code=1))
+            errors = [
+                {
+                    "file": build_error.filename,
+                    "line": build_error.line_number,
+                    "column": build_error.column_number,
+                    "message": build_error.error_message,
+                    "snippet": build_error.code_snippet,
+                }
+                for build_error in build_errors
+            ]
+        except Exception as e:
+            logger.warning(f"Unable to extract Maven build errors: {e}")
+
+    if not errors:
+        errors = [
+            {"file": None, "line": None, "column": None, "message": line, "snippet": None}
+            for line in output.splitlines()
+            if line.startswith(("[ERROR]", "[FATAL]"))
+        ]
+
+    unique_errors, seen = [], set()
+    for error in errors:
+        key = (error["file"], error["line"], error["column"], error["message"])
+        if key not in seen:
+            seen.add(key)
+            unique_errors.append(error)
+    return unique_errors
+
+
+def format_maven_error(error: dict, root_dir: str = "") -> str:
+    """
+    Format a single extracted error as one compact line.
+
+    Args:
+        error: Error dictionary from `extract_maven_errors`
+        root_dir: Root directory to strip from file paths
+
+    Returns:
+        Formatted error string
+    """
+    if not error["file"] or error["line"] is None:
+        return error["message"]
+
+    filename = error["file"]
+    if root_dir and filename.startswith(root_dir):
+        filename = filename[len(root_dir):].lstrip("/")
+    if error["column"] is None:
+        return f"{filename}:{error['line']} {error['message']}"
+    return f"{filename}:[{error['line']},{error['column']}] {error['message']}"
+
+
+def compact_output(output: str, max_lines: int = 40, root_dir: str = "") -> str:
+    """
+    Condense a tool output to its error-relevant lines.
+
+    Maven logs are reduced to their extracted build errors (or the build summary on success);
+    other outputs keep the lines that look like errors, or their head and tail otherwise.
+
+    Args:
+        output: Tool output text
+        max_lines: Maximum number of lines to keep
+        root_dir: Root directory of the repository
+
+    Returns:
+        Compacted output
+    """
+    lines = output.splitlines()
+
+    if BUILD_FAILURE in output:
+        kept = [format_maven_error(error, root_dir) for error in extract_maven_errors(output, root_dir)]
+        kept.append(BUILD_FAILURE)
+    elif BUILD_SUCCESS in output:
+        kept = [line for line in lines if _SUMMARY_LINE_PATTERN.search(line)]
+    else:
+        kept = [line for line in lines if _ERROR_LINE_PATTERN.search(line)]
+        if not kept:
+            half = max(max_lines // 2, 1)
+            kept = lines if len(lines) <= max_lines else lines[:half] + ["..."] + lines[-half:]
+
+    kept = [line for entry in kept for line in entry.splitlines()]
+    if len(kept) > max_lines:
+        kept = kept[:max_lines] + [f"... ({len(kept) - max_lines} more lines omitted)"]
+
+    header = f"[Compacted output: {len(lines)} lines, {len(output)} chars originally]"
+    return "\n".join([header] + kept)
+
+
+def is_compacted(output: Optional[str]) -> bool:
+    """
+    Check whether an output was already produced by `compact_output`.
+
+    Args:
+        output: Tool output text
+
+    Returns:
+        True if the output is compacted
+    """
+    return bool(output) and output.startswith("[Compacted output: ")
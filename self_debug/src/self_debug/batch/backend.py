@@ -0,0 +1,345 @@
+"""Batch backends: Spark, or local processes on a single node without Spark.
+
+The local backend implements the subset of Spark RDD APIs used by the batch pipeline
+(`batch/utils.py` and `batch/prefetch.py`), with the same semantics:
+- Transformations (`map`, `filter`, `flatMap`, ...) are lazy, and fused per item:
+  Each item runs through all of them in one task of a process pool.
+- Actions (`collect`, `count`, `reduce`, ...) run the tasks, and `cache` keeps the
+  results for later actions.
+- Shuffles (`distinct`, `zipWithIndex`, `partitionBy`, ...) run in the driver.
+
+Tasks are bounded by # pending ones, results keep the input order, and they are
+optionally streamed to disk as tasks finish: One pickle file per action.
+
+Sample usage:
+
+```
+context = backend.create_context(backend.LOCAL, max_workers=8)
+projects, metrics = spark_utils.run_spark_projects(context, datasets, config)
+context.stop()
+```
+"""
+
+from collections import Counter
+from concurrent import futures
+import contextlib
+import functools
+import itertools
+import logging
+from multiprocessing import util as mp_util
+import os
+import pickle
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from self_debug.common import lazy_import, utils, warm_pool
+
+cloudpickle = lazy_import.lazy_module("pyspark.cloudpickle", package="pyspark")
+pyspark = lazy_import.lazy_module("pyspark")
+
+
+LOCAL = "local"
+SPARK = "spark"
+
+BACKENDS = (LOCAL, SPARK)
+
+# Pending tasks per worker: Bounded, not all items are pickled at once.
+PENDING_TASKS_PER_WORKER = 2
+
+RESULTS_FILENAME = "stage-{stage:04d}.pkl"
+
+_MAP = "map"
+_FILTER = "filter"
+_FLAT_MAP = "flatMap"
+
+# Per worker: The last unpickled transformations.
+_OPS = (None, None)
+
+
+def init_worker(level: int = logging.INFO):
+    """Default per worker initialization: Logging, and warm resources for all tasks."""
+    logging.basicConfig(level=level, format=utils.LOGGING_FORMAT)
+
+    # Closed when the worker exits, which skips `atexit` hooks.
+    pool = warm_pool.get_pool()
+    pool.acquire()
+    mp_util.Finalize(pool, pool.release, exitpriority=10)
+
+
+def _apply(ops: Sequence[Tuple[str, Callable]], item: Any) -> List[Any]:
+    """Apply fused transformations to an item: Zero or more outputs."""
+    items = [item]
+    for kind, fn in ops:
+        if kind == _MAP:
+            items = [fn(x) for x in items]
+        elif kind == _FILTER:
+            items = [x for x in items if fn(x)]
+        else:
+            items = [y for x in items for y in fn(x)]
+    return items
+
+
+def _run_task(ops_bytes: bytes, item: Any) -> List[Any]:
+    """Run a task in a worker."""
+    global _OPS  # pylint: disable=global-statement
+    if _OPS[0] != ops_bytes:
+        _OPS = (ops_bytes, pickle.loads(ops_bytes))
+    return _apply(_OPS[1], item)
+
+
+def load_results(filename: str) -> Iterator[Tuple[int, List[Any]]]:
+    """Load results streamed to disk: (index, outputs) in finishing order."""
+    with open(filename, "rb") as file:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+
+
+class LocalContext:
+    """Local process pool, as a `SparkContext`."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        initializer: Optional[Callable] = init_worker,
+        initargs: Tuple[Any, ...] = (),
+        output_dir: Optional[str] = None,
+        mp_context=None,
+    ):
+        # Non positive: Run tasks in the driver.
+        self.max_workers = os.cpu_count() if max_workers is None else max_workers
+        self.initializer = initializer
+        self.initargs = initargs
+        self.output_dir = output_dir
+        self.mp_context = mp_context
+
+        # Stats.
+        self.num_stages = 0
+        self.num_tasks = 0
+
+        self._executor = None
+
+    @property
+    def defaultParallelism(self) -> int:  # pylint: disable=invalid-name
+        """Default # partitions."""
+        return max(self.max_workers, 1)
+
+    def parallelize(  # pylint: disable=invalid-name
+        self, items: Iterable[Any], numSlices: Optional[int] = None
+    ) -> "LocalDataset":
+        """Create a dataset."""
+        return LocalDataset(self, items=list(items), num_partitions=numSlices)
+
+    def _get_executor(self) -> futures.ProcessPoolExecutor:
+        if self._executor is None:
+            logging.info("Start local workers: # = %d.", self.max_workers)
+            self._executor = futures.ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self.mp_context,
+                initializer=self.initializer,
+                initargs=self.initargs,
+            )
+        return self._executor
+
+    def run(self, items: Sequence[Any], ops: Sequence[Tuple[str, Callable]]):
+        """Run transformations of items as tasks: Outputs in the input order."""
+        self.num_stages += 1
+        self.num_tasks += len(items)
+
+        filename = None
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            filename = os.path.join(
+                self.output_dir, RESULTS_FILENAME.format(stage=self.num_stages)
+            )
+
+        outputs = [None] * len(items)
+        with utils.TimeItInSeconds(
+            f"Local::Stage{self.num_stages:04d}", logging_fn=logging.info
+        ), (open(filename, "wb") if filename else contextlib.nullcontext()) as file:
+            for index, output in self._run(items, ops):
+                outputs[index] = output
+                if file is not None:
+                    pickle.dump((index, output), file)
+                    file.flush()
+
+        return list(itertools.chain.from_iterable(outputs))
+
+    def _run(self, items: Sequence[Any], ops: Sequence[Tuple[str, Callable]]):
+        """Yield (index, outputs) as tasks finish."""
+        if self.max_workers <= 0:
+            for index, item in enumerate(items):
+                yield index, _apply(ops, item)
+            return
+
+        executor = self._get_executor()
+        # Functions are pickled by value, e.g. lambdas: The same pickler as Spark.
+        ops_bytes = cloudpickle.dumps(list(ops))
+        max_pending = self.max_workers * PENDING_TASKS_PER_WORKER
+
+        pending = {}
+        items = enumerate(items)
+        while True:
+            for index, item in itertools.islice(items, max_pending - len(pending)):
+                pending[executor.submit(_run_task, ops_bytes, item)] = index
+            if not pending:
+                return
+
+            done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+
+    def stop(self):
+        """Stop workers."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+class LocalDataset:
+    """Local dataset, as a Spark RDD."""
+
+    def __init__(
+        self,
+        context: LocalContext,
+        items: Optional[List[Any]] = None,
+        parent: Optional["LocalDataset"] = None,
+        ops: Tuple[Tuple[str, Callable], ...] = (),
+        num_partitions: Optional[int] = None,
+    ):
+        self.context = context
+        self._items = items
+        self._parent = parent
+        self._ops = ops
+        self._num_partitions = num_partitions
+        self._cached = False
+
+    def _transform(self, kind: str, fn: Callable) -> "LocalDataset":
+        # Fused with this dataset's transformations, unless it's cached.
+        if self._cached or self._items is not None:
+            parent, ops = self, ()
+        else:
+            parent, ops = self._parent, self._ops
+        return LocalDataset(
+            self.context,
+            parent=parent,
+            ops=ops + ((kind, fn),),
+            num_partitions=self._num_partitions,
+        )
+
+    def _collect(self) -> List[Any]:
+        if self._items is not None:
+            return self._items
+
+        items = self.context.run(self._parent._collect(), self._ops)
+        if self._cached:
+            self._items = items
+        return items
+
+    def _from_items(self, items: List[Any], num_partitions=None) -> "LocalDataset":
+        return LocalDataset(self.context, items=items, num_partitions=num_partitions)
+
+    # Transformations.
+    def map(self, fn: Callable) -> "LocalDataset":
+        """Map."""
+        return self._transform(_MAP, fn)
+
+    def filter(self, fn: Callable) -> "LocalDataset":
+        """Filter."""
+        return self._transform(_FILTER, fn)
+
+    def flatMap(self, fn: Callable) -> "LocalDataset":  # pylint: disable=invalid-name
+        """Flat map."""
+        return self._transform(_FLAT_MAP, fn)
+
+    def mapValues(self, fn: Callable) -> "LocalDataset":  # pylint: disable=invalid-name
+        """Map values of (key, value) pairs."""
+        return self.map(lambda kv: (kv[0], fn(kv[1])))
+
+    def flatMapValues(  # pylint: disable=invalid-name
+        self, fn: Callable
+    ) -> "LocalDataset":
+        """Flat map values of (key, value) pairs."""
+        return self.flatMap(lambda kv: [(kv[0], v) for v in fn(kv[1])])
+
+    def mapPartitions(  # pylint: disable=invalid-name
+        self, fn: Callable
+    ) -> "LocalDataset":
+        """Map partitions: Each item is a partition, as it's a task."""
+        return self.flatMap(lambda x: fn(iter([x])))
+
+    def values(self) -> "LocalDataset":
+        """Values of (key, value) pairs."""
+        return self.map(lambda kv: kv[1])
+
+    # Shuffles: In the driver.
+    def distinct(self) -> "LocalDataset":
+        """Distinct items, in the order of first occurrences."""
+        return self._from_items(list(dict.fromkeys(self._collect())))
+
+    def zipWithIndex(self) -> "LocalDataset":  # pylint: disable=invalid-name
+        """(item, index) pairs."""
+        return self._from_items(
+            [(item, index) for index, item in enumerate(self._collect())],
+            self._num_partitions,
+        )
+
+    def partitionBy(  # pylint: disable=invalid-name
+        self, numPartitions: int, partitionFunc: Callable = hash
+    ) -> "LocalDataset":
+        """Partition (key, value) pairs: Ordered by partitions."""
+        items = sorted(
+            self._collect(), key=lambda kv: partitionFunc(kv[0]) % numPartitions
+        )
+        return self._from_items(items, numPartitions)
+
+    # Actions.
+    def cache(self) -> "LocalDataset":
+        """Keep results after the first action."""
+        self._cached = True
+        return self
+
+    def collect(self) -> List[Any]:
+        """All items."""
+        return list(self._collect())
+
+    def count(self) -> int:
+        """# items."""
+        return len(self._collect())
+
+    def countByValue(self):  # pylint: disable=invalid-name
+        """Item => count."""
+        return Counter(self._collect())
+
+    def isEmpty(self) -> bool:  # pylint: disable=invalid-name
+        """Whether there are no items."""
+        return not self._collect()
+
+    def first(self) -> Any:
+        """The first item."""
+        items = self._collect()
+        if not items:
+            raise ValueError("Dataset is empty.")
+        return items[0]
+
+    def reduce(self, fn: Callable) -> Any:
+        """Reduce items."""
+        items = self._collect()
+        if not items:
+            raise ValueError("Can not reduce() empty dataset.")
+        return functools.reduce(fn, items)
+
+    def getNumPartitions(self) -> int:  # pylint: disable=invalid-name
+        """# partitions."""
+        return self._num_partitions or self.context.defaultParallelism
+
+
+def create_context(backend: str = SPARK, **kwargs):
+    """Create a `SparkContext`, or a local one with kwargs."""
+    if backend == SPARK:
+        return pyspark.SparkContext()
+    if backend == LOCAL:
+        return LocalContext(**kwargs)
+
+    raise ValueError(f"Unsupported backend `{backend}`: Not in {BACKENDS}.")
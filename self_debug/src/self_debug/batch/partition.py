@@ -0,0 +1,229 @@
+"""Cost aware partitions: Longest processing time first (LPT), to cut batch makespan.
+
+Round robin partitions have a similar # projects each, while per project latency
+ranges from seconds to `DEBUG_TIMEOUT`: One straggler partition holds the whole job.
+Instead, each project has a cost, estimated from raw metrics of prior runs (a json
+list of legacy metrics per project, e.g. by `--upload_raw_metrics_to_s3`):
+- Its debugger latency.
+- Otherwise, its # initial build errors or LOC from repo jobs (`hash_utils`), with
+  seconds per error or line fitted on projects with known latency.
+- Otherwise, the median latency.
+
+The heaviest projects are optionally isolated, i.e. in their own partitions, and the
+rest are packed into the least loaded partition one by one, heaviest first.
+"""
+
+import ast
+from dataclasses import dataclass
+import heapq
+import logging
+import os
+import re
+import statistics
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from self_debug.proto import dataset_pb2
+
+from self_debug.common import lazy_import, s3_data, utils
+from self_debug import self_debugging
+
+boto3 = lazy_import.lazy_module("boto3")
+
+
+# Without any history: All projects have the same cost, i.e. balanced # projects.
+DEFAULT_COST = 1.0
+MAX_COST = self_debugging.DEBUG_TIMEOUT
+
+# Legacy keys of raw metrics, see `batch/utils.py` and `common/hash_utils.py`.
+_PROJECT_REGEX = re.compile(r"^Debugger::00--01--project=<(.*)#=([^#>]*)>$")
+_GROUND_TRUTH_REGEX = re.compile(r"ground_truth__EQ__(.+)$")
+_LATENCY_KEY = "Debugger::02--00--latency_seconds::max"
+_INIT_ERRORS_KEY = "Debugger::02--01--#errors-init::max"
+_LOC_REGEX = re.compile(r"repo-num-loc__EQ__(\d+)$")
+
+
+@dataclass
+class History:
+    """History of a project in prior runs."""
+
+    latency_seconds: Optional[float] = None
+    num_errors: Optional[int] = None
+    loc: Optional[int] = None
+
+    def update(self, other: "History"):
+        """Merge in place: The max latency, and the latest others."""
+        if other.latency_seconds is not None:
+            self.latency_seconds = max(
+                self.latency_seconds or 0.0, other.latency_seconds
+            )
+        if other.num_errors is not None:
+            self.num_errors = other.num_errors
+        if other.loc is not None:
+            self.loc = other.loc
+
+
+def _to_key(ground_truth: Any) -> str:
+    """Key of a ground truth: Github ones are (url, commit id)."""
+    if isinstance(ground_truth, (list, tuple)):
+        ground_truth = ground_truth[0] if ground_truth else ""
+    ground_truth = str(ground_truth)
+    if ground_truth.startswith("("):
+        try:
+            return _to_key(ast.literal_eval(ground_truth))
+        except (SyntaxError, ValueError):
+            pass
+    return ground_truth
+
+
+def get_key(element: Any) -> str:
+    """Key of a dataset repo, or a project as a dict, to look up its history."""
+    if isinstance(element, dataset_pb2.DatasetRepo):
+        repo = element.WhichOneof("repo")
+        if repo == "local_repo":
+            return element.local_repo.root_dir
+        if repo == "s3_repo":
+            return element.s3_repo.s3_dir
+        if repo == "github_repo":
+            return element.github_repo.github_url
+        return element.root_dir
+
+    # See `batch/utils.py`.
+    return _to_key(element["project_object"].ground_truth)
+
+
+def parse_raw_metrics(metrics: Dict[str, float]) -> Optional[Tuple[str, History]]:
+    """History of a project in its raw metrics: None if it's unknown."""
+    key = None
+    history = History()
+    for name, value in metrics.items():
+        match = _PROJECT_REGEX.match(name)
+        if match:
+            key = _to_key(match.group(1))
+            if match.group(2).isdigit():
+                history.num_errors = int(match.group(2))
+            continue
+
+        match = _GROUND_TRUTH_REGEX.search(name)
+        if match and key is None:
+            key = _to_key(match.group(1))
+        elif name == _LATENCY_KEY:
+            history.latency_seconds = value
+        elif name == _INIT_ERRORS_KEY and history.num_errors is None:
+            history.num_errors = int(value)
+        else:
+            match = _LOC_REGEX.search(name)
+            if match:
+                history.loc = int(match.group(1))
+
+    if key is None:
+        return None
+    return key, history
+
+
+def _load_json(filename: str) -> Any:
+    if not filename.startswith(s3_data.S3_PREFIX):
+        return utils.load_json(filename)
+
+    bucket_name, _, key = filename[len(s3_data.S3_PREFIX) :].partition("/")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        local_filename = os.path.join(temp_dir, os.path.basename(key))
+        boto3.client("s3").download_file(bucket_name, key, local_filename)
+        return utils.load_json(local_filename)
+
+
+def load_history(filenames: Iterable[str]) -> Dict[str, History]:
+    """History per project from raw metrics files: Missing files are skipped."""
+    history = {}
+    for filename in filenames:
+        try:
+            raw_metrics = _load_json(filename) or ()
+        except Exception as error:  # pylint: disable=broad-except
+            logging.exception("Unable to load history `%s`: %s", filename, error)
+            continue
+
+        for metrics in raw_metrics:
+            parsed = parse_raw_metrics(metrics)
+            if parsed is not None:
+                history.setdefault(parsed[0], History()).update(parsed[1])
+
+    logging.info("History of projects: # = %d.", len(history))
+    return history
+
+
+def _median(values: Iterable[float]) -> Optional[float]:
+    values = list(values)
+    return statistics.median(values) if values else None
+
+
+class CostModel:
+    """Cost of a project in seconds, estimated from its history."""
+
+    def __init__(self, history: Optional[Dict[str, History]] = None):
+        self.history = history or {}
+
+        known = [h for h in self.history.values() if h.latency_seconds is not None]
+        self.default_cost = _median(h.latency_seconds for h in known) or DEFAULT_COST
+        self.seconds_per_error = _median(
+            h.latency_seconds / h.num_errors for h in known if h.num_errors
+        )
+        self.seconds_per_loc = _median(
+            h.latency_seconds / h.loc for h in known if h.loc
+        )
+
+    def cost(self, key: str) -> float:
+        """Estimated cost."""
+        history = self.history.get(key)
+        if history is None:
+            return self.default_cost
+        if history.latency_seconds is not None:
+            return min(max(history.latency_seconds, 0.0), MAX_COST)
+
+        estimates = []
+        if history.num_errors is not None and self.seconds_per_error is not None:
+            estimates.append(history.num_errors * self.seconds_per_error)
+        if history.loc is not None and self.seconds_per_loc is not None:
+            estimates.append(history.loc * self.seconds_per_loc)
+        if not estimates:
+            return self.default_cost
+        return min(statistics.mean(estimates), MAX_COST)
+
+
+def create_cost_model(
+    partition_config: dataset_pb2.DatasetPartition,
+) -> Optional[CostModel]:
+    """Cost model of a dataset partition config, if it's cost aware."""
+    if not partition_config.cost_history:
+        return None
+    return CostModel(load_history(partition_config.cost_history))
+
+
+def lpt_partition(
+    costs: Sequence[float], partitions: int, isolate_heaviest: int = 0
+) -> List[int]:
+    """Partition per item: The heaviest ones isolated, and LPT for the rest."""
+    partitions = max(partitions, 1)
+    isolate_heaviest = min(max(isolate_heaviest, 0), partitions - 1)
+
+    # Heaviest first: Ties by index.
+    order = sorted(range(len(costs)), key=lambda index: (-costs[index], index))
+    assignment = [0] * len(costs)
+    for partition, index in enumerate(order[:isolate_heaviest]):
+        assignment[index] = partition
+
+    # (load, partition): The least loaded one first.
+    loads = [(0.0, partition) for partition in range(isolate_heaviest, partitions)]
+    for index in order[isolate_heaviest:]:
+        load, partition = heapq.heappop(loads)
+        assignment[index] = partition
+        heapq.heappush(loads, (load + costs[index], partition))
+
+    return assignment
+
+
+def makespan(costs: Sequence[float], assignment: Sequence[int]) -> float:
+    """Max load of all partitions."""
+    loads = {}
+    for cost, partition in zip(costs, assignment):
+        loads[partition] = loads.get(partition, 0.0) + cost
+    return max(loads.values(), default=0.0)
@@ -0,0 +1,409 @@
+"""Prefetch maven artifacts once per batch, as a content addressed local repository.
+
+1. `collect_coordinates`: Per project, dependencies, plugins and parents in its poms,
+   both before and after the upgrades in `dependency_version.json`.
+2. `build_bundle`: Resolve the union across the dataset once into a local repository,
+   archived as `m2-{sha256 of coordinates}.tar.gz`: Skipped if it already exists.
+3. `install_bundle`: Per executor, unpack it once as the read-only tail of its local
+   repository (`-Dmaven.repo.local.tail`, maven 3.9+), optionally in offline mode.
+
+Builds stay online by default: Bundles miss artifacts without explicit versions in
+poms (e.g. managed by a parent or a BOM), default plugin versions, and dependencies
+added later by LLMs, which maven resolves remotely when they're not in the tail.
+"""
+
+import glob
+import hashlib
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from xml.etree import ElementTree
+
+from self_debug.common import lazy_import, pom_transformer, pom_utils, s3_data, utils
+
+boto3 = lazy_import.lazy_module("boto3")
+
+
+BUNDLE_PREFIX = "m2-"
+BUNDLE_SUFFIX = ".tar.gz"
+BUNDLE_REPOSITORY = "repository"
+
+# Executors unpack bundles here: One subdir per bundle key.
+INSTALL_DIR = os.path.join("~", ".m2", "prefetch")
+INSTALL_DONE = ".done"
+
+MAVEN_ARGS = "MAVEN_ARGS"
+MVN_GO_OFFLINE = (
+    "mvn -B -f {pom} -Dmaven.repo.local={repository} dependency:go-offline"
+)
+MVN_REPO_LOCAL_TAIL = "-Dmaven.repo.local.tail={repository}"
+MVN_OFFLINE = "-o"
+
+DEFAULT_PLUGIN_GROUP_ID = "org.apache.maven.plugins"
+JAR = "jar"
+POM = "pom"
+
+# Files to drop from a bundle: Failed downloads, and the origin repositories of
+# artifacts, so that they are available to projects with any repository ids.
+_BUNDLE_EXCLUDED_SUFFIXES = (".lastUpdated", "_remote.repositories")
+
+_PREFETCH_POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <modelVersion>4.0.0</modelVersion>
+  <groupId>self-debug.prefetch</groupId>
+  <artifactId>prefetch-{index:03d}</artifactId>
+  <version>1.0</version>
+  <dependencies>
+{dependencies}
+  </dependencies>
+  <build>
+    <plugins>
+{plugins}
+    </plugins>
+  </build>
+</project>
+"""
+
+_PREFETCH_DEPENDENCY = """    <dependency>
+      <groupId>{group_id}</groupId>
+      <artifactId>{artifact_id}</artifactId>
+      <version>{version}</version>
+      <type>{type}</type>
+    </dependency>"""
+
+_PREFETCH_PLUGIN = """      <plugin>
+        <groupId>{group_id}</groupId>
+        <artifactId>{artifact_id}</artifactId>
+        <version>{version}</version>
+      </plugin>"""
+
+# (groupId, artifactId, type, version): Type is `maven-plugin` for plugins.
+Coordinate = Tuple[str, str, str, str]
+MAVEN_PLUGIN = "maven-plugin"
+
+_INSTALL_LOCK = threading.Lock()
+
+
+def _is_resolved(version: Optional[str]) -> bool:
+    return bool(version) and "${" not in version
+
+
+def _add(
+    coordinates: Set[Coordinate],
+    coordinate: Coordinate,
+    new_version: Optional[str] = None,
+):
+    """Add a coordinate, and its upgraded one if any."""
+    group_id, artifact_id, d_type, version = coordinate
+    if _is_resolved(version):
+        coordinates.add(coordinate)
+    if new_version:
+        coordinates.add((group_id, artifact_id, d_type, new_version))
+
+
+def collect_pom_coordinates(
+    pom_file: str, dependency_versions: Optional[Dict[str, str]] = None
+) -> Set[Coordinate]:
+    """Coordinates in a pom, before and after upgrades.
+
+    Upgrades are the same as `pom_transformer.PomDocument.update_versions`: Versioned
+    dependencies if `pom_utils.should_upgrade`, and parents.
+    """
+    doc = pom_transformer.PomDocument(pom_file)
+    dependency_versions = dependency_versions or {}
+
+    coordinates = set()
+    for d_type in ("dependency", "plugin"):
+        for (group_id, artifact_id), refs in doc.index(d_type).items():
+            if not artifact_id:
+                continue
+            if d_type == "plugin":
+                group_id = group_id or DEFAULT_PLUGIN_GROUP_ID
+            if not group_id:
+                continue
+
+            for ref in refs:
+                version = None if ref.version is None else doc.resolve(ref.version.text)
+                if d_type == "plugin":
+                    artifact_type = MAVEN_PLUGIN
+                else:
+                    # E.g. `pom` for imported BOMs.
+                    node = ref.element.find("xmlns:type", pom_utils.namespaces)
+                    artifact_type = JAR if node is None else (node.text or JAR)
+
+                new_version = None
+                if d_type == "dependency" and ref.version is not None:
+                    new_version = dependency_versions.get(f"{group_id}:{artifact_id}")
+                    if new_version and not pom_utils.should_upgrade(
+                        version, new_version
+                    ):
+                        new_version = None
+
+                _add(
+                    coordinates,
+                    (group_id, artifact_id, artifact_type, version),
+                    new_version,
+                )
+
+    parent = doc.root.find("xmlns:parent", pom_utils.namespaces)
+    if parent is not None:
+        group_id, artifact_id, version = (
+            parent.findtext(f"xmlns:{tag}", None, pom_utils.namespaces)
+            for tag in ("groupId", "artifactId", "version")
+        )
+        if group_id and artifact_id:
+            _add(
+                coordinates,
+                (group_id, artifact_id, POM, version),
+                dependency_versions.get(f"{group_id}:{artifact_id}"),
+            )
+
+    return coordinates
+
+
+def collect_coordinates(
+    root_dir: str, dependency_versions: Optional[Dict[str, str]] = None
+) -> Set[Coordinate]:
+    """Coordinates in all poms of a repo, before and after upgrades."""
+    coordinates = set()
+    for pom_file in sorted(
+        glob.glob(os.path.join(root_dir, "**", "pom.xml"), recursive=True)
+    ):
+        try:
+            coordinates |= collect_pom_coordinates(pom_file, dependency_versions)
+        except ElementTree.ParseError as error:
+            logging.warning("Unable to parse pom `%s`: <<<%s>>>", pom_file, error)
+
+    return coordinates
+
+
+def get_bundle_key(coordinates: Iterable[Coordinate]) -> str:
+    """Content address of a bundle: Hash of its sorted coordinates."""
+    content = "\n".join(":".join(c) for c in sorted(set(coordinates)))
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def get_bundle_name(key: str) -> str:
+    """Bundle filename, for a key."""
+    return f"{BUNDLE_PREFIX}{key}{BUNDLE_SUFFIX}"
+
+
+def build_prefetch_poms(coordinates: Iterable[Coordinate]) -> List[str]:
+    """Synthetic poms declaring coordinates: Each `groupId:artifactId` once a pom."""
+    layers: List[Dict[Tuple[str, str, bool], Coordinate]] = []
+    for coordinate in sorted(set(coordinates)):
+        group_id, artifact_id, d_type, _ = coordinate
+        key = (group_id, artifact_id, d_type == MAVEN_PLUGIN)
+        for layer in layers:
+            if key not in layer:
+                break
+        else:
+            layer = {}
+            layers.append(layer)
+        layer[key] = coordinate
+
+    poms = []
+    for index, layer in enumerate(layers):
+        dependencies, plugins = [], []
+        for group_id, artifact_id, d_type, version in layer.values():
+            kwargs = {
+                "group_id": group_id,
+                "artifact_id": artifact_id,
+                "version": version,
+                "type": d_type,
+            }
+            if d_type == MAVEN_PLUGIN:
+                plugins.append(_PREFETCH_PLUGIN.format(**kwargs))
+            else:
+                dependencies.append(_PREFETCH_DEPENDENCY.format(**kwargs))
+
+        poms.append(
+            _PREFETCH_POM.format(
+                index=index,
+                dependencies="\n".join(dependencies),
+                plugins="\n".join(plugins),
+            )
+        )
+
+    return poms
+
+
+def _clean_repository(repository: str) -> int:
+    count = 0
+    for root, _, files in os.walk(repository):
+        for filename in files:
+            if filename.endswith(_BUNDLE_EXCLUDED_SUFFIXES):
+                os.remove(os.path.join(root, filename))
+                count += 1
+    return count
+
+
+def _split_s3_uri(s3_uri: str) -> Tuple[str, str]:
+    bucket_name, _, key = s3_uri[len(s3_data.S3_PREFIX) :].partition("/")
+    return bucket_name, key
+
+
+def _exists(bundle: str) -> bool:
+    if not bundle.startswith(s3_data.S3_PREFIX):
+        return os.path.exists(bundle)
+
+    bucket_name, key = _split_s3_uri(bundle)
+    response = boto3.client("s3").list_objects_v2(
+        Bucket=bucket_name, Prefix=key, MaxKeys=1
+    )
+    return any(obj["Key"] == key for obj in response.get("Contents", ()))
+
+
+def build_bundle(
+    coordinates: Sequence[Coordinate],
+    bundle_dir: str,
+    command: str = MVN_GO_OFFLINE,
+    **kwargs,
+) -> Optional[str]:
+    """Resolve coordinates into a bundle in a local dir or s3: Return the bundle.
+
+    Resolution is best effort: A pom with unresolvable coordinates is logged, and the
+    bundle has the rest.
+    """
+    bundle = os.path.join(bundle_dir, get_bundle_name(get_bundle_key(coordinates)))
+    if _exists(bundle):
+        logging.warning("Prefetch bundle exists: `%s`.", bundle)
+        return bundle
+
+    poms = build_prefetch_poms(coordinates)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = os.path.join(temp_dir, BUNDLE_REPOSITORY)
+        for index, content in enumerate(poms):
+            pom_file = os.path.join(temp_dir, f"prefetch-{index:03d}", "pom.xml")
+            os.makedirs(os.path.dirname(pom_file))
+            utils.export_file(pom_file, content)
+
+            result = utils.do_run_command(
+                command.format(pom=pom_file, repository=repository),
+                check=False,
+                **kwargs,
+            )
+            if result.return_code != 0:
+                logging.warning(
+                    "[%d/%d] Unable to prefetch all artifacts: <<<%s>>>",
+                    index,
+                    len(poms),
+                    result,
+                )
+        if not os.path.isdir(repository):
+            logging.warning("Nothing is prefetched for %d poms.", len(poms))
+            return None
+
+        logging.info("Removed %d files from bundle.", _clean_repository(repository))
+
+        # Archive to a temporary file first: Others never see a partial bundle.
+        upload_dir = os.path.join(temp_dir, "upload")
+        os.makedirs(upload_dir)
+        local_bundle = os.path.join(upload_dir, os.path.basename(bundle))
+        with tarfile.open(local_bundle, "w:gz") as tar:
+            tar.add(repository, arcname=BUNDLE_REPOSITORY)
+
+        if bundle.startswith(s3_data.S3_PREFIX):
+            s3_data.upload_to_s3(upload_dir, bundle_dir)
+        else:
+            os.makedirs(bundle_dir, exist_ok=True)
+            partial = f"{bundle}.{os.getpid()}.partial"
+            shutil.copyfile(local_bundle, partial)
+            os.replace(partial, bundle)
+
+    logging.warning(
+        "Prefetched %d coordinates in %d poms: `%s`.",
+        len(coordinates),
+        len(poms),
+        bundle,
+    )
+    return bundle
+
+
+def get_maven_args(repository: str, offline: bool = False) -> str:
+    """Maven args to use a prefetched repository as the read-only tail."""
+    args = MVN_REPO_LOCAL_TAIL.format(repository=repository)
+    if offline:
+        args = f"{MVN_OFFLINE} {args}"
+    return args
+
+
+def _set_maven_args(args: str):
+    """Add to `MAVEN_ARGS`, which maven 3.9+ prepends to its command line args."""
+    current = os.environ.get(MAVEN_ARGS, "")
+    if args not in current:
+        os.environ[MAVEN_ARGS] = f"{current} {args}".strip()
+
+
+def install_bundle(
+    bundle: Optional[str],
+    install_dir: str = INSTALL_DIR,
+    offline: bool = False,
+) -> Optional[str]:
+    """Unpack a bundle once per executor, and use it for maven: Return the repository.
+
+    Maven runs in subprocesses, which inherit `MAVEN_ARGS` from this process.
+    """
+    if not bundle:
+        return None
+
+    name = os.path.basename(bundle)
+    if not (name.startswith(BUNDLE_PREFIX) and name.endswith(BUNDLE_SUFFIX)):
+        raise ValueError(f"Not a prefetch bundle: `{bundle}`.")
+    key = name[len(BUNDLE_PREFIX) : -len(BUNDLE_SUFFIX)]
+
+    target = os.path.join(os.path.expanduser(install_dir), key)
+    repository = os.path.join(target, BUNDLE_REPOSITORY)
+    with _INSTALL_LOCK:
+        if not os.path.exists(os.path.join(target, INSTALL_DONE)):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with tempfile.TemporaryDirectory(dir=os.path.dirname(target)) as temp_dir:
+                local_bundle = bundle
+                if bundle.startswith(s3_data.S3_PREFIX):
+                    local_bundle = os.path.join(temp_dir, name)
+                    boto3.client("s3").download_file(
+                        *_split_s3_uri(bundle), local_bundle
+                    )
+
+                unpacked = os.path.join(temp_dir, key)
+                with tarfile.open(local_bundle, "r:gz") as tar:
+                    tar.extractall(unpacked)  # nosec: Bundles are built by the batch.
+                utils.export_file(os.path.join(unpacked, INSTALL_DONE), bundle)
+
+                shutil.rmtree(target, ignore_errors=True)
+                os.replace(unpacked, target)
+            logging.warning("Installed prefetch bundle: `%s` => `%s`.", bundle, target)
+
+        _set_maven_args(get_maven_args(repository, offline=offline))
+
+    return repository
+
+
+def run_spark_prefetch(
+    projects,
+    root_dir_fn,
+    bundle_dir: str,
+    dependency_versions: Optional[Dict[str, str]] = None,
+) -> Optional[str]:
+    """Spark: Collect coordinates of all projects, and build a bundle in one task."""
+    coordinates = (
+        projects.flatMap(
+            lambda kwargs: collect_coordinates(root_dir_fn(kwargs), dependency_versions)
+        )
+        .distinct()
+        .collect()
+    )
+    logging.warning("Prefetch coordinates: # = %d.", len(coordinates))
+    if not coordinates:
+        return None
+
+    coordinates = sorted(coordinates)
+    return (
+        projects.context.parallelize([0], 1)
+        .map(lambda _: build_bundle(coordinates, bundle_dir))
+        .collect()[0]
+    )
@@ -13,6 +13,8 @@ python spark_build.py --base_config_file=$BASE_CONFIG --config_file=$CONFIG --us
     --dry_run_builder=1
 ```
 
+Without Spark, on a single node: Add `--backend=local --local_workers=$(nproc)`.
+
 """
 
 import argparse
@@ -21,13 +23,13 @@ import os
 from typing import Any, Sequence
 
 from self_debug.proto import config_pb2
-from pyspark import SparkContext
 
 from self_debug.common import utils
 
 from self_debug.datasets import hf_utils
-from self_debug.metrics import utils as metric_utils
+from self_debug.metrics import registry as metrics_registry
 
+from self_debug.batch import backend
 from self_debug.batch import utils as spark_utils
 
 
@@ -87,6 +89,27 @@ def _parse_args():
     )
 
     parser.add_argument("--region", type=str, default="", help="AWS region.")
+    # Batch backend: Spark, or local processes without Spark.
+    parser.add_argument(
+        "--backend",
+        type=str,
+        default=backend.SPARK,
+        choices=backend.BACKENDS,
+        help="Batch backend.",
+    )
+    parser.add_argument(
+        "--local_workers",
+        type=int,
+        default=None,
+        help="Local backend: # worker processes, all cores by default.",
+    )
+    parser.add_argument(
+        "--local_output_dir",
+        type=str,
+        default="",
+        help="Local backend: Stream task results to this dir.",
+    )
+
     # The user running this job, and to send summary email to.
     parser.add_argument(
         "--user",
@@ -151,8 +174,9 @@ def spark_main(
                 spark_utils.get_builder_metrics(projects, config, dry_run_builder)[-1]
             )
 
+        metrics = metrics_registry.merge(None, metrics)
         for iter_metrics in reduce_metrics:
-            metrics = metric_utils.reduce_by_key(metrics, iter_metrics)
+            metrics.merge(iter_metrics)
 
     # 3. Collect metrics.
     for name, seconds in (
@@ -163,12 +187,8 @@ def spark_main(
         ("repo", repo_timer.seconds),
         ("total", batch_timer.seconds),
     ):
-        metrics.update(
-            {
-                f"#seconds::{name}": seconds,
-                f"#minutes::{name}": seconds / 60.0,
-            }
-        )
+        metrics.set(f"#seconds::{name}", seconds)
+        metrics.set(f"#minutes::{name}", seconds / 60.0)
 
     # 4. Send email.
     tag = f"(`{args.application}`, `{args.job_name}`)"
@@ -196,7 +216,11 @@ def main(args):
     hf_utils.resolve_hf_dataset(config.dataset)
     logging.info("Config: <<<%s>>>", config)
 
-    spark = SparkContext()
+    spark = backend.create_context(
+        args.backend,
+        max_workers=args.local_workers,
+        output_dir=args.local_output_dir or None,
+    )
 
     # Create RDD from list of files.
     datasets = tuple(config.dataset.dataset_repos)
@@ -24,6 +24,8 @@ python spark_debug.py --base_config_file=$BASE_CONFIG --config_file=$CONFIG \
     --dry_run_debugger=1
 ```
 
+Without Spark, on a single node: Add `--backend=local --local_workers=$(nproc)`.
+
 """
 # pylint: enable=line-too-long
 
@@ -32,16 +34,17 @@ import logging
 import os
 from typing import Any, Sequence
 
-import boto3
 from self_debug.proto import config_pb2
-from pyspark import SparkContext
 
-from self_debug.common import utils
-from self_debug.metrics import utils as metric_utils
+from self_debug.common import lazy_import, utils
+from self_debug.metrics import registry as metrics_registry
 from self_debug.datasets import hf_utils
 
+from self_debug.batch import backend
 from self_debug.batch import utils as spark_utils
 
+boto3 = lazy_import.lazy_module("boto3")
+
 # Probably no need for all lines, if it's too long.
 BUILD_ERROR_CUTOFF_LINES = 10
 
@@ -169,6 +172,38 @@ def _parse_args():
     #  2: os.env + driver   credential
     parser.add_argument("--qnet_env", type=int, default=1, help="QNet env vars.")
 
+    # Prefetch maven artifacts once per batch: A local dir or s3 dir for bundles.
+    parser.add_argument(
+        "--prefetch_dir", type=str, default="", help="Prefetch bundle dir."
+    )
+    parser.add_argument(
+        "--prefetch_offline",
+        type=int,
+        default=0,
+        help="Run maven offline with prefetched artifacts only (maven 3.9+).",
+    )
+
+    # Batch backend: Spark, or local processes without Spark.
+    parser.add_argument(
+        "--backend",
+        type=str,
+        default=backend.SPARK,
+        choices=backend.BACKENDS,
+        help="Batch backend.",
+    )
+    parser.add_argument(
+        "--local_workers",
+        type=int,
+        default=None,
+        help="Local backend: # worker processes, all cores by default.",
+    )
+    parser.add_argument(
+        "--local_output_dir",
+        type=str,
+        default="",
+        help="Local backend: Stream task results to this dir.",
+    )
+
     # The user running this job, and to send summary email to.
     parser.add_argument(
         "--user",
@@ -212,6 +247,12 @@ def spark_main(
                 spark, datasets, config, dry_run_builder and dry_run_debugger, args
             )
 
+        with utils.TimeItInSeconds(
+            "Spark::Prefetch", logging_fn=logging.warning
+        ) as prefetch_timer:
+            projects, bundle = spark_utils.run_spark_prefetch(projects, config, args)
+            metrics["#prefetch_bundle"] = int(bool(bundle))
+
         reduce_metrics = []
         # 2. Run self debugging.
         with utils.TimeItInSeconds(
@@ -234,8 +275,9 @@ def spark_main(
             )
             reduce_metrics.append(dbg_metrics)
 
+        metrics = metrics_registry.merge(None, metrics)
         for iter_metrics in reduce_metrics:
-            metrics = metric_utils.reduce_by_key(metrics, iter_metrics)
+            metrics.merge(iter_metrics)
 
     batch_summary.update(
         {
@@ -252,16 +294,13 @@ def spark_main(
     for name, seconds in (
         ("builder", builder_timer.seconds),
         ("debugger", debugger_timer.seconds),
+        ("prefetch", prefetch_timer.seconds),
         ("projects", projects_timer.seconds),
         ("repo", repo_timer.seconds),
         ("total", batch_timer.seconds),
     ):
-        metrics.update(
-            {
-                f"#seconds::{name}": seconds,
-                f"#minutes::{name}": seconds / 60.0,
-            }
-        )
+        metrics.set(f"#seconds::{name}", seconds)
+        metrics.set(f"#minutes::{name}", seconds / 60.0)
 
     # 4. Send email.
     tag = f"(`{args.application}`, `{args.job_name}`)"
@@ -289,7 +328,11 @@ def main(args):
     hf_utils.resolve_hf_dataset(config.dataset)
     logging.info("Config: <<<%s>>>", config)
 
-    spark = SparkContext()
+    spark = backend.create_context(
+        args.backend,
+        max_workers=args.local_workers,
+        output_dir=args.local_output_dir or None,
+    )
 
     # Create RDD from list of files.
     datasets = tuple(config.dataset.dataset_repos)
@@ -0,0 +1,148 @@
+"""Unit tests for backend.py."""
+
+import argparse
+import functools
+import itertools
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from parameterized import parameterized
+from self_debug.proto import config_pb2
+
+from self_debug.batch import backend
+from self_debug.batch import utils as spark_utils
+from self_debug.common import utils, warm_pool
+
+
+def _get_metrics(config, kwargs):
+    """Map function of a job."""
+    del config
+    return kwargs["x"] % 3 == 0, {"#x": 1, f"#x={kwargs['x'] % 2}": 1}
+
+
+_RESOURCES = itertools.count()
+
+
+def _get_warm_resource(config, kwargs):
+    """Map function of a job: With a warm resource."""
+    del config, kwargs
+    return warm_pool.get_or_create("resource", lambda: next(_RESOURCES)), {}
+
+
+class TestBackend(unittest.TestCase):
+    """Unit tests for backend.py."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    @parameterized.expand(((0,), (2,)))
+    def test_transformations(self, max_workers):
+        """Unit tests transformations and actions."""
+        context = backend.create_context(backend.LOCAL, max_workers=max_workers)
+        numbers = context.parallelize(range(10))
+        numbers.cache()
+
+        odd = numbers.map(lambda x: x * 3).filter(lambda x: x % 2)
+        self.assertEqual(odd.collect(), [3, 9, 15, 21, 27])
+        self.assertEqual(odd.count(), 5)
+        self.assertEqual(odd.first(), 3)
+        self.assertEqual(odd.reduce(lambda x, y: x + y), 75)
+        self.assertFalse(odd.isEmpty())
+        self.assertTrue(odd.filter(lambda x: x > 100).isEmpty())
+
+        pairs = numbers.map(lambda x: (x % 3, [x] * (x % 2)))
+        self.assertEqual(
+            pairs.flatMapValues(lambda x: x).values().collect(), [1, 3, 5, 7, 9]
+        )
+        self.assertEqual(pairs.mapValues(len).values().countByValue(), {0: 5, 1: 5})
+        self.assertEqual(
+            numbers.flatMap(lambda x: [x % 4] * 2).distinct().collect(), [0, 1, 2, 3]
+        )
+
+        partitioned = (
+            numbers.zipWithIndex()
+            .map(lambda p: (p[1], p[0]))
+            .partitionBy(3, lambda index: index % 3)
+        )
+        self.assertEqual(partitioned.getNumPartitions(), 3)
+        self.assertEqual(partitioned.values().collect(), [0, 3, 6, 9, 1, 4, 7, 2, 5, 8])
+
+        # Cached: Each item runs once, with fused transformations.
+        num_tasks = context.num_tasks
+        self.assertEqual(odd.count(), 5)
+        self.assertEqual(context.num_tasks, num_tasks + 10)
+        odd.cache()
+        self.assertEqual(odd.count(), 5)
+        self.assertEqual(odd.collect(), [3, 9, 15, 21, 27])
+        self.assertEqual(context.num_tasks, num_tasks + 20)
+
+        context.stop()
+
+    def test_get_metrics(self):
+        """Unit tests _get_metrics: Same metrics as in the driver, streamed to disk."""
+        args = argparse.Namespace(upload_raw_metrics_to_s3=None)
+        summaries = []
+        for max_workers in (0, 2):
+            output_dir = os.path.join(self.temp_dir, str(max_workers))
+            context = backend.LocalContext(max_workers, output_dir=output_dir)
+            projects = context.parallelize(
+                [{spark_utils.PARSED_ARGS: args, "x": x} for x in range(7)]
+            )
+
+            summary, metrics = spark_utils._get_metrics(
+                projects, config_pb2.Config(), _get_metrics, job="test"
+            )
+            context.stop()
+            summaries.append((summary, metrics.to_legacy()))
+
+            filename = os.path.join(
+                output_dir, backend.RESULTS_FILENAME.format(stage=1)
+            )
+            results = sorted(backend.load_results(filename))
+            self.assertEqual([index for index, _ in results], list(range(7)))
+            self.assertEqual(results[3][-1][0][0], True)
+
+        self.assertEqual(summaries[0], summaries[1])
+        self.assertEqual(
+            summaries[0][0], {"n_total": 7, "n_success": 3, "p_success": 3 / 7.0}
+        )
+        self.assertEqual(
+            {k: v for k, v in summaries[0][1].items() if k.startswith("#x")},
+            {"#x": 7, "#x=0": 4, "#x=1": 3},
+        )
+
+    @parameterized.expand(((0, 7), (1, 1)))
+    def test_warm_pool(self, max_workers, expected_num_resources):
+        """Unit tests warm resources: Per worker, or per partition in the driver."""
+        args = argparse.Namespace(upload_raw_metrics_to_s3=None)
+        context = backend.LocalContext(max_workers)
+        projects = context.parallelize(
+            [{spark_utils.PARSED_ARGS: args, "x": x} for x in range(7)]
+        )
+
+        results = projects.mapPartitions(
+            functools.partial(
+                spark_utils._map_partition, _get_warm_resource, config_pb2.Config()
+            )
+        ).collect()
+        context.stop()
+
+        self.assertEqual(len(results), 7)
+        self.assertEqual(len({r for r, _ in results}), expected_num_resources)
+        self.assertFalse(warm_pool.get_pool().active)
+
+    def test_create_context(self):
+        """Unit tests create_context."""
+        with self.assertRaises(ValueError):
+            backend.create_context("unknown")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
@@ -0,0 +1,146 @@
+"""Unit tests for partition.py."""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from parameterized import parameterized
+from self_debug.proto import dataset_pb2
+
+from self_debug.batch import backend, partition
+from self_debug.batch import utils as spark_utils
+from self_debug.common import utils
+from self_debug.metrics import registry as metrics_registry
+
+
+def _debugger_metrics(ground_truth, init_errors: int, seconds: float):
+    """Raw metrics of a project, the same way as `_get_metrics_from_debugger`."""
+    metrics = metrics_registry.MetricsRegistry()
+    metrics.inc(
+        "Debugger::00--01--project", project=f"{ground_truth}#={init_errors:03d}"
+    )
+    metrics.observe("Debugger::02--00--latency_seconds", seconds)
+    metrics.observe("Debugger::02--01--#errors-init", init_errors)
+    return metrics.to_legacy()
+
+
+def _repo_metrics(ground_truth: str, loc: int):
+    """Raw metrics of a repo job, the same way as `GitRepo.run_metrics`."""
+    return {
+        f"GitRepo::ground_truth__EQ__{ground_truth}": 1,
+        f"GitRepo::RepoSnapshot::repo-num-loc__EQ__{loc:06d}": 1,
+    }
+
+
+class TestPartition(unittest.TestCase):
+    """Unit tests for partition.py."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    @parameterized.expand(
+        (
+            (
+                _debugger_metrics("s3://bucket/a/", 3, 60.0),
+                ("s3://bucket/a/", partition.History(60.0, 3, None)),
+            ),
+            (
+                _debugger_metrics(("https://github.com/a/b", "abc"), 1, 10.0),
+                ("https://github.com/a/b", partition.History(10.0, 1, None)),
+            ),
+            (
+                _repo_metrics("https://github.com/a/b", 1200),
+                ("https://github.com/a/b", partition.History(None, None, 1200)),
+            ),
+            (
+                {"Debugger::02--00--latency_seconds::max": 10.0},
+                None,
+            ),
+        )
+    )
+    def test_parse_raw_metrics(self, metrics, expected_history):
+        """Unit tests parse_raw_metrics."""
+        self.assertEqual(partition.parse_raw_metrics(metrics), expected_history)
+
+    def test_cost_model(self):
+        """Unit tests load_history and CostModel."""
+        filename = os.path.join(self.temp_dir, "raw.json")
+        utils.export_json(
+            filename,
+            [
+                _debugger_metrics("/a", 2, 100.0),
+                _debugger_metrics("/b", 4, 400.0),
+                _debugger_metrics("/b", 4, 300.0),
+                _repo_metrics("/b", 4000),
+                _repo_metrics("/c", 2000),
+                _repo_metrics("/d", 0),
+                {"unknown": 1},
+            ],
+        )
+        config = dataset_pb2.DatasetPartition(
+            cost_history=[filename, os.path.join(self.temp_dir, "missing.json")]
+        )
+        model = partition.create_cost_model(config)
+        self.assertEqual(len(model.history), 4)
+
+        # (/a, /b): Medians of 250s, 75s per error, and 0.1s per line by `/b` only.
+        self.assertEqual(model.default_cost, 250.0)
+        self.assertEqual(model.cost("/a"), 100.0)
+        self.assertEqual(model.cost("/b"), 400.0)
+        self.assertEqual(model.cost("/c"), 200.0)
+        self.assertEqual(model.cost("/d"), 0.0)
+        self.assertEqual(model.cost("/e"), 250.0)
+
+        self.assertIsNone(partition.create_cost_model(dataset_pb2.DatasetPartition()))
+
+    @parameterized.expand(
+        (
+            ((5, 4, 3, 3, 2, 1), 2, 0, [0, 1, 1, 0, 1, 0], 9),
+            ((5, 4, 3, 3, 2, 1), 2, 1, [0, 1, 1, 1, 1, 1], 13),
+            ((5, 4, 3, 3, 2, 1), 3, 1, [0, 1, 2, 2, 1, 1], 7),
+            ((1, 1, 1, 1), 3, 5, [0, 1, 2, 2], 2),
+            ((), 3, 0, [], 0),
+        )
+    )
+    def test_lpt_partition(
+        self, costs, partitions, isolate_heaviest, expected_assignment, expected_max
+    ):
+        """Unit tests lpt_partition."""
+        assignment = partition.lpt_partition(costs, partitions, isolate_heaviest)
+        self.assertEqual(assignment, expected_assignment)
+        self.assertEqual(partition.makespan(costs, assignment), expected_max)
+
+    def test_do_repartition(self):
+        """Unit tests _do_repartition: Stragglers are spread across partitions."""
+        history = {
+            f"/repo{index}": partition.History(latency_seconds=seconds)
+            for index, seconds in enumerate((600, 500, 400, 10, 10, 10))
+        }
+        datasets = [
+            dataset_pb2.DatasetRepo(local_repo=dataset_pb2.LocalRepo(root_dir=key))
+            for key in history
+        ]
+
+        context = backend.LocalContext(max_workers=0)
+        projects = spark_utils._do_repartition(
+            context.parallelize(datasets),
+            partitions=2,
+            nodes=0,
+            cost_model=partition.CostModel(history),
+        )
+        self.assertEqual(projects.getNumPartitions(), 2)
+        self.assertEqual(
+            [partition.get_key(d) for d in projects.collect()],
+            # Round robin: (1010, 520) seconds, instead of (630, 900).
+            ["/repo0", "/repo3", "/repo4", "/repo5", "/repo1", "/repo2"],
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
@@ -0,0 +1,238 @@
+"""Unit tests for prefetch.py."""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from parameterized import parameterized
+
+from self_debug.batch import prefetch
+from self_debug.common import utils
+
+POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <parent>
+    <groupId>org.springframework.boot</groupId>
+    <artifactId>spring-boot-starter-parent</artifactId>
+    <version>2.5.4</version>
+  </parent>
+  <artifactId>app</artifactId>
+  <properties>
+    <guava.version>30.1-jre</guava.version>
+  </properties>
+  <dependencyManagement>
+    <dependencies>
+      <dependency>
+        <groupId>com.fasterxml.jackson</groupId>
+        <artifactId>jackson-bom</artifactId>
+        <version>2.12.4</version>
+        <type>pom</type>
+        <scope>import</scope>
+      </dependency>
+    </dependencies>
+  </dependencyManagement>
+  <dependencies>
+    <dependency>
+      <groupId>com.google.guava</groupId>
+      <artifactId>guava</artifactId>
+      <version>${guava.version}</version>
+    </dependency>
+    <dependency>
+      <groupId>org.projectlombok</groupId>
+      <artifactId>lombok</artifactId>
+    </dependency>
+    <dependency>
+      <groupId>org.unknown</groupId>
+      <artifactId>unknown</artifactId>
+      <version>${unknown.version}</version>
+    </dependency>
+  </dependencies>
+  <build>
+    <plugins>
+      <plugin>
+        <artifactId>maven-compiler-plugin</artifactId>
+        <version>3.8.1</version>
+      </plugin>
+    </plugins>
+  </build>
+</project>
+"""
+
+DEPENDENCY_VERSIONS = {
+    "com.google.guava:guava": "32.1.2-jre",
+    "org.projectlombok:lombok": "1.18.30",
+    "org.springframework.boot:spring-boot-starter-parent": "3.1.5",
+    "org.apache.maven.plugins:maven-compiler-plugin": "3.8.0",
+}
+
+# Fake `mvn dependency:go-offline`: An artifact per pom, and files to be removed.
+COMMAND = (
+    "mkdir -p {repository}/com/example/a/1.0 && "
+    "cp {pom} {repository}/com/example/a/1.0/$(basename $(dirname {pom})).pom && "
+    "touch {repository}/com/example/a/1.0/_remote.repositories "
+    "{repository}/com/example/a/1.0/a-1.0.jar.lastUpdated"
+)
+
+
+class TestPrefetch(unittest.TestCase):
+    """Unit tests for prefetch.py."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root_dir = os.path.join(self.temp_dir, "repo")
+        utils.export_file(os.path.join(self.root_dir, "pom.xml"), POM)
+        utils.export_file(os.path.join(self.root_dir, "broken", "pom.xml"), "<a>")
+
+        self.environ = mock.patch.dict(os.environ, {}, clear=False)
+        self.environ.start()
+        os.environ.pop(prefetch.MAVEN_ARGS, None)
+
+    def tearDown(self):
+        self.environ.stop()
+        shutil.rmtree(self.temp_dir)
+
+    @parameterized.expand(
+        (
+            (
+                None,
+                set(),
+            ),
+            (
+                DEPENDENCY_VERSIONS,
+                {
+                    ("com.google.guava", "guava", "jar", "32.1.2-jre"),
+                    (
+                        "org.springframework.boot",
+                        "spring-boot-starter-parent",
+                        "pom",
+                        "3.1.5",
+                    ),
+                },
+            ),
+        )
+    )
+    def test_collect_coordinates(self, dependency_versions, expected_upgrades):
+        """Unit tests collect_coordinates: Before and after upgrades."""
+        self.assertEqual(
+            prefetch.collect_coordinates(self.root_dir, dependency_versions),
+            {
+                ("com.fasterxml.jackson", "jackson-bom", "pom", "2.12.4"),
+                ("com.google.guava", "guava", "jar", "30.1-jre"),
+                (
+                    "org.apache.maven.plugins",
+                    "maven-compiler-plugin",
+                    "maven-plugin",
+                    "3.8.1",
+                ),
+                (
+                    "org.springframework.boot",
+                    "spring-boot-starter-parent",
+                    "pom",
+                    "2.5.4",
+                ),
+            }
+            | expected_upgrades,
+        )
+
+    def test_build_prefetch_poms(self):
+        """Unit tests build_prefetch_poms: Each `groupId:artifactId` once a pom."""
+        poms = prefetch.build_prefetch_poms(
+            (
+                ("g", "a", "jar", "1.0"),
+                ("g", "a", "jar", "2.0"),
+                ("g", "a", "maven-plugin", "1.0"),
+                ("g", "b", "jar", "1.0"),
+            )
+        )
+
+        self.assertEqual(len(poms), 2)
+        self.assertIn("<version>1.0</version>", poms[0])
+        self.assertIn("<artifactId>b</artifactId>", poms[0])
+        self.assertIn("<plugin>", poms[0])
+        self.assertIn("<version>2.0</version>", poms[1])
+        self.assertNotIn("<artifactId>b</artifactId>", poms[1])
+
+    def test_get_bundle_key(self):
+        """Unit tests get_bundle_key: Content addressed."""
+        coordinates = [("g", "a", "jar", "1.0"), ("g", "b", "jar", "1.0")]
+        self.assertEqual(
+            prefetch.get_bundle_key(coordinates),
+            prefetch.get_bundle_key(reversed(coordinates * 2)),
+        )
+        self.assertNotEqual(
+            prefetch.get_bundle_key(coordinates),
+            prefetch.get_bundle_key(coordinates[:1]),
+        )
+
+    def test_build_and_install_bundle(self):
+        """Unit tests build_bundle and install_bundle."""
+        coordinates = sorted(
+            prefetch.collect_coordinates(self.root_dir, DEPENDENCY_VERSIONS)
+        )
+        bundle_dir = os.path.join(self.temp_dir, "bundles")
+
+        bundle = prefetch.build_bundle(coordinates, bundle_dir, command=COMMAND)
+        self.assertEqual(
+            os.path.basename(bundle),
+            prefetch.get_bundle_name(prefetch.get_bundle_key(coordinates)),
+        )
+        self.assertTrue(os.path.exists(bundle))
+
+        # Exists already.
+        self.assertEqual(
+            prefetch.build_bundle(coordinates, bundle_dir, command="exit 1"), bundle
+        )
+
+        install_dir = os.path.join(self.temp_dir, "install")
+        repository = prefetch.install_bundle(bundle, install_dir, offline=True)
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(repository, "com/example/a/1.0"))),
+            ["prefetch-000.pom", "prefetch-001.pom"],
+        )
+        expected_args = f"-o -Dmaven.repo.local.tail={repository}"
+        self.assertEqual(os.environ[prefetch.MAVEN_ARGS], expected_args)
+
+        # Once per executor.
+        with mock.patch.object(prefetch.tarfile, "open") as mock_open:
+            self.assertEqual(
+                prefetch.install_bundle(bundle, install_dir, offline=True), repository
+            )
+            mock_open.assert_not_called()
+        self.assertEqual(os.environ[prefetch.MAVEN_ARGS], expected_args)
+
+        # Online by default: The bundle is the read-only tail only.
+        self.assertEqual(
+            prefetch.get_maven_args(repository),
+            f"-Dmaven.repo.local.tail={repository}",
+        )
+
+    @parameterized.expand(
+        (
+            (None, None),
+            ("/tmp/not-a-bundle.zip", ValueError),
+        )
+    )
+    def test_install_bundle_invalid(self, bundle, expected_error):
+        """Unit tests install_bundle: No bundle or an invalid one."""
+        if expected_error is None:
+            self.assertIsNone(prefetch.install_bundle(bundle, self.temp_dir))
+        else:
+            with self.assertRaises(expected_error):
+                prefetch.install_bundle(bundle, self.temp_dir)
+        self.assertNotIn(prefetch.MAVEN_ARGS, os.environ)
+
+    def test_build_bundle_failure(self):
+        """Unit tests build_bundle: Nothing is prefetched."""
+        self.assertIsNone(
+            prefetch.build_bundle(
+                [("g", "a", "jar", "1.0")], self.temp_dir, command="exit 1"
+            )
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
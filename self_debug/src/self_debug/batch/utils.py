@@ -10,18 +10,34 @@ import logging
 import os
 import shutil
 import tempfile
-from typing import Any, Dict, List, Sequence, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
-import boto3
 from self_debug.proto import batch_pb2, config_pb2, metrics_pb2
 from pytz import timezone
 
-from self_debug.common import git_repo, s3_data, send_email, utils
+from self_debug.batch import partition, prefetch
+from self_debug.common import (
+    eval_utils,
+    git_repo,
+    lazy_import,
+    profiler,
+    s3_data,
+    send_email,
+    utils,
+    warm_pool,
+)
 from self_debug.datasets import project as ds_project
 from self_debug.lang.base import ast_parser_factory, builder_factory
-from self_debug.metrics import cloud_watch, utils as metric_utils
+from self_debug.metrics import (
+    cloud_watch,
+    publisher,
+    registry as metrics_registry,
+    utils as metric_utils,
+)
 from self_debug import self_debugging
 
+boto3 = lazy_import.lazy_module("boto3")
+
 
 # Probably no need for all lines, if it's too long.
 BUILD_ERROR_CUTOFF_LINES = 10
@@ -30,6 +46,8 @@ CW_NAME = "Name"
 CW_VALUE = "Value"
 
 CW_LATENCY_SECONDS = "latency_seconds"
+# Per phase, e.g. `phase_seconds_p50_llm`.
+CW_PHASE_SECONDS = "phase_seconds"
 CW_NUM_ERRORS_FACTOR = "NUM_ERRORS_FACTOR"
 CW_WALLTIME_SECONDS = "walltime_seconds"
 
@@ -45,6 +63,8 @@ PROJECT = "project"
 PROJECT_INDEX = "project_index"
 ROOT_DIR = "root_dir"
 PROJECT_OBJECT = "project_object"
+# Prefetched maven artifacts: A bundle shared by all projects in a batch.
+PREFETCH_BUNDLE = "prefetch_bundle"
 
 QNET_PORTING_DIR = "MidTransformCode"
 
@@ -177,7 +197,13 @@ def tee_output(pipe, log_file, index: int, logging_fn=logging.warning):
             log.write(line + "\n")
 
 
-def _do_repartition(projects, partitions: int, nodes: int):
+def _do_repartition(
+    projects,
+    partitions: int,
+    nodes: int,
+    cost_model: Optional[partition.CostModel] = None,
+    isolate_heaviest: int = 0,
+):
     projects.cache()
     count = projects.count()
     if not count:
@@ -191,18 +217,30 @@ def _do_repartition(projects, partitions: int, nodes: int):
     partitions = min(nums)
     logging.info("Repartition: # = %d from `%s` ...", partitions, nums)
 
-    # Evenly partitioned among nodes.
+    # Evenly partitioned among nodes, or balanced by costs.
+    assignment = [index % partitions for index in range(count)]
+    if cost_model is not None:
+        keys = projects.map(partition.get_key).collect()
+        costs = [cost_model.cost(key) for key in keys]
+        makespan = partition.makespan(costs, assignment)
+        assignment = partition.lpt_partition(costs, partitions, isolate_heaviest)
+        logging.warning(
+            "Repartition by costs: Makespan = %.1f seconds <== %.1f (round robin).",
+            partition.makespan(costs, assignment),
+            makespan,
+        )
+
     return (
         projects.zipWithIndex()
         .map(lambda p: (p[1], p[0]))  # (index, $element)
-        .partitionBy(partitions, lambda index: index % partitions)
+        .partitionBy(partitions, lambda index: assignment[index])
         .values()
     )
 
 
-def _repartition_projects(projects, partitions: int, nodes: int):
+def _repartition_projects(projects, partitions: int, nodes: int, **kwargs):
     """Repartition projects."""
-    projects = _do_repartition(projects, partitions, nodes)
+    projects = _do_repartition(projects, partitions, nodes, **kwargs)
     projects.cache()
 
     metrics = {
@@ -235,12 +273,19 @@ def run_spark_projects(  # pylint: disable=too-many-branches,too-many-locals
     logging.info("Total number of datasets: # = %d.", len(datasets))
 
     datasets_rdd = spark.parallelize(datasets)
+    partition_kwargs = {
+        "cost_model": partition.create_cost_model(config.dataset.dataset_partition),
+        "isolate_heaviest": config.dataset.dataset_partition.isolate_heaviest,
+    }
     if (
         config.dataset.HasField("dataset_partition")
         and config.dataset.dataset_partition.partition_repos
     ):
         datasets_rdd = _do_repartition(
-            datasets_rdd, config.dataset.dataset_partition.partition_repos, args.nodes
+            datasets_rdd,
+            config.dataset.dataset_partition.partition_repos,
+            args.nodes,
+            **partition_kwargs,
         )
 
     # 1. Filter repos.
@@ -377,7 +422,10 @@ def run_spark_projects(  # pylint: disable=too-many-branches,too-many-locals
         and config.dataset.dataset_partition.partition_projects
     ):
         projects, repartition_metrics = _repartition_projects(
-            projects, config.dataset.dataset_partition.partition_projects, args.nodes
+            projects,
+            config.dataset.dataset_partition.partition_projects,
+            args.nodes,
+            **partition_kwargs,
         )
         projects.cache()
         metrics.update(repartition_metrics)
@@ -385,6 +433,40 @@ def run_spark_projects(  # pylint: disable=too-many-branches,too-many-locals
     return projects, metrics
 
 
+def _get_root_dir(kwargs) -> str:
+    return kwargs.get(PROJECT_OBJECT).maybe_init_root_dir(kwargs.get(ROOT_DIR))[0]
+
+
+def run_spark_prefetch(projects, config: config_pb2.Config, args: Any = None):
+    """Prefetch maven artifacts of all projects once: Return projects and the bundle."""
+    bundle_dir = getattr(args, "prefetch_dir", None)
+    if not (bundle_dir and config.builder.HasField("maven_builder")):
+        return projects, None
+
+    bundle = prefetch.run_spark_prefetch(
+        projects,
+        _get_root_dir,
+        bundle_dir,
+        utils.load_json(eval_utils.DEPENDENCY_VERSION),
+    )
+    if not bundle:
+        return projects, None
+
+    projects = projects.map(lambda kwargs: {**kwargs, PREFETCH_BUNDLE: bundle})
+    projects.cache()
+    return projects, bundle
+
+
+def _maybe_install_prefetch(kwargs):
+    """Use prefetched maven artifacts in this executor, if any."""
+    bundle = kwargs.get(PREFETCH_BUNDLE)
+    if bundle:
+        prefetch.install_bundle(
+            bundle,
+            offline=bool(getattr(kwargs.get(PARSED_ARGS), "prefetch_offline", False)),
+        )
+
+
 def _get_metrics_from_project(config: config_pb2.Config, *args) -> Dict[str, int]:
     """Get metrics from git project: Args is dict with keys of `root_dir` & `proejct`."""
     del config
@@ -451,6 +533,7 @@ def _get_metrics_from_project(config: config_pb2.Config, *args) -> Dict[str, int
 def _get_metrics_from_repo(config: config_pb2.Config, *args) -> Dict[str, int]:
     """Get metrics from git repo: Args is dict with keys of `root_dir` & `proejct`."""
     kwargs = args[0]
+    _maybe_install_prefetch(kwargs)
     project_obj = kwargs.get(PROJECT_OBJECT)
 
     input_root_dir = kwargs.get(ROOT_DIR)
@@ -509,6 +592,7 @@ def _get_metrics_from_builder(
 ) -> Tuple[metrics_pb2.Metrics, Dict[str, int]]:
     """Get metrics from builder: Args is dict with keys of `root_dir` & `project`."""
     kwargs = args[0]
+    _maybe_install_prefetch(kwargs)
     parsed_args = kwargs.get(PARSED_ARGS)
 
     input_root_dir = kwargs.get(ROOT_DIR)
@@ -634,6 +718,17 @@ def get_multi_batch_dimensions(
     return tuple(prefixes), tuple(multi_dims)
 
 
+def _get_publisher(cfg, monitor_cfg, parsed_args, dry_run: bool):
+    enabled = (cfg.enable_cloud_watch or cfg.jsonl_file) and monitor_cfg.debugger
+    return publisher.get_publisher(
+        region=parsed_args.region,
+        namespace=cfg.namespace,
+        jsonl_file=cfg.jsonl_file or None,
+        dry_run=not enabled or dry_run,
+        flush_seconds=cfg.flush_seconds,
+    )
+
+
 def publish_metrics(  # pylint: disable=too-many-locals
     project: str,
     proto: metrics_pb2.Metrics,
@@ -721,13 +816,8 @@ def publish_metrics(  # pylint: disable=too-many-locals
         for metric in metrics:
             metric.update({"Dimensions": dimensions})
 
-        client = cloud_watch.CloudWatch(
-            region=parsed_args.region, namespace=cfg.namespace
-        )
-        client.publish(
-            metrics,
-            dry_run=not (cfg.enable_cloud_watch and monitor_cfg.debugger) or dry_run,
-        )
+        # Flushed in the background, with other projects in the same executor.
+        _get_publisher(cfg, monitor_cfg, parsed_args, dry_run).add(metrics)
 
 
 def publish_batch_metrics(
@@ -770,7 +860,14 @@ def publish_batch_metrics(
                             CW_LATENCY_SECONDS: cloud_watch.UNIT_TIME_SECONDS,
                             CW_NUM_ERRORS_FACTOR: None,
                             CW_WALLTIME_SECONDS: cloud_watch.UNIT_TIME_SECONDS,
-                        }.get(name, cloud_watch.UNIT_COUNT)
+                        }.get(
+                            name,
+                            (
+                                cloud_watch.UNIT_TIME_SECONDS
+                                if name.startswith(CW_PHASE_SECONDS)
+                                else cloud_watch.UNIT_COUNT
+                            ),
+                        )
                     ),
                 )
             )
@@ -779,13 +876,10 @@ def publish_batch_metrics(
         for metric in metrics:
             metric.update({"Dimensions": dimensions})
 
-        client = cloud_watch.CloudWatch(
-            region=parsed_args.region, namespace=cfg.namespace
-        )
-        client.publish(
-            metrics,
-            dry_run=not (cfg.enable_cloud_watch and monitor_cfg.debugger) or dry_run,
-        )
+        _get_publisher(cfg, monitor_cfg, parsed_args, dry_run).add(metrics)
+
+    # On the driver: Flush before the job finishes.
+    _get_publisher(cfg, monitor_cfg, parsed_args, dry_run).flush()
 
 
 def _load_credentials(parsed_args, qnet_env: int = -1):
@@ -826,8 +920,9 @@ def _load_credentials(parsed_args, qnet_env: int = -1):
 
 def _get_metrics_from_debugger(  # pylint: disable=too-many-branches,too-many-locals,too-many-statements
     config: config_pb2.Config, *args
-) -> Tuple[metrics_pb2.Metrics, Dict[str, int]]:
+) -> Tuple[metrics_pb2.Metrics, metrics_registry.MetricsRegistry]:
     kwargs = args[0]
+    _maybe_install_prefetch(kwargs)
 
     project_obj = kwargs.get(PROJECT_OBJECT)
     _, download = project_obj.maybe_init_root_dir(kwargs.get(ROOT_DIR))
@@ -860,7 +955,7 @@ def _get_metrics_from_debugger(  # pylint: disable=too-many-branches,too-many-lo
     max_iterations = parsed_args.max_iterations or config.max_iterations
     repo = self_debugging_runner.repo
     # 1. Save a snapshot if s3.
-    metrics = {}
+    metrics = metrics_registry.MetricsRegistry()
     if not parsed_args.dry_run_debugger and isinstance(
         project_obj, ds_project.S3Project
     ):
@@ -888,12 +983,8 @@ def _get_metrics_from_debugger(  # pylint: disable=too-many-branches,too-many-lo
         else:
             key = "00--00--git-n.a."
 
-        metrics.update(
-            {
-                "Debugger::00--00--s3--attemped": 1,
-                f"Debugger::{key}": 1,
-            }
-        )
+        metrics.inc("Debugger::00--00--s3--attemped")
+        metrics.inc(f"Debugger::{key}")
 
     # 1.5 Create a new branch as needed.
     branch = None
@@ -953,10 +1044,10 @@ def _get_metrics_from_debugger(  # pylint: disable=too-many-branches,too-many-lo
             used_max,
             n_deprecated_api,
         ) = ("unknown", False, None, None, None, -1)
-        metrics.update(
-            {
-                f"Debugger::01--00--error--{project.format(root_dir=kwargs.get(ROOT_DIR))}--{error}": 1,
-            }
+        metrics.inc(
+            "Debugger::01--00--error",
+            project=project.format(root_dir=kwargs.get(ROOT_DIR)),
+            error=error,
         )
 
         proto = metrics_pb2.Metrics()
@@ -976,11 +1067,7 @@ def _get_metrics_from_debugger(  # pylint: disable=too-many-branches,too-many-lo
 
     # 3. Upload to s3.
     if not parsed_args.dry_run_debugger and parsed_args.upload_to_s3:
-        metrics.update(
-            {
-                "Debugger::00--00--s3-upload-00--attemped": 1,
-            }
-        )
+        metrics.inc("Debugger::00--00--s3-upload-00--attemped")
         try:
             upload_to_s3 = parsed_args.upload_to_s3
             if qnet_dir:
@@ -1067,18 +1154,10 @@ def _get_metrics_from_debugger(  # pylint: disable=too-many-branches,too-many-lo
             )
             s3_data.upload_to_s3(root_dir_to_s3, upload_to_s3)
 
-            metrics.update(
-                {
-                    "Debugger::00--00--s3-upload-01--success": 1,
-                }
-            )
+            metrics.inc("Debugger::00--00--s3-upload-01--success")
         except Exception as error:
             logging.exception("Unable to upload to s3: <<<%s>>>", error)
-            metrics.update(
-                {
-                    "Debugger::00--00--s3-upload-01--failure": 1,
-                }
-            )
+            metrics.inc("Debugger::00--00--s3-upload-01--failure")
 
     try:
         pgs = project_obj.ground_truth
@@ -1092,46 +1171,70 @@ def _get_metrics_from_debugger(  # pylint: disable=too-many-branches,too-many-lo
     except Exception as error:
         logging.exception("Unable to publish metrics: `%s`.", error)
         cw_status = "failure"
-    metrics.update(
-        {
-            "Debugger::00--00--metrics--attempted": 1,
-            f"Debugger::00--00--metrics--{cw_status}": 1,
-        }
-    )
+    metrics.inc("Debugger::00--00--metrics--attempted")
+    metrics.inc(f"Debugger::00--00--metrics--{cw_status}")
 
     success = dbg_success
     max_iterations = f"{max_iterations if used_max is None else used_max:03d}"
     n_errors = "?" if build_errors is None else f"{len(build_errors):03d}"
     # Using raw dir, not the copied dir for aggregation.
     project = f"{project_obj.ground_truth}#={init_errors}"
-    metrics.update(
-        {
-            "Debugger::00--00--attemped": 1,
-            f"Debugger::00--01--project=<{project}>": 1,
-            f"Debugger::00--02--project-iter=<{project}, {max_iterations}>": 1,
-            # Final states.
-            f"Debugger::01--00--success=<{success}>": 1,
-            f"Debugger::01--01--#deprecation=<{n_deprecated_api}>": 1,
-            f"Debugger::01--02--success-iter=<{success},{iteration}>": 1,
-            f"Debugger::01--03--success-#errors=<{success},{n_errors}>": 1,
-            f"Debugger::01--04--success-#deprecation=<{success},{n_deprecated_api}>": 1,
-            f"Debugger::01--05--success-iter/max=<{success},{iteration}/{max_iterations}>": 1,
-            # - Project.
-            f"Debugger::01--10--success-project=<{success},{project}>": 1,
-            f"Debugger::01--11--success-project-iter=<{success},{project},{iteration}>": 1,
-            f"Debugger::01--12--success-project-#errors=<{success},{project},{n_errors}>": 1,
-            f"Debugger::01--13--success-project-#deprecation=<{success},{project},{n_deprecated_api}>": 1,
-            (
-                f"Debugger::01--13--success-project-iter/max="
-                f"<{success},{project},{iteration}/{max_iterations}>"
-            ): 1,
-            f"SparkUtils::Debugger::Download={download}": 1,
-        }
-    )
+    iter_max = f"{iteration}/{max_iterations}"
+    metrics.inc("Debugger::00--00--attemped")
+    metrics.inc("Debugger::00--01--project", project=project)
+    metrics.inc("Debugger::00--02--project-iter", project=project, max=max_iterations)
+    # Final states.
+    for name, labels in (
+        ("01--00--success", {}),
+        ("01--01--#deprecation", {"deprecation": n_deprecated_api}),
+        ("01--02--success-iter", {"iter": iteration}),
+        ("01--03--success-#errors", {"errors": n_errors}),
+        ("01--04--success-#deprecation", {"deprecation": n_deprecated_api}),
+        ("01--05--success-iter/max", {"iter_max": iter_max}),
+        # - Project.
+        ("01--10--success-project", {"project": project}),
+        ("01--11--success-project-iter", {"project": project, "iter": iteration}),
+        ("01--12--success-project-#errors", {"project": project, "errors": n_errors}),
+        (
+            "01--13--success-project-#deprecation",
+            {"project": project, "deprecation": n_deprecated_api},
+        ),
+        (
+            "01--13--success-project-iter/max",
+            {"project": project, "iter_max": iter_max},
+        ),
+    ):
+        if name != "01--01--#deprecation":
+            labels = {"success": success, **labels}
+        metrics.inc(f"Debugger::{name}", **labels)
+    metrics.inc(f"SparkUtils::Debugger::Download={download}")
+
+    # Distributions across projects.
+    metrics.observe("Debugger::02--00--latency_seconds", proto.latency.seconds)
+    if init_errors is not None:
+        metrics.observe("Debugger::02--01--#errors-init", str_to_int(init_errors))
+    if build_errors is not None:
+        metrics.observe("Debugger::02--02--#errors-final", len(build_errors))
 
     return proto, metrics
 
 
+def _aggregate_phase_metrics(protos) -> Dict[str, float]:
+    """Percentiles of runtime per phase across projects."""
+    seconds_by_phase = defaultdict(list)
+    for proto in protos:
+        for phase_proto in proto.phase_metrics:
+            seconds_by_phase[phase_proto.phase].append(phase_proto.latency.seconds)
+
+    metrics = {}
+    for phase, seconds in sorted(seconds_by_phase.items()):
+        for pct in profiler.PERCENTILES:
+            metrics[f"{CW_PHASE_SECONDS}_p{pct}_{phase}"] = profiler.percentile(
+                seconds, pct
+            )
+    return metrics
+
+
 def _aggregate_metrics(protos):
     n_total = len(protos)
 
@@ -1190,6 +1293,8 @@ def _aggregate_metrics(protos):
         }
     )
 
+    metrics.update(_aggregate_phase_metrics(ported_protos))
+
     if demo_proto.final_state_metrics.HasField("h_num_errors_factor"):
         metrics.update(
             {
@@ -1200,6 +1305,16 @@ def _aggregate_metrics(protos):
     return metrics
 
 
+def _map_partition(map_fn, config: config_pb2.Config, partition_projects):
+    """Map projects in a partition: They share warm resources in this executor."""
+    pool = warm_pool.get_pool()
+    with pool.scope():
+        # Explicit teardown: Flush metrics at the end of the partition.
+        pool.on_close(publisher.close_publishers)
+        for kwargs in partition_projects:
+            yield map_fn(config, kwargs)
+
+
 def _get_metrics(
     projects,
     config,
@@ -1207,7 +1322,7 @@ def _get_metrics(
     job: str,
     dry_run: bool = False,
     proto: bool = False,
-) -> Tuple[int, int, Dict[str, int]]:
+) -> Tuple[Dict[str, Any], metrics_registry.MetricsRegistry]:
     """Get metrics."""
     if dry_run or projects.isEmpty():
         return (
@@ -1215,14 +1330,14 @@ def _get_metrics(
                 "n_total": 0,
                 "n_success": 0,
             },
-            {},
+            metrics_registry.MetricsRegistry(),
         )
 
     projects.cache()
     args = projects.first()[PARSED_ARGS]
 
     # Tuple[Union[bool, proto], metrics]
-    total = projects.map(functools.partial(map_fn, config))
+    total = projects.mapPartitions(functools.partial(_map_partition, map_fn, config))
     total.cache()
     logging.info("Total = <<<\n%s\n>>>", total.collect())
 
@@ -1232,7 +1347,7 @@ def _get_metrics(
         summary_raw_metrics = (
             total
             # dict
-            .map(lambda x: x[-1])
+            .map(lambda x: metrics_registry.merge(None, x[-1]).to_legacy())
             .filter(lambda x: x)
             .map(lambda x: [x])
             .reduce(lambda x, y: x + y)
@@ -1279,7 +1394,10 @@ def _get_metrics(
     else:
         success = total.filter(lambda x: x[0])
 
-    metrics = total.map(lambda x: x[-1]).reduce(metric_utils.reduce_by_key)
+    # Merged in place: A new registry per project, either from a dict or a registry.
+    metrics = total.map(lambda x: metrics_registry.merge(None, x[-1])).reduce(
+        metrics_registry.merge
+    )
 
     summary = {
         "n_total": total.count(),
@@ -1342,7 +1460,7 @@ def get_debugger_metrics(projects, config: config_pb2.Config, dry_run: bool = Fa
 
 
 def email(
-    metrics: Dict[str, Any],
+    metrics: Union[Dict[str, Any], metrics_registry.MetricsRegistry],
     user: str = "",
     tag: str = "",
     filename: str = "",
@@ -1351,6 +1469,8 @@ def email(
     """Send email."""
     if not filename:
         filename = os.path.abspath(__file__)
+    if isinstance(metrics, metrics_registry.MetricsRegistry):
+        metrics = metrics.to_legacy()
 
     # Exclude some metrics.
     metrics = {
@@ -0,0 +1,100 @@
+"""Fakes to benchmark the self debugging loop offline: No LLM or Maven calls.
+
+- ReplayLlmAgent: Replay canned LLM responses.
+- ReplayMavenBuilder: Replay recorded Maven logs as build output.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Sequence, Tuple, Union
+
+from self_debug.common import utils
+from self_debug.lang.base import builder
+from self_debug.lang.java.maven import builder as maven_builder
+from self_debug.lm import llm_agent_factory
+
+
+class ReplayLlmAgent(llm_agent_factory.BaseLlmAgent):
+    """Replay canned responses in order: The last one is repeated afterwards."""
+
+    def __init__(
+        self,
+        responses: Union[Sequence[str], Callable[[str], str]],
+        latency_seconds: float = 0.0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.responses = responses
+        self.latency_seconds = latency_seconds
+
+        self.num_calls = 0
+
+    @classmethod
+    def create_from_config(cls, config: Any, *args, **kwargs):
+        """Create from config."""
+        del config
+        return cls(*args, **kwargs)
+
+    def run(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        messages: Tuple[Any] = None,
+        deadline=None,
+    ) -> str:
+        """LLM call."""
+        del system_prompt, messages, deadline
+
+        index = self.num_calls
+        self.num_calls += 1
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
+
+        if callable(self.responses):
+            return self.responses(prompt)
+        if not self.responses:
+            return ""
+        return self.responses[min(index, len(self.responses) - 1)]
+
+
+class ReplayMavenBuilder(maven_builder.MavenBuilder):
+    """Replay recorded Maven logs in order, or by the repo state with a callable.
+
+    For a sequence, the last log is repeated afterwards; a callable takes the root dir.
+    """
+
+    def __init__(
+        self,
+        root_dir: str,
+        logs: Union[Sequence[str], Callable[[str], str]],
+        latency_seconds: float = 0.0,
+        **kwargs,
+    ):
+        kwargs.setdefault("require_maven_installed", False)
+        kwargs.setdefault(maven_builder.SHOW_DEPRECATION, False)
+        super().__init__("", root_dir, **kwargs)
+
+        self.logs = logs
+        self.latency_seconds = latency_seconds
+
+        self.num_builds = 0
+
+    def run_build_command(self, **kwargs) -> builder.CmdData:
+        """Replay a recorded log."""
+        del kwargs
+
+        index = self.num_builds
+        self.num_builds += 1
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
+
+        if callable(self.logs):
+            stdout = self.logs(self.root_dir)
+        else:
+            stdout = self.logs[min(index, len(self.logs) - 1)]
+        logging.debug("Replay build log #%d: len = %d.", index, len(stdout))
+
+        return utils.CmdData(
+            stdout=stdout,
+            return_code=0 if maven_builder.BUILD_SUCCESS in stdout else 1,
+        )
@@ -0,0 +1,229 @@
+"""Benchmark the framework overhead of self debugging, without LLM or Maven calls.
+
+Synthetic repos are debugged with canned LLM responses and replayed Maven logs, and the
+Python side of each iteration (prompt, parsing, patching, AST, git, trajectory updates)
+is measured with profiler spans.
+
+Sample command:
+
+```
+python benchmark/run_benchmark.py \
+    --num_files 200 --num_errors 20 --repeat 3 \
+    --output_json /tmp/benchmark.json \
+    # --baseline_json /tmp/baseline.json --max_regression 0.2
+```
+
+It exits with 1 if the overhead per iteration regresses from the baseline.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+from typing import Any, Dict, Optional
+
+from self_debug.proto import config_pb2
+
+from self_debug.benchmark import fakes, synthetic_repo
+from self_debug.common import (
+    filesystem_writer_factory,
+    profiler,
+    prompt_manager_factory,
+    utils,
+)
+from self_debug.lang.base import ast_parser_factory, builder
+from self_debug.lm import grouped_llm_parser_factory
+from self_debug import self_debugging
+
+
+CONFIG_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "configs",
+    "java_config.pbtxt",
+)
+
+# Spans of the fakes: Excluded from the framework overhead.
+EXTERNAL_SPANS = ("llm:call", "build:cmd")
+
+OVERHEAD = "overhead_seconds_per_iteration"
+
+
+def _parse_args():
+    """Parse args."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config_file", type=str, default=CONFIG_FILE, help="Config.")
+
+    parser.add_argument("--num_files", type=int, default=100, help="# Java files.")
+    parser.add_argument("--num_errors", type=int, default=10, help="# broken files.")
+    parser.add_argument("--num_methods", type=int, default=20, help="# per file.")
+    parser.add_argument(
+        "--num_log_lines", type=int, default=1000, help="# non error lines per log."
+    )
+    parser.add_argument(
+        "--bad_every", type=int, default=0, help="Every # responses is a bad one."
+    )
+    parser.add_argument("--enable_ast", type=int, default=0, help="Run AST parser.")
+
+    parser.add_argument("--max_iterations", type=int, default=None, help="Max.")
+    parser.add_argument("--repeat", type=int, default=3, help="# runs.")
+
+    parser.add_argument("--output_json", type=str, default=None, help="Output.")
+    parser.add_argument("--baseline_json", type=str, default=None, help="Baseline.")
+    parser.add_argument(
+        "--max_regression", type=float, default=0.2, help="Max overhead regression."
+    )
+    return parser.parse_known_args()
+
+
+def create_runner(
+    config: config_pb2.Config,
+    repo: synthetic_repo.SyntheticRepo,
+    bad_every: int = 0,
+    enable_ast: bool = False,
+) -> self_debugging.SelfDebugging:
+    """Create a self debugging runner with fakes for the synthetic repo."""
+    config = config_pb2.Config.FromString(config.SerializeToString())
+    config.repo.root_dir = repo.root_dir
+    # Not a Java job: Skip the final eval running Maven.
+    config.builder.ClearField("maven_builder")
+
+    git = repo.create()
+    maven = fakes.ReplayMavenBuilder(
+        repo.root_dir, repo.build_log, **{builder.BASE_CONFIG: config.builder}
+    )
+    if enable_ast and config.HasField("ast_parser"):
+        ast_parser = ast_parser_factory.create_ast_parser(
+            config.ast_parser, root_dir=repo.root_dir, project=maven.project
+        )
+    else:
+        config.ClearField("ast_parser")
+        ast_parser = None
+
+    return self_debugging.SelfDebugging(
+        fakes.ReplayLlmAgent(repo.responses(bad_every)),
+        grouped_llm_parser_factory.create_grouped_llm_parser(
+            config.llm_parser_by_group
+        ),
+        prompt_manager_factory.create_prompt_manager(config.prompt_manager),
+        git,
+        maven,
+        ast_parser,
+        filesystem_writer_factory.create_filesystem_writer("PairedFileSystemWriter"),
+        config,
+        min_iterations=0,
+        max_n_examples=config.max_n_examples,
+    )
+
+
+def run_once(
+    config: config_pb2.Config, max_iterations: Optional[int], **kwargs
+) -> Dict[str, Any]:
+    """Run once in a temp dir."""
+    bad_every = kwargs.pop("bad_every", 0)
+    enable_ast = kwargs.pop("enable_ast", False)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repo = synthetic_repo.SyntheticRepo(os.path.join(temp_dir, "bench"), **kwargs)
+        runner = create_runner(config, repo, bad_every, enable_ast)
+        if max_iterations is None:
+            max_iterations = len(runner.llm_agent.responses)
+
+        with utils.TimeItInSeconds("Benchmark", logging_fn=logging.warning) as timer:
+            proto, build_errors = runner.run(max_iterations)
+
+        spans = runner.profiler.summary(by_name=True)
+        iterations = max(proto.final_state_metrics.iterations, 1)
+        external = sum(spans[name]["total"] for name in EXTERNAL_SPANS if name in spans)
+        return {
+            "seconds": timer.seconds,
+            "iterations": proto.final_state_metrics.iterations,
+            "success": proto.final_state_metrics.state.success,
+            "num_errors": len(build_errors),
+            "num_llm_calls": runner.llm_agent.num_calls,
+            "num_builds": runner.builder.num_builds,
+            OVERHEAD: (timer.seconds - external) / iterations,
+            "seconds_per_iteration": {
+                name: span["total"] / iterations for name, span in spans.items()
+            },
+            "phases": runner.profiler.summary(),
+            "spans": spans,
+        }
+
+
+def summarize(runs) -> Dict[str, Any]:
+    """Percentiles across runs: Overhead and spans per iteration."""
+
+    def _percentiles(values) -> Dict[str, float]:
+        return {
+            f"p{pct}": profiler.percentile(values, pct) for pct in profiler.PERCENTILES
+        }
+
+    names = sorted(set().union(*(run["seconds_per_iteration"] for run in runs)))
+    return {
+        OVERHEAD: _percentiles([run[OVERHEAD] for run in runs]),
+        "seconds": _percentiles([run["seconds"] for run in runs]),
+        "seconds_per_iteration": {
+            name: _percentiles(
+                [run["seconds_per_iteration"].get(name, 0.0) for run in runs]
+            )
+            for name in names
+        },
+    }
+
+
+def check_regression(
+    summary: Dict[str, Any], baseline: Dict[str, Any], max_regression: float
+) -> bool:
+    """Whether the median overhead per iteration is within the max regression."""
+    current = summary[OVERHEAD]["p50"]
+    expected = baseline["summary"][OVERHEAD]["p50"]
+    ok = current <= expected * (1.0 + max_regression)
+
+    log_fn = logging.info if ok else logging.error
+    log_fn(
+        "Overhead per iteration: %f seconds vs baseline %f (max regression %f).",
+        current,
+        expected,
+        max_regression,
+    )
+    return ok
+
+
+def main() -> int:
+    """Main."""
+    args, _ = _parse_args()
+    config = utils.load_proto(args.config_file, config_pb2.Config)
+
+    params = {
+        "num_files": args.num_files,
+        "num_errors": args.num_errors,
+        "num_methods": args.num_methods,
+        "num_log_lines": args.num_log_lines,
+        "bad_every": args.bad_every,
+        "enable_ast": bool(args.enable_ast),
+    }
+    runs = []
+    for rep in range(args.repeat):
+        logging.warning("Benchmark run %02d/ %02d ...", rep, args.repeat)
+        runs.append(run_once(config, args.max_iterations, **params))
+
+    result = {
+        "params": dict(params, max_iterations=args.max_iterations),
+        "summary": summarize(runs),
+        "runs": runs,
+    }
+    logging.warning("Benchmark summary: <<<%s>>>", result["summary"])
+    if args.output_json:
+        utils.export_json(args.output_json, result)
+
+    if args.baseline_json:
+        baseline = utils.load_json(args.baseline_json)
+        if not check_regression(result["summary"], baseline, args.max_regression):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    sys.exit(main())
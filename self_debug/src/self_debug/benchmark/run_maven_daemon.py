@@ -0,0 +1,168 @@
+"""Benchmark cold `mvn` vs warm maven daemon (`mvnd`) build times per iteration.
+
+The same repo is built iteratively with each backend, the way the self debugging loop
+does: One broken file is fixed before each build of a synthetic repo, or an existing
+repo (e.g. a bundled test repo) is rebuilt as is. It requires `mvn` and `mvnd`.
+
+Sample command:
+
+```
+python benchmark/run_maven_daemon.py \
+    --num_files 200 --num_errors 10 --iterations 10 \
+    --output_json /tmp/maven_daemon.json
+    # --root_dir ../lang/java/native
+```
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from self_debug.proto import builder_pb2
+
+from self_debug.benchmark import synthetic_repo
+from self_debug.common import profiler, utils
+from self_debug.lang.java.maven import builder as maven_builder
+from self_debug.lang.java.maven import daemon as maven_daemon
+
+
+BUILD_COMMAND = "cd {root_dir}; mvn clean compile"
+
+BACKENDS = {
+    "cold": builder_pb2.MavenBuilder.MVN,
+    "warm": builder_pb2.MavenBuilder.MVND,
+}
+
+
+def _parse_args():
+    """Parse args."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--root_dir", type=str, default=None, help="Existing repo, or a synthetic one."
+    )
+    parser.add_argument("--num_files", type=int, default=100, help="# Java files.")
+    parser.add_argument("--num_errors", type=int, default=10, help="# broken files.")
+
+    parser.add_argument("--iterations", type=int, default=10, help="# builds.")
+    parser.add_argument(
+        "--build_command", type=str, default=BUILD_COMMAND, help="Build command."
+    )
+    parser.add_argument("--mvnd", type=str, default="mvnd", help="Maven daemon.")
+
+    parser.add_argument("--output_json", type=str, default=None, help="Output.")
+    return parser.parse_known_args()
+
+
+def _fix_next(repo: Optional[synthetic_repo.SyntheticRepo]) -> bool:
+    """Fix the next broken file of a synthetic repo, like an LLM fix."""
+    if repo is None:
+        return False
+
+    for filename in repo.java_files:
+        content = utils.load_file(filename, log=False)
+        if synthetic_repo.BROKEN_LINE in content:
+            utils.export_file(
+                filename,
+                content.replace(synthetic_repo.BROKEN_LINE, synthetic_repo.FIXED_LINE),
+                log=False,
+            )
+            return True
+    return False
+
+
+def run_backend(
+    backend: str, iterations: int, root_dir: Optional[str] = None, **kwargs
+) -> List[float]:
+    """Build seconds per iteration with a backend, in a fresh copy of the repo."""
+    build_command = kwargs.pop("build_command", BUILD_COMMAND)
+    daemon_config = builder_pb2.MavenDaemon(command=kwargs.pop("mvnd", "mvnd"))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repo = None
+        if root_dir is None:
+            repo = synthetic_repo.SyntheticRepo(
+                os.path.join(temp_dir, "bench"), **kwargs
+            )
+            repo.create()
+            root_dir = repo.root_dir
+        else:
+            root_dir = shutil.copytree(root_dir, os.path.join(temp_dir, "repo"))
+
+        builder = maven_builder.MavenBuilder(
+            "",
+            root_dir,
+            build_command=build_command,
+            show_deprecation=False,
+            backend=BACKENDS[backend],
+            maven_daemon=daemon_config,
+        )
+
+        seconds = []
+        try:
+            for index in range(iterations):
+                _fix_next(repo)
+                with utils.TimeItInSeconds(
+                    f"Build::{backend}::{index:02d}", logging_fn=logging.warning
+                ) as timer:
+                    builder.build()
+                seconds.append(timer.seconds)
+        finally:
+            if builder.daemon is not None:
+                builder.daemon.stop()
+
+    return seconds
+
+
+def summarize(seconds: List[float]) -> Dict[str, Any]:
+    """The first build (starting a daemon if any) and percentiles of the rest."""
+    rest = seconds[1:] or seconds
+    summary = {
+        "first": seconds[0] if seconds else None,
+        "total": sum(seconds),
+    }
+    for pct in profiler.PERCENTILES:
+        summary[f"p{pct}"] = profiler.percentile(rest, pct)
+    return summary
+
+
+def main() -> int:
+    """Main."""
+    args, _ = _parse_args()
+
+    kwargs = {
+        "build_command": args.build_command,
+        "mvnd": args.mvnd,
+    }
+    if args.root_dir is None:
+        kwargs.update(num_files=args.num_files, num_errors=args.num_errors)
+
+    result = {}
+    for backend in BACKENDS:
+        seconds = run_backend(backend, args.iterations, args.root_dir, **kwargs)
+        result[backend] = {
+            "seconds": seconds,
+            "summary": summarize(seconds),
+        }
+
+    cold, warm = result["cold"]["summary"]["p50"], result["warm"]["summary"]["p50"]
+    result["speedup_p50"] = cold / warm if cold and warm else None
+    logging.warning(
+        "Build seconds per iteration (p50): cold = %s, warm = %s, speedup = %s.",
+        cold,
+        warm,
+        result["speedup_p50"],
+    )
+    if args.output_json:
+        utils.export_json(args.output_json, result)
+
+    maven_daemon.get_pool().stop_all()
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""Synthetic Maven repo with compilation errors, its Maven logs and LLM fixes.
+
+Each broken file has one line which doesn't compile; a fix replaces it, so that the
+next build log has one error fewer.
+"""
+
+from dataclasses import dataclass
+import logging
+import os
+from typing import List, Optional
+
+from self_debug.common import git_repo, utils
+from self_debug.lang.java.maven import builder as maven_builder
+
+
+BROKEN_LINE = '        int value = "broken";'
+FIXED_LINE = "        int value = 0;"
+ERROR_MESSAGE = "incompatible types: java.lang.String cannot be converted to int"
+
+POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <modelVersion>4.0.0</modelVersion>
+  <groupId>bench</groupId>
+  <artifactId>bench</artifactId>
+  <version>1.0</version>
+  <properties>
+    <maven.compiler.release>17</maven.compiler.release>
+  </properties>
+</project>
+"""
+
+FIX_RESPONSE = """
+The variable is assigned a string, change it to an int.
+
+[Change Start {filename}]
+[Find Start]
+{find}
+[Find End]
+[Replace Start]
+{replace}
+[Replace End]
+[Change End {filename}]
+"""
+
+
+@dataclass
+class SyntheticRepo:
+    """Synthetic Maven repo: Files spread over packages, the first few are broken."""
+
+    root_dir: str
+    num_files: int = 10
+    num_errors: int = 5
+    num_methods: int = 20
+    num_packages: int = 4
+    # Non error lines in a build log, e.g. downloading dependencies.
+    num_log_lines: int = 1000
+
+    @property
+    def java_files(self) -> List[str]:
+        """Java files, sorted."""
+        return sorted(
+            os.path.join(
+                self.root_dir,
+                "src/main/java/bench",
+                f"p{index % self.num_packages}",
+                f"C{index:05d}.java",
+            )
+            for index in range(self.num_files)
+        )
+
+    def _java_content(self, filename: str, broken: bool) -> str:
+        package = os.path.basename(os.path.dirname(filename))
+        cls = os.path.splitext(os.path.basename(filename))[0]
+
+        lines = [f"package bench.{package};", "", f"public class {cls} {{"]
+        for index in range(self.num_methods):
+            lines += [
+                f"    public int method{index}(int arg) {{",
+                f"        return arg + {index};",
+                "    }",
+                "",
+            ]
+        lines += [
+            "    public int broken() {",
+            BROKEN_LINE if broken else FIXED_LINE,
+            "        return value;",
+            "    }",
+            "}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def create(self) -> git_repo.GitRepo:
+        """Create files and commit them."""
+        os.makedirs(self.root_dir, exist_ok=True)
+        utils.export_file(os.path.join(self.root_dir, "pom.xml"), POM)
+        for index, filename in enumerate(self.java_files):
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            utils.export_file(
+                filename, self._java_content(filename, index < self.num_errors)
+            )
+
+        repo = git_repo.GitRepo(self.root_dir)
+        repo.initialize()
+        for key, value in (("user.name", "bench"), ("user.email", "bench@localhost")):
+            utils.run_command(
+                ["git", "config", key, value], cwd=self.root_dir, shell=False
+            )
+        repo.commit_all("Synthetic repo.")
+        logging.info(
+            "Synthetic repo: # files = %d, # errors = %d at `%s`.",
+            self.num_files,
+            self.num_errors,
+            self.root_dir,
+        )
+        return repo
+
+    def build_log(self, root_dir: Optional[str] = None) -> str:
+        """Maven log of the current repo state."""
+        del root_dir
+
+        errors = []
+        for filename in self.java_files:
+            lines = utils.load_file(filename, log=False).splitlines()
+            if BROKEN_LINE in lines:
+                line_number = lines.index(BROKEN_LINE) + 1
+                column_number = BROKEN_LINE.index('"') + 1
+                errors.append(
+                    f"[ERROR] {filename}:[{line_number},{column_number}] "
+                    f"{ERROR_MESSAGE}"
+                )
+
+        lines = ["[INFO] Scanning for projects...", "[INFO] Building bench 1.0"]
+        lines += [
+            f"Downloaded from central: https://repo.maven.apache.org/maven2/bench/dep{index}/1.0/dep{index}-1.0.pom"  # pylint: disable=line-too-long
+            for index in range(self.num_log_lines)
+        ]
+        lines.append(
+            "[INFO] --- maven-compiler-plugin:3.11.0:compile (default-compile) @ bench ---"  # pylint: disable=line-too-long
+        )
+        if not errors:
+            return "\n".join(lines + [maven_builder.BUILD_SUCCESS])
+
+        sep = "[INFO] " + "-" * 61
+        lines += [maven_builder.COMPILATION_ERROR_START, sep]
+        lines += errors
+        lines += [f"[INFO] {len(errors)} errors", sep, maven_builder.BUILD_FAILURE]
+        return "\n".join(lines)
+
+    def responses(self, bad_every: int = 0) -> List[str]:
+        """LLM responses to fix broken files in order, optionally with bad ones.
+
+        A bad response (every `bad_every` responses) doesn't match the file.
+        """
+        responses = []
+        for filename in self.java_files[: self.num_errors]:
+            if bad_every > 0 and len(responses) % bad_every == bad_every - 1:
+                responses.append(
+                    FIX_RESPONSE.format(
+                        filename=filename, find="        int missing;", replace=""
+                    )
+                )
+            responses.append(
+                FIX_RESPONSE.format(
+                    filename=filename, find=BROKEN_LINE, replace=FIXED_LINE
+                )
+            )
+
+        return responses
@@ -0,0 +1,107 @@
+"""Unit tests for fakes.py and synthetic_repo.py."""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from parameterized import parameterized
+
+from self_debug.proto import config_pb2
+
+from self_debug.benchmark import fakes, synthetic_repo
+from self_debug.common import filesystem_writer_factory, utils
+from self_debug.lm import grouped_llm_parser_factory
+
+_CONFIG_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "configs",
+    "java_config.pbtxt",
+)
+
+
+class TestFakes(unittest.TestCase):
+    """Unit tests for fakes.py and synthetic_repo.py."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.repo = synthetic_repo.SyntheticRepo(
+            os.path.join(self.temp_dir, "bench"),
+            num_files=6,
+            num_errors=3,
+            num_methods=2,
+            num_log_lines=10,
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    @parameterized.expand(
+        (
+            (("a", "b"), ("a", "b", "b")),
+            ((), ("", "")),
+            (lambda prompt: prompt.upper(), ("P", "P")),
+        )
+    )
+    def test_replay_llm_agent(self, responses, expected):
+        """Unit tests ReplayLlmAgent."""
+        agent = fakes.ReplayLlmAgent(responses)
+
+        self.assertEqual(tuple(agent.run("p") for _ in expected), expected)
+        self.assertEqual(agent.num_calls, len(expected))
+
+    def test_replay_maven_builder(self):
+        """Unit tests ReplayMavenBuilder: Build errors of the synthetic repo."""
+        self.repo.create()
+        builder = fakes.ReplayMavenBuilder(self.repo.root_dir, self.repo.build_log)
+
+        errors = builder.build()
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(
+            [e.filename for e in errors], self.repo.java_files[: len(errors)]
+        )
+        self.assertEqual(errors[0].line_number, 13)
+        self.assertEqual(errors[0].error_message, synthetic_repo.ERROR_MESSAGE)
+        self.assertEqual(builder.num_builds, 1)
+
+        builder = fakes.ReplayMavenBuilder(
+            self.repo.root_dir, ("[INFO] BUILD FAILURE", "[INFO] BUILD SUCCESS")
+        )
+        self.assertTrue(builder.build())
+        self.assertEqual(builder.build(), ())
+        self.assertEqual(builder.build(), ())
+
+    @parameterized.expand(
+        (
+            (0, 3),
+            (2, 5),
+        )
+    )
+    def test_responses(self, bad_every, expected_responses):
+        """Unit tests SyntheticRepo.responses: Patched in order to fix errors."""
+        self.repo.create()
+        config = utils.load_proto(_CONFIG_FILE, config_pb2.Config)
+        llm_parser = grouped_llm_parser_factory.create_grouped_llm_parser(
+            config.llm_parser_by_group
+        )
+        writer = filesystem_writer_factory.create_filesystem_writer(
+            "PairedFileSystemWriter"
+        )
+
+        responses = self.repo.responses(bad_every)
+        self.assertEqual(len(responses), expected_responses)
+
+        num_patched = 0
+        for response in responses:
+            changes, _ = llm_parser.run(response)
+            num_patched += any(writer.run(changes).values())
+        self.assertEqual(num_patched, 3)
+        self.assertIn(
+            "[INFO] BUILD SUCCESS", self.repo.build_log().splitlines()[-1]
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
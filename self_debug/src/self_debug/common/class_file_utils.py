@@ -0,0 +1,133 @@
+"""Class file util functions: Read Java major versions natively, without `javap`.
+
+A class file starts with magic `0xCAFEBABE`, then minor and major versions as unsigned
+big endian shorts, therefore only its first 8 bytes are read.
+"""
+
+from collections import Counter
+from concurrent import futures
+import logging
+import os
+import struct
+from typing import Dict, Iterator, Optional, Tuple
+import zipfile
+
+
+CLASS_SUFFIX = ".class"
+JAR_SUFFIX = ".jar"
+
+CLASS_FILE_MAGIC = 0xCAFEBABE
+HEADER_SIZE = 8
+
+# Same as `find -path '*/target/classes/*.class'`.
+TARGET_CLASSES = os.path.join("target", "classes")
+
+EXCLUDED_DIRS = (".git",)
+
+
+def parse_major_version(header: bytes) -> Optional[int]:
+    """Parse major version from the first 8 bytes of a class file."""
+    if len(header) < HEADER_SIZE:
+        return None
+
+    magic, _, major = struct.unpack(">IHH", header[:HEADER_SIZE])
+    if magic != CLASS_FILE_MAGIC:
+        return None
+    return major
+
+
+def read_major_version(filename: str) -> Optional[int]:
+    """Read major version of a class file."""
+    try:
+        with open(filename, "rb") as ifile:
+            return parse_major_version(ifile.read(HEADER_SIZE))
+    except OSError as error:
+        logging.warning("Unable to read class file `%s`: %s.", filename, error)
+        return None
+
+
+def read_jar_major_versions(filename: str) -> Counter:
+    """Read major versions of class files in a jar."""
+    versions = Counter()
+    try:
+        with zipfile.ZipFile(filename) as jar:
+            for info in jar.infolist():
+                # Skip e.g. `module-info.class` under `META-INF/versions/*`.
+                if not info.filename.endswith(CLASS_SUFFIX) or info.filename.startswith(
+                    "META-INF/"
+                ):
+                    continue
+
+                with jar.open(info) as ifile:
+                    version = parse_major_version(ifile.read(HEADER_SIZE))
+                if version is not None:
+                    versions[version] += 1
+    except (OSError, zipfile.BadZipFile) as error:
+        logging.warning("Unable to read jar file `%s`: %s.", filename, error)
+
+    return versions
+
+
+def iter_files(
+    root_dir: str, suffixes: Tuple[str] = (CLASS_SUFFIX,), exclude_test: bool = False
+) -> Iterator[str]:
+    """Iterate files by suffix, optionally excluding paths (relative to root_dir) with `test`."""
+    stack = [root_dir]
+    while stack:
+        dirname = stack.pop()
+        try:
+            entries = list(os.scandir(dirname))
+        except OSError as error:
+            logging.warning("Unable to list dir `%s`: %s.", dirname, error)
+            continue
+
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in EXCLUDED_DIRS:
+                    stack.append(entry.path)
+            elif entry.name.endswith(suffixes) and entry.is_file():
+                if exclude_test and "test" in os.path.relpath(entry.path, root_dir).lower():
+                    continue
+                yield entry.path
+
+
+def get_major_version_histogram(
+    root_dir: str,
+    custom_class_dirs: bool = False,
+    jars: bool = False,
+    max_workers: int = 8,
+) -> Dict[int, int]:
+    """Get histogram of major versions: Version => number of class files.
+
+    Args:
+        root_dir: Root dir of the repo.
+        custom_class_dirs: Whether to read all class files except test ones, as there might
+            be customized class dirs specified in `pom.xml` files; only under
+            `*/target/classes` otherwise.
+        jars: Whether to read class files in `*/target/*.jar` too.
+        max_workers: Number of threads reading files.
+    """
+    class_files, jar_files = [], []
+    suffixes = (CLASS_SUFFIX, JAR_SUFFIX) if jars else (CLASS_SUFFIX,)
+    for path in iter_files(root_dir, suffixes, exclude_test=custom_class_dirs):
+        if path.endswith(JAR_SUFFIX):
+            if os.path.basename(os.path.dirname(path)) == "target":
+                jar_files.append(path)
+        elif custom_class_dirs or f"{os.sep}{TARGET_CLASSES}{os.sep}" in path:
+            class_files.append(path)
+
+    histogram = Counter()
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for version in executor.map(read_major_version, class_files):
+            if version is not None:
+                histogram[version] += 1
+        for versions in executor.map(read_jar_major_versions, jar_files):
+            histogram.update(versions)
+
+    logging.info(
+        "Major versions of # class files = %d, # jars = %d: %s.",
+        len(class_files),
+        len(jar_files),
+        dict(histogram),
+    )
+    return dict(histogram)
@@ -0,0 +1,118 @@
+"""Deadlines: Propagate a time budget through builds, maven commands and LLM calls.
+
+A deadline is set for a scope (e.g. `SelfDebugging.run`), and picked up by nested calls
+(e.g. `utils.do_run_command`) to bound their timeouts by the remaining budget.
+"""
+
+import contextlib
+import contextvars
+from dataclasses import dataclass
+import logging
+import time
+from typing import Optional
+
+
+@dataclass
+class Deadline:
+    """Deadline in `time.monotonic()` seconds: Never expires if `expires_at` is None."""
+
+    expires_at: Optional[float] = None
+    name: str = ""
+
+    @classmethod
+    def from_seconds(cls, seconds: Optional[float], name: str = "") -> "Deadline":
+        """Deadline in a number of seconds from now."""
+        return cls(None if seconds is None else time.monotonic() + seconds, name)
+
+    def remaining_seconds(self) -> Optional[float]:
+        """Remaining seconds, could be negative; None for no deadline."""
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        """Whether it's expired."""
+        remaining = self.remaining_seconds()
+        return remaining is not None and remaining <= 0
+
+    def timeout(self, timeout: Optional[float] = None) -> Optional[float]:
+        """Bound a timeout by the remaining seconds."""
+        remaining = self.remaining_seconds()
+        if remaining is None:
+            return timeout
+        if timeout is None:
+            return max(remaining, 0.0)
+        return max(min(timeout, remaining), 0.0)
+
+    def check(self, step: str = ""):
+        """Raise if it's expired."""
+        if self.expired:
+            raise DeadlineExceeded(self, step)
+
+
+class DeadlineExceeded(TimeoutError):
+    """A step is unable to start or finish before its deadline."""
+
+    def __init__(self, deadline: Optional[Deadline] = None, step: str = ""):
+        self.deadline = deadline
+        self.step = step
+
+        name = deadline.name if deadline and deadline.name else "deadline"
+        super().__init__(f"Exceeded {name} at step `{step}`.")
+
+
+_CURRENT = contextvars.ContextVar("deadline", default=None)
+
+
+def get_deadline() -> Optional[Deadline]:
+    """Get the current deadline, if any."""
+    return _CURRENT.get()
+
+
+def get_timeout(timeout: Optional[float] = None, deadline: Optional[Deadline] = None):
+    """Bound a timeout by the given deadline, or the current one."""
+    deadline = deadline or get_deadline()
+    return timeout if deadline is None else deadline.timeout(timeout)
+
+
+@contextlib.contextmanager
+def scope(seconds: Optional[float] = None, name: str = "", deadline=None):
+    """Set the current deadline within a scope: Never later than the outer one."""
+    if deadline is None:
+        deadline = Deadline.from_seconds(seconds, name)
+
+    outer = get_deadline()
+    if outer is not None and outer.expires_at is not None:
+        if deadline.expires_at is None or outer.expires_at < deadline.expires_at:
+            logging.debug("Deadline `%s` is bounded by `%s`.", name, outer.name)
+            deadline = Deadline(outer.expires_at, deadline.name or outer.name)
+
+    token = _CURRENT.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _CURRENT.reset(token)
+
+
+@contextlib.contextmanager
+def unbounded(name: str = ""):
+    """No deadline within a scope, even if an outer one is set, e.g. to clean up.
+
+    Commands are skipped under an exceeded deadline, while cleanup (e.g. reverting
+    changes, stopping a daemon) needs to run after it.
+    """
+    deadline = Deadline(name=name)
+    token = _CURRENT.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _CURRENT.reset(token)
+
+
+def sleep(seconds: float, deadline: Optional[Deadline] = None) -> bool:
+    """Sleep, but not beyond the deadline: Return whether it slept for all seconds."""
+    bounded = get_timeout(seconds, deadline)
+    if bounded > 0:
+        time.sleep(bounded)
+    return bounded >= seconds
@@ -6,19 +6,20 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Tuple, Union
 import pickle
 
-from transformers import AutoModel, AutoTokenizer
-from transformers.dynamic_module_utils import get_imports
-import torch
 import hashlib
-from torch import Tensor
 import glob
 from pathlib import Path
+from unittest.mock import patch
 
-import numpy as np
-from rank_bm25 import BM25Okapi
-import nltk
+from self_debug.common import lazy_import
+
+transformers = lazy_import.lazy_module("transformers")
+dynamic_module_utils = lazy_import.lazy_module(
+    "transformers.dynamic_module_utils", "transformers"
+)
+torch = lazy_import.lazy_module("torch")
+np = lazy_import.lazy_module("numpy")
 
-# nltk.download('punkt_tab')
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 TREE_STRUCTURE_CMD = "tree --charset=ascii"
 
@@ -29,21 +30,24 @@ class EmbeddingSimilarity(ABC):
     def load_model(self, ckpt: str):
         if ckpt not in EmbeddingSimilarity.models:
             try:
-                model = AutoModel.from_pretrained(ckpt, trust_remote_code=True).to(
-                    self.device
-                )
+                model = transformers.AutoModel.from_pretrained(
+                    ckpt, trust_remote_code=True
+                ).to(self.device)
                 if ckpt.startswith("codesage/codesage"):
-                    tokenizer = AutoTokenizer.from_pretrained(
+                    tokenizer = transformers.AutoTokenizer.from_pretrained(
                         ckpt, trust_remote_code=True, add_eos_token=True
                     )
                 else:
-                    tokenizer = AutoTokenizer.from_pretrained(
+                    tokenizer = transformers.AutoTokenizer.from_pretrained(
                         ckpt, trust_remote_code=True
                     )
             except Exception as e:
                 print("Catching exception: ", e)
 
                 # work around starts for flash_attn on cpu. From https://huggingface.co/qnguyen3/nanoLLaVA-1.5/discussions/4
+                # Bound before patching: Otherwise the patched one calls itself.
+                get_imports = dynamic_module_utils.get_imports
+
                 def fixed_get_imports(filename: Union[str, os.PathLike]) -> List[str]:
                     """Work around for https://huggingface.co/microsoft/phi-1_5/discussions/72."""
                     imports = get_imports(filename)
@@ -54,15 +58,15 @@ class EmbeddingSimilarity(ABC):
                 with patch(
                     "transformers.dynamic_module_utils.get_imports", fixed_get_imports
                 ):
-                    model = AutoModel.from_pretrained(ckpt, trust_remote_code=True).to(
-                        self.device
-                    )
+                    model = transformers.AutoModel.from_pretrained(
+                        ckpt, trust_remote_code=True
+                    ).to(self.device)
                     if ckpt.startswith("codesage/codesage"):
-                        tokenizer = AutoTokenizer.from_pretrained(
+                        tokenizer = transformers.AutoTokenizer.from_pretrained(
                             ckpt, trust_remote_code=True, add_eos_token=True
                         )
                     else:
-                        tokenizer = AutoTokenizer.from_pretrained(
+                        tokenizer = transformers.AutoTokenizer.from_pretrained(
                             ckpt, trust_remote_code=True
                         )
                 # word around ends.
@@ -0,0 +1,239 @@
+"""Cached dependency resolution: Run `mvn dependency:tree` once per pom and m2 state.
+
+The tree is parsed once into an index of `groupId:artifactId` to its effective version,
+scope and depth, together with dependencies declared in poms. It's cached by a key of
+all pom files in a repo and the local repository state, so that repeated checks, e.g.
+evaluation reruns with unchanged poms, don't run maven again.
+"""
+
+from dataclasses import dataclass
+import glob
+import hashlib
+import logging
+import os
+import re
+import threading
+from typing import Dict, FrozenSet, Optional, Sequence, Tuple
+import xml.etree.ElementTree as ET
+
+from self_debug.common import utils
+
+
+MVN_DEPENDENCY_TREE = "mvn dependency:tree"
+
+M2_DIR = os.path.join("~", ".m2")
+M2_SETTINGS = "settings.xml"
+M2_REPOSITORY = "repository"
+
+POM = "pom.xml"
+POM_NAMESPACES = {"maven": "http://maven.apache.org/POM/4.0.0"}
+
+MAX_CACHE_SIZE = 1024
+
+# [INFO] +- org.projectlombok:lombok:jar:1.18.30:provided
+# [INFO] |  \- org.slf4j:slf4j-api:jar:1.7.36:compile
+_TREE_LINE_REGEX = re.compile(r"^\[INFO\] ((?:[| ]  )*)[+\\]- (\S+)")
+
+
+@dataclass(frozen=True)
+class Dependency:
+    """A resolved dependency."""
+
+    group_id: str
+    artifact_id: str
+    type: str
+    version: str
+    scope: str
+    # 1 for direct dependencies.
+    depth: int
+
+    @property
+    def key(self) -> str:
+        """`groupId:artifactId`."""
+        return f"{self.group_id}:{self.artifact_id}"
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """Resolved dependencies, and `groupId:artifactId` declared in poms."""
+
+    dependencies: Dict[str, Dependency]
+    declared: FrozenSet[str]
+
+    def get_version(self, key: str, max_depth: Optional[int] = None) -> Optional[str]:
+        """Effective version of a dependency, if resolved within a depth."""
+        dependency = self.dependencies.get(key)
+        if dependency is None:
+            return None
+        if max_depth is not None and dependency.depth > max_depth:
+            return None
+        return dependency.version
+
+    def get_declared_versions(self, max_depth: Optional[int] = 1) -> Dict[str, str]:
+        """Effective versions of declared dependencies: Direct ones by default."""
+        versions = {}
+        for key, dependency in self.dependencies.items():
+            if key in self.declared and (
+                max_depth is None or dependency.depth <= max_depth
+            ):
+                versions[key] = dependency.version
+        return versions
+
+
+def parse_dependency_tree(text: str) -> Dict[str, Dependency]:
+    """Parse `mvn dependency:tree` output: The nearest one wins, then the last one."""
+    dependencies = {}
+    for line in (text or "").splitlines():
+        match = _TREE_LINE_REGEX.match(line)
+        if match is None:
+            continue
+
+        coordinate = match.group(2).split(":")
+        if len(coordinate) != 5:
+            logging.warning("Invalid dependency version: `%s`.", match.group(2))
+            continue
+
+        group_id, artifact_id, d_type, version, scope = coordinate
+        dependency = Dependency(
+            group_id=group_id,
+            artifact_id=artifact_id,
+            type=d_type,
+            version=version,
+            scope=scope,
+            depth=len(match.group(1)) // 3 + 1,
+        )
+
+        # Modules in a reactor have their own trees.
+        existing = dependencies.get(dependency.key)
+        if existing is None or dependency.depth <= existing.depth:
+            dependencies[dependency.key] = dependency
+
+    return dependencies
+
+
+def parse_declared_dependencies(content: str) -> FrozenSet[str]:
+    """`groupId:artifactId` of dependencies in a pom: Raise ParseError if invalid."""
+    # Remove leading whitespace and blank lines
+    content = re.sub(r"^\s+", "", content or "", flags=re.MULTILINE)
+    root = ET.fromstring(content)
+
+    declared = set()
+    for dep in root.findall(".//maven:dependency", POM_NAMESPACES):
+        group_id = dep.find("maven:groupId", POM_NAMESPACES)
+        artifact_id = dep.find("maven:artifactId", POM_NAMESPACES)
+        if group_id is not None and artifact_id is not None:
+            declared.add(f"{group_id.text}:{artifact_id.text}")
+
+    return frozenset(declared)
+
+
+def _find_poms(working_dir: str) -> Sequence[str]:
+    return sorted(glob.glob(os.path.join(working_dir, "**", POM), recursive=True))
+
+
+def _stat_key(path: str) -> str:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return "-"
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def get_m2_state(m2_dir: Optional[str] = None) -> str:
+    """A cheap key of the local repository state: Settings and the repository dir."""
+    m2_dir = os.path.expanduser(m2_dir or M2_DIR)
+    settings = os.path.join(m2_dir, M2_SETTINGS)
+    content = utils.load_file(settings, log=False) or ""
+
+    return "\n".join(
+        (
+            hashlib.sha256(content.encode()).hexdigest(),
+            _stat_key(os.path.join(m2_dir, M2_REPOSITORY)),
+        )
+    )
+
+
+class DependencyResolver:
+    """Resolve dependencies of repos, cached by all poms and the m2 state."""
+
+    def __init__(
+        self,
+        command: str = MVN_DEPENDENCY_TREE,
+        m2_dir: Optional[str] = None,
+        max_cache_size: int = MAX_CACHE_SIZE,
+    ):
+        self.command = command
+        self.m2_dir = m2_dir
+        self.max_cache_size = max_cache_size
+
+        # Stats.
+        self.num_hits = 0
+        self.num_misses = 0
+
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _load_poms(self, working_dir: str) -> Tuple[str, Dict[str, str]]:
+        digest = hashlib.sha256(get_m2_state(self.m2_dir).encode())
+        contents = {}
+        for pom in _find_poms(working_dir):
+            content = utils.load_file(pom, log=False) or ""
+            contents[pom] = content
+            digest.update(os.path.relpath(pom, working_dir).encode())
+            digest.update(b"\0")
+            digest.update(hashlib.sha256(content.encode()).digest())
+
+        return digest.hexdigest(), contents
+
+    def resolve(self, working_dir: str) -> Optional[Resolution]:
+        """Resolve dependencies: None if any pom is invalid or maven fails."""
+        working_dir = os.path.abspath(working_dir)
+        key, contents = self._load_poms(working_dir)
+        with self._lock:
+            resolution = self._cache.get(key)
+            if resolution is not None:
+                self.num_hits += 1
+                return resolution
+            self.num_misses += 1
+
+        declared = set()
+        for pom, content in contents.items():
+            try:
+                declared |= parse_declared_dependencies(content)
+            except ET.ParseError as error:
+                logging.warning("Error parsing pom.xml `%s`: `%s`.", pom, error)
+                return None
+
+        result = utils.do_run_command(self.command, cwd=working_dir, check=False)
+        if result.return_code != 0:
+            logging.warning("Error generating dependency-tree: <<<%s>>>", result)
+            return None
+
+        resolution = Resolution(
+            dependencies=parse_dependency_tree(result.stdout),
+            declared=frozenset(declared),
+        )
+        # Only successful resolutions are cached.
+        with self._lock:
+            if len(self._cache) >= self.max_cache_size:
+                self._cache.clear()
+            self._cache[key] = resolution
+        return resolution
+
+    def clear(self):
+        """Clear cached resolutions."""
+        with self._lock:
+            self._cache.clear()
+
+
+_RESOLVER = None
+_RESOLVER_LOCK = threading.Lock()
+
+
+def get_resolver() -> DependencyResolver:
+    """Shared resolver per process."""
+    global _RESOLVER  # pylint: disable=global-statement
+    with _RESOLVER_LOCK:
+        if _RESOLVER is None:
+            _RESOLVER = DependencyResolver()
+        return _RESOLVER
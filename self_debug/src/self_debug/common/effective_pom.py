@@ -0,0 +1,375 @@
+"""Pure python effective pom resolver: Java versions without `mvn help:effective-pom`.
+
+Only what `file_utils.get_java_versions` needs is resolved:
+- `<parent>` chains, through `relativePath`, the reactor and the local repository.
+- `${...}` properties, including project coordinates, interpolated recursively.
+- `maven-compiler-plugin` configurations, from pluginManagement and plugins.
+
+It returns None when a parent pom is not available locally, so that callers fall back
+to Maven. Parsed poms and resolved results are cached by pom content hash.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import hashlib
+import logging
+import os
+import re
+import threading
+from typing import Dict, Optional, Sequence, Set, Tuple
+import xml.etree.ElementTree as ET
+
+
+POM = "pom.xml"
+DEFAULT_RELATIVE_PATH = os.path.join("..", POM)
+M2_REPOSITORY = os.path.join("~", ".m2", "repository")
+
+COMPILER_PLUGIN = "maven-compiler-plugin"
+COMPILER_PROPERTIES = (
+    "maven.compiler.source",
+    "maven.compiler.target",
+    "maven.compiler.release",
+)
+COMPILER_CONFIGURATIONS = ("source", "target", "release")
+
+MAX_DEPTH = 16
+MAX_CACHE_SIZE = 4096
+
+_PROPERTY_REGEX = re.compile(r"\$\{([^${}]+)\}")
+
+Coordinate = Tuple[Optional[str], Optional[str], Optional[str]]
+JavaVersions = Tuple[Optional[Set[str]], Optional[Dict[str, str]]]
+
+
+@dataclass(frozen=True)
+class RawPom:
+    """What's needed from a single pom, before inheritance and interpolation."""
+
+    group_id: Optional[str] = None
+    artifact_id: Optional[str] = None
+    version: Optional[str] = None
+    # (groupId, artifactId, version) and relativePath: None for the default one.
+    parent: Optional[Coordinate] = None
+    relative_path: Optional[str] = None
+    properties: Dict[str, str] = field(default_factory=dict)
+    # Compiler plugin configurations: Plugins override pluginManagement.
+    compiler: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def coordinate(self) -> Coordinate:
+        """Coordinate with groupId and version inherited from the parent."""
+        parent = self.parent or (None, None, None)
+        return (
+            self.group_id or parent[0],
+            self.artifact_id,
+            self.version or parent[2],
+        )
+
+
+def interpolate(value: Optional[str], properties: Dict[str, str]) -> Optional[str]:
+    """Interpolate `${name}` in a value, recursively: Undefined ones are kept as is."""
+    if value is None:
+        return None
+
+    for _ in range(MAX_DEPTH):
+        new_value = _PROPERTY_REGEX.sub(
+            lambda match: properties.get(match.group(1), match.group(0)), value
+        )
+        if new_value == value:
+            break
+        value = new_value
+    return value
+
+
+def _text(element, path: str, namespace: str) -> Optional[str]:
+    if element is None:
+        return None
+
+    child = element.find(path.format(ns=namespace))
+    if child is None or child.text is None:
+        return None
+    return child.text.strip()
+
+
+def _parse(content: bytes) -> Optional[RawPom]:
+    """Parse a pom: None if it's not a valid pom."""
+    try:
+        root = ET.fromstring(content.strip())
+    except ET.ParseError as error:
+        logging.warning("Unable to parse pom: <<<%s>>>", error)
+        return None
+
+    namespace = root.tag.split("}")[0] + "}" if "}" in root.tag else ""
+    if root.tag != f"{namespace}project":
+        return None
+
+    parent = root.find(f"{namespace}parent")
+    parent_coordinate = relative_path = None
+    if parent is not None:
+        parent_coordinate = tuple(
+            _text(parent, f"{{ns}}{tag}", namespace)
+            for tag in ("groupId", "artifactId", "version")
+        )
+        node = parent.find(f"{namespace}relativePath")
+        if node is not None:
+            relative_path = (node.text or "").strip()
+
+    properties = {}
+    node = root.find(f"{namespace}properties")
+    if node is not None:
+        for child in node:
+            if isinstance(child.tag, str):
+                name = child.tag.replace(namespace, "")
+                properties[name] = (child.text or "").strip()
+
+    compiler = {}
+    for path in (
+        "{ns}build/{ns}pluginManagement/{ns}plugins",
+        "{ns}build/{ns}plugins",
+    ):
+        plugins = root.find(path.format(ns=namespace))
+        if plugins is None:
+            continue
+
+        for plugin in plugins.findall(f"{namespace}plugin"):
+            if _text(plugin, "{ns}artifactId", namespace) != COMPILER_PLUGIN:
+                continue
+
+            config = plugin.find(f"{namespace}configuration")
+            for key in COMPILER_CONFIGURATIONS:
+                value = _text(config, f"{{ns}}{key}", namespace)
+                if value:
+                    compiler[key] = value
+
+    return RawPom(
+        group_id=_text(root, "{ns}groupId", namespace),
+        artifact_id=_text(root, "{ns}artifactId", namespace),
+        version=_text(root, "{ns}version", namespace),
+        parent=parent_coordinate,
+        relative_path=relative_path,
+        properties=properties,
+        compiler=compiler,
+    )
+
+
+class _Cache:
+    """Thread safe LRU cache."""
+
+    def __init__(self, maxsize: int = MAX_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """Get a value, as the most recently used one."""
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        """Put a value, and drop the least recently used ones."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Clear all values."""
+        with self._lock:
+            self._data.clear()
+
+
+# Content hash => RawPom or None.
+_RAW_POMS = _Cache()
+# Content hashes of a parent chain => JavaVersions.
+_JAVA_VERSIONS = _Cache()
+
+_MISSING = object()
+
+
+def clear_cache():
+    """Clear cached poms and results."""
+    _RAW_POMS.clear()
+    _JAVA_VERSIONS.clear()
+
+
+def load_pom(filename: str) -> Tuple[Optional[str], Optional[RawPom]]:
+    """Load a pom: Return its content hash and the parsed pom, cached by the hash."""
+    try:
+        with open(filename, "rb") as f:
+            content = f.read()
+    except OSError as error:
+        logging.warning("Unable to read pom `%s`: <<<%s>>>", filename, error)
+        return None, None
+
+    content_hash = hashlib.sha256(content).hexdigest()
+    raw = _RAW_POMS.get(content_hash, _MISSING)
+    if raw is _MISSING:
+        raw = _parse(content)
+        _RAW_POMS.put(content_hash, raw)
+    return content_hash, raw
+
+
+class EffectivePomResolver:
+    """Resolve effective Java versions of poms in a reactor."""
+
+    def __init__(
+        self, filenames: Sequence[str] = (), m2_repository: Optional[str] = None
+    ):
+        self.m2_repository = os.path.expanduser(m2_repository or M2_REPOSITORY)
+
+        # (groupId, artifactId) => pom in the reactor.
+        self.reactor = {}
+        for filename in filenames:
+            if not filename:
+                continue
+            _, raw = load_pom(filename)
+            if raw is not None:
+                self.reactor.setdefault(raw.coordinate[:2], os.path.abspath(filename))
+
+    def _find_parent(self, filename: str, raw: RawPom) -> Optional[str]:
+        group_id, artifact_id, version = raw.parent
+
+        relative_path = raw.relative_path
+        if relative_path is None:
+            relative_path = DEFAULT_RELATIVE_PATH
+        if relative_path:
+            parent = os.path.join(os.path.dirname(filename), relative_path)
+            if os.path.isdir(parent):
+                parent = os.path.join(parent, POM)
+            if os.path.isfile(parent):
+                _, parent_raw = load_pom(parent)
+                if parent_raw is not None and parent_raw.coordinate[:2] == (
+                    group_id,
+                    artifact_id,
+                ):
+                    return os.path.abspath(parent)
+
+        parent = self.reactor.get((group_id, artifact_id))
+        if parent is not None:
+            return parent
+
+        if group_id and artifact_id and version and "${" not in version:
+            parent = os.path.join(
+                self.m2_repository,
+                *group_id.split("."),
+                artifact_id,
+                version,
+                f"{artifact_id}-{version}.pom",
+            )
+            if os.path.isfile(parent):
+                return parent
+
+        logging.info(
+            "Parent pom `%s:%s:%s` is not available locally for `%s`.",
+            group_id,
+            artifact_id,
+            version,
+            filename,
+        )
+        return None
+
+    def _load_chain(self, filename: str):
+        """A pom and its parents, child first: None if any pom is not available."""
+        chain = []
+        visited = set()
+        while filename is not None:
+            filename = os.path.abspath(filename)
+            if filename in visited or len(chain) >= MAX_DEPTH:
+                logging.warning("Invalid parent chain at `%s`.", filename)
+                return None
+            visited.add(filename)
+
+            content_hash, raw = load_pom(filename)
+            if raw is None:
+                return None
+            chain.append((content_hash, raw))
+
+            if raw.parent is None:
+                break
+            filename = self._find_parent(filename, raw)
+            if filename is None:
+                return None
+
+        return chain
+
+    def get_java_version(self, filename: str) -> Optional[JavaVersions]:
+        """Java versions of a pom: None if it's unable to be resolved locally."""
+        chain = self._load_chain(filename)
+        if chain is None:
+            return None
+
+        key = tuple(content_hash for content_hash, _ in chain)
+        result = _JAVA_VERSIONS.get(key)
+        if result is None:
+            result = self._resolve([raw for _, raw in chain])
+            _JAVA_VERSIONS.put(key, result)
+
+        versions, version_dict = result
+        if versions is None:
+            return result
+        return set(versions), dict(version_dict)
+
+    @staticmethod
+    def _resolve(chain: Sequence[RawPom]) -> JavaVersions:
+        properties, compiler = {}, {}
+        for raw in reversed(chain):
+            properties.update(raw.properties)
+            compiler.update(raw.compiler)
+
+        pom = chain[0]
+        group_id, artifact_id, version = pom.coordinate
+        for prefix in ("project.", "pom."):
+            properties[f"{prefix}groupId"] = group_id
+            properties[f"{prefix}artifactId"] = artifact_id
+            properties[f"{prefix}version"] = version
+        if pom.parent is not None:
+            properties["project.parent.groupId"] = pom.parent[0]
+            properties["project.parent.artifactId"] = pom.parent[1]
+            properties["project.parent.version"] = pom.parent[2]
+        properties = {k: v for k, v in properties.items() if v is not None}
+
+        version_dict = {}
+        for key, value in tuple(
+            (key, properties.get(key)) for key in COMPILER_PROPERTIES
+        ) + tuple(compiler.items()):
+            value = interpolate(value, properties)
+            if value and "${" not in value:
+                version_dict[key] = value
+
+        if not version_dict:
+            return None, None
+        return set(version_dict.values()), version_dict
+
+
+def get_java_versions(
+    filenames: Sequence[str], m2_repository: Optional[str] = None
+) -> Optional[JavaVersions]:
+    """Java versions of poms in a reactor: None if any is unable to be resolved."""
+    filenames = [filename for filename in filenames if filename]
+    if not filenames:
+        return None
+
+    resolver = EffectivePomResolver(filenames, m2_repository=m2_repository)
+
+    summary_versions = set()
+    summary_version_dict = {}
+    for filename in filenames:
+        result = resolver.get_java_version(filename)
+        if result is None:
+            return None
+
+        versions, version_dict = result
+        if versions:
+            summary_versions |= versions
+            summary_version_dict.update(version_dict)
+
+    if not summary_versions:
+        return None, None
+    return summary_versions, summary_version_dict
@@ -1,16 +1,13 @@
 """Eval utils for maximal migration."""
 
-import glob
 import logging
-import os
 import re
-import subprocess
-import xml.etree.ElementTree as ET
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from packaging.version import Version
 
-from self_debug.common import utils
+from self_debug.common import dependency_resolver, utils
 
 DEPENDENCY_VERSION = Path(__file__).parent.parent / "data/dependency_version.json"
 
@@ -18,72 +15,22 @@ DEPENDENCY_VERSION = Path(__file__).parent.parent / "data/dependency_version.jso
 # pylint: disable=invalid-name
 
 
-def preprocess_xml(file_path):
-    """Preprocess xml."""
-    content = utils.load_file(file_path) or ""
-
-    # Remove leading whitespace and blank lines
-    content = re.sub(r"^\s+", "", content, flags=re.MULTILINE)
-    return content
-
-
 def extract_dependencies(pom_file):
     """Extract deps."""
-    # Preprocess the XML content
-    xml_content = preprocess_xml(pom_file)
-
-    # Parse the preprocessed content
-    root = ET.fromstring(xml_content)
-
-    # Define the namespace
-    ns = {"maven": "http://maven.apache.org/POM/4.0.0"}
-
-    dependencies = set()
-    for dep in root.findall(".//maven:dependency", ns):
-        group_id = dep.find("maven:groupId", ns).text
-        artifact_id = dep.find("maven:artifactId", ns).text
-        dependencies.add(f"{group_id}:{artifact_id}")
-
-    return dependencies
-
-
-def generate_dependency_tree(working_dir):
-    """Generate dependency tree."""
-    try:
-        with open(os.path.join(working_dir, "dependency-tree.txt"), "w") as outfile:
-            res = subprocess.run(
-                ["mvn", "dependency:tree"],
-                stdout=outfile,
-                stderr=subprocess.STDOUT,
-                cwd=working_dir,
-            )
-            if res.returncode != 0:
-                logging.warning("Error generating dependency-tree")
-                return None
-        return os.path.join(working_dir, "dependency-tree.txt")
-    except subprocess.CalledProcessError as error:
-        logging.warning("Error generating dependency-tree: `%s`.", error)
-        return None
+    return set(
+        dependency_resolver.parse_declared_dependencies(utils.load_file(pom_file))
+    )
 
 
 def get_effective_versions(dt_path, interested_deps):
     """Get effective version."""
-    dep_versions = {}
-
-    dt = (utils.load_file(dt_path) or "").splitlines()
-    for line in dt:
-        if line.startswith(r"[INFO] +- ") or line.startswith(r"[INFO] \- "):
-            dep_plus_version = line.split(" ")[-1].strip()
-            artifact_list = dep_plus_version.split(":")
-            if len(artifact_list) != 5:
-                logging.warning("Invalid dependency version: `%s`.", dep_plus_version)
-            else:
-                group_id = artifact_list[0]
-                artifact_id = artifact_list[1]
-                version = artifact_list[3]
-                if group_id + ":" + artifact_id in interested_deps:
-                    dep_versions[group_id + ":" + artifact_id] = version
-    return dep_versions
+    resolution = dependency_resolver.Resolution(
+        dependencies=dependency_resolver.parse_dependency_tree(
+            utils.load_file(dt_path)
+        ),
+        declared=frozenset(interested_deps),
+    )
+    return resolution.get_declared_versions()
 
 
 def compare_versions(v1, v2):
@@ -116,28 +63,27 @@ def compare_major_versions(v1, v2):
         return norm1[0] >= norm2[0]
 
 
-def check_version(working_dir, dependency_version_path=None, check_major_version=True):
-    """Check version."""
+def check_versions(
+    working_dir,
+    dependency_version_path=None,
+    check_major_version=True,
+    resolver: Optional[dependency_resolver.DependencyResolver] = None,
+) -> Tuple[bool, List[Dict[str, Any]]]:
+    """Check versions of declared dependencies: Return status and failed ones.
+
+    Dependencies are resolved by a shared resolver, cached by all poms and m2 state.
+    """
     if dependency_version_path is None:
         dependency_version_path = DEPENDENCY_VERSION
+    if resolver is None:
+        resolver = dependency_resolver.get_resolver()
 
-    pom_paths = glob.glob(os.path.join(working_dir, "**", "pom.xml"), recursive=True)
-    interested_deps = set()
-    for pom_path in pom_paths:
-        try:
-            interested_deps.update(extract_dependencies(pom_path))
-        except ET.ParseError as error:
-            logging.warning("Error parsing pom.xml: `%s`.", error)
-            logging.warning("Please ensure the file is well-formed XML and try again.")
-            return False
-
-    dependency_tree = generate_dependency_tree(working_dir)
+    resolution = resolver.resolve(working_dir)
+    if resolution is None:
+        logging.warning("Failed to resolve dependencies: `%s`.", working_dir)
+        return False, []
 
-    if not dependency_tree:
-        logging.warning("Failed to generate effective POM. Exiting.")
-        return False
-
-    dep_versions = get_effective_versions(dependency_tree, interested_deps)
+    dep_versions = resolution.get_declared_versions()
 
     expected_versions = utils.load_json(dependency_version_path) or {}
 
@@ -166,7 +112,6 @@ def check_version(working_dir, dependency_version_path=None, check_major_version
                     "valid-version-update": valid_update,
                 }
             )
-    subprocess.run(["rm", dependency_tree], check=True)
     logging.warning(
         "Check version completed # = %d: `%s`.", len(dep_versions), working_dir
     )
@@ -176,7 +121,12 @@ def check_version(working_dir, dependency_version_path=None, check_major_version
         )
         logging.warning(results)
 
-    return eval_status
+    return eval_status, results
+
+
+def check_version(working_dir, dependency_version_path=None, check_major_version=True):
+    """Check version."""
+    return check_versions(working_dir, dependency_version_path, check_major_version)[0]
 
 
 if __name__ == "__main__":
@@ -11,7 +11,7 @@ import xml.etree.ElementTree as ET
 
 from packaging.version import Version
 
-from self_debug.common import hash_utils, maven_utils, utils
+from self_debug.common import effective_pom, hash_utils, maven_utils, utils
 
 # pylint: disable=broad-exception-caught,too-many-branches,too-many-locals,too-many-nested-blocks,too-many-return-statements
 
@@ -289,8 +289,13 @@ def get_java_versions(
     mvn_command: str = MVN_CLEAN_VERIFY,
     run_effective: bool = True,
     return_int_on_failing_effective: bool = False,
+    resolve_effective: bool = True,
 ):
-    """Parse repos' Maven pom.xml file to find hardcoded Java versions 8, 11, 17, etc."""
+    """Parse repos' Maven pom.xml file to find hardcoded Java versions 8, 11, 17, etc.
+
+    Effective Java versions are resolved locally first, and `mvn help:effective-pom`
+    only runs when a parent pom is not available locally.
+    """
     summary_versions = set()
     summary_version_dict = {}
 
@@ -309,6 +314,18 @@ def get_java_versions(
         summary_version_dict.update(version_dict)
 
     if not summary_versions and not summary_version_dict and run_effective:
+        result = None
+        if resolve_effective:
+            result = effective_pom.get_java_versions(filenames)
+        # No versions locally: Maven may still find some, or fail the same way as before.
+        if result is not None and result[0] is not None:
+            logging.info(
+                "Resolve effective pom.xml locally for `%s`: Java version `%s`.",
+                root_dir,
+                result,
+            )
+            return result
+
         with tempfile.TemporaryDirectory() as temp_dir:
             # Generate
             temp_pom = os.path.join(temp_dir, "effective-pom.xml")
@@ -616,10 +633,9 @@ def reject_java_repo_or_snapshot(
     # 4. Validate compiled class
     if compiled_version:
         base_commit = False
-        c_versions = utils.get_compiled_java_major_versions(
-            root_dir, java_home=java_home
-        )
-        logging.warning("Compiled versions: `%s`.", c_versions)
+        c_histogram = utils.get_compiled_java_major_version_histogram(root_dir)
+        c_versions = None if c_histogram is None else set(c_histogram)
+        logging.warning("Compiled versions: `%s`.", c_histogram)
 
         if c_versions is not None:
             metrics[
@@ -630,6 +646,10 @@ def reject_java_repo_or_snapshot(
             metrics[
                 f"reject-snapshot-04-complied-java-version-values__EQ__{'|'.join(s_versions)}"
             ] += 1
+            for version, count in c_histogram.items():
+                metrics[
+                    f"reject-snapshot-04-complied-java-version-num-classes-{version}"
+                ] += count
 
         if c_versions is None:
             metrics["reject-snapshot-05-00-complied-java-version-none"] += 1
@@ -0,0 +1,323 @@
+"""Repo fingerprinting: Walk the tree once, hash and count lines in one read per file.
+
+- Tree view: Same as the output of `tree .` (hidden entries skipped, locale like sort).
+- Files: Selected files are read once on a thread pool, for both sha256 and #lines;
+  large files are memory mapped.
+- Merkle digests: Per directory, over the selected files, so unchanged subtrees can be
+  compared (and reused by the per file cache) across snapshots.
+"""
+
+from concurrent import futures
+import codecs
+from dataclasses import dataclass, field as dataclass_field
+import hashlib
+import logging
+import mmap
+import os
+import re
+import threading
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+
+EXCLUDED_DIRS = (".git",)
+
+# Files larger than this are memory mapped and processed in chunks.
+MMAP_THRESHOLD_BYTES = 1 << 20
+MMAP_CHUNK_BYTES = 1 << 23
+
+MAX_CACHE_SIZE = 1 << 20
+
+# `tree .` output: The vertical connector is followed by non-breaking spaces.
+TREE_MIDDLE = "\u251c\u2500\u2500 "
+TREE_LAST = "\u2514\u2500\u2500 "
+TREE_PIPE = "\u2502\u00a0\u00a0 "
+TREE_BLANK = "    "
+
+# Same as `str.splitlines`.
+LINE_BREAK_REGEX = re.compile("\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+@dataclass
+class FileFingerprint:
+    """Fingerprint of a file."""
+
+    path: str
+    sha256: str
+    num_lines: int
+    size: int = 0
+    # Decoded content, kept for small files only if requested.
+    text: Optional[str] = None
+
+
+@dataclass
+class RepoSnapshot:
+    """Fingerprint of a repo at a point in time."""
+
+    root_dir: str
+    tree: str = ""
+    # Absolute path => file fingerprint, for selected files only.
+    files: Dict[str, FileFingerprint] = dataclass_field(default_factory=dict)
+    # Dir path relative to root_dir (`.` for root_dir) => Merkle digest.
+    dir_digests: Dict[str, str] = dataclass_field(default_factory=dict)
+
+    @property
+    def digest(self) -> str:
+        """Merkle digest of the whole repo."""
+        return self.dir_digests.get(os.curdir, "")
+
+    def find_files(self, predicate: Callable[[str], bool]) -> Tuple[FileFingerprint]:
+        """Find selected files by absolute path, sorted by path (same as `utils.find_files`)."""
+        return tuple(self.files[path] for path in sorted(self.files) if predicate(path))
+
+    def changed_dirs(self, other: "RepoSnapshot") -> Tuple[str]:
+        """Dirs whose Merkle digests differ from another snapshot."""
+        dirs = set(self.dir_digests) | set(other.dir_digests)
+        return tuple(
+            sorted(
+                d
+                for d in dirs
+                if self.dir_digests.get(d) != other.dir_digests.get(d)
+            )
+        )
+
+
+def _tree_sort_key(name: str):
+    """Sort key approximating `tree` under an en_US.UTF-8 locale: Case and punctuation are ignored first."""
+    return re.sub(r"[^0-9a-zA-Z]", "", name).lower(), name
+
+
+def count_lines(text: str, prev_char: str = "") -> Tuple[int, str]:
+    """Count line breaks as `str.splitlines` does, given the previous char for `\\r\\n` spans."""
+    count = len(LINE_BREAK_REGEX.findall(text))
+    if prev_char == "\r" and text.startswith("\n"):
+        count -= 1
+    return count, (text[-1] if text else prev_char)
+
+
+def decode(data: bytes, universal_newlines: bool = True) -> str:
+    """Decode as `utils.load_file(..., fix=FIX_UTF8)`: Strict utf-8 in text mode, or ignore errors."""
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("utf-8", errors="ignore")
+
+    if universal_newlines:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def fingerprint_file(path: str, keep_text: bool = False) -> FileFingerprint:
+    """Hash a file and count its lines (same as `len(text.splitlines())`) in one read."""
+    size = os.path.getsize(path)
+    if size <= MMAP_THRESHOLD_BYTES or keep_text:
+        with open(path, "rb") as ifile:
+            data = ifile.read()
+        text = data.decode("utf-8", errors="ignore")
+        return FileFingerprint(
+            path=path,
+            sha256=hashlib.sha256(data).hexdigest(),
+            num_lines=len(text.splitlines()),
+            size=len(data),
+            text=decode(data) if keep_text else None,
+        )
+
+    sha256 = hashlib.sha256()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    num_breaks, last_char = 0, ""
+    with open(path, "rb") as ifile:
+        with mmap.mmap(ifile.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start in range(0, len(data), MMAP_CHUNK_BYTES):
+                chunk = data[start : start + MMAP_CHUNK_BYTES]
+                sha256.update(chunk)
+
+                count, last_char = count_lines(decoder.decode(chunk), last_char)
+                num_breaks += count
+    count, last_char = count_lines(decoder.decode(b"", final=True), last_char)
+    num_breaks += count
+
+    # The last line may not end with a line break.
+    if last_char and not LINE_BREAK_REGEX.match(last_char):
+        num_breaks += 1
+    return FileFingerprint(
+        path=path, sha256=sha256.hexdigest(), num_lines=num_breaks, size=size
+    )
+
+
+class RepoFingerprinter:
+    """Fingerprint repos, caching file fingerprints by (path, size, mtime)."""
+
+    def __init__(self, max_workers: int = 8, max_cache_size: int = MAX_CACHE_SIZE):
+        self.max_workers = max_workers
+        self.max_cache_size = max_cache_size
+
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _fingerprint_file(self, path: str, stat, keep_text: bool) -> FileFingerprint:
+        """Fingerprint a file, reusing the cached one if unchanged."""
+        key = (path, stat.st_size, stat.st_mtime_ns, stat.st_ino, keep_text)
+        with self._lock:
+            result = self._cache.get(key)
+        if result is not None:
+            return result
+
+        result = fingerprint_file(path, keep_text=keep_text)
+        with self._lock:
+            if len(self._cache) >= self.max_cache_size:
+                self._cache.clear()
+            self._cache[key] = result
+        return result
+
+    def fingerprint(
+        self,
+        root_dir: str,
+        select: Optional[Callable[[str], bool]] = None,
+        keep_text: Optional[Callable[[str], bool]] = None,
+        tree: bool = True,
+    ) -> RepoSnapshot:
+        """Fingerprint a repo.
+
+        Args:
+            root_dir: Root dir of the repo.
+            select: Predicate on file names, for files to hash; all files by default.
+            keep_text: Predicate on file names, for files whose decoded content to keep.
+            tree: Whether to render the `tree .` view.
+        """
+        root_dir = os.path.abspath(root_dir)
+        snapshot = RepoSnapshot(root_dir=root_dir)
+        if not os.path.isdir(root_dir):
+            return snapshot
+
+        # 1. Walk once: Dir => entries (name, is_dir, dir_entry).
+        listing = {}
+        selected = []
+        stack = [root_dir]
+        while stack:
+            dirname = stack.pop()
+            entries = []
+            try:
+                scanned = list(os.scandir(dirname))
+            except OSError as error:
+                logging.warning("Unable to list dir `%s`: %s.", dirname, error)
+                scanned = []
+
+            for entry in scanned:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                entries.append((entry.name, is_dir, entry))
+                if is_dir:
+                    if entry.name not in EXCLUDED_DIRS:
+                        stack.append(entry.path)
+                elif (select is None or select(entry.name)) and entry.is_file():
+                    try:
+                        selected.append((entry.path, entry.stat()))
+                    except OSError as error:
+                        logging.warning("Unable to stat `%s`: %s.", entry.path, error)
+            listing[dirname] = entries
+
+        # 2. Read selected files once, in parallel.
+        def _run(item):
+            path, stat = item
+            try:
+                return self._fingerprint_file(
+                    path, stat, bool(keep_text and keep_text(os.path.basename(path)))
+                )
+            except OSError as error:
+                logging.warning("Unable to fingerprint `%s`: %s.", path, error)
+                return None
+
+        with futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for result in executor.map(_run, selected):
+                if result is not None:
+                    snapshot.files[result.path] = result
+
+        # 3. Tree view and Merkle digests.
+        if tree:
+            snapshot.tree = self._render_tree(root_dir, listing)
+        self._merkle(root_dir, root_dir, listing, snapshot)
+
+        logging.info(
+            "Fingerprinted `%s`: # dirs = %d, # selected files = %d.",
+            root_dir,
+            len(listing),
+            len(snapshot.files),
+        )
+        return snapshot
+
+    @staticmethod
+    def _render_tree(root_dir: str, listing) -> str:
+        """Render the same output as `tree .`."""
+        lines = [os.curdir]
+        num_dirs, num_files = 0, 0
+
+        def _render(dirname: str, prefix: str):
+            nonlocal num_dirs, num_files
+
+            entries = sorted(
+                (e for e in listing.get(dirname, ()) if not e[0].startswith(".")),
+                key=lambda e: _tree_sort_key(e[0]),
+            )
+            for index, (name, is_dir, entry) in enumerate(entries):
+                last = index == len(entries) - 1
+                connector = TREE_LAST if last else TREE_MIDDLE
+
+                if entry.is_symlink():
+                    lines.append(f"{prefix}{connector}{name} -> {os.readlink(entry.path)}")
+                    if entry.is_dir():
+                        num_dirs += 1
+                    else:
+                        num_files += 1
+                    continue
+
+                lines.append(f"{prefix}{connector}{name}")
+                if is_dir:
+                    num_dirs += 1
+                    _render(entry.path, prefix + (TREE_BLANK if last else TREE_PIPE))
+                else:
+                    num_files += 1
+
+        _render(root_dir, "")
+
+        dirs = "directory" if num_dirs == 1 else "directories"
+        files = "file" if num_files == 1 else "files"
+        lines += ["", f"{num_dirs} {dirs}, {num_files} {files}"]
+        return "\n".join(lines)
+
+    def _merkle(self, root_dir: str, dirname: str, listing, snapshot) -> str:
+        """Compute Merkle digests bottom up, over selected files only."""
+        digest = hashlib.sha256()
+        for name, is_dir, entry in sorted(listing.get(dirname, ())):
+            if is_dir:
+                if entry.path in listing:
+                    sub = self._merkle(root_dir, entry.path, listing, snapshot)
+                    digest.update(f"d {name} {sub}\n".encode("utf-8", "surrogateescape"))
+            elif entry.path in snapshot.files:
+                sha256 = snapshot.files[entry.path].sha256
+                digest.update(f"f {name} {sha256}\n".encode("utf-8", "surrogateescape"))
+
+        result = digest.hexdigest()
+        snapshot.dir_digests[os.path.relpath(dirname, root_dir)] = result
+        return result
+
+
+_FINGERPRINTER = None
+_FINGERPRINTER_LOCK = threading.Lock()
+
+
+def get_fingerprinter() -> RepoFingerprinter:
+    """Shared fingerprinter, so that its cache is reused across snapshots."""
+    global _FINGERPRINTER  # pylint: disable=global-statement
+
+    with _FINGERPRINTER_LOCK:
+        if _FINGERPRINTER is None:
+            _FINGERPRINTER = RepoFingerprinter(max_workers=min(32, os.cpu_count() or 1))
+        return _FINGERPRINTER
+
+
+def select_names(suffixes: Sequence[str] = (), names: Sequence[str] = ()):
+    """File name predicate: By suffix or by exact name."""
+    suffixes, names = tuple(suffixes), frozenset(names)
+
+    def _select(name: str) -> bool:
+        return name in names or (bool(suffixes) and name.endswith(suffixes))
+
+    return _select
@@ -6,7 +6,7 @@ import os
 from typing import Dict, Sequence, Tuple
 
 from self_debug.metrics import utils as metric_utils
-from self_debug.common import file_utils, hash_utils, utils
+from self_debug.common import file_utils, hash_utils, profiler, utils
 
 
 ALL = "."
@@ -48,9 +48,10 @@ class GitRepo:
         """Run git command."""
         shell = kwargs.pop("shell", False)
 
-        return utils.run_command(
-            ["git"] + command, cwd=self.root_dir, shell=shell, **kwargs
-        )
+        with profiler.span(f"git:{command[0] if command else ''}"):
+            return utils.run_command(
+                ["git"] + command, cwd=self.root_dir, shell=shell, **kwargs
+            )
 
     def _read_cmd(self, *args, **kwargs):
         """Run git read only command."""
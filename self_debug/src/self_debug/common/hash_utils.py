@@ -5,11 +5,13 @@ import hashlib
 import logging
 import os
 import re
-from typing import Tuple
+import threading
+from typing import Optional, Tuple
 
-from self_debug.common import git_repo, utils
+from self_debug.common import fingerprint, git_repo, junit_utils, utils
 
 
+JAVA_SUFFIX = ".java"
 POM = "pom.xml"
 SUBDIR_SRC_TEST = "src/test"
 
@@ -20,9 +22,19 @@ JAVA_HOMES = (
     "/usr/lib/jvm/java-1.8.0-openjdk-1.8.0.432.b06-1.amzn2.0.1.x86_64",  # Local
 )
 
+# (root_dir, repo hash, whether to run maven) => number of test cases.
+_NUM_TEST_CASES_CACHE = {}
+_NUM_TEST_CASES_LOCK = threading.Lock()
+
+
+def get_num_test_cases(root_dir: str, stdout: str = "", run_maven: bool = False) -> int:
+    """Get number of test cases: From `mvn test` output, or estimated statically.
+
+    Running `mvn test` takes minutes, therefore it's opt-in (e.g. for validation).
+    """
+    if not stdout and not run_maven:
+        return junit_utils.estimate_num_test_cases(root_dir)
 
-def get_num_test_cases(root_dir: str, stdout: str = "") -> int:
-    """Get number of test cases."""
     if not stdout and root_dir and os.path.exists(root_dir):
         for java_home in JAVA_HOMES:
             if not os.path.exists(java_home):
@@ -96,15 +108,17 @@ def get_git_commit_ids(repo_obj, num: int = 0, poms=None):
     return tuple(commit_ids)
 
 
-def _hash_files(files) -> Tuple[str, int]:
-    """Hash files."""
-    hashes = []
-    loc = 0
-    for file in files:
-        hashes.append(get_hash(utils.load_file(file, mode="rb"), encode=False))
-        loc += len((utils.load_file(file, fix=utils.FIX_UTF8) or "").splitlines())
+def get_num_test_cases_cached(root_dir: str, key: str, run_maven: bool = False) -> int:
+    """Get number of test cases, cached by a key of the repo content (e.g. its hash)."""
+    key = (key, run_maven)
+    with _NUM_TEST_CASES_LOCK:
+        if key in _NUM_TEST_CASES_CACHE:
+            return _NUM_TEST_CASES_CACHE[key]
 
-    return "\n".join(hashes), loc
+    num_tests = get_num_test_cases(root_dir, run_maven=run_maven)
+    with _NUM_TEST_CASES_LOCK:
+        _NUM_TEST_CASES_CACHE[key] = num_tests
+    return num_tests
 
 
 def get_repo_hash(
@@ -112,8 +126,16 @@ def get_repo_hash(
     hash_tree: bool = True,
     hash_source: bool = True,
     hash_pom: bool = True,
+    count_tests: bool = True,
+    fingerprinter: Optional[fingerprint.RepoFingerprinter] = None,
+    count_tests_with_maven: bool = False,
 ) -> str:
-    """Get repo hash based on (tree strcuture, source file hash, pom.xml content)."""
+    """Get repo hash based on (tree strcuture, source file hash, pom.xml content).
+
+    The tree is walked once, with each selected file read once (see `fingerprint.py`);
+    test cases are counted statically unless `count_tests_with_maven` (`mvn test`), and
+    cached by the repo hash.
+    """
     root_dir = os.path.abspath(root_dir)
 
     inputs = []
@@ -123,18 +145,34 @@ def get_repo_hash(
 
     # All output will be hashed, therefore we need to use path relative to `root_dir`.
     loc = 0
-    if exist:
+    if exist and (hash_tree or hash_source or hash_pom):
+        if fingerprinter is None:
+            fingerprinter = fingerprint.get_fingerprinter()
+        snapshot = fingerprinter.fingerprint(
+            root_dir,
+            select=fingerprint.select_names(
+                suffixes=(JAVA_SUFFIX,) if hash_source else (),
+                names=(POM,) if hash_pom else (),
+            ),
+            keep_text=fingerprint.select_names(names=(POM,)),
+            tree=hash_tree,
+        )
+
         if hash_tree:
-            inputs.append(utils.run_command(["tree ."], cwd=root_dir)[0])
+            inputs.append(snapshot.tree)
 
         if hash_source:
-            src_files = utils.find_files(root_dir, r"\*.java")
+            src_files = [
+                f.path
+                for f in snapshot.find_files(
+                    lambda path: os.path.basename(path).endswith(JAVA_SUFFIX)
+                )
+            ]
             logging.info("# java files: %d.", len(src_files))
 
             # Hashes only, without filenames
-            src_result = _hash_files(src_files)
-            inputs.append(src_result[0])
-            loc += src_result[-1]
+            inputs.append("\n".join(snapshot.files[f].sha256 for f in src_files))
+            loc += sum(snapshot.files[f].num_lines for f in src_files)
 
             metrics[f"repo-num-files-java__EQ__{len(src_files):04d}"] += 1
             # *Test.java, *Tests.java
@@ -160,14 +198,14 @@ def get_repo_hash(
 
         if hash_pom:
             # Hashes with filenames
-            pom_files = utils.find_files(root_dir, POM)
+            pom_files = snapshot.find_files(lambda path: os.path.basename(path) == POM)
             logging.info("# %s files: %d.", POM, len(pom_files))
             for pom in pom_files:
-                pom_rel = os.path.relpath(pom, root_dir)
+                pom_rel = os.path.relpath(pom.path, root_dir)
                 inputs.append(pom_rel)
                 logging.debug("Hashing pom file: `%s`.", pom_rel)
 
-                inputs.append((utils.load_file(pom, fix=utils.FIX_UTF8) or "").strip())
+                inputs.append((pom.text or "").strip())
 
             metrics[f"repo-num-files-pom-xml__EQ__{len(pom_files):04d}"] += 1
 
@@ -176,12 +214,15 @@ def get_repo_hash(
     metrics[f"repo-root-src-test-dir-exists__EQ__{src_test_exist}"] += 1
     metrics[f"repo-num-loc__EQ__{loc:06d}"] += 1
 
-    num_tests = get_num_test_cases(root_dir)
-    metrics[f"repo-num-test-cases__EQ__{num_tests:04d}"] += 1
-
     result = get_hash("\n".join(inputs))
     logging.warning("Hash = `%s` (len = %d): `%s`.", result, len(inputs), root_dir)
 
+    if count_tests:
+        num_tests = get_num_test_cases_cached(
+            root_dir, f"{root_dir}::{result}", run_maven=count_tests_with_maven
+        )
+        metrics[f"repo-num-test-cases__EQ__{num_tests:04d}"] += 1
+
     return result, metrics
 
 
@@ -233,7 +274,9 @@ def get_repo_snapshot_info(repo_obj, **kwargs):
 
 def _run():
     logging.info(
-        "#test cases = `%d`.", get_num_test_cases("/home/sliuxl/github/xresloader")
+        "#test cases = `%d` vs `%d` (mvn).",
+        get_num_test_cases("/home/sliuxl/github/xresloader"),
+        get_num_test_cases("/home/sliuxl/github/xresloader", run_maven=True),
     )
 
 
@@ -0,0 +1,191 @@
+"""JUnit util functions: Estimate the number of test cases statically, without `mvn test`.
+
+- JUnit 4/5: Methods annotated with `@Test` or `@ParameterizedTest` (fully qualified or not).
+- JUnit 3: `public void test*()` methods in classes extending `*TestCase`, without the above.
+
+A parameterized test is counted once, while Maven reports one test per invocation.
+"""
+
+from concurrent import futures
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+from self_debug.common import fingerprint
+
+
+JAVA_SUFFIX = ".java"
+SUBDIR_SRC_TEST = "src/test"
+
+TEST_ANNOTATIONS = ("Test", "ParameterizedTest")
+
+MAX_CACHE_SIZE = 1 << 20
+
+# Comments, text blocks, strings and chars: Matched together so that e.g. `//` in a string is kept.
+_COMMENT_OR_LITERAL_REGEX = re.compile(
+    r'//[^\n]*|/\*.*?\*/|"""(?:\\.|[^\\])*?"""|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'',
+    re.DOTALL,
+)
+_TEST_ANNOTATION_REGEX = re.compile(
+    r"@(?:[\w$]+\s*\.\s*)*(?:" + "|".join(TEST_ANNOTATIONS) + r")(?![\w$])"
+)
+_JUNIT3_CLASS_REGEX = re.compile(r"\bextends\s+(?:[\w$]+\.)*[\w$]*TestCase\b")
+# Leading annotations (with balanced-enough args), then a public no-arg `test*` method.
+_JUNIT3_METHOD_REGEX = re.compile(
+    r"((?:@[\w$.]+\s*(?:\([^()]*(?:\([^()]*\)[^()]*)*\))?\s*)*)"
+    r"\bpublic\s+(?:final\s+)?void\s+test[\w$]*\s*\(\s*\)"
+)
+
+# Content sha256 => number of test cases.
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def strip_comments_and_literals(text: str) -> str:
+    """Remove comments and replace string/char literals with empty ones."""
+
+    def _replace(match) -> str:
+        token = match.group(0)
+        if token.startswith("/"):
+            return " "
+        return '""' if token.startswith('"') else "''"
+
+    return _COMMENT_OR_LITERAL_REGEX.sub(_replace, text)
+
+
+def count_test_methods(text: str) -> int:
+    """Count test methods in the source of a Java file."""
+    text = strip_comments_and_literals(text)
+
+    count = len(_TEST_ANNOTATION_REGEX.findall(text))
+    if _JUNIT3_CLASS_REGEX.search(text):
+        for match in _JUNIT3_METHOD_REGEX.finditer(text):
+            if not _TEST_ANNOTATION_REGEX.search(match.group(1)):
+                count += 1
+
+    return count
+
+
+def count_test_methods_from_ast(parser: Any, filename: str, ast: Any) -> int:
+    """Count test methods given the AST of a Java file, see `count_test_methods`."""
+    count = 0
+    for cls in parser.parse_classes(filename, ast, parameters=False, variables=False):
+        junit3 = bool(_JUNIT3_CLASS_REGEX.search(cls.signature or "")) or any(
+            (parent.name or "").endswith("TestCase") for parent in cls.parents
+        )
+        for method in cls.methods:
+            signature = method.signature or ""
+            if _TEST_ANNOTATION_REGEX.search(signature):
+                count += 1
+            elif junit3 and _JUNIT3_METHOD_REGEX.search(signature):
+                count += 1
+
+    return count
+
+
+def is_test_source(path: str, root_dir: str) -> bool:
+    """Whether it's a Java file under `src/test` of the root or of any module."""
+    rel_path = os.path.relpath(path, root_dir)
+    return rel_path.endswith(JAVA_SUFFIX) and (
+        rel_path.startswith(f"{SUBDIR_SRC_TEST}/")
+        or f"/{SUBDIR_SRC_TEST}/" in rel_path
+    )
+
+
+def _count_file(path: str) -> Optional[int]:
+    try:
+        with open(path, "rb") as ifile:
+            return count_test_methods(fingerprint.decode(ifile.read()))
+    except OSError as error:
+        logging.warning("Unable to count tests in `%s`: %s.", path, error)
+        return None
+
+
+def _count_with_ast(parser: Any, paths: Sequence[str]) -> Dict[str, int]:
+    """Count with the AST parser, in one batch; files failed to parse are skipped."""
+    try:
+        _, asts = parser.parse(paths)
+    except Exception as error:
+        logging.exception("Unable to parse ASTs for # files = %d: %s.", len(paths), error)
+        return {}
+
+    counts = {}
+    for path in paths:
+        ast = asts.get(path)
+        if ast is None:
+            continue
+
+        try:
+            counts[path] = count_test_methods_from_ast(parser, path, ast)
+        except Exception as error:
+            logging.warning("Unable to count tests from AST `%s`: %s.", path, error)
+    return counts
+
+
+def estimate_num_test_cases(
+    root_dir: str,
+    ast_parser: Any = None,
+    fingerprinter: Optional[fingerprint.RepoFingerprinter] = None,
+    max_workers: int = 8,
+) -> int:
+    """Estimate number of test cases under `**/src/test`, without running tests.
+
+    Args:
+        root_dir: Root dir of the repo.
+        ast_parser: Optional AST parser (e.g. `JavaAstParser`), whose batch `parse` is
+            used for files not in the cache; a lightweight source scan is used otherwise.
+        fingerprinter: Used to walk the repo and hash files; shared one by default.
+        max_workers: Number of threads scanning files.
+
+    Returns:
+        Number of test cases, or -2 if the root dir doesn't exist (same as no results
+        in the `mvn test` output).
+    """
+    if not root_dir or not os.path.isdir(root_dir):
+        return -2
+
+    root_dir = os.path.abspath(root_dir)
+    if fingerprinter is None:
+        fingerprinter = fingerprint.get_fingerprinter()
+    snapshot = fingerprinter.fingerprint(
+        root_dir, select=fingerprint.select_names(suffixes=(JAVA_SUFFIX,)), tree=False
+    )
+    files = snapshot.find_files(lambda path: is_test_source(path, root_dir))
+
+    # Cached by content, so that unchanged files across snapshots are not scanned again.
+    counts = {}
+    with _CACHE_LOCK:
+        for file in files:
+            if file.sha256 in _CACHE:
+                counts[file.path] = _CACHE[file.sha256]
+    missing = [file.path for file in files if file.path not in counts]
+
+    new_counts = {}
+    if missing and ast_parser is not None:
+        new_counts.update(_count_with_ast(ast_parser, missing))
+    missing = [path for path in missing if path not in new_counts]
+    if missing:
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for path, count in zip(missing, executor.map(_count_file, missing)):
+                if count is not None:
+                    new_counts[path] = count
+
+    with _CACHE_LOCK:
+        if len(_CACHE) + len(new_counts) > MAX_CACHE_SIZE:
+            _CACHE.clear()
+        for file in files:
+            if file.path in new_counts:
+                _CACHE[file.sha256] = new_counts[file.path]
+    counts.update(new_counts)
+
+    result = sum(counts.values())
+    logging.info(
+        "Estimated # test cases = %d: # test files = %d (# scanned = %d) in `%s`.",
+        result,
+        len(files),
+        len(new_counts),
+        root_dir,
+    )
+    return result
@@ -0,0 +1,76 @@
+"""Lazy imports: Heavy modules (e.g. boto3, torch) are imported on first use.
+
+Sample usage:
+
+```
+from self_debug.common import lazy_import
+
+boto3 = lazy_import.lazy_module("boto3")
+
+
+def create_client():
+    return boto3.client("s3")  # `boto3` is imported here.
+```
+"""
+
+import importlib
+import sys
+import types
+from typing import Optional
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy: The module is imported on first attribute access."""
+
+    def __init__(self, name: str, package: Optional[str] = None):
+        super().__init__(name)
+        # Pip package to install, when it's different from the top level module.
+        self.__dict__["_package"] = package or name.split(".")[0]
+        self.__dict__["_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            try:
+                module = importlib.import_module(self.__name__)
+            except ImportError as error:
+                raise ImportError(
+                    f"Unable to import `{self.__name__}`: "
+                    f"Try `pip install {self.__dict__['_package']}`."
+                ) from error
+            self.__dict__["_module"] = module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the module is imported."""
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, attr: str):
+        try:
+            module = self._load()
+        except ImportError as error:
+            # Keep `hasattr(module, "__path__")` and alike working.
+            if attr.startswith("__"):
+                raise AttributeError(attr) from error
+            raise
+        return getattr(module, attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_module(name: str, package: Optional[str] = None) -> types.ModuleType:
+    """Module to be imported on first use, or itself if it's already imported."""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name, package)
+
+
+def is_imported(name: str) -> bool:
+    """Whether a module is imported, e.g. by a lazy module on first use."""
+    return name in sys.modules
@@ -4,6 +4,7 @@ import logging
 import os
 import time
 
+from self_debug.common import deadline as deadline_lib
 from self_debug.common import utils
 
 
@@ -35,6 +36,10 @@ MVN_EFFECTIVE_POM_SLEEP_SECONDS = 2
 
 MVN_TIMEOUT_SECONDS = 300  # 5 min
 
+MVN_SHOW_DEPRECATION_OPTIONS = (
+    "-Dmaven.compiler.showDeprecation=true -Dmaven.compiler.showWarnings=true"
+)
+
 
 def replace_maven_command(
     command: str, new_partial_command: str = MVN_DEPENDENCY_RESOLVE
@@ -58,13 +63,27 @@ def replace_maven_command(
     return cmd, replaced
 
 
+def add_maven_options(command: str, options: str = MVN_SHOW_DEPRECATION_OPTIONS):
+    """Add options to the last maven command, right after `mvn `."""
+    if not isinstance(command, str) or not options:
+        return command
+
+    segments = command.split("mvn ")
+    if len(segments) <= 1 or options in segments[-1]:
+        return command
+
+    return "mvn ".join(segments[:-1]) + f"mvn {options} " + segments[-1]
+
+
 def do_run_maven_command(command: str, **kwargs):
-    """Run maven."""
+    """Run maven: Within the given `deadline`, or the current one by default."""
     start_time = time.time()
 
     max_attempts = kwargs.pop(
         "MVN_DEPENDENCY_RESOLVE_MAX_ATTEMPTS", MVN_DEPENDENCY_RESOLVE_MAX_ATTEMPTS
     )
+    deadline = kwargs.pop("deadline", None) or deadline_lib.get_deadline()
+    kwargs["deadline"] = deadline
 
     # Run dependency command.
     cmd, replaced = replace_maven_command(command, MVN_DEPENDENCY_RESOLVE)
@@ -83,7 +102,7 @@ def do_run_maven_command(command: str, **kwargs):
                 break
 
         result = utils.do_run_command(cmd, **run_kwargs)
-        if result.return_code == 0:
+        if result.return_code == 0 or utils.is_timeout(result):
             break
 
         wip = False
@@ -104,8 +123,10 @@ def do_run_maven_command(command: str, **kwargs):
         if not wip:
             break
 
-        if index < max_attempts - 1:
-            time.sleep(MVN_DEPENDENCY_RESOLVE_SLEEP_SECONDS)
+        if index < max_attempts - 1 and not deadline_lib.sleep(
+            MVN_DEPENDENCY_RESOLVE_SLEEP_SECONDS, deadline
+        ):
+            break
 
     run_kwargs = dict(kwargs)
     if ARG_TIME_OUT_SECONDS in kwargs:
@@ -115,7 +136,7 @@ def do_run_maven_command(command: str, **kwargs):
             MVN_TIMEOUT_SECONDS, run_kwargs[ARG_TIME_OUT_SECONDS]
         )
 
-    # Run the given command.
+    # Run the given command: The timeout above is bounded by the deadline, if any.
     return utils.do_run_command(command, **run_kwargs)
 
 
@@ -0,0 +1,254 @@
+"""Batch POM transformer: Parse each pom once, apply all updates and write once.
+
+Same updates as `pom_utils.update_jdk_related` and `pom_utils.apply_selected_notes`,
+without a parse/ write cycle per dependency:
+- Dependencies are indexed by `(groupId, artifactId)` and properties are resolved once.
+- Version, parent and JDK updates are applied in one pass.
+- Poms in different modules are transformed in parallel.
+"""
+
+from concurrent import futures
+from dataclasses import dataclass
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from xml.etree import ElementTree
+
+from self_debug.common import pom_utils
+
+
+POM_NAMESPACE = pom_utils.namespaces["xmlns"]
+_NS = "{" + POM_NAMESPACE + "}"
+
+JDK_VERSION = "17"
+
+FORCED_JDK_PROPERTIES = (
+    "maven.compiler.source",
+    "maven.compiler.target",
+    "maven.compiler.release",
+)
+OPTIONAL_JDK_PROPERTIES = (
+    "java.version",
+    "jdk.version",
+    "javaVersion",
+    "jdkversion",
+    "java.testversion",
+)
+
+COMPILER_PLUGIN = ("org.apache.maven.plugins", "maven-compiler-plugin")
+
+MAX_WORKERS = 8
+
+GroupArtifact = Tuple[Optional[str], Optional[str]]
+
+
+def _tag(element) -> str:
+    return element.tag.replace(_NS, "")
+
+
+def parse_coordinate(group_artifact: str) -> GroupArtifact:
+    """`groupId:artifactId` to a tuple."""
+    group_id, artifact_id = group_artifact.split(":")
+    return group_id, artifact_id
+
+
+def resolve_property(
+    properties: Dict[str, str], value: Optional[str]
+) -> Optional[str]:
+    """Resolve `${name}` by properties, recursively: None if it's not defined."""
+    seen = set()
+    while value is not None and value.startswith("${"):
+        name = value[2:-1]
+        if name in seen:
+            return None
+        seen.add(name)
+        value = properties.get(name)
+    return value
+
+
+@dataclass
+class DependencyRef:
+    """A dependency or plugin element, with its version element if any."""
+
+    element: Any
+    version: Any = None
+
+
+class PomDocument:
+    """A parsed pom: Dependencies indexed by `(groupId, artifactId)`."""
+
+    def __init__(self, pom_file: str):
+        self.pom_file = pom_file
+
+        parser = ElementTree.XMLParser(encoding="utf-8")
+        self.tree = ElementTree.parse(pom_file, parser=parser)
+        self.root = self.tree.getroot()
+
+        self.dependencies = self.index("dependency")
+        # Same as `pom_utils.extract_pom_property`: The first properties block.
+        self.properties = pom_utils.extract_pom_property(self.root)
+
+        self.num_updates = 0
+
+    def index(self, d_type: str) -> Dict[GroupArtifact, List[DependencyRef]]:
+        """Index dependencies or plugins by `(groupId, artifactId)`."""
+        index = {}
+        for element in self.root.findall(
+            f".//xmlns:{d_type}", namespaces=pom_utils.namespaces
+        ):
+            group_id = artifact_id = version = None
+            # Same as `pom_utils.update_pom_dependency`: Stop at `version`.
+            for child in element:
+                tag = _tag(child)
+                if tag == "groupId":
+                    group_id = child.text
+                elif tag == "artifactId":
+                    artifact_id = child.text
+                elif tag == "version":
+                    version = child
+                    break
+            index.setdefault((group_id, artifact_id), []).append(
+                DependencyRef(element, version)
+            )
+        return index
+
+    def resolve(self, value: Optional[str]) -> Optional[str]:
+        """Resolve a `${...}` value by properties."""
+        return resolve_property(self.properties, value)
+
+    def _add_dependency(self, group_id: str, artifact_id: str, new_version: str):
+        # Same as `pom_utils.update_pom_dependency` for a pom without dependencies.
+        self.root.append(
+            ElementTree.XML(
+                "\n<dependencies>\n<dependency>\n<groupId>"
+                + group_id
+                + "</groupId>\n<artifactId>"
+                + artifact_id
+                + "</artifactId>\n<version>"
+                + new_version
+                + "</version>\n</dependency>\n</dependencies>\n"
+            )
+        )
+        logging.info(
+            "Add dependency (with mega block): `%s:%s:%s`.",
+            group_id,
+            artifact_id,
+            new_version,
+        )
+        self.num_updates += 1
+
+    def update_versions(  # pylint: disable=too-many-arguments
+        self,
+        candidate: Dict[str, str],
+        should_upgrade: Optional[Callable[[Optional[str], str], bool]] = None,
+        resolve_properties: bool = True,
+        update_parent: bool = True,
+        add_missing: bool = True,
+    ) -> int:
+        """Upgrade dependency and parent versions: `groupId:artifactId` to version."""
+        if should_upgrade is None:
+            should_upgrade = pom_utils.should_upgrade
+        num_updates = self.num_updates
+
+        if add_missing and candidate and not self.dependencies:
+            key = next(iter(candidate))
+            self._add_dependency(*parse_coordinate(key), candidate[key])
+
+        for group_artifact, new_version in candidate.items():
+            for ref in self.dependencies.get(parse_coordinate(group_artifact), ()):
+                if ref.version is None or not ref.version.text:
+                    continue
+
+                current_version = ref.version.text
+                if resolve_properties and current_version.startswith("${"):
+                    current_version = self.resolve(current_version)
+                if should_upgrade(current_version, new_version):
+                    logging.debug(
+                        "Update `%s`: `%s` => `%s`.",
+                        group_artifact,
+                        ref.version.text,
+                        new_version,
+                    )
+                    ref.version.text = new_version
+                    self.num_updates += 1
+
+        if update_parent:
+            self._update_parent(candidate)
+
+        return self.num_updates - num_updates
+
+    def _update_parent(self, candidate: Dict[str, str]):
+        parent = self.root.find(".//xmlns:parent", namespaces=pom_utils.namespaces)
+        if parent is None:
+            return
+
+        group_id = artifact_id = None
+        for child in parent:
+            tag = _tag(child)
+            if tag == "groupId":
+                group_id = child.text
+            elif tag == "artifactId":
+                artifact_id = child.text
+            elif tag == "version":
+                break
+
+        new_version = candidate.get(f"{group_id}:{artifact_id}")
+        if new_version is not None:
+            pom_utils.update_pom_parent(self.root, group_id, artifact_id, new_version)
+            self.num_updates += 1
+
+    def update_jdk(self, jdk_version: str = JDK_VERSION):
+        """Same as `pom_utils.update_jdk_related`, in place."""
+        for property_name in FORCED_JDK_PROPERTIES:
+            pom_utils.update_jdk_property(self.root, property_name, jdk_version, True)
+        for property_name in OPTIONAL_JDK_PROPERTIES:
+            pom_utils.update_jdk_property(self.root, property_name, jdk_version, False)
+
+        pom_utils.update_jdk_plugin_configuration(self.root, *COMPILER_PLUGIN)
+        self.num_updates += 1
+
+    def write(self, new_pom_file: Optional[str] = None, **kwargs):
+        """Write once: To the same file by default."""
+        ElementTree.register_namespace("", POM_NAMESPACE)
+        kwargs.setdefault("default_namespace", None)
+        self.tree.write(new_pom_file or self.pom_file, **kwargs)
+
+
+def transform_pom(
+    pom_file: str,
+    candidate: Optional[Dict[str, str]] = None,
+    jdk: bool = False,
+    new_pom_file: Optional[str] = None,
+    **kwargs,
+) -> int:
+    """Apply JDK and version updates to a pom: Return # updates."""
+    write_kwargs = kwargs.pop("write_kwargs", None) or {}
+
+    doc = PomDocument(pom_file)
+    if jdk:
+        doc.update_jdk()
+    if candidate:
+        doc.update_versions(candidate, **kwargs)
+    doc.write(new_pom_file, **write_kwargs)
+
+    logging.info("Transformed pom: `%s`, # updates = %d.", pom_file, doc.num_updates)
+    return doc.num_updates
+
+
+def transform_poms(
+    pom_files: Sequence[str], max_workers: Optional[int] = MAX_WORKERS, **kwargs
+) -> Dict[str, int]:
+    """Transform poms in parallel: Return # updates by pom."""
+    pom_files = list(pom_files)
+    max_workers = max(min(max_workers or os.cpu_count() or 1, len(pom_files)), 1)
+
+    result = {}
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_pom = {
+            executor.submit(transform_pom, pom_file, **kwargs): pom_file
+            for pom_file in pom_files
+        }
+        for future in futures.as_completed(future_to_pom):
+            result[future_to_pom[future]] = future.result()
+
+    return {pom_file: result[pom_file] for pom_file in pom_files}
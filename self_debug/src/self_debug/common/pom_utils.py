@@ -287,47 +287,26 @@ def update_jdk_related(pom_file, new_pom_file):
     """
     logging.warning("Rewrite pom file: `%s` <== `%s` ...", new_pom_file, pom_file)
 
-    forced_properties = [
-        "maven.compiler.source",
-        "maven.compiler.target",
-        "maven.compiler.release",
-    ]
-    optional_properties = [
-        "java.version",
-        "jdk.version",
-        "javaVersion",
-        "jdkversion",
-        "java.testversion",
-    ]
+    from self_debug.common import pom_transformer
 
-    parser = ElementTree.XMLParser(encoding="utf-8")
-    tree = ElementTree.parse(pom_file, parser=parser)
-    root = tree.getroot()
+    pom_transformer.transform_pom(pom_file, jdk=True, new_pom_file=new_pom_file)
 
-    for property_name in forced_properties:
-        update_jdk_property(root, property_name, "17", True)
-    for property_name in optional_properties:
-        update_jdk_property(root, property_name, "17", False)
 
-    update_jdk_plugin_configuration(
-        root, "org.apache.maven.plugins", "maven-compiler-plugin"
-    )
-    ElementTree.register_namespace("", "http://maven.apache.org/POM/4.0.0")
-    tree.write(new_pom_file, default_namespace=None)
+def apply_selected_notes(pom_file, candidate: Dict) -> None:
+    """
+    Update dependency and parent versions of a POM file in place
+    Parsed and written once for all candidates, by `pom_transformer`
 
+    Parameters
+    ----------
+    pom_file:
+        filename of the pom file
+    candidate: dict
+        groupId:artifactId to the new version
+    """
+    from self_debug.common import pom_transformer
 
-def apply_selected_notes(pom_file, candidate: Dict) -> None:
-    for group_artifact_str in candidate:
-        group_id, artifact_id = group_artifact_str.split(":")
-        version = candidate[group_artifact_str]
-        update_pom_content(
-            pom_file=pom_file,
-            d_type="dependency",
-            new_groupid=group_id,
-            new_artifactid=artifact_id,
-            new_version=version,
-            new_pom_file=pom_file,
-        )
+    pom_transformer.transform_pom(pom_file, candidate=candidate)
 
 
 def extract_pom_property(root):
@@ -0,0 +1,290 @@
+"""Profiler: Nested spans per phase (e.g. build, ast, llm, git), by iteration.
+
+A profiler is set for a scope (e.g. `SelfDebugging.run`), and spans started within it
+(e.g. by `GitRepo` commands) are recorded by it; without one, spans are plain timers.
+
+Spans are exported to trajectory and metrics protos, or as a Chrome trace JSON, which
+could be loaded in `chrome://tracing`, Perfetto or speedscope.
+"""
+
+import contextlib
+import contextvars
+from dataclasses import dataclass, field
+import functools
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from self_debug.common import utils
+
+
+# Phase is the span name up to `:`, e.g. `git` for `git:commit`.
+PHASE_SEPARATOR = ":"
+
+MAX_SPANS = 100000
+
+PERCENTILES = (50, 95)
+
+
+@dataclass
+class SpanData:
+    """A finished span: Times in seconds, start relative to the profiler's start."""
+
+    name: str
+    start_seconds: float
+    seconds: float
+    depth: int = 0
+    parent: Optional[str] = None
+    iteration: Optional[int] = None
+    error: bool = False
+    thread_id: int = 0
+    args: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def phase(self) -> str:
+        """Phase of the span."""
+        return get_phase(self.name)
+
+
+class Span(utils.TimeItInSeconds):
+    """A timer, which is recorded by its profiler (if any) when it's finished."""
+
+    def __init__(
+        self,
+        name: str,
+        profiler: Optional["Profiler"] = None,
+        logging_fn=logging.debug,
+        **kwargs,
+    ):
+        super().__init__(name, logging_fn=logging_fn)
+        self.profiler = profiler
+        self.args = kwargs
+
+        self.depth = 0
+        self.parent = None
+
+    def __enter__(self):
+        super().__enter__()
+        if self.profiler is not None:
+            self.profiler.push(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        super().__exit__(exc_type, exc_val, exc_tb)
+        if self.profiler is not None:
+            self.profiler.pop(self, error=exc_type is not None)
+
+
+class Profiler:
+    """Record spans: Nested spans are tracked per thread."""
+
+    def __init__(self, name: str = "", max_spans: int = MAX_SPANS):
+        self.name = name
+        self.max_spans = max_spans
+
+        self.start_time = time.time()
+        # Set by the caller, e.g. the self debugging iteration.
+        self.iteration = None
+
+        self.spans: List[SpanData] = []
+        self.num_dropped = 0
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[Span]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def span(self, name: str, **kwargs) -> Span:
+        """A span recorded by this profiler."""
+        return Span(name, profiler=self, **kwargs)
+
+    def push(self, span: Span):
+        """Start a span."""
+        stack = self._stack()
+        span.depth = len(stack)
+        span.parent = stack[-1].name if stack else None
+        stack.append(span)
+
+    def pop(self, span: Span, error: bool = False):
+        """Finish a span."""
+        stack = self._stack()
+        if span in stack:
+            del stack[stack.index(span) :]
+
+        data = SpanData(
+            name=span.name,
+            start_seconds=span.start_time - self.start_time,
+            seconds=span.seconds,
+            depth=span.depth,
+            parent=span.parent,
+            iteration=self.iteration,
+            error=error,
+            thread_id=threading.get_ident(),
+            args=span.args,
+        )
+        with self._lock:
+            if len(self.spans) < self.max_spans:
+                self.spans.append(data)
+            else:
+                self.num_dropped += 1
+
+    def phase_seconds(self, by_name: bool = False) -> Dict[str, List[float]]:
+        """Runtime of spans by phase, or by name.
+
+        By phase, only the outermost spans of a phase are counted, e.g. `llm:call`
+        within `llm` is not, so that the runtime is not counted twice.
+        """
+        seconds = {}
+        with self._lock:
+            for span in self.spans:
+                if by_name:
+                    key = span.name
+                elif span.parent is not None and get_phase(span.parent) == span.phase:
+                    continue
+                else:
+                    key = span.phase
+                seconds.setdefault(key, []).append(span.seconds)
+        return seconds
+
+    def summary(self, by_name: bool = False) -> Dict[str, Dict[str, float]]:
+        """Summary by phase or name: Count, total, max and percentiles in seconds."""
+        summary = {}
+        for phase, seconds in sorted(self.phase_seconds(by_name).items()):
+            summary[phase] = {
+                "count": len(seconds),
+                "total": sum(seconds),
+                "max": max(seconds),
+            }
+            for pct in PERCENTILES:
+                summary[phase][f"p{pct}"] = percentile(seconds, pct)
+        return summary
+
+    def update_trajectory(self, traj):
+        """Add spans to a trajectory proto."""
+        with self._lock:
+            spans = tuple(self.spans)
+
+        for span in spans:
+            proto = traj.spans.add()
+            proto.name = span.name
+            proto.start_seconds = span.start_seconds
+            proto.seconds = span.seconds
+            proto.depth = span.depth
+            if span.parent is not None:
+                proto.parent = span.parent
+            if span.iteration is not None:
+                proto.iteration = span.iteration
+            proto.error = span.error
+
+        return traj
+
+    def update_metrics(self, proto):
+        """Add phase metrics to a metrics proto."""
+        for phase, summary in self.summary().items():
+            phase_proto = proto.phase_metrics.add()
+            phase_proto.phase = phase
+            phase_proto.count = summary["count"]
+            phase_proto.latency.seconds = summary["total"]
+            phase_proto.max_seconds = summary["max"]
+
+        return proto
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Chrome trace event format: Complete events (`ph` = `X`) in microseconds."""
+        with self._lock:
+            spans = tuple(self.spans)
+
+        pid = os.getpid()
+        events = []
+        for span in sorted(spans, key=lambda s: (s.start_seconds, s.depth)):
+            args = {key: str(value) for key, value in span.args.items()}
+            if span.iteration is not None:
+                args["iteration"] = span.iteration
+            if span.error:
+                args["error"] = True
+
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.phase,
+                    "ph": "X",
+                    "ts": int(span.start_seconds * 1e6),
+                    "dur": int(span.seconds * 1e6),
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": args,
+                }
+            )
+
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "name": self.name,
+                "start_time": self.start_time,
+                "num_dropped": self.num_dropped,
+            },
+        }
+
+    def export_chrome_trace(self, filename: str):
+        """Export as a Chrome trace JSON file."""
+        utils.export_json(filename, self.to_chrome_trace())
+
+
+def get_phase(name: str) -> str:
+    """Get phase of a span name."""
+    return name.split(PHASE_SEPARATOR, 1)[0]
+
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """Percentile with linear interpolation, same as `numpy.percentile` by default."""
+    if not values:
+        return None
+
+    values = sorted(values)
+    rank = (len(values) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+_CURRENT = contextvars.ContextVar("profiler", default=None)
+
+
+def get_profiler() -> Optional[Profiler]:
+    """Get the current profiler, if any."""
+    return _CURRENT.get()
+
+
+@contextlib.contextmanager
+def scope(profiler: Profiler):
+    """Set the current profiler within a scope."""
+    token = _CURRENT.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _CURRENT.reset(token)
+
+
+def span(name: str, **kwargs) -> Span:
+    """A span recorded by the current profiler, if any."""
+    return Span(name, profiler=get_profiler(), **kwargs)
+
+
+def traced(name: str):
+    """Decorator: Run a function within a span."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
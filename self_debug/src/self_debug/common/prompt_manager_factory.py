@@ -10,7 +10,7 @@ import logging
 import os
 from typing import Any, Sequence, Tuple
 
-from self_debug.common import utils
+from self_debug.common import utils, warm_pool
 
 
 FILENAME = "file_path"
@@ -51,7 +51,10 @@ class TemplatePromptManager(BasePromptManager):
         def _try_load_file(filename: str):
             for pwd in ("", os.path.dirname(os.path.dirname(__file__))):
                 try_file = os.path.join(pwd, filename) if pwd else filename
-                content = utils.load_file(try_file)
+                content = warm_pool.get_or_create(
+                    ("prompt", os.path.abspath(try_file)),
+                    lambda f=try_file: utils.load_file(f),
+                )
                 if content is not None:
                     return content
 
@@ -1,11 +1,13 @@
 from self_debug.lm import llm_agent_factory
 from self_debug.lang.base import builder_factory
 from self_debug.proto import config_pb2, metrics_pb2, trajectory_pb2
-from fuzzywuzzy import fuzz
+from self_debug.common import lazy_import
 from typing import Optional
 import logging
 import re
 
+fuzz = lazy_import.lazy_module("fuzzywuzzy.fuzz", "fuzzywuzzy")
+
 
 def fun_remove_line_number(input_string):
     # Use regex to match ", line <number>,"
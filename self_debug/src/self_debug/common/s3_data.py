@@ -18,8 +18,9 @@ from typing import Any, Optional, Tuple, Union
 
 from self_debug.proto import config_pb2
 
-import boto3
-from self_debug.common import github, git_repo, utils
+from self_debug.common import github, git_repo, lazy_import, utils
+
+boto3 = lazy_import.lazy_module("boto3")
 
 
 RANDOM_LEN = 6
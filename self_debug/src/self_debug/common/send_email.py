@@ -5,10 +5,10 @@ import os
 import sys
 from typing import Any, Dict, Sequence, Tuple, Union
 
-import boto3
-from botocore.exceptions import ClientError
+from self_debug.common import lazy_import, utils
 
-from self_debug.common import utils
+boto3 = lazy_import.lazy_module("boto3")
+botocore_exceptions = lazy_import.lazy_module("botocore.exceptions", "botocore")
 
 
 AWS_REGION = "us-east-1"
@@ -94,7 +94,7 @@ def email(
             logging.info("Email sent! Message ID: ```%s```.", response["MessageId"])
             sent = True
         # Display an error if something goes wrong.
-        except ClientError as error:
+        except botocore_exceptions.ClientError as error:
             logging.exception(
                 "Failed to send email: <<<%s>>>.", error.response["Error"]["Message"]
             )
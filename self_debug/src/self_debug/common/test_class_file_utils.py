@@ -0,0 +1,123 @@
+"""Unit tests for class_file_utils.py."""
+
+import logging
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+import zipfile
+
+from parameterized import parameterized
+
+from self_debug.common import class_file_utils, utils
+
+
+def _header(major: int, magic: int = 0xCAFEBABE, minor: int = 0) -> bytes:
+    return struct.pack(">IHH", magic, minor, major) + b"\x00" * 16
+
+
+class TestClassFileUtils(unittest.TestCase):
+    """Unit tests for class_file_utils.py."""
+
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root_dir)
+
+    def _export(self, files):
+        for path, major in files:
+            path = os.path.join(self.root_dir, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            utils.export_file(path, _header(major), "wb")
+
+    @parameterized.expand(
+        (
+            (_header(52), 52),
+            (_header(61, minor=3), 61),
+            (_header(61, magic=0xCAFEBABF), None),
+            (_header(61)[:7], None),
+            (b"", None),
+        )
+    )
+    def test_parse_major_version(self, header, expected):
+        """Unit tests parse_major_version."""
+        self.assertEqual(class_file_utils.parse_major_version(header), expected)
+
+    @parameterized.expand(
+        (
+            (
+                (
+                    ("target/classes/a/A.class", 61),
+                    ("m/target/classes/B.class", 61),
+                    ("m/target/classes/C.class", 52),
+                    ("m/target/test-classes/CTest.class", 55),
+                    ("out/D.class", 50),
+                ),
+                {
+                    "": {61: 2, 52: 1},
+                    "custom": {61: 2, 52: 1, 50: 1},
+                },
+            ),
+            (
+                (
+                    ("out/D.class", 50),
+                    ("out/test/DTest.class", 55),
+                ),
+                {
+                    "": {},
+                    "custom": {50: 1},
+                },
+            ),
+        )
+    )
+    def test_get_major_version_histogram(self, files, expected):
+        """Unit tests get_major_version_histogram."""
+        self._export(files)
+
+        self.assertEqual(
+            class_file_utils.get_major_version_histogram(self.root_dir), expected[""]
+        )
+        self.assertEqual(
+            class_file_utils.get_major_version_histogram(
+                self.root_dir, custom_class_dirs=True
+            ),
+            expected["custom"],
+        )
+        self.assertEqual(
+            utils.get_compiled_java_major_versions(self.root_dir),
+            set(expected[""] or expected["custom"]),
+        )
+
+    def test_get_major_version_histogram_jars(self):
+        """Unit tests get_major_version_histogram: Class files in jars."""
+        self._export((("target/classes/A.class", 61),))
+
+        with zipfile.ZipFile(os.path.join(self.root_dir, "target/a.jar"), "w") as jar:
+            jar.writestr("a/A.class", _header(61))
+            jar.writestr("a/B.class", _header(52))
+            jar.writestr("META-INF/versions/9/module-info.class", _header(53))
+            jar.writestr("a/README", b"")
+        utils.export_file(os.path.join(self.root_dir, "target/bad.jar"), "not a zip")
+
+        self.assertEqual(
+            class_file_utils.get_major_version_histogram(self.root_dir, jars=True),
+            {61: 2, 52: 1},
+        )
+
+    def test_get_compiled_java_major_versions(self):
+        """Unit tests utils.get_compiled_java_major_versions: Without a JDK."""
+        self.assertIsNone(utils.get_compiled_java_major_versions(self.root_dir))
+
+        self._export(
+            (("target/classes/A.class", 61), ("module/target/classes/B.class", 52))
+        )
+        self.assertEqual(
+            utils.get_compiled_java_major_versions(self.root_dir), {52, 61}
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
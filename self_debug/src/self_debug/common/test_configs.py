@@ -1,5 +1,6 @@
 """Unit tests for proto/*.proto and testdata/*.pbtxt."""
 
+import glob
 import logging
 import os
 import tempfile
@@ -85,6 +86,17 @@ class TestConfigs(unittest.TestCase):
             loaded_proto = utils.load_proto(tmp_file, expected_proto_type)
             self.assertEqual(proto, loaded_proto)
 
+    def test_show_deprecation(self):
+        """Unit test for java configs: Deprecated APIs are counted from build logs."""
+        pwd = os.path.dirname(os.path.abspath(__file__))
+
+        filenames = sorted(glob.glob(os.path.join(pwd, "../configs/*.pbtxt")))
+        self.assertTrue(filenames)
+        for filename in filenames:
+            config = utils.load_proto(filename, config_pb2.Config)
+            if config.builder.HasField("maven_builder"):
+                self.assertTrue(config.builder.maven_builder.show_deprecation, filename)
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
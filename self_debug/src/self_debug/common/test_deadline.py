@@ -0,0 +1,127 @@
+"""Unit tests for deadline.py."""
+
+import logging
+import time
+import unittest
+
+from parameterized import parameterized
+
+from self_debug.common import deadline as deadline_lib
+from self_debug.common import utils
+
+
+class TestDeadline(unittest.TestCase):
+    """Unit tests for deadline.py."""
+
+    @parameterized.expand(
+        (
+            (None, None, None),
+            (None, 10, 10),
+            (100, None, 100),
+            (100, 10, 10),
+            (10, 100, 10),
+            (-1, 10, 0),
+        )
+    )
+    def test_timeout(self, seconds, timeout, expected):
+        """Unit tests Deadline.timeout."""
+        deadline = deadline_lib.Deadline.from_seconds(seconds)
+
+        result = deadline.timeout(timeout)
+        if expected is None:
+            self.assertIsNone(result)
+        else:
+            self.assertAlmostEqual(result, expected, delta=1)
+        self.assertEqual(deadline.expired, seconds is not None and seconds < 0)
+
+    def test_check(self):
+        """Unit tests Deadline.check."""
+        deadline_lib.Deadline.from_seconds(10).check("step")
+
+        deadline = deadline_lib.Deadline.from_seconds(-1, name="debug")
+        with self.assertRaises(deadline_lib.DeadlineExceeded) as context:
+            deadline.check("build")
+        self.assertIsInstance(context.exception, TimeoutError)
+        self.assertEqual(context.exception.step, "build")
+        self.assertIn("debug", str(context.exception))
+
+    def test_scope(self):
+        """Unit tests scope: Nested deadlines are never later than outer ones."""
+        self.assertIsNone(deadline_lib.get_deadline())
+        self.assertEqual(deadline_lib.get_timeout(10), 10)
+
+        with deadline_lib.scope(100, name="outer") as outer:
+            self.assertIs(deadline_lib.get_deadline(), outer)
+            self.assertAlmostEqual(deadline_lib.get_timeout(), 100, delta=1)
+
+            with deadline_lib.scope(1000, name="inner") as inner:
+                self.assertEqual(inner.expires_at, outer.expires_at)
+                self.assertEqual(inner.name, "inner")
+
+            with deadline_lib.scope(None) as inner:
+                self.assertEqual(inner.expires_at, outer.expires_at)
+
+            with deadline_lib.scope(10) as inner:
+                self.assertLess(inner.expires_at, outer.expires_at)
+                self.assertAlmostEqual(deadline_lib.get_timeout(100), 10, delta=1)
+
+            self.assertIs(deadline_lib.get_deadline(), outer)
+
+        self.assertIsNone(deadline_lib.get_deadline())
+
+    def test_unbounded(self):
+        """Unit tests unbounded: Commands run after the outer deadline is exceeded."""
+        with deadline_lib.scope(-1, name="expired") as outer:
+            self.assertTrue(utils.is_timeout(utils.do_run_command("echo done")))
+
+            with deadline_lib.unbounded(name="cleanup") as deadline:
+                self.assertIs(deadline_lib.get_deadline(), deadline)
+                self.assertIsNone(deadline.remaining_seconds())
+                self.assertEqual(utils.do_run_command("echo done").stdout, "done")
+
+            self.assertIs(deadline_lib.get_deadline(), outer)
+
+    def test_sleep(self):
+        """Unit tests sleep: Cut short by the deadline."""
+        self.assertTrue(deadline_lib.sleep(0.01))
+
+        start = time.monotonic()
+        with deadline_lib.scope(0.1):
+            self.assertFalse(deadline_lib.sleep(10))
+        self.assertLess(time.monotonic() - start, 5)
+
+    @parameterized.expand(
+        (
+            ("sleep 10; echo done", {"timeout": 0.5}),
+            ("sleep 10 & sleep 10; echo done", {"timeout": 0.5}),
+            (
+                "sleep 10; echo done",
+                {"deadline": deadline_lib.Deadline.from_seconds(0.5)},
+            ),
+        )
+    )
+    def test_do_run_command_timeout(self, command, kwargs):
+        """Unit tests utils.do_run_command: The process group is killed on timeout."""
+        start = time.monotonic()
+        cmd_data = utils.do_run_command(command, **kwargs)
+
+        self.assertLess(time.monotonic() - start, 8)
+        self.assertTrue(utils.is_timeout(cmd_data))
+        self.assertNotEqual(cmd_data.return_code, 0)
+
+    def test_do_run_command_expired(self):
+        """Unit tests utils.do_run_command: Not run if the deadline is exceeded."""
+        with deadline_lib.scope(-1, name="expired"):
+            cmd_data = utils.do_run_command("echo done")
+
+        self.assertIsInstance(cmd_data.error, deadline_lib.DeadlineExceeded)
+        self.assertTrue(utils.is_timeout(cmd_data))
+
+        cmd_data = utils.do_run_command("echo done", timeout=10)
+        self.assertFalse(utils.is_timeout(cmd_data))
+        self.assertEqual(cmd_data.stdout, "done")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
@@ -0,0 +1,220 @@
+"""Unit tests for dependency_resolver.py."""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from parameterized import parameterized
+
+from self_debug.common import dependency_resolver, eval_utils, utils
+
+# pylint: disable=line-too-long
+DEPENDENCY_TREE = r"""[INFO] Scanning for projects...
+[INFO] ------------------------------------------------------------------------
+[INFO] Reactor Build Order:
+[INFO]
+[INFO] --- dependency:3.6.1:tree (default-cli) @ core ---
+[INFO] com.example:core:jar:1.0
+[INFO] +- org.springframework.boot:spring-boot-starter-web:jar:2.5.4:compile
+[INFO] |  +- org.springframework.boot:spring-boot-starter:jar:2.5.4:compile
+[INFO] |  |  \- org.yaml:snakeyaml:jar:1.28:compile
+[INFO] |  \- com.fasterxml.jackson.core:jackson-databind:jar:2.12.4:compile
+[INFO] +- com.google.guava:guava:jar:30.1-jre:compile
+[INFO] \- org.junit.jupiter:junit-jupiter:jar:5.7.2:test
+[INFO]
+[INFO] --- dependency:3.6.1:tree (default-cli) @ app ---
+[INFO] com.example:app:jar:1.0
+[INFO] +- com.example:core:jar:1.0:compile
+[INFO] |  \- com.google.guava:guava:jar:30.1-jre:compile
+[INFO] +- com.fasterxml.jackson.core:jackson-databind:jar:2.13.0:compile
+[INFO] \- io.netty:netty-all:jar:linux-x86_64:4.1.68.Final:compile
+[INFO] BUILD SUCCESS
+"""
+# pylint: enable=line-too-long
+
+POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <artifactId>{artifact_id}</artifactId>
+  <dependencies>
+{dependencies}
+  </dependencies>
+</project>
+"""
+
+DEPENDENCY = """    <dependency>
+      <groupId>{group_id}</groupId>
+      <artifactId>{artifact_id}</artifactId>
+    </dependency>"""
+
+
+def _pom(artifact_id: str, *keys) -> str:
+    dependencies = "\n".join(
+        DEPENDENCY.format(group_id=key.split(":")[0], artifact_id=key.split(":")[1])
+        for key in keys
+    )
+    return POM.format(artifact_id=artifact_id, dependencies=dependencies)
+
+
+class TestDependencyResolver(unittest.TestCase):
+    """Unit tests for dependency_resolver.py."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root_dir = os.path.join(self.temp_dir, "repo")
+        self.m2_dir = os.path.join(self.temp_dir, "m2")
+        os.makedirs(os.path.join(self.m2_dir, "repository"))
+
+        self.tree_file = self._write("dependency-tree.txt", DEPENDENCY_TREE)
+        self._write(
+            "repo/pom.xml",
+            _pom(
+                "core",
+                "org.springframework.boot:spring-boot-starter-web",
+                "com.google.guava:guava",
+                "org.junit.jupiter:junit-jupiter",
+            ),
+        )
+        self._write(
+            "repo/app/pom.xml",
+            _pom(
+                "app", "com.example:core", "com.fasterxml.jackson.core:jackson-databind"
+            ),
+        )
+
+        self.resolver = dependency_resolver.DependencyResolver(
+            command=f"cat {self.tree_file}", m2_dir=self.m2_dir
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, path: str, content: str) -> str:
+        filename = os.path.join(self.temp_dir, path)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(content)
+        return filename
+
+    def test_parse_dependency_tree(self):
+        """Unit tests parse_dependency_tree: The nearest one wins, then the last one."""
+        dependencies = dependency_resolver.parse_dependency_tree(DEPENDENCY_TREE)
+
+        self.assertEqual(
+            {key: (d.version, d.scope, d.depth) for key, d in dependencies.items()},
+            {
+                "org.springframework.boot:spring-boot-starter-web": (
+                    "2.5.4",
+                    "compile",
+                    1,
+                ),
+                "org.springframework.boot:spring-boot-starter": ("2.5.4", "compile", 2),
+                "org.yaml:snakeyaml": ("1.28", "compile", 3),
+                "com.fasterxml.jackson.core:jackson-databind": ("2.13.0", "compile", 1),
+                "com.google.guava:guava": ("30.1-jre", "compile", 1),
+                "org.junit.jupiter:junit-jupiter": ("5.7.2", "test", 1),
+                "com.example:core": ("1.0", "compile", 1),
+            },
+        )
+        self.assertEqual(dependency_resolver.parse_dependency_tree(None), {})
+
+    @parameterized.expand(
+        (
+            (
+                "org.yaml:snakeyaml",
+                None,
+                "1.28",
+            ),
+            (
+                "org.yaml:snakeyaml",
+                2,
+                None,
+            ),
+            (
+                "org.yaml:missing",
+                None,
+                None,
+            ),
+        )
+    )
+    def test_get_version(self, key, max_depth, expected_version):
+        """Unit tests Resolution.get_version."""
+        resolution = self.resolver.resolve(self.root_dir)
+        self.assertEqual(resolution.get_version(key, max_depth), expected_version)
+
+    def test_resolve_cached(self):
+        """Unit tests resolve: Cached by poms and m2 state."""
+        resolution = self.resolver.resolve(self.root_dir)
+        self.assertEqual(
+            resolution.get_declared_versions(),
+            {
+                "org.springframework.boot:spring-boot-starter-web": "2.5.4",
+                "com.fasterxml.jackson.core:jackson-databind": "2.13.0",
+                "com.google.guava:guava": "30.1-jre",
+                "org.junit.jupiter:junit-jupiter": "5.7.2",
+                "com.example:core": "1.0",
+            },
+        )
+        self.assertIs(self.resolver.resolve(self.root_dir), resolution)
+        self.assertEqual((self.resolver.num_hits, self.resolver.num_misses), (1, 1))
+
+        # Poms changed.
+        self._write("repo/app/pom.xml", _pom("app", "com.example:core"))
+        self.assertNotIn(
+            "com.fasterxml.jackson.core:jackson-databind",
+            self.resolver.resolve(self.root_dir).declared,
+        )
+        self.assertEqual((self.resolver.num_hits, self.resolver.num_misses), (1, 2))
+
+        # M2 state changed.
+        self._write("m2/settings.xml", "<settings/>")
+        self.resolver.resolve(self.root_dir)
+        self.assertEqual((self.resolver.num_hits, self.resolver.num_misses), (1, 3))
+
+    def test_resolve_failure(self):
+        """Unit tests resolve: Failures are not cached."""
+        self._write("repo/broken/pom.xml", "<project>")
+        self.assertIsNone(self.resolver.resolve(self.root_dir))
+        os.remove(os.path.join(self.root_dir, "broken", "pom.xml"))
+
+        resolver = dependency_resolver.DependencyResolver(
+            command="exit 1", m2_dir=self.m2_dir
+        )
+        self.assertIsNone(resolver.resolve(self.root_dir))
+        self.assertIsNone(resolver.resolve(self.root_dir))
+        self.assertEqual((resolver.num_hits, resolver.num_misses), (0, 2))
+
+    @parameterized.expand(
+        (
+            (True, True, []),
+            (False, False, ["com.google.guava:guava"]),
+        )
+    )
+    def test_check_versions(self, check_major_version, expected_status, expected_deps):
+        """Unit tests eval_utils.check_versions."""
+        dependency_version = self._write(
+            "dependency_version.json",
+            json.dumps(
+                {
+                    "com.google.guava:guava": "30.2",
+                    "org.junit.jupiter:junit-jupiter": "5.0.0",
+                    "org.yaml:snakeyaml": "2.0",
+                }
+            ),
+        )
+
+        status, results = eval_utils.check_versions(
+            self.root_dir,
+            dependency_version,
+            check_major_version=check_major_version,
+            resolver=self.resolver,
+        )
+        self.assertEqual(status, expected_status)
+        self.assertEqual([r["dependency"] for r in results], expected_deps)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
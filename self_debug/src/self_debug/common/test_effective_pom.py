@@ -0,0 +1,287 @@
+"""Unit tests for effective_pom.py."""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from parameterized import parameterized
+
+from self_debug.common import effective_pom, file_utils, maven_utils, utils
+
+_PWD = os.path.dirname(os.path.abspath(__file__))
+
+PARENT_POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <groupId>com.example</groupId>
+  <artifactId>parent</artifactId>
+  <version>1.0</version>
+  <packaging>pom</packaging>
+  <properties>
+    <java.version>11</java.version>
+    <maven.compiler.source>${java.version}</maven.compiler.source>
+  </properties>
+  <build>
+    <pluginManagement>
+      <plugins>
+        <plugin>
+          <groupId>org.apache.maven.plugins</groupId>
+          <artifactId>maven-compiler-plugin</artifactId>
+          <configuration>
+            <source>${java.version}</source>
+            <target>1.${java.minor}</target>
+          </configuration>
+        </plugin>
+      </plugins>
+    </pluginManagement>
+  </build>
+</project>
+"""
+
+CHILD_POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <parent>
+    <groupId>com.example</groupId>
+    <artifactId>parent</artifactId>
+    <version>1.0</version>
+    {relative_path}
+  </parent>
+  <artifactId>{artifact_id}</artifactId>
+  <properties>
+    <java.minor>8</java.minor>
+  </properties>
+</project>
+"""
+
+MISSING_MODULE_POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <groupId>com.example</groupId>
+  <artifactId>parent</artifactId>
+  <version>1.0</version>
+  <packaging>pom</packaging>
+  <modules>
+    <module>missing</module>
+  </modules>
+</project>
+"""
+
+REMOTE_CHILD_POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project>
+  <parent>
+    <groupId>org.springframework.boot</groupId>
+    <artifactId>spring-boot-starter-parent</artifactId>
+    <version>1.4.1.RELEASE</version>
+    <relativePath/>
+  </parent>
+  <artifactId>app</artifactId>
+</project>
+"""
+
+REMOTE_PARENT_POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project>
+  <groupId>org.springframework.boot</groupId>
+  <artifactId>spring-boot-starter-parent</artifactId>
+  <version>1.4.1.RELEASE</version>
+  <properties>
+    <java.version>1.6</java.version>
+    <maven.compiler.release>${java.version}</maven.compiler.release>
+    <maven.compiler.target>${project.version}</maven.compiler.target>
+  </properties>
+</project>
+"""
+
+
+class TestEffectivePom(unittest.TestCase):
+    """Unit tests for effective_pom.py."""
+
+    def setUp(self):
+        effective_pom.clear_cache()
+        self.temp_dir = tempfile.mkdtemp()
+        self.m2_repository = os.path.join(self.temp_dir, "m2")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, path: str, content: str) -> str:
+        filename = os.path.join(self.temp_dir, path)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(content)
+        return filename
+
+    @parameterized.expand(
+        (
+            (None, {}, None),
+            ("1.8", {}, "1.8"),
+            ("${a}", {"a": "11"}, "11"),
+            ("1.${a}", {"a": "8"}, "1.8"),
+            ("${a}-${b}", {"a": "${b}", "b": "17"}, "17-17"),
+            ("${a}", {"a": "${a}"}, "${a}"),
+            ("${env.JAVA}", {}, "${env.JAVA}"),
+        )
+    )
+    def test_interpolate(self, value, properties, expected):
+        """Unit tests interpolate."""
+        self.assertEqual(effective_pom.interpolate(value, properties), expected)
+
+    @parameterized.expand(
+        (
+            # Default relativePath.
+            ("", "pom.xml", "module/pom.xml"),
+            # Reactor.
+            ("<relativePath/>", "parent/pom.xml", "module/pom.xml"),
+            (
+                "<relativePath>../parent</relativePath>",
+                "parent/pom.xml",
+                "module/pom.xml",
+            ),
+        )
+    )
+    def test_get_java_versions(self, relative_path, parent_path, child_path):
+        """Unit tests get_java_versions: Parents in the reactor."""
+        filenames = [
+            self._write(parent_path, PARENT_POM),
+            self._write(
+                child_path,
+                CHILD_POM.format(relative_path=relative_path, artifact_id="module"),
+            ),
+        ]
+
+        expected = {
+            "maven.compiler.source": "11",
+            "source": "11",
+            "target": "1.8",
+        }
+        self.assertEqual(
+            effective_pom.get_java_versions(filenames, self.m2_repository),
+            ({"11", "1.8"}, expected),
+        )
+        # Unresolved `${java.minor}` in the parent itself.
+        del expected["target"]
+        self.assertEqual(
+            effective_pom.get_java_versions(filenames[:1], self.m2_repository),
+            ({"11"}, expected),
+        )
+
+    def test_get_java_versions_m2(self):
+        """Unit tests get_java_versions: Parents in the local repository."""
+        filenames = [self._write("pom.xml", REMOTE_CHILD_POM)]
+        self.assertIsNone(
+            effective_pom.get_java_versions(filenames, self.m2_repository)
+        )
+
+        self._write(
+            "m2/org/springframework/boot/spring-boot-starter-parent/1.4.1.RELEASE/"
+            "spring-boot-starter-parent-1.4.1.RELEASE.pom",
+            REMOTE_PARENT_POM,
+        )
+        self.assertEqual(
+            effective_pom.get_java_versions(filenames, self.m2_repository),
+            (
+                {"1.6", "1.4.1.RELEASE"},
+                {
+                    "maven.compiler.target": "1.4.1.RELEASE",
+                    "maven.compiler.release": "1.6",
+                },
+            ),
+        )
+
+    @parameterized.expand(
+        (
+            ((),),
+            (("./testdata/effective-pom.xml",),),
+            (("./testdata/java_pom_05.xml",),),
+        )
+    )
+    def test_get_java_versions_invalid(self, filenames):
+        """Unit tests get_java_versions: Not a pom."""
+        self.assertIsNone(
+            effective_pom.get_java_versions(
+                [os.path.join(_PWD, f) for f in filenames], self.m2_repository
+            )
+        )
+
+    def test_cache(self):
+        """Unit tests get_java_versions: Cached by pom content hashes."""
+        filenames = [
+            self._write("pom.xml", PARENT_POM),
+            self._write(
+                "a/pom.xml", CHILD_POM.format(relative_path="", artifact_id="a")
+            ),
+        ]
+
+        with mock.patch.object(
+            effective_pom, "_parse", wraps=effective_pom._parse
+        ) as mock_parse:
+            result = effective_pom.get_java_versions(filenames, self.m2_repository)
+            self.assertEqual(mock_parse.call_count, 2)
+
+            # Same contents, e.g. in another commit.
+            other = [
+                self._write(
+                    os.path.join("copy", os.path.relpath(f, self.temp_dir)),
+                    utils.load_file(f),
+                )
+                for f in filenames
+            ]
+            self.assertEqual(
+                effective_pom.get_java_versions(other, self.m2_repository), result
+            )
+            self.assertEqual(mock_parse.call_count, 2)
+
+            result[0].add("17")
+            self.assertEqual(
+                effective_pom.get_java_versions(filenames, self.m2_repository)[0],
+                {"11", "1.8"},
+            )
+
+            self._write("pom.xml", PARENT_POM.replace("11", "17"))
+            self.assertEqual(
+                effective_pom.get_java_versions(filenames, self.m2_repository)[0],
+                {"17", "1.8"},
+            )
+            self.assertEqual(mock_parse.call_count, 3)
+
+    def test_file_utils(self):
+        """Unit tests file_utils.get_java_versions: Without running maven."""
+        filenames = [self._write("pom.xml", REMOTE_CHILD_POM)]
+        self._write(
+            "m2/org/springframework/boot/spring-boot-starter-parent/1.4.1.RELEASE/"
+            "spring-boot-starter-parent-1.4.1.RELEASE.pom",
+            REMOTE_PARENT_POM,
+        )
+
+        with mock.patch.object(
+            effective_pom, "M2_REPOSITORY", self.m2_repository
+        ), mock.patch.object(utils, "do_run_command") as mock_run:
+            self.assertEqual(
+                file_utils.get_java_versions(filenames, self.temp_dir)[0],
+                {"1.6", "1.4.1.RELEASE"},
+            )
+            mock_run.assert_not_called()
+
+    def test_file_utils_fallback(self):
+        """Unit tests file_utils.get_java_versions: Maven runs without local versions."""
+        filenames = [self._write("pom.xml", MISSING_MODULE_POM)]
+
+        with mock.patch.object(
+            effective_pom, "M2_REPOSITORY", self.m2_repository
+        ), mock.patch.object(
+            utils, "do_run_command", return_value=utils.CmdData("", 1)
+        ) as mock_run, mock.patch.object(
+            maven_utils, "MVN_EFFECTIVE_POM_SLEEP_SECONDS", 0
+        ):
+            self.assertEqual(
+                file_utils.get_java_versions(
+                    filenames, self.temp_dir, return_int_on_failing_effective=True
+                ),
+                -1,
+            )
+            mock_run.assert_called()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
@@ -0,0 +1,142 @@
+"""Unit tests for fingerprint.py."""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from parameterized import parameterized
+
+from self_debug.common import fingerprint, hash_utils, utils
+
+
+# `tree .` output: With non-breaking spaces after vertical connectors.
+_TREE = """.
+├── a
+│\u00a0\u00a0 ├── B.java
+│\u00a0\u00a0 └── pom.xml
+├── pom.xml
+├── src_test
+│\u00a0\u00a0 └── x.txt
+└── Z.java
+
+2 directories, 5 files"""
+
+
+class TestFingerprint(unittest.TestCase):
+    """Unit tests for fingerprint.py."""
+
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp()
+        for path, content in (
+            ("a/B.java", "class B {}\n"),
+            ("a/pom.xml", "<project/>\r\n"),
+            ("pom.xml", "<project>\n</project>\n"),
+            ("src_test/x.txt", "x"),
+            ("Z.java", "class Z {\n}"),
+            (".hidden/C.java", "class C {}"),
+            (".git/HEAD", "ref: refs/heads/master"),
+        ):
+            path = os.path.join(self.root_dir, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            utils.export_file(path, content.encode(), "wb")
+
+    def tearDown(self):
+        shutil.rmtree(self.root_dir)
+
+    @parameterized.expand(
+        (
+            ("",),
+            ("a",),
+            ("a\n",),
+            ("a\nb",),
+            ("a\r\nb\r\n",),
+            ("a\rb\n\n",),
+            ("a\x0cb c",),
+            ("\n\n\n",),
+        )
+    )
+    def test_fingerprint_file(self, content):
+        """Unit tests fingerprint_file: Small files and memory mapped chunks."""
+        filename = os.path.join(self.root_dir, "file.txt")
+        data = content.encode()
+        utils.export_file(filename, data, "wb")
+
+        expected = (hashlib.sha256(data).hexdigest(), len(content.splitlines()))
+
+        result = fingerprint.fingerprint_file(filename)
+        self.assertEqual((result.sha256, result.num_lines), expected)
+
+        if not data:
+            return
+
+        # Memory mapped, in chunks of 2 bytes.
+        with mock.patch.object(fingerprint, "MMAP_THRESHOLD_BYTES", 0):
+            with mock.patch.object(fingerprint, "MMAP_CHUNK_BYTES", 2):
+                result = fingerprint.fingerprint_file(filename)
+        self.assertEqual((result.sha256, result.num_lines), expected)
+
+    def test_fingerprint(self):
+        """Unit tests fingerprint: Tree view, selected files and Merkle digests."""
+        fingerprinter = fingerprint.RepoFingerprinter(max_workers=2)
+        select = fingerprint.select_names(suffixes=(".java",), names=("pom.xml",))
+
+        snapshot = fingerprinter.fingerprint(
+            self.root_dir, select=select, keep_text=select
+        )
+        self.assertEqual(snapshot.tree, _TREE)
+        self.assertEqual(
+            sorted(os.path.relpath(f, self.root_dir) for f in snapshot.files),
+            [".hidden/C.java", "Z.java", "a/B.java", "a/pom.xml", "pom.xml"],
+        )
+        self.assertEqual(
+            snapshot.files[os.path.join(self.root_dir, "a/pom.xml")].text,
+            "<project/>\n",
+        )
+        self.assertEqual(
+            sorted(snapshot.dir_digests), [".", ".hidden", "a", "src_test"]
+        )
+
+        # Change one file: Only its dir and ancestors change.
+        utils.export_file(os.path.join(self.root_dir, "a/B.java"), "class B { }\n")
+        new_snapshot = fingerprinter.fingerprint(
+            self.root_dir, select=select, keep_text=select
+        )
+        self.assertEqual(new_snapshot.changed_dirs(snapshot), (".", "a"))
+
+        # Unchanged files are reused from the cache.
+        self.assertIs(
+            new_snapshot.files[os.path.join(self.root_dir, "Z.java")],
+            snapshot.files[os.path.join(self.root_dir, "Z.java")],
+        )
+
+    @parameterized.expand(
+        (
+            (True, True),
+            (True, False),
+            (False, True),
+        )
+    )
+    def test_get_repo_hash(self, hash_source, hash_pom):
+        """Unit tests get_repo_hash: Count tests separately."""
+        with mock.patch.object(hash_utils, "get_num_test_cases", return_value=3) as run:
+            for _ in range(2):
+                result, metrics = hash_utils.get_repo_hash(
+                    self.root_dir, hash_source=hash_source, hash_pom=hash_pom
+                )
+            run.assert_called_once()
+        self.assertEqual(metrics["repo-num-test-cases__EQ__0003"], 1)
+
+        result_no_tests, metrics = hash_utils.get_repo_hash(
+            self.root_dir, hash_source=hash_source, hash_pom=hash_pom, count_tests=False
+        )
+        self.assertEqual(result_no_tests, result)
+        self.assertFalse(any("test-cases" in key for key in metrics))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
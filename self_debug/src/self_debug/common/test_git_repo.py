@@ -206,7 +206,7 @@ class TestGitRepo(unittest.TestCase):
                         "GitRepo::RepoSnapshot::repo-root-dir-exists__EQ__True": 1,
                         "GitRepo::RepoSnapshot::repo-root-src-test-dir-exists__EQ__False": 1,
                         "GitRepo::RepoSnapshot::repo-num-loc__EQ__000000": 1,
-                        "GitRepo::RepoSnapshot::repo-num-test-cases__EQ__-002": 1,
+                        "GitRepo::RepoSnapshot::repo-num-test-cases__EQ__0000": 1,
                         "GitRepo::RepoSnapshot::repo_commit_first_00__EQ__": 1,
                         "GitRepo::RepoSnapshot::repo_commit_first_01__EQ__": 1,
                         "GitRepo::RepoSnapshot::repo_commit_last_00__EQ__": 1,
@@ -250,7 +250,7 @@ class TestGitRepo(unittest.TestCase):
                         "GitRepo::RepoSnapshot::repo-root-dir-exists__EQ__True": 1,
                         "GitRepo::RepoSnapshot::repo-root-src-test-dir-exists__EQ__False": 1,
                         "GitRepo::RepoSnapshot::repo-num-loc__EQ__000000": 1,
-                        "GitRepo::RepoSnapshot::repo-num-test-cases__EQ__-002": 1,
+                        "GitRepo::RepoSnapshot::repo-num-test-cases__EQ__0000": 1,
                         "GitRepo::RepoSnapshot::repo_commit_first_00__EQ__": 1,
                         "GitRepo::RepoSnapshot::repo_commit_first_01__EQ__": 1,
                         "GitRepo::RepoSnapshot::repo_commit_last_00__EQ__": 1,
@@ -299,7 +299,7 @@ class TestGitRepo(unittest.TestCase):
                         "GitRepo::RepoSnapshot::repo-root-dir-exists__EQ__True": 1,
                         "GitRepo::RepoSnapshot::repo-root-src-test-dir-exists__EQ__False": 1,
                         "GitRepo::RepoSnapshot::repo-num-loc__EQ__000000": 1,
-                        "GitRepo::RepoSnapshot::repo-num-test-cases__EQ__-002": 1,
+                        "GitRepo::RepoSnapshot::repo-num-test-cases__EQ__0000": 1,
                         "GitRepo::RepoSnapshot::repo_commit_first_00__EQ__": 1,
                         "GitRepo::RepoSnapshot::repo_commit_first_01__EQ__": 1,
                         "GitRepo::RepoSnapshot::repo_commit_last_00__EQ__": 1,
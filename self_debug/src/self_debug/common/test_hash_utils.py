@@ -209,7 +209,7 @@ class TestHashUtils(unittest.TestCase):
         {
             "repo-num-files-java__EQ__0000": 1,
             "repo-num-loc__EQ__000000": 1,
-            "repo-num-test-cases__EQ__-002": 1,
+            "repo-num-test-cases__EQ__0000": 1,
             "repo-num-files-pom-xml__EQ__0003": 1,
             "repo-num-files-root-any-test-java__EQ__0000": 1,
             "repo-num-files-src-test-any-java__EQ__0000": 1,
@@ -233,7 +233,7 @@ class TestHashUtils(unittest.TestCase):
                         int,
                         {
                             "repo-num-loc__EQ__000000": 1,
-                            "repo-num-test-cases__EQ__-002": 1,
+                            "repo-num-test-cases__EQ__0000": 1,
                             "repo-root-dir-exists__EQ__True": 1,
                             "repo-root-src-test-dir-exists__EQ__False": 1,
                         },
@@ -253,7 +253,7 @@ class TestHashUtils(unittest.TestCase):
                         int,
                         {
                             "repo-num-loc__EQ__000000": 1,
-                            "repo-num-test-cases__EQ__-002": 1,
+                            "repo-num-test-cases__EQ__0000": 1,
                             "repo-root-dir-exists__EQ__True": 1,
                             "repo-root-src-test-dir-exists__EQ__False": 1,
                             "repo-num-files-java__EQ__0000": 1,
@@ -0,0 +1,186 @@
+"""Unit tests for junit_utils.py."""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import xml.etree.ElementTree as ET
+
+from parameterized import parameterized
+
+from self_debug.common import hash_utils, junit_utils, utils
+from self_debug.lang.java import ast_parser
+
+
+_JUNIT4 = """
+package a;
+
+import org.junit.Test;
+
+public class ATest {
+    // @Test
+    /* @Test
+     * public void testCommented() {}
+     */
+    private static final String S = "@Test";
+
+    @Test
+    public void a() {}
+
+    @Test(expected = IllegalStateException.class)
+    public void b() {}
+
+    @org.junit.jupiter.api.Test
+    void c() {}
+
+    @ParameterizedTest
+    @ValueSource(strings = {"x", "y"})
+    void d(String s) {}
+
+    @TestFactory
+    Object e() { return null; }
+
+    @Before
+    public void setUp() {}
+}
+"""
+
+_JUNIT3 = """
+public class BTest extends junit.framework.TestCase {
+    public void testA() {}
+
+    public final void testB() throws Exception {}
+
+    @Test
+    public void testC() {}
+
+    public void testWithArg(int x) {}
+
+    private void testPrivate() {}
+
+    public void helper() {}
+}
+"""
+
+# The same shape as the AST parser's output, e.g. `lang/java/testdata/ast_parser.xml`.
+_AST = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
+<root>
+    <Package>b</Package>
+    <Class>
+        <Name>BTest</Name>
+        <Signature> public class BTest extends TestCase</Signature>
+        <LineStart>1</LineStart>
+        <LineEnd>5</LineEnd>
+        <Parents>
+            <Parent>
+                <Name>TestCase</Name>
+                <Signature>TestCase</Signature>
+                <LineStart>1</LineStart>
+            </Parent>
+        </Parents>
+        <Constructors/>
+        <Methods>
+            <Method>
+                <Name>testA</Name>
+                <Signature> public void testA()</Signature>
+                <Override>false</Override>
+                <LineStart>2</LineStart>
+                <LineEnd>2</LineEnd>
+                <Parameters/>
+            </Method>
+            <Method>
+                <Name>a</Name>
+                <Signature>@Test public void a()</Signature>
+                <Override>false</Override>
+                <LineStart>3</LineStart>
+                <LineEnd>3</LineEnd>
+                <Parameters/>
+            </Method>
+            <Method>
+                <Name>helper</Name>
+                <Signature> public void helper()</Signature>
+                <Override>false</Override>
+                <LineStart>4</LineStart>
+                <LineEnd>4</LineEnd>
+                <Parameters/>
+            </Method>
+        </Methods>
+    </Class>
+</root>"""
+
+
+class TestJunitUtils(unittest.TestCase):
+    """Unit tests for junit_utils.py."""
+
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp()
+        for path, content in (
+            ("src/test/java/a/ATest.java", _JUNIT4),
+            ("module/src/test/java/b/BTest.java", _JUNIT3),
+            ("src/main/java/a/A.java", _JUNIT4),
+            ("src/test/resources/test.txt", _JUNIT4),
+        ):
+            path = os.path.join(self.root_dir, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            utils.export_file(path, content)
+
+        junit_utils._CACHE.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.root_dir)
+
+    @parameterized.expand(
+        (
+            ("", 0),
+            (_JUNIT4, 4),
+            (_JUNIT3, 3),
+            ('String s = "\\"@Test"; // @Test\n@Test void a() {}', 1),
+            ('String s = """\n  @Test\n  """;', 0),
+            ("public void testA() {}", 0),
+        )
+    )
+    def test_count_test_methods(self, text, expected):
+        """Unit tests count_test_methods."""
+        self.assertEqual(junit_utils.count_test_methods(text), expected)
+
+    def test_count_test_methods_from_ast(self):
+        """Unit tests count_test_methods_from_ast."""
+        parser = ast_parser.JavaAstParser(self.root_dir)
+        self.assertEqual(
+            junit_utils.count_test_methods_from_ast(
+                parser, "BTest.java", ET.fromstring(_AST)
+            ),
+            2,
+        )
+
+    def test_estimate_num_test_cases(self):
+        """Unit tests estimate_num_test_cases: Cached by content."""
+        self.assertEqual(junit_utils.estimate_num_test_cases(""), -2)
+        self.assertEqual(junit_utils.estimate_num_test_cases(self.root_dir), 7)
+
+        with mock.patch.object(junit_utils, "count_test_methods") as count:
+            self.assertEqual(junit_utils.estimate_num_test_cases(self.root_dir), 7)
+            count.assert_not_called()
+
+        # Test files are counted with the AST parser if given, in one batch.
+        junit_utils._CACHE.clear()
+        parser = mock.MagicMock()
+        parser.parse.return_value = (None, {})
+        self.assertEqual(
+            junit_utils.estimate_num_test_cases(self.root_dir, ast_parser=parser), 7
+        )
+        parser.parse.assert_called_once()
+        self.assertEqual(len(parser.parse.call_args[0][0]), 2)
+
+    def test_get_num_test_cases(self):
+        """Unit tests get_num_test_cases: Maven is opt-in."""
+        with mock.patch.object(utils, "run_command") as run:
+            self.assertEqual(hash_utils.get_num_test_cases(self.root_dir), 7)
+            run.assert_not_called()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
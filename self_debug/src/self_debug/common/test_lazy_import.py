@@ -0,0 +1,117 @@
+"""Unit tests for lazy_import.py."""
+
+import logging
+import os
+import subprocess
+import sys
+import unittest
+
+from parameterized import parameterized
+
+from self_debug.common import lazy_import, utils
+
+
+# Heavy modules, which are imported on first use only.
+HEAVY_MODULES = (
+    "boto3",
+    "botocore",
+    "datasets",
+    "fuzzywuzzy",
+    "migration_bench",
+    "numpy",
+    "requests",
+    "torch",
+    "transformers",
+)
+
+# Cumulative import time: Loose enough for a slow machine.
+IMPORT_BUDGET_SECONDS = 3.0
+
+
+def _import_times(module: str):
+    """Cumulative import time in seconds by module, with `python -X importtime`."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        env=env,
+        text=True,
+        check=False,
+    )
+    if result.returncode:
+        raise ImportError(result.stderr.splitlines()[-1])
+
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+class TestLazyImport(unittest.TestCase):
+    """Unit tests for lazy_import.py."""
+
+    def test_lazy_module(self):
+        """Unit tests lazy_module: Imported on first attribute access."""
+        sys.modules.pop("colorsys", None)
+
+        module = lazy_import.lazy_module("colorsys")
+        self.assertIsInstance(module, lazy_import.LazyModule)
+        self.assertFalse(module.loaded)
+        self.assertFalse(lazy_import.is_imported("colorsys"))
+        self.assertIn("not loaded", repr(module))
+
+        self.assertEqual(module.rgb_to_hsv(1.0, 0.0, 0.0), (0.0, 1.0, 1.0))
+        self.assertTrue(module.loaded)
+        self.assertTrue(lazy_import.is_imported("colorsys"))
+        self.assertIn("rgb_to_hsv", dir(module))
+
+        # Already imported: The module itself.
+        self.assertIs(lazy_import.lazy_module("colorsys"), sys.modules["colorsys"])
+
+    @parameterized.expand(
+        (
+            ("no_such_module_for_test", None, "pip install no_such_module_for_test"),
+            ("no_such_module_for_test.sub", "pkg", "pip install pkg"),
+        )
+    )
+    def test_lazy_module_missing(self, name, package, expected_hint):
+        """Unit tests lazy_module: Missing modules fail on first use."""
+        module = lazy_import.lazy_module(name, package)
+
+        with self.assertRaisesRegex(ImportError, expected_hint):
+            module.any_function()
+        self.assertFalse(hasattr(module, "__path__"))
+        self.assertFalse(module.loaded)
+
+    @parameterized.expand(
+        (
+            ("self_debug.common.dedup",),
+            ("self_debug.common.reflection",),
+            ("self_debug.common.s3_data",),
+            ("self_debug.common.send_email",),
+            ("self_debug.datasets.hf_utils",),
+            ("self_debug.eval.final_eval",),
+            ("self_debug.lm.llm_agent_factory",),
+            ("self_debug.metrics.cloud_watch",),
+            ("self_debug.run_self_debugging",),
+            ("self_debug.self_debugging",),
+        )
+    )
+    def test_import_time(self, module):
+        """Heavy modules are not imported eagerly, within an import time budget."""
+        times = _import_times(module)
+
+        self.assertIn(module, times)
+        for name in times:
+            self.assertNotIn(name.split(".")[0], HEAVY_MODULES, name)
+        self.assertLess(times[module], IMPORT_BUDGET_SECONDS)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
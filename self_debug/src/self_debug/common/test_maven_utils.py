@@ -63,6 +63,28 @@ class TestMavenUtils(unittest.TestCase):
             maven_utils.replace_maven_command(command, **kwargs), expected_command
         )
 
+    @parameterized.expand(
+        (
+            ("cd {root_dir}", "cd {root_dir}"),
+            (
+                "cd {root_dir}; mvn clean verify",
+                f"cd {{root_dir}}; mvn {maven_utils.MVN_SHOW_DEPRECATION_OPTIONS} clean verify",  # pylint: disable=line-too-long
+            ),
+            (
+                "cd {root_dir}; mvn compile; /tmp/mvn clean verify | tee log.txt",
+                f"cd {{root_dir}}; mvn compile; /tmp/mvn {maven_utils.MVN_SHOW_DEPRECATION_OPTIONS} clean verify | tee log.txt",  # pylint: disable=line-too-long
+            ),
+            # Added already
+            (
+                f"mvn {maven_utils.MVN_SHOW_DEPRECATION_OPTIONS} clean verify",
+                f"mvn {maven_utils.MVN_SHOW_DEPRECATION_OPTIONS} clean verify",
+            ),
+        )
+    )
+    def test_add_maven_options(self, command, expected_command):
+        """Unit tests add_maven_options."""
+        self.assertEqual(maven_utils.add_maven_options(command), expected_command)
+
     @parameterized.expand(
         # pylint: disable=line-too-long
         (
@@ -0,0 +1,210 @@
+"""Unit tests for pom_transformer.py."""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from xml.etree import ElementTree
+
+from parameterized import parameterized
+
+from self_debug.common import pom_transformer, pom_utils, utils
+
+_PWD = os.path.dirname(os.path.abspath(__file__))
+
+POM_WITH_PROPERTIES = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <modelVersion>4.0.0</modelVersion>
+  <parent>
+    <groupId>org.springframework.boot</groupId>
+    <artifactId>spring-boot-starter-parent</artifactId>
+    <version>2.1.0.RELEASE</version>
+  </parent>
+  <properties>
+    <java.version>1.8</java.version>
+    <guava.version>${guava.base}</guava.version>
+    <guava.base>20.0</guava.base>
+    <junit.version>5.9.0</junit.version>
+  </properties>
+  <dependencies>
+    <dependency>
+      <groupId>com.google.guava</groupId>
+      <artifactId>guava</artifactId>
+      <version>${guava.version}</version>
+    </dependency>
+    <dependency>
+      <groupId>org.junit.jupiter</groupId>
+      <artifactId>junit-jupiter</artifactId>
+      <version>${junit.version}</version>
+    </dependency>
+    <dependency>
+      <groupId>org.projectlombok</groupId>
+      <artifactId>lombok</artifactId>
+    </dependency>
+  </dependencies>
+</project>
+"""
+
+POM_WITHOUT_DEPENDENCIES = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <modelVersion>4.0.0</modelVersion>
+  <groupId>com.example</groupId>
+  <artifactId>demo</artifactId>
+  <version>1.0</version>
+</project>
+"""
+
+CANDIDATE = {
+    "org.springframework.boot:spring-boot-starter-parent": "3.2.0",
+    "com.google.guava:guava": "33.0.0-jre",
+    "org.junit.jupiter:junit-jupiter": "5.8.0",
+    "org.projectlombok:lombok": "1.18.30",
+    "com.example:missing": "1.0",
+}
+
+
+def _legacy_apply_selected_notes(pom_file: str, candidate):
+    """The legacy loop: Parse and write per dependency."""
+    for group_artifact, version in candidate.items():
+        group_id, artifact_id = group_artifact.split(":")
+        pom_utils.update_pom_content(
+            pom_file, "dependency", group_id, artifact_id, version, pom_file
+        )
+
+
+def _candidate(pom_file: str):
+    """Upgrade and downgrade every other dependency, plus the parent."""
+    doc = pom_transformer.PomDocument(pom_file)
+    candidate = {}
+    for index, (group_id, artifact_id) in enumerate(sorted(doc.dependencies, key=str)):
+        if group_id and artifact_id:
+            candidate[f"{group_id}:{artifact_id}"] = "99.0" if index % 2 else "0.1"
+
+    parent = doc.root.find("xmlns:parent", namespaces=pom_utils.namespaces)
+    if parent is not None:
+        group_id = parent.find("xmlns:groupId", namespaces=pom_utils.namespaces)
+        artifact_id = parent.find("xmlns:artifactId", namespaces=pom_utils.namespaces)
+        candidate[f"{group_id.text}:{artifact_id.text}"] = "99.0"
+
+    candidate["com.example:missing"] = "1.0"
+    return candidate
+
+
+class TestPomTransformer(unittest.TestCase):
+    """Unit tests for pom_transformer.py."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _copy(self, pom_file: str, name: str) -> str:
+        new_pom_file = os.path.join(self.temp_dir, name)
+        shutil.copy(pom_file, new_pom_file)
+        return new_pom_file
+
+    def _write(self, content: str, name: str = "pom.xml") -> str:
+        pom_file = os.path.join(self.temp_dir, name)
+        with open(pom_file, "w", encoding="utf-8") as f:
+            f.write(content)
+        return pom_file
+
+    def _assert_same_as_legacy(self, pom_file: str, candidate):
+        lhs = self._copy(pom_file, "lhs.xml")
+        rhs = self._copy(pom_file, "rhs.xml")
+
+        pom_utils.apply_selected_notes(lhs, candidate)
+        _legacy_apply_selected_notes(rhs, candidate)
+
+        self.assertEqual(
+            ElementTree.tostring(ElementTree.parse(lhs).getroot()),
+            ElementTree.tostring(ElementTree.parse(rhs).getroot()),
+        )
+
+    @parameterized.expand(
+        (
+            ("java_pom_00_ns.xml",),
+            ("java_pom_02_xmpp_light_ns.xml",),
+            ("java_pom_06.xml",),
+            ("java_pom_08_multi_plugins.xml",),
+            ("java_pom_10.xml",),
+        )
+    )
+    def test_same_as_legacy(self, filename):
+        """Unit tests apply_selected_notes: Same as the legacy per dependency loop."""
+        pom_file = os.path.join(_PWD, "testdata", filename)
+        self._assert_same_as_legacy(pom_file, _candidate(pom_file))
+
+    @parameterized.expand(
+        (
+            (POM_WITH_PROPERTIES,),
+            (POM_WITHOUT_DEPENDENCIES,),
+        )
+    )
+    def test_same_as_legacy_crafted(self, content):
+        """Unit tests apply_selected_notes: Property versions, parent and no deps."""
+        self._assert_same_as_legacy(self._write(content), CANDIDATE)
+
+    def test_update_versions(self):
+        """Unit tests update_versions: Property versions are resolved."""
+        pom_file = self._write(POM_WITH_PROPERTIES)
+
+        doc = pom_transformer.PomDocument(pom_file)
+        self.assertEqual(doc.resolve("${guava.version}"), "20.0")
+        # guava, parent: Upgraded; junit: Downgrade skipped; lombok: No version.
+        self.assertEqual(doc.update_versions(CANDIDATE), 2)
+        doc.write()
+
+        doc = pom_transformer.PomDocument(pom_file)
+        versions = {
+            key: ref.version.text if ref.version is not None else None
+            for key, (ref,) in doc.dependencies.items()
+        }
+        self.assertEqual(
+            versions,
+            {
+                ("com.google.guava", "guava"): "33.0.0-jre",
+                ("org.junit.jupiter", "junit-jupiter"): "${junit.version}",
+                ("org.projectlombok", "lombok"): None,
+            },
+        )
+
+    @parameterized.expand(
+        (
+            ({}, None, None),
+            ({"a": "1"}, "${a}", "1"),
+            ({"a": "${b}", "b": "2"}, "${a}", "2"),
+            ({"a": "${b}", "b": "${a}"}, "${a}", None),
+            ({"a": "1"}, "${b}", None),
+            ({"a": "1"}, "1.0", "1.0"),
+        )
+    )
+    def test_resolve_property(self, properties, value, expected):
+        """Unit tests resolve_property."""
+        self.assertEqual(pom_transformer.resolve_property(properties, value), expected)
+
+    def test_transform_poms(self):
+        """Unit tests transform_poms: JDK and versions for multiple poms."""
+        pom_files = [
+            self._write(POM_WITH_PROPERTIES, "pom.xml"),
+            self._write(POM_WITHOUT_DEPENDENCIES, "module.xml"),
+        ]
+
+        result = pom_transformer.transform_poms(
+            pom_files, max_workers=2, candidate=CANDIDATE, jdk=True
+        )
+        # JDK + 2 versions; JDK + mega block + no parent.
+        self.assertEqual(result, {pom_files[0]: 3, pom_files[1]: 2})
+
+        properties = pom_utils.extract_pom_property(ElementTree.parse(pom_files[0]))
+        self.assertEqual(properties["java.version"], pom_transformer.JDK_VERSION)
+        self.assertEqual(
+            properties["maven.compiler.source"], pom_transformer.JDK_VERSION
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
@@ -0,0 +1,146 @@
+"""Unit tests for profiler.py."""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import unittest
+
+from parameterized import parameterized
+
+from self_debug.proto import metrics_pb2, trajectory_pb2
+from self_debug.common import git_repo, profiler, utils
+
+
+class TestProfiler(unittest.TestCase):
+    """Unit tests for profiler.py."""
+
+    @parameterized.expand(
+        (
+            ((), 50, None),
+            ((3,), 95, 3),
+            ((1, 2, 3, 4), 50, 2.5),
+            ((4, 1, 3, 2), 0, 1),
+            ((1, 2, 3, 4), 100, 4),
+            ((0, 10), 95, 9.5),
+        )
+    )
+    def test_percentile(self, values, pct, expected):
+        """Unit tests percentile."""
+        self.assertEqual(profiler.percentile(values, pct), expected)
+
+    def test_span_without_profiler(self):
+        """Unit tests span: A plain timer without the current profiler."""
+        self.assertIsNone(profiler.get_profiler())
+
+        with profiler.span("llm") as span:
+            pass
+        self.assertIsNotNone(span.seconds)
+        self.assertIsNone(span.profiler)
+
+    def test_nested_spans(self):
+        """Unit tests nested spans, by iteration."""
+
+        @profiler.traced("llm")
+        def _llm():
+            with profiler.span("llm:call", model="m"):
+                pass
+            return 1
+
+        prof = profiler.Profiler(name="project")
+        with profiler.scope(prof):
+            prof.iteration = 1
+            self.assertEqual(_llm(), 1)
+
+            prof.iteration = 2
+            with self.assertRaises(ValueError):
+                with profiler.span("git:commit"):
+                    raise ValueError("error")
+
+        self.assertIsNone(profiler.get_profiler())
+        self.assertEqual(
+            [(s.name, s.depth, s.parent, s.iteration, s.error) for s in prof.spans],
+            [
+                ("llm:call", 1, "llm", 1, False),
+                ("llm", 0, None, 1, False),
+                ("git:commit", 0, None, 2, True),
+            ],
+        )
+        self.assertEqual(
+            {phase: len(s) for phase, s in prof.phase_seconds().items()},
+            {"llm": 1, "git": 1},
+        )
+        self.assertEqual(
+            {name: len(s) for name, s in prof.phase_seconds(by_name=True).items()},
+            {"llm": 1, "llm:call": 1, "git:commit": 1},
+        )
+        summary = prof.summary()
+        self.assertEqual(sorted(summary), ["git", "llm"])
+        self.assertEqual(summary["llm"]["count"], 1)
+        self.assertIn("p95", summary["llm"])
+
+        # Protos.
+        traj = prof.update_trajectory(trajectory_pb2.Trajectory())
+        self.assertEqual(len(traj.spans), 3)
+        self.assertEqual(traj.spans[0].parent, "llm")
+        self.assertTrue(traj.spans[2].error)
+
+        metrics = prof.update_metrics(metrics_pb2.Metrics())
+        self.assertEqual(
+            [(p.phase, p.count) for p in metrics.phase_metrics],
+            [("git", 1), ("llm", 1)],
+        )
+
+        # Chrome trace.
+        trace = prof.to_chrome_trace()
+        self.assertEqual(
+            [event["name"] for event in trace["traceEvents"]],
+            ["llm", "llm:call", "git:commit"],
+        )
+        self.assertEqual({event["ph"] for event in trace["traceEvents"]}, {"X"})
+        self.assertEqual(
+            trace["traceEvents"][1]["args"], {"model": "m", "iteration": 1}
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "trace.json")
+            prof.export_chrome_trace(filename)
+            with open(filename) as ifile:
+                self.assertEqual(len(json.load(ifile)["traceEvents"]), 3)
+
+    def test_threads(self):
+        """Unit tests spans in threads: Nested per thread."""
+        prof = profiler.Profiler(max_spans=3)
+
+        def _run():
+            with prof.span("build"):
+                with prof.span("build:cmd"):
+                    pass
+
+        threads = [threading.Thread(target=_run) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(prof.spans), 3)
+        self.assertEqual(prof.num_dropped, 1)
+        self.assertEqual(
+            sorted(s.depth for s in prof.spans if s.name == "build:cmd")[0], 1
+        )
+
+    def test_git_repo(self):
+        """Unit tests spans of git commands."""
+        prof = profiler.Profiler()
+        with tempfile.TemporaryDirectory() as temp_dir, profiler.scope(prof):
+            repo = git_repo.GitRepo(temp_dir)
+            repo.initialize()
+            repo.status()
+
+        self.assertEqual([s.name for s in prof.spans], ["git:init", "git:status"])
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
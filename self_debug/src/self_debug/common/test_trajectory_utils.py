@@ -0,0 +1,126 @@
+"""Unit tests for trajectory_utils.py."""
+
+import logging
+import os
+import tempfile
+import unittest
+
+from parameterized import parameterized
+from self_debug.proto import trajectory_pb2
+
+from self_debug.common import trajectory_utils, utils
+
+
+def _create_trajectory(iterations: int) -> trajectory_pb2.Trajectory:
+    """A trajectory the same way as self debugging: Prompts repeat previous ones."""
+    traj = trajectory_pb2.Trajectory(root_dir="/root", max_iterations=iterations)
+    messages = []
+    for iteration in range(iterations):
+        build_step = traj.steps.add(iteration=iteration)
+        build_step.action.build_action.num_errors = iterations - iteration
+
+        prompt = f"Fix error {iteration}: " + "x" * 100
+        llm_step = traj.steps.add(iteration=iteration)
+        llm_action = llm_step.action.llm_action
+        if messages:
+            llm_action.prompt.prompt_messages.messages.extend(messages + [prompt])
+        else:
+            llm_action.prompt.prompt = prompt
+        llm_action.response = f"Response {iteration}: " + "y" * 100
+
+        messages.extend([prompt, llm_action.response])
+
+    return traj
+
+
+class TestTrajectoryUtils(unittest.TestCase):
+    """Unit tests for trajectory_utils.py."""
+
+    def test_message_table(self):
+        """Unit tests MessageTable."""
+        table = trajectory_utils.MessageTable(("a", "b", "a"))
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.add("b"), 1)
+        self.assertEqual(table.add("c"), 2)
+        self.assertEqual(table.get(2), "c")
+        self.assertEqual(table.messages, ["a", "b", "c"])
+
+    @parameterized.expand(
+        (
+            (0, 0),
+            (1, 0),
+            (2, 3),
+            (10, 19),
+        )
+    )
+    def test_compact(self, iterations, expected_num_messages):
+        """Unit tests compact and expand: Each message is stored once."""
+        traj = _create_trajectory(iterations)
+
+        compact_traj = trajectory_utils.compact(traj)
+        self.assertEqual(len(compact_traj.messages), expected_num_messages)
+        for step in compact_traj.trajectory.steps:
+            prompt = step.action.llm_action.prompt
+            self.assertFalse(prompt.prompt_messages.messages)
+
+        self.assertEqual(trajectory_utils.expand(compact_traj), traj)
+
+    def test_compact_with_table(self):
+        """Unit tests compact with message ids in a table, e.g. in a run."""
+        table = trajectory_utils.MessageTable()
+        traj = trajectory_pb2.Trajectory()
+        prompt_messages = traj.steps.add().action.llm_action.prompt.prompt_messages
+        prompt_messages.message_ids.extend([table.add("a"), table.add("b")])
+        prompt_messages = traj.steps.add().action.llm_action.prompt.prompt_messages
+        prompt_messages.messages.extend(["a", "b", "c"])
+
+        compact_traj = trajectory_utils.compact(traj, table)
+        self.assertEqual(list(compact_traj.messages), ["a", "b", "c"])
+
+        expanded = trajectory_utils.expand(compact_traj)
+        self.assertEqual(
+            [
+                list(step.action.llm_action.prompt.prompt_messages.messages)
+                for step in expanded.steps
+            ],
+            [["a", "b"], ["a", "b", "c"]],
+        )
+
+    def test_export_trajectory(self):
+        """Unit tests export, load and convert: Compact files are smaller."""
+        traj = _create_trajectory(20)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            compact_file = os.path.join(temp_dir, "traj.binpb.gz")
+            text_file = os.path.join(temp_dir, "traj.pbtxt")
+            trajectory_utils.export_trajectory(traj, compact_file)
+            trajectory_utils.export_trajectory(traj, text_file)
+
+            self.assertEqual(trajectory_utils.load_trajectory(compact_file), traj)
+            self.assertEqual(trajectory_utils.load_trajectory(text_file), traj)
+            self.assertLess(
+                os.path.getsize(compact_file) * 20, os.path.getsize(text_file)
+            )
+
+            converted_file = os.path.join(temp_dir, "converted.pbtxt")
+            self.assertTrue(
+                trajectory_utils.convert_trajectory(compact_file, converted_file)
+            )
+            self.assertEqual(
+                utils.load_file(converted_file), utils.load_file(text_file)
+            )
+
+            self.assertIsNone(
+                trajectory_utils.load_trajectory(
+                    os.path.join(temp_dir, "missing.binpb.gz")
+                )
+            )
+            self.assertFalse(
+                trajectory_utils.convert_trajectory(
+                    os.path.join(temp_dir, "missing.binpb.gz"), converted_file
+                )
+            )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
@@ -177,16 +177,27 @@ class TestUtils(unittest.TestCase):
             (
                 r"test_\*.py",
                 (
+                    "test_class_file_utils.py",
                     "test_configs.py",
+                    "test_deadline.py",
+                    "test_dependency_resolver.py",
+                    "test_effective_pom.py",
                     "test_file_utils.py",
                     "test_filesystem_writer_factory.py",
+                    "test_fingerprint.py",
                     "test_git_repo.py",
                     "test_github.py",
                     "test_hash_utils.py",
+                    "test_junit_utils.py",
+                    "test_lazy_import.py",
                     "test_maven_utils.py",
+                    "test_pom_transformer.py",
+                    "test_profiler.py",
                     "test_prompt_manager_factory.py",
                     "test_send_email.py",
+                    "test_trajectory_utils.py",
                     "test_utils.py",
+                    "test_warm_pool.py",
                 ),
             ),
         )
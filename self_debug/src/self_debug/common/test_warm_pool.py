@@ -0,0 +1,95 @@
+"""Unit tests for warm_pool.py."""
+
+import logging
+import unittest
+
+from parameterized import parameterized
+
+from self_debug.common import utils, warm_pool
+
+
+class TestWarmPool(unittest.TestCase):
+    """Unit tests for warm_pool.py."""
+
+    @parameterized.expand(
+        (
+            (0, 3, 0, 0),
+            (1, 1, 1, 2),
+            (2, 1, 1, 2),
+        )
+    )
+    def test_get(self, depth, expected_num_objects, expected_created, expected_reused):
+        """Unit tests WarmPool.get: Shared in scopes only."""
+        pool = warm_pool.WarmPool()
+        for _ in range(depth):
+            pool.acquire()
+
+        objects = [pool.get("key", object) for _ in range(3)]
+        self.assertEqual(len({id(o) for o in objects}), expected_num_objects)
+        self.assertEqual(pool.num_created, expected_created)
+        self.assertEqual(pool.num_reused, expected_reused)
+        self.assertEqual(pool.active, depth > 0)
+
+    def test_scope(self):
+        """Unit tests WarmPool.scope: The outermost one closes resources and hooks."""
+        closed = []
+        pool = warm_pool.WarmPool()
+        with pool.scope():
+            pool.get("a", lambda: "A", close=closed.append)
+            pool.get("b", lambda: "B")
+            pool.get("c", lambda: "C", close=closed.append)
+
+            with pool.scope():
+                self.assertEqual(pool.get("a", lambda: "AA"), "A")
+                pool.on_close(lambda: closed.append("hook"))
+            self.assertEqual(closed, [])
+            self.assertEqual(len(pool), 3)
+
+            def _hook():
+                closed.append("same hook")
+
+            pool.on_close(_hook)
+            pool.on_close(_hook)
+
+        # Reverse order of creation, then hooks.
+        self.assertEqual(closed, ["C", "A", "hook", "same hook"])
+        self.assertEqual(len(pool), 0)
+        self.assertFalse(pool.active)
+
+        # Extra releases are no op.
+        pool.release()
+        self.assertFalse(pool.active)
+
+    def test_close_error(self):
+        """Unit tests WarmPool.close: Errors don't stop other resources."""
+
+        def _close(resource):
+            raise ValueError(resource)
+
+        closed = []
+        pool = warm_pool.WarmPool()
+        with pool.scope():
+            pool.get("a", lambda: "A", close=closed.append)
+            pool.get("b", lambda: "B", close=_close)
+            pool.on_close(lambda: _close("hook"))
+
+        self.assertEqual(closed, ["A"])
+
+    def test_get_or_create(self):
+        """Unit tests get_or_create: The shared pool."""
+        self.assertIs(warm_pool.get_pool(), warm_pool.get_pool())
+
+        with warm_pool.get_pool().scope():
+            self.assertIs(
+                warm_pool.get_or_create("key", object),
+                warm_pool.get_or_create("key", object),
+            )
+        self.assertIsNot(
+            warm_pool.get_or_create("key", object),
+            warm_pool.get_or_create("key", object),
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
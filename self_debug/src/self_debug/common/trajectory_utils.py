@@ -0,0 +1,166 @@
+"""Compact trajectories: Prompt messages are stored once, and steps reference ids.
+
+Each LLM action prompts with all previous messages, i.e. iteration k repeats k - 1
+prompts and responses, and a full trajectory grows quadratically. A compact one has
+a table of unique messages by content (`CompactTrajectory.messages`), and LLM actions
+have `PromptMessages.message_ids` instead: It's exported as gzipped binary proto.
+
+Sample command, to convert between formats (e.g. to read a compact one as text):
+
+```
+python common/trajectory_utils.py \
+    --input trajectory--abc.binpb.gz --output /tmp/trajectory.pbtxt
+```
+"""
+
+import argparse
+import gzip
+import logging
+import sys
+from typing import Dict, Iterable, List, Optional
+
+from self_debug.proto import trajectory_pb2
+
+from self_debug.common import utils
+
+
+# Gzipped binary `CompactTrajectory`: Otherwise a full `Trajectory` as text.
+COMPACT_SUFFIX = ".binpb.gz"
+TEXT_SUFFIX = ".pbtxt"
+
+
+class MessageTable:
+    """Unique messages by content: Ids are indices."""
+
+    def __init__(self, messages: Iterable[str] = ()):
+        self.messages: List[str] = []
+        self._ids: Dict[str, int] = {}
+        for message in messages:
+            self.add(message)
+
+    def __len__(self):
+        return len(self.messages)
+
+    def add(self, message: str) -> int:
+        """Id of a message: A new one if it's unseen."""
+        message_id = self._ids.get(message)
+        if message_id is None:
+            message_id = len(self.messages)
+            self._ids[message] = message_id
+            self.messages.append(message)
+        return message_id
+
+    def get(self, message_id: int) -> str:
+        """Message of an id."""
+        return self.messages[message_id]
+
+
+def _prompt_messages(traj: trajectory_pb2.Trajectory):
+    for step in traj.steps:
+        if step.action.WhichOneof("ac") != "llm_action":
+            continue
+
+        prompt = step.action.llm_action.prompt
+        if prompt.WhichOneof("llm_prompt") == "prompt_messages":
+            yield prompt.prompt_messages
+
+
+def compact(
+    traj: trajectory_pb2.Trajectory, table: Optional[MessageTable] = None
+) -> trajectory_pb2.CompactTrajectory:
+    """Compact a trajectory: Its existing message ids, if any, are in the table.
+
+    New messages are added to the table, e.g. the one of a run.
+    """
+    table = MessageTable() if table is None else table
+
+    result = trajectory_pb2.CompactTrajectory()
+    result.trajectory.CopyFrom(traj)
+    for prompt_messages in _prompt_messages(result.trajectory):
+        prompt_messages.message_ids.extend(
+            table.add(message) for message in prompt_messages.messages
+        )
+        del prompt_messages.messages[:]
+
+    result.messages.extend(table.messages)
+    return result
+
+
+def expand(compact_traj: trajectory_pb2.CompactTrajectory) -> trajectory_pb2.Trajectory:
+    """Full view of a compact trajectory, with messages instead of ids."""
+    traj = trajectory_pb2.Trajectory()
+    traj.CopyFrom(compact_traj.trajectory)
+    for prompt_messages in _prompt_messages(traj):
+        prompt_messages.messages.extend(
+            compact_traj.messages[message_id]
+            for message_id in prompt_messages.message_ids
+        )
+        del prompt_messages.message_ids[:]
+
+    return traj
+
+
+def export_trajectory(
+    traj: trajectory_pb2.Trajectory,
+    filename: str,
+    table: Optional[MessageTable] = None,
+):
+    """Export a trajectory, compact or not by the file suffix."""
+    compact_traj = compact(traj, table)
+    if filename.endswith(COMPACT_SUFFIX):
+        utils.export_file(
+            filename, gzip.compress(compact_traj.SerializeToString()), "wb"
+        )
+    else:
+        utils.export_proto(expand(compact_traj), filename)
+
+
+def load_trajectory(filename: str) -> Optional[trajectory_pb2.Trajectory]:
+    """Load a full trajectory, compact or not by the file suffix."""
+    if not filename.endswith(COMPACT_SUFFIX):
+        return utils.load_proto(filename, trajectory_pb2.Trajectory)
+
+    data = utils.load_file(filename, "rb")
+    if data is None:
+        return None
+
+    compact_traj = trajectory_pb2.CompactTrajectory()
+    compact_traj.ParseFromString(gzip.decompress(data))
+    return expand(compact_traj)
+
+
+def convert_trajectory(input_filename: str, output_filename: str) -> bool:
+    """Convert a trajectory file between formats."""
+    traj = load_trajectory(input_filename)
+    if traj is None:
+        logging.warning("Unable to load trajectory `%s`.", input_filename)
+        return False
+
+    export_trajectory(traj, output_filename)
+    return True
+
+
+def _parse_args():
+    """Parse args."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--input",
+        type=str,
+        required=True,
+        help=f"Trajectory: `*{COMPACT_SUFFIX}` or `*{TEXT_SUFFIX}`.",
+    )
+    parser.add_argument(
+        "--output", type=str, required=True, help="Trajectory, in the other format."
+    )
+    return parser.parse_known_args()
+
+
+def main() -> int:
+    """Main."""
+    args, _ = _parse_args()
+    return 0 if convert_trajectory(args.input, args.output) else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    sys.exit(main())
@@ -7,13 +7,17 @@ import json
 import logging
 import os
 import re
+import signal
 import subprocess
 import tempfile
 import time
 from typing import Any, Dict, Optional, Sequence, Tuple, Union
 
 from google.protobuf import text_format
-import requests
+
+from self_debug.common import class_file_utils, deadline as deadline_lib, lazy_import
+
+requests = lazy_import.lazy_module("requests")
 
 
 SKIP_SPARK_PREFIX = "SKIP-SPARK-METRICS-"
@@ -37,6 +41,9 @@ GITHUB_URL = "https://github.com/klee-contrib/kinetix"
 
 _PWD = os.path.dirname(os.path.abspath(__file__))
 
+# Seconds to wait after SIGTERM before SIGKILL, for a timed out process group.
+KILL_GRACE_SECONDS = 5
+
 
 @dataclass
 class CmdData:
@@ -49,21 +56,70 @@ class CmdData:
     error: Any = None
 
 
+def kill_process_group(process: subprocess.Popen, grace_seconds: float = None):
+    """Kill a process and its children (e.g. forked JVMs): SIGTERM then SIGKILL."""
+    if grace_seconds is None:
+        grace_seconds = KILL_GRACE_SECONDS
+
+    for sig, wait_seconds in ((signal.SIGTERM, grace_seconds), (signal.SIGKILL, None)):
+        try:
+            os.killpg(process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            return
+
+        try:
+            process.wait(timeout=wait_seconds)
+            # Children may outlive the session leader.
+            os.killpg(process.pid, 0)
+        except subprocess.TimeoutExpired:
+            continue
+        except (ProcessLookupError, PermissionError):
+            return
+
+
+def _run_process_group(command, timeout: Optional[float], check: bool, **kwargs):
+    """Run a command in its own process group, which is killed as a whole on timeout."""
+    with subprocess.Popen(command, start_new_session=True, **kwargs) as process:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired as error:
+            logging.warning("CMD: %s => Killed after %s seconds.", command, timeout)
+            kill_process_group(process)
+            error.output, error.stderr = process.communicate()
+            raise error
+        except BaseException:
+            kill_process_group(process)
+            raise
+
+    code = process.returncode
+    if check and code != 0:
+        raise subprocess.CalledProcessError(code, command, stdout, stderr)
+    return stdout, stderr, code
+
+
 def do_run_command(command: Union[str, Sequence[str]], **kwargs) -> CmdData:
     """
     Runs a command and returns the output and success status.
 
     Args:
         command (str): The command to run.
+        kwargs: `timeout` in seconds and `deadline` (the current one by default) bound
+            its runtime, after which its whole process group is killed.
 
     Returns:
         Tuple[Union[str, Exception], bool]: A tuple containing the output (either a string or an
             Exception) and a boolean indicating whether the command was successful.
     """
+    deadline = kwargs.pop("deadline", None) or deadline_lib.get_deadline()
+    timeout = deadline_lib.get_timeout(kwargs.pop("timeout", None), deadline)
     try:
+        if timeout is not None and timeout <= 0:
+            raise deadline_lib.DeadlineExceeded(deadline, str(command))
+
         logging.info("CMD: %s", command)
-        result = subprocess.run(
+        stdout, stderr, code = _run_process_group(
             command,
+            timeout,
             stdout=kwargs.pop("stdout", subprocess.PIPE),
             stderr=subprocess.PIPE,
             shell=kwargs.pop("shell", True),
@@ -71,9 +127,8 @@ def do_run_command(command: Union[str, Sequence[str]], **kwargs) -> CmdData:
             **kwargs,
         )
 
-        stdout = result.stdout.decode().strip()
-        stderr = result.stderr.decode().strip()
-        code = result.returncode
+        stdout = stdout.decode().strip()
+        stderr = stderr.decode().strip()
 
         logging.debug("CMD: %s => STDOUT: %s", command, stdout)
         logging.debug("CMD: %s => STDERR: %s", command, stderr)
@@ -95,6 +150,11 @@ def do_run_command(command: Union[str, Sequence[str]], **kwargs) -> CmdData:
         )
 
 
+def is_timeout(cmd_data: CmdData) -> bool:
+    """Whether a command timed out, or didn't start because of its deadline."""
+    return isinstance(cmd_data.error, (subprocess.TimeoutExpired, TimeoutError))
+
+
 def run_command(*args, **kwargs) -> Tuple[Union[str, Exception], int]:
     """Run command."""
     result = do_run_command(*args, **kwargs)
@@ -323,10 +383,44 @@ def _parse_compiled_java_major_versions(output: str):
     return versions
 
 
+def get_compiled_java_major_version_histogram(
+    root_dir: str, num_options=2, jars: bool = False
+) -> Optional[Dict[int, int]]:
+    """Get compiled java major versions => # class files, reading class file headers only."""
+    if not os.path.exists(root_dir):
+        return None
+
+    # There might be customized class dir specified in `pom.xml` files.
+    for index, custom_class_dirs in enumerate((False, True)[:num_options]):
+        histogram = class_file_utils.get_major_version_histogram(
+            root_dir, custom_class_dirs=custom_class_dirs, jars=jars
+        )
+        if histogram:
+            return histogram
+
+        logging.warning(
+            "[%d] Unable to get *.classes files (custom class dirs = %s): `%s`.",
+            index,
+            custom_class_dirs,
+            root_dir,
+        )
+
+    return None
+
+
 def get_compiled_java_major_versions(
-    root_dir: str, num_options=2, java_home: str = None
+    root_dir: str, num_options=2, java_home: str = None, use_javap: bool = False
 ):
-    """Get compiled java major versions, after `mvn clean verify` is a success."""
+    """Get compiled java major versions, after `mvn clean verify` is a success.
+
+    Class file headers are read natively, unless `use_javap` (requires a JDK).
+    """
+    if not use_javap:
+        histogram = get_compiled_java_major_version_histogram(
+            root_dir, num_options=num_options
+        )
+        return None if histogram is None else set(histogram)
+
     if not os.path.exists(root_dir):
         return None
 
@@ -0,0 +1,148 @@
+"""Warm resources per process, e.g. per Spark executor: Shared by tasks in a scope.
+
+Some resources are the same for all projects, but are created per project, e.g. LLM
+clients and prompt templates. In a scope, e.g. `mapPartitions` over projects, they are
+created once and reused by all tasks, until the outermost scope closes them.
+
+Outside of any scope, every call creates a new one, as if there was no pool.
+
+Sample usage:
+
+```
+def _create_client():
+    return boto3.client("bedrock-runtime")
+
+
+with warm_pool.get_pool().scope():
+    for project in projects:
+        client = warm_pool.get_or_create(("bedrock", region), _create_client)
+```
+"""
+
+from collections import OrderedDict
+import contextlib
+import logging
+import threading
+from typing import Any, Callable, Hashable, Optional
+
+
+class WarmPool:
+    """Warm resources by key: Shared while there are active scopes."""
+
+    def __init__(self):
+        # Key => (resource, close function).
+        self._resources = OrderedDict()
+        # Called on close, e.g. to flush metrics.
+        self._close_hooks = OrderedDict()
+        self._depth = 0
+        self._lock = threading.RLock()
+
+        # Stats.
+        self.num_created = 0
+        self.num_reused = 0
+
+    def __len__(self):
+        return len(self._resources)
+
+    @property
+    def active(self) -> bool:
+        """Whether resources are shared."""
+        return self._depth > 0
+
+    def get(
+        self,
+        key: Hashable,
+        factory: Callable[[], Any],
+        close: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """Get or create a resource: A new one per call if it's not active."""
+        with self._lock:
+            if not self.active:
+                return factory()
+
+            if key in self._resources:
+                self.num_reused += 1
+                return self._resources[key][0]
+
+            resource = factory()
+            self._resources[key] = (resource, close)
+            self.num_created += 1
+            logging.info("Warm resource: `%s`.", key)
+            return resource
+
+    def on_close(self, hook: Callable[[], Any]):
+        """Call a hook on close, once however many times it's added."""
+        with self._lock:
+            self._close_hooks[hook] = None
+
+    def acquire(self):
+        """Enter a scope."""
+        with self._lock:
+            self._depth += 1
+
+    def release(self):
+        """Exit a scope: The outermost one closes all resources."""
+        with self._lock:
+            self._depth = max(self._depth - 1, 0)
+            if not self._depth:
+                self.close()
+
+    @contextlib.contextmanager
+    def scope(self):
+        """Share resources in the scope."""
+        self.acquire()
+        try:
+            yield self
+        finally:
+            self.release()
+
+    def close(self):
+        """Close resources in the reverse order of creation, and call hooks."""
+        with self._lock:
+            resources = list(self._resources.items())[::-1]
+            hooks = list(self._close_hooks)
+            self._resources.clear()
+            self._close_hooks.clear()
+
+        if resources or hooks:
+            logging.info(
+                "Close warm resources: # = %d (%d reused), hooks # = %d.",
+                len(resources),
+                self.num_reused,
+                len(hooks),
+            )
+        for key, (resource, close) in resources:
+            if close is None:
+                continue
+            try:
+                close(resource)
+            except Exception as error:  # pylint: disable=broad-except
+                logging.exception("Unable to close `%s`: %s", key, error)
+
+        for hook in hooks:
+            try:
+                hook()
+            except Exception as error:  # pylint: disable=broad-except
+                logging.exception("Unable to call close hook `%s`: %s", hook, error)
+
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool() -> WarmPool:
+    """Shared pool per process."""
+    global _POOL  # pylint: disable=global-statement
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = WarmPool()
+        return _POOL
+
+
+def get_or_create(
+    key: Hashable,
+    factory: Callable[[], Any],
+    close: Optional[Callable[[Any], Any]] = None,
+) -> Any:
+    """Get or create a resource in the shared pool."""
+    return get_pool().get(key, factory, close)
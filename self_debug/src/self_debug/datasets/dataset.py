@@ -4,10 +4,11 @@ from dataclasses import dataclass
 import logging
 from typing import Any, Dict, Optional, Tuple, Union
 
-import numpy
 from self_debug.proto import dataset_pb2
 
-from self_debug.common import utils
+from self_debug.common import lazy_import, utils
+
+numpy = lazy_import.lazy_module("numpy")
 
 
 @dataclass
@@ -2,10 +2,13 @@
 
 import os
 
-import datasets
-
 from self_debug.proto import dataset_pb2
-from migration_bench.common.hf_utils import load_hf_dataset
+
+from self_debug.common import lazy_import
+
+mb_hf_utils = lazy_import.lazy_module(
+    "migration_bench.common.hf_utils", "migration_bench"
+)
 
 # https://huggingface.co/datasets/AmazonScience/migration-bench-java-full
 JAVA_FULL = "AmazonScience/migration-bench-java-full"
@@ -38,7 +41,7 @@ def resolve_hf_dataset(ds_config, **kwargs):
         }
     )
 
-    rows = load_hf_dataset(**kwargs)
+    rows = mb_hf_utils.load_hf_dataset(**kwargs)
     for row in zip(rows[COLUMN_REPO], rows[COLUMN_COMMIT]):
         repo, commit = row
         cfg = ds_config.dataset_repos.add()
@@ -3,22 +3,24 @@
 import logging
 import sys
 
-from self_debug.common import utils
-
-
-# pylint: disable=unused-import
-from migration_bench.eval.final_eval import (
-    KEY_GITHUB_URL,
-    KEY_GIT_DIFF_CONTENT,
-    KEY_GIT_DIFF_FILE,
-    DATASET_COMMIT_IDS,
-    DATASET_NUM_TESTS,
-    LHS_BRANCH,
-    alias,
-    run_eval,
-    # run_batch_eval,
+from self_debug.common import lazy_import, utils
+
+
+# Imported on first use, e.g. `KEY_GITHUB_URL`, `DATASET_NUM_TESTS`, `alias`.
+_final_eval = lazy_import.lazy_module(
+    "migration_bench.eval.final_eval", "migration_bench"
 )
-# pylint: enable=unused-import
+
+
+def __getattr__(name: str):
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(_final_eval, name)
+
+
+def run_eval(*args, **kwargs) -> bool:
+    """Run final eval."""
+    return _final_eval.run_eval(*args, **kwargs)
 
 
 def _run(github_url: str, git_diff_file: str = None):
@@ -5,7 +5,7 @@ import logging
 import os
 from typing import Dict, Optional, Tuple
 
-from self_debug.common import utils
+from self_debug.common import profiler, utils
 from self_debug.lang.base import ast_parser, builder
 
 ClassData = ast_parser.ClassData
@@ -208,6 +208,7 @@ class AstHelper:
             uniq_vars, "variables", build_error, use_name=False
         )
 
+    @profiler.traced("ast")
     def run(self, build_error: builder.BuildData) -> Dict[str, str]:
         """Get prompt info for build error."""
         if self._parsable():
@@ -9,7 +9,8 @@ from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 from self_debug.proto import builder_pb2
 
-from self_debug.common import utils
+from self_debug.common import deadline as deadline_lib
+from self_debug.common import profiler, utils
 from self_debug.lang.base import ast_parser
 from self_debug.lm import utils as llm_utils
 from self_debug.metrics import utils as metric_utils
@@ -23,6 +24,8 @@ BUILD_COMMAND_SANITY_CHECK = "build_command_sanity_check"
 
 BUILD_ERROR_CHANGE_OPTIONS = "build_error_change_option"
 
+DEADLINE = "deadline"
+
 #
 # Build errors comparison.
 #
@@ -149,6 +152,8 @@ class BaseBuilder(abc.ABC):
         self.feedback = []
         # Cache previous build errors.
         self.previous_build_errors = ()
+        # Cache the last build command result, e.g. to reuse its log.
+        self.last_build_data = None
 
         logging.debug(
             "[ctor] %s: (root_dir, cmd) = (%s, %s) with (feedback, option) = (%s, %s).",
@@ -168,6 +173,11 @@ class BaseBuilder(abc.ABC):
         """Run final eval."""
         return True
 
+    @property
+    def deprecation_build_data(self) -> Optional[utils.CmdData]:
+        """Last full build with deprecation warnings shown, to reuse its log."""
+        return None
+
     def run_metrics(
         self,
         build_errors: Tuple[BuildData],
@@ -334,9 +344,25 @@ class BaseBuilder(abc.ABC):
 
         return False
 
+    def run_build_command(self, **kwargs) -> CmdData:
+        """Run the build command."""
+        return utils.do_run_command(
+            self.command, check=False, deadline=kwargs.get(DEADLINE)
+        )
+
     def build(self, *args, **kwargs) -> Union[Tuple[BuildData], str]:
-        """Build: Return structured build data indicating success or str indicating failure."""
-        cmd_data = utils.do_run_command(self.command, check=False)
+        """Build: Return structured build data indicating success or str indicating failure.
+
+        It's bounded by `deadline` in kwargs (the current one by default), raising
+        `DeadlineExceeded` on timeout.
+        """
+        with profiler.span("build:cmd"):
+            cmd_data = self.run_build_command(**kwargs)
+        self.last_build_data = cmd_data
+        if utils.is_timeout(cmd_data):
+            raise deadline_lib.DeadlineExceeded(
+                kwargs.get(DEADLINE) or deadline_lib.get_deadline(), self.command
+            )
 
         # Skip parsing when it's OK.
         if cmd_data.return_code == 0:
@@ -349,7 +375,8 @@ class BaseBuilder(abc.ABC):
 
         if cmd_data.error is None:
             success = cmd_data.return_code == 0
-            errors = self.extract_build_errors(cmd_data, *args, **kwargs)
+            with profiler.span("build:parse"):
+                errors = self.extract_build_errors(cmd_data, *args, **kwargs)
 
             logging.debug("Number of build errors: %d.", len(errors))
             if (success and errors) or (not success and not errors):
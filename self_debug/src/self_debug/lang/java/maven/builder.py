@@ -13,8 +13,12 @@ import re
 
 from self_debug.proto import builder_pb2
 
+from self_debug.common import fingerprint
+from self_debug.common import maven_utils as common_maven_utils
 from self_debug.common import utils
 from self_debug.lang.base import builder
+from self_debug.lang.java.maven import daemon as maven_daemon
+from self_debug.lang.java.maven import impact_analyzer
 from self_debug.lang.java.maven import maven_utils
 
 
@@ -24,6 +28,17 @@ BUILD_CMD_KEY_TEST = "test"
 BUILD_FAILURE = "[INFO] BUILD FAILURE"
 BUILD_SUCCESS = "[INFO] BUILD SUCCESS"
 
+SHOW_DEPRECATION = "show_deprecation"
+
+BACKEND = "backend"
+MAVEN_DAEMON = "maven_daemon"
+
+SELECT_IMPACTED_TESTS = "select_impacted_tests"
+# Added for `{test}`, if it's not in the build command.
+TEST_OPTIONS = "-Dtest={test} -Dsurefire.failIfNoSpecifiedTests=false"
+# `{test}` when no test is impacted.
+SKIP_TESTS = "-DskipTests"
+
 COMPILATION_ERROR_START = "[ERROR] COMPILATION ERROR :"
 COMPILATION_ERROR_END = BUILD_FAILURE
 
@@ -65,14 +80,39 @@ class MavenBuilder(builder.BaseBuilder):
 
         logging.debug("[ctor] %s: jdk_path = %s.", self.__class__.__name__, jdk_path)
         self.jdk_path = jdk_path or ""
+        self.show_deprecation = kwargs.get(
+            SHOW_DEPRECATION, getattr(builder_pb2.MavenBuilder(), SHOW_DEPRECATION)
+        )
+        # Whether the last build is for a module or a test only.
+        self.last_build_partial = False
+        # Sources digest after the last successful build with deprecation warnings.
+        self._deprecation_digest = None
+
+        self.select_impacted_tests = kwargs.get(
+            SELECT_IMPACTED_TESTS,
+            getattr(builder_pb2.MavenBuilder(), SELECT_IMPACTED_TESTS),
+        )
+
+        # A warm maven daemon per workspace, instead of a cold `mvn` per build.
+        self.daemon_config = None
+        if kwargs.get(BACKEND) == builder_pb2.MavenBuilder.MVND:
+            self.daemon_config = kwargs.get(MAVEN_DAEMON) or builder_pb2.MavenDaemon()
 
         self._sanity_check(kwargs)
 
     def _sanity_check(self, kwargs):
         """Sanity check: Before any iterations."""
+        if not kwargs.get("require_maven_installed", True):
+            logging.debug("Skip sanity check: Maven is not required to be installed.")
+            return
+
         command = kwargs.get(
             builder.BUILD_COMMAND_SANITY_CHECK, "mvn --version"
         ).replace("{JAVA_HOME}", self.jdk_path)
+        if self.daemon_config is not None:
+            command = maven_daemon.MavenDaemon(
+                self.root_dir, self.daemon_config
+            ).to_daemon_command(command)
         output, success = utils.run_command(command, check=False)
         logging.warning("Sanity check [%s] `%s`: %s.", success, command, output)
 
@@ -104,6 +144,10 @@ class MavenBuilder(builder.BaseBuilder):
             "require_maven_installed",
             "require_test_class_and_method_invariance",
             "source_branch",
+            SHOW_DEPRECATION,
+            BACKEND,
+            MAVEN_DAEMON,
+            SELECT_IMPACTED_TESTS,
         ):
             if field not in kwargs:
                 kwargs.update({field: getattr(config, field)})
@@ -115,6 +159,60 @@ class MavenBuilder(builder.BaseBuilder):
         """Suffix for the project file."""
         return "/pom.xml"
 
+    @property
+    def daemon(self) -> Optional[maven_daemon.MavenDaemon]:
+        """Maven daemon of this workspace, if it's the backend."""
+        if self.daemon_config is None:
+            return None
+
+        pool = maven_daemon.get_pool(self.daemon_config.max_daemons)
+        return pool.get(self.root_dir, self.daemon_config)
+
+    def run_build_command(self, **kwargs) -> builder.CmdData:
+        """Run the build command: With a warm maven daemon if it's the backend."""
+        daemon = self.daemon
+        if daemon is None:
+            return super().run_build_command(**kwargs)
+
+        return daemon.run(self.command, deadline=kwargs.get(builder.DEADLINE))
+
+    def select_tests(
+        self, changed_files: Sequence[str], build_errors: Sequence[Any] = ()
+    ) -> Optional[str]:
+        """Impacted tests of changed files for `{test}`: None to run all tests.
+
+        Tests mentioned in build errors, e.g. failing ones, are included.
+        """
+        if not self.select_impacted_tests or not changed_files:
+            return None
+
+        tests = impact_analyzer.get_analyzer(self.root_dir).select_tests(
+            changed_files, [error.error_message or "" for error in build_errors]
+        )
+        if tests is None:
+            return None
+        return ",".join(tests) or SKIP_TESTS
+
+    def _get_sources_digest(self) -> str:
+        snapshot = fingerprint.get_fingerprinter().fingerprint(
+            self.root_dir,
+            select=fingerprint.select_names(suffixes=(".java",), names=("pom.xml",)),
+            tree=False,
+        )
+        return snapshot.digest
+
+    @property
+    def deprecation_build_data(self) -> Optional[utils.CmdData]:
+        """Last full build with deprecation warnings shown, to reuse its log.
+
+        Only if it succeeded, and sources are unchanged since, e.g. not restored.
+        """
+        if self._deprecation_digest is None or self.last_build_partial:
+            return None
+        if self._deprecation_digest != self._get_sources_digest():
+            return None
+        return self.last_build_data
+
     def _run_final_eval(self) -> bool:
         """Run final eval."""
         result = parse_repo.same_repo_test_files(
@@ -350,18 +448,39 @@ class MavenBuilder(builder.BaseBuilder):
         else:
             test = kwargs.get(BUILD_CMD_KEY_TEST, "")
 
+        self.last_build_partial = bool(module or test)
         command_copy = None
         if module or test:
             command_copy = self.command
+            if test == SKIP_TESTS:
+                self.command = common_maven_utils.add_maven_options(
+                    self.command, SKIP_TESTS
+                )
+                test = ""
+            elif test and "{test}" not in self.command:
+                self.command = common_maven_utils.add_maven_options(
+                    self.command, TEST_OPTIONS
+                )
             self.command = self.command.format(module=module, test=test)
+        # Deprecation warnings are counted from the last full build log.
+        show_deprecation = self.show_deprecation and not self.last_build_partial
+        if show_deprecation:
+            command_copy = self.command if command_copy is None else command_copy
+            self.command = common_maven_utils.add_maven_options(self.command)
+
+        self._deprecation_digest = None
+        try:
+            errors = super().build(*args, **kwargs)
+        finally:
+            if command_copy is not None:
+                self.command = command_copy
 
-        errors = super().build(*args, **kwargs)
+        if show_deprecation and self.last_build_data.return_code == 0:
+            self._deprecation_digest = self._get_sources_digest()
 
         for build_data in errors:
             logging.debug("<<<%s>>>", build_data)
             logging.debug(build_data.code_snippet)
             logging.debug("Variables: `%s`.", build_data.variables)
 
-        if command_copy is not None:
-            self.command = command_copy
         return errors
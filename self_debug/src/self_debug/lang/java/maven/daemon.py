@@ -0,0 +1,209 @@
+"""Warm maven daemons (`mvnd`) per workspace, to avoid a cold `mvn` JVM per build.
+
+A daemon keeps plugins loaded, models parsed and code JIT-ed across builds of the same
+workspace. Builds have the same output as `mvn -B`, i.e. the same `CmdData` and build
+errors. Daemons are
+- health checked before a build, and stopped if it fails: The next build starts one.
+- restarted, when a build fails because of the daemon, or times out.
+- capped per executor: The least recently used workspace has its daemons stopped.
+"""
+
+import atexit
+from collections import OrderedDict
+import hashlib
+import logging
+import os
+import re
+import threading
+from typing import Optional
+
+from self_debug.proto import builder_pb2
+
+from self_debug.common import deadline as deadline_lib
+from self_debug.common import utils
+
+
+# Bare `mvn` commands, not `mvnd` or `/path/to/mvn`.
+MVN_REGEX = re.compile(r"(?<![\w/.-])mvn(?![\w.-])")
+
+DAEMON_STORAGE = "-Dmvnd.daemonStorage={storage}"
+STOP = "{command} {storage} --stop"
+
+HEALTH_CHECK_TIMEOUT_SECONDS = 60
+STOP_TIMEOUT_SECONDS = 60
+
+# Build failures of the daemon itself, instead of the project.
+DAEMON_FAILURES = (
+    "DaemonException",
+    "Could not connect to the Maven daemon",
+    "Daemon disappeared",
+    "The daemon has stopped",
+)
+
+
+def get_workspace(root_dir: str) -> str:
+    """Workspace key of a root dir: Readable and unique."""
+    root_dir = os.path.abspath(root_dir)
+    digest = hashlib.sha256(root_dir.encode()).hexdigest()[:12]
+    return f"{os.path.basename(root_dir)}-{digest}"
+
+
+class MavenDaemon:
+    """Maven daemons of a workspace."""
+
+    def __init__(self, root_dir: str, config: Optional[builder_pb2.MavenDaemon] = None):
+        self.config = builder_pb2.MavenDaemon() if config is None else config
+        self.root_dir = root_dir
+        self.workspace = get_workspace(root_dir)
+        self.storage = os.path.expanduser(
+            self.config.daemon_storage.format(workspace=self.workspace)
+        )
+
+        # Stats.
+        self.num_builds = 0
+        self.num_restarts = 0
+
+        self._lock = threading.Lock()
+
+    @property
+    def storage_arg(self) -> str:
+        """Daemon registry of this workspace."""
+        return DAEMON_STORAGE.format(storage=self.storage)
+
+    def to_daemon_command(self, command: str) -> str:
+        """Replace `mvn` by `mvnd` with this workspace's daemons."""
+        daemon = " ".join(
+            arg
+            for arg in (self.config.command, self.storage_arg, self.config.args)
+            if arg
+        )
+        return MVN_REGEX.sub(lambda _: daemon, command)
+
+    def _run(self, command: str, timeout: int) -> utils.CmdData:
+        # Not bounded by the build's deadline: Daemons are stopped after it's exceeded.
+        with deadline_lib.unbounded(name="daemon"):
+            return utils.do_run_command(
+                command.format(command=self.config.command, storage=self.storage_arg),
+                check=False,
+                timeout=timeout,
+            )
+
+    def health_check(self) -> bool:
+        """Health check: Stop daemons if it fails."""
+        if not self.config.health_check_command:
+            return True
+
+        cmd_data = self._run(
+            self.config.health_check_command, HEALTH_CHECK_TIMEOUT_SECONDS
+        )
+        if cmd_data.return_code == 0:
+            return True
+
+        logging.warning(
+            "Unhealthy maven daemon `%s`: <<<%s>>>", self.workspace, cmd_data
+        )
+        self.stop()
+        return False
+
+    def stop(self):
+        """Stop daemons: The next build starts a new one."""
+        cmd_data = self._run(STOP, STOP_TIMEOUT_SECONDS)
+        logging.info("Stop maven daemon `%s`: <<<%s>>>", self.workspace, cmd_data)
+
+    @staticmethod
+    def is_daemon_failure(cmd_data: utils.CmdData) -> bool:
+        """Whether a build fails because of the daemon, or times out."""
+        if utils.is_timeout(cmd_data):
+            return True
+        if cmd_data.return_code == 0:
+            return False
+
+        output = f"{cmd_data.stdout or ''}\n{cmd_data.stderr or ''}"
+        return any(failure in output for failure in DAEMON_FAILURES)
+
+    def run(self, command: str, deadline=None) -> utils.CmdData:
+        """Run a maven command with daemons: One build at a time per workspace."""
+        command = self.to_daemon_command(command)
+        with self._lock:
+            self.health_check()
+
+            for restart in range(max(self.config.max_restarts, 0) + 1):
+                cmd_data = utils.do_run_command(command, check=False, deadline=deadline)
+                self.num_builds += 1
+                if not self.is_daemon_failure(cmd_data):
+                    break
+
+                logging.warning(
+                    "[%d] Maven daemon `%s` failed: <<<%s>>>",
+                    restart,
+                    self.workspace,
+                    cmd_data,
+                )
+                self.stop()
+                self.num_restarts += 1
+                if utils.is_timeout(cmd_data):
+                    break
+
+        return cmd_data
+
+
+class MavenDaemonPool:
+    """Maven daemons per executor, by workspace: Capped by the number of workspaces."""
+
+    def __init__(self, max_daemons: int = 2):
+        self.max_daemons = max_daemons
+        self._daemons = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._daemons)
+
+    def get(
+        self, root_dir: str, config: Optional[builder_pb2.MavenDaemon] = None
+    ) -> MavenDaemon:
+        """Get the daemon of a workspace, as the most recently used one."""
+        workspace = get_workspace(root_dir)
+        evicted = []
+        with self._lock:
+            daemon = self._daemons.get(workspace)
+            # Reconfigured, e.g. another `mvnd`.
+            if daemon is not None and config is not None and daemon.config != config:
+                evicted.append(daemon)
+                daemon = None
+            if daemon is None:
+                daemon = MavenDaemon(root_dir, config)
+                self._daemons[workspace] = daemon
+            self._daemons.move_to_end(workspace)
+
+            while len(self._daemons) > max(self.max_daemons, 1):
+                evicted.append(self._daemons.popitem(last=False)[1])
+
+        for old in evicted:
+            logging.info("Evict maven daemon `%s`.", old.workspace)
+            old.stop()
+        return daemon
+
+    def stop_all(self):
+        """Stop all daemons."""
+        with self._lock:
+            daemons = list(self._daemons.values())
+            self._daemons.clear()
+
+        for daemon in daemons:
+            daemon.stop()
+
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool(max_daemons: Optional[int] = None) -> MavenDaemonPool:
+    """Shared pool per process: Daemons are stopped at exit."""
+    global _POOL  # pylint: disable=global-statement
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = MavenDaemonPool()
+            atexit.register(_POOL.stop_all)
+        if max_daemons is not None:
+            _POOL.max_daemons = max_daemons
+        return _POOL
@@ -0,0 +1,225 @@
+"""Test impact analysis: Map changed production classes to the test classes using them.
+
+Java files under `src/main/` and `src/test/` are scanned for their package, imports
+and referenced class names, which resolve to production classes by
+- explicit imports, including static ones,
+- wildcard imports or the same package, for simple names,
+- fully qualified names.
+
+Changed classes are expanded to production classes depending on them, transitively,
+and tests referencing any of them are impacted. Parsed files are cached per repo by
+their mtime and size, so that only changed files are scanned again.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+import logging
+import os
+import re
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from self_debug.common import utils
+
+
+JAVA_SUFFIX = ".java"
+MAIN_DIR = os.path.join("src", "main")
+TEST_DIR = os.path.join("src", "test")
+
+MAX_ANALYZERS = 64
+
+_PACKAGE_REGEX = re.compile(r"^\s*package\s+([\w.]+)\s*;", re.MULTILINE)
+_IMPORT_REGEX = re.compile(
+    r"^\s*import\s+(static\s+)?([\w.]+?)(\.\*)?\s*;", re.MULTILINE
+)
+_SIMPLE_NAME_REGEX = re.compile(r"\b([A-Z]\w*)\b")
+_QUALIFIED_NAME_REGEX = re.compile(r"\b((?:[a-z_]\w*\.)+[A-Z]\w*)")
+
+
+@dataclass(frozen=True)
+class JavaFile:
+    """What's needed from a java file to resolve class references."""
+
+    fqn: str
+    package: str
+    imports: FrozenSet[str]
+    wildcard_imports: FrozenSet[str]
+    simple_names: FrozenSet[str]
+    qualified_names: FrozenSet[str]
+
+    @property
+    def simple_name(self) -> str:
+        """Simple class name."""
+        return self.fqn.rsplit(".", 1)[-1]
+
+
+def parse_java_file(filename: str, content: str) -> JavaFile:
+    """Parse a java file: Its class name is the filename."""
+    match = _PACKAGE_REGEX.search(content)
+    package = match.group(1) if match else ""
+    name = os.path.splitext(os.path.basename(filename))[0]
+
+    imports, wildcard_imports = set(), set()
+    for static, path, wildcard in _IMPORT_REGEX.findall(content):
+        if static and not wildcard:
+            # `import static a.b.C.method;` => `a.b.C`.
+            path = path.rsplit(".", 1)[0]
+        if wildcard and not static:
+            wildcard_imports.add(path)
+        else:
+            imports.add(path)
+
+    return JavaFile(
+        fqn=f"{package}.{name}" if package else name,
+        package=package,
+        imports=frozenset(imports),
+        wildcard_imports=frozenset(wildcard_imports),
+        simple_names=frozenset(_SIMPLE_NAME_REGEX.findall(content)),
+        qualified_names=frozenset(_QUALIFIED_NAME_REGEX.findall(content)),
+    )
+
+
+def _is_under(filename: str, subdir: str) -> bool:
+    return f"{os.path.sep}{subdir}{os.path.sep}" in filename
+
+
+class ImpactAnalyzer:
+    """Test impact analyzer of a repo."""
+
+    def __init__(self, root_dir: str):
+        self.root_dir = os.path.abspath(root_dir)
+
+        # Stats.
+        self.num_parsed = 0
+
+        # Filename => ((mtime, size), JavaFile).
+        self._files: Dict[str, Tuple[Tuple[int, int], JavaFile]] = {}
+        self._lock = threading.Lock()
+
+    def _abspath(self, filename: str) -> str:
+        return os.path.abspath(os.path.join(self.root_dir, filename))
+
+    def _scan(self) -> Dict[str, JavaFile]:
+        """Java files under main and test dirs: Parse new or changed ones only."""
+        files = {}
+        for root, dirs, filenames in os.walk(self.root_dir):
+            dirs[:] = [d for d in dirs if not d.startswith(".") and d != "target"]
+            for name in filenames:
+                filename = os.path.join(root, name)
+                if not name.endswith(JAVA_SUFFIX) or not (
+                    _is_under(filename, MAIN_DIR) or _is_under(filename, TEST_DIR)
+                ):
+                    continue
+
+                try:
+                    stat = os.stat(filename)
+                except OSError:
+                    continue
+                key = (stat.st_mtime_ns, stat.st_size)
+
+                cached = self._files.get(filename)
+                if cached is None or cached[0] != key:
+                    content = utils.load_file(filename, log=False) or ""
+                    cached = (key, parse_java_file(filename, content))
+                    self.num_parsed += 1
+                files[filename] = cached
+
+        self._files = files
+        return {filename: java for filename, (_, java) in files.items()}
+
+    @staticmethod
+    def _references(java: JavaFile, classes: Dict[str, Set[str]]) -> Set[str]:
+        """Production classes referenced by a java file."""
+        refs = set()
+        for fqn in java.imports | java.qualified_names:
+            if fqn in classes:
+                refs.add(fqn)
+
+        packages = {java.package} | java.wildcard_imports
+        for name in java.simple_names:
+            for fqn in classes.get(name, ()):
+                if fqn.rsplit(".", 1)[0] in packages or fqn == name:
+                    refs.add(fqn)
+
+        refs.discard(java.fqn)
+        return refs
+
+    def select_tests(
+        self, changed_files: Iterable[str], texts: Iterable[str] = ()
+    ) -> Optional[List[str]]:
+        """Test classes impacted by changed files, or mentioned in texts, e.g. errors.
+
+        None means the full test suite, when the impact is unknown: Any changed file is
+        not an existing java file under main or test dirs.
+        """
+        changed_files = [self._abspath(f) for f in changed_files]
+        with self._lock:
+            files = self._scan()
+
+        main = {f: java for f, java in files.items() if _is_under(f, MAIN_DIR)}
+        tests = {f: java for f, java in files.items() if _is_under(f, TEST_DIR)}
+
+        changed = set()
+        impacted_tests = set()
+        for filename in changed_files:
+            if filename in tests:
+                impacted_tests.add(tests[filename].fqn)
+            elif filename in main:
+                changed.add(main[filename].fqn)
+            else:
+                # Not a java file, or a deleted one.
+                logging.info("Unknown test impact of `%s`: Run all tests.", filename)
+                return None
+
+        # Simple name => production classes.
+        classes = defaultdict(set)
+        for java in main.values():
+            classes[java.simple_name].add(java.fqn)
+            classes[java.fqn].add(java.fqn)
+        classes = dict(classes)
+
+        # Production classes depending on changed ones, transitively.
+        dependents = defaultdict(set)
+        for java in main.values():
+            for ref in self._references(java, classes):
+                dependents[ref].add(java.fqn)
+        pending = list(changed)
+        while pending:
+            for fqn in dependents.get(pending.pop(), ()):
+                if fqn not in changed:
+                    changed.add(fqn)
+                    pending.append(fqn)
+
+        text = "\n".join(texts)
+        for java in tests.values():
+            if java.fqn in impacted_tests:
+                continue
+            if self._references(java, classes) & changed or (
+                text and re.search(rf"\b{re.escape(java.simple_name)}\b", text)
+            ):
+                impacted_tests.add(java.fqn)
+
+        logging.info(
+            "Impacted tests: # = %d of %d, by %d classes.",
+            len(impacted_tests),
+            len(tests),
+            len(changed),
+        )
+        return sorted(impacted_tests)
+
+
+_ANALYZERS: Dict[str, ImpactAnalyzer] = {}
+_ANALYZERS_LOCK = threading.Lock()
+
+
+def get_analyzer(root_dir: str) -> ImpactAnalyzer:
+    """Shared analyzer per repo."""
+    root_dir = os.path.abspath(root_dir)
+    with _ANALYZERS_LOCK:
+        analyzer = _ANALYZERS.get(root_dir)
+        if analyzer is None:
+            if len(_ANALYZERS) >= MAX_ANALYZERS:
+                _ANALYZERS.clear()
+            analyzer = ImpactAnalyzer(root_dir)
+            _ANALYZERS[root_dir] = analyzer
+        return analyzer
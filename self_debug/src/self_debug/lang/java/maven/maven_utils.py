@@ -2,6 +2,7 @@
 
 from typing import Optional, Sequence, Tuple, Union
 import logging
+import re
 
 
 MAVEN_LOG_LONG_LINE_MAX_CHARACTERS = 1250
@@ -20,6 +21,12 @@ MAVEN_NON_ERROR_LINES_MAX = 400
 
 NEW_LINE = "\n"
 
+MAVEN_DEPRECATION_WARNING_REGEX = r"\[WARNING\].*has been deprecated"
+# E.g. `[INFO] --- maven-compiler-plugin:3.1:compile (default-compile) @ x ---`.
+MAVEN_PLUGIN_GOAL_REGEX = r"^\[INFO\] --- ([\w.-]+):([^:\s]+):([\w.-]+) .*---$"
+# Maven 3.9+ logs plugin prefixes instead.
+MAVEN_COMPILER_PLUGINS = ("maven-compiler-plugin", "compiler")
+
 
 def maybe_split(lines: Union[str, Sequence[str]], rstrip: bool = True) -> Tuple[str]:
     """Filter maven error from its log."""
@@ -127,3 +134,30 @@ def normalize_maven_output(
     if len(summary) == 1:
         return summary[0]
     return NEW_LINE.join(summary)
+
+
+def count_deprecation_warnings(
+    stdout: str,
+    warning_regex: str = MAVEN_DEPRECATION_WARNING_REGEX,
+    goals=("compile",),
+) -> int:
+    """Count deprecation warnings in a build log, from compiler plugin goals only.
+
+    E.g. for `mvn clean verify`, warnings from `testCompile` are skipped, the same as
+    running `mvn clean compile`; all warnings are counted if no goals are logged.
+    """
+    if not stdout:
+        return 0
+
+    count = 0
+    goal = None
+    for line in stdout.splitlines():
+        match = re.match(MAVEN_PLUGIN_GOAL_REGEX, line)
+        if match:
+            goal = match.group(3) if match.group(1) in MAVEN_COMPILER_PLUGINS else ""
+            continue
+
+        if (goal is None or goal in goals) and re.search(warning_regex, line):
+            count += 1
+
+    return count
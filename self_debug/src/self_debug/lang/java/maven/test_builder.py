@@ -2,7 +2,9 @@
 
 import logging
 import os
+import tempfile
 import unittest
+from unittest import mock
 
 from parameterized import parameterized
 from self_debug.proto import builder_pb2
@@ -90,6 +92,53 @@ class TestMavenBuilder(unittest.TestCase):
         self.assertEqual(mvn_builder.project, expected_project)
         self.assertEqual(mvn_builder.command, expected_command)
 
+    @parameterized.expand(
+        (
+            ({}, "", "", 0, False),
+            ({"show_deprecation": True}, "", "", 0, True),
+            ({"show_deprecation": True}, "module-a", "", 0, False),
+            ({"show_deprecation": True}, "", "", 1, False),
+        )
+    )
+    def test_deprecation_build_data(
+        self, kwargs, module, test, return_code, expected_reuse
+    ):
+        """Unit tests for deprecation_build_data: Reuse the last full build log."""
+        with tempfile.TemporaryDirectory() as root_dir:
+            java_file = os.path.join(root_dir, "src/main/java/A.java")
+            utils.export_file(java_file, "class A {}")
+
+            mvn_builder = builder.MavenBuilder(
+                "<JDK_PATH>",
+                root_dir,
+                require_maven_installed=False,
+                build_command="cd {root_dir}; mvn clean verify -pl {{module}} {{test}}",
+                **kwargs,
+            )
+            self.assertIsNone(mvn_builder.deprecation_build_data)
+
+            stdout = builder.BUILD_FAILURE if return_code else builder.BUILD_SUCCESS
+            cmd_data = base_builder.CmdData(stdout=stdout, return_code=return_code)
+            with mock.patch.object(
+                utils, "do_run_command", return_value=cmd_data
+            ) as run:
+                mvn_builder.build(module, test)
+
+            command = run.call_args[0][0]
+            self.assertEqual(
+                "-Dmaven.compiler.showDeprecation" in command,
+                bool(kwargs) and not module,
+            )
+            self.assertIn("{module}", mvn_builder.command)
+            if expected_reuse:
+                self.assertIs(mvn_builder.deprecation_build_data, cmd_data)
+
+                # Sources are changed, e.g. restored.
+                utils.export_file(java_file, "class A { int a; }")
+                self.assertIsNone(mvn_builder.deprecation_build_data)
+            else:
+                self.assertIsNone(mvn_builder.deprecation_build_data)
+
     @parameterized.expand(
         (
             (
@@ -0,0 +1,195 @@
+"""Unit tests for daemon.py."""
+
+import logging
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from parameterized import parameterized
+from self_debug.proto import builder_pb2
+
+from self_debug.common import deadline as deadline_lib
+from self_debug.common import utils
+from self_debug.lang.base import builder as base_builder
+from self_debug.lang.java.maven import builder, daemon
+
+_PWD = os.path.dirname(os.path.abspath(__file__))
+
+# Fake `mvnd`: Log its args, and output `$FAKE_DIR/output.txt` for builds.
+FAKE_MVND = """#!/bin/bash
+DIR=$(dirname "$0")
+echo "$@" >> "$DIR/calls.txt"
+case "$*" in
+  *--status*) exit "$(cat "$DIR/status.txt" 2>/dev/null || echo 0)" ;;
+  *--stop*) exit 0 ;;
+esac
+if [ -f "$DIR/hang.txt" ]; then
+  sleep 30
+fi
+if [ -f "$DIR/crash.txt" ]; then
+  rm "$DIR/crash.txt"
+  echo "org.mvndaemon.mvnd.common.DaemonException: Daemon disappeared"
+  exit 1
+fi
+cat "$DIR/output.txt"
+exit "$(cat "$DIR/return_code.txt")"
+"""
+
+
+class TestMavenDaemon(unittest.TestCase):
+    """Unit tests for daemon.py."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root_dir = os.path.join(self.temp_dir, "xmpp-light")
+        os.makedirs(self.root_dir)
+
+        self.mvnd = os.path.join(self.temp_dir, "mvnd")
+        utils.export_file(self.mvnd, FAKE_MVND)
+        os.chmod(self.mvnd, os.stat(self.mvnd).st_mode | stat.S_IEXEC)
+        self._set_output("testdata/xmpp-light-03-success.txt", 0)
+
+        self.config = builder_pb2.MavenDaemon(
+            command=self.mvnd,
+            daemon_storage=os.path.join(self.temp_dir, "storage", "{workspace}"),
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _set_output(self, filename: str, return_code: int):
+        shutil.copyfile(
+            os.path.join(_PWD, filename), os.path.join(self.temp_dir, "output.txt")
+        )
+        utils.export_file(
+            os.path.join(self.temp_dir, "return_code.txt"), str(return_code)
+        )
+
+    def _calls(self):
+        content = utils.load_file(os.path.join(self.temp_dir, "calls.txt")) or ""
+        return [line.split()[-1] for line in content.splitlines()]
+
+    @parameterized.expand(
+        (
+            (
+                "cd /repo; mvn clean verify",
+                "cd /repo; mvnd -Dmvnd.daemonStorage=/s -B clean verify",
+            ),
+            (
+                "cd /repo; JAVA_HOME=/jdk mvn clean verify && mvn test",
+                "cd /repo; JAVA_HOME=/jdk mvnd -Dmvnd.daemonStorage=/s -B clean verify"
+                " && mvnd -Dmvnd.daemonStorage=/s -B test",
+            ),
+            (
+                "cd /repo; /tmp/mvn clean verify; mvnd -v; ./mvnw -v",
+                "cd /repo; /tmp/mvn clean verify; mvnd -v; ./mvnw -v",
+            ),
+        )
+    )
+    def test_to_daemon_command(self, command, expected_command):
+        """Unit tests to_daemon_command."""
+        mvnd = daemon.MavenDaemon(
+            self.root_dir,
+            builder_pb2.MavenDaemon(daemon_storage="/s", args="-B"),
+        )
+        self.assertEqual(mvnd.to_daemon_command(command), expected_command)
+
+    def test_run_restart(self):
+        """Unit tests run: Health check, and restart on daemon failures."""
+        mvnd = daemon.MavenDaemon(self.root_dir, self.config)
+        self.assertTrue(mvnd.storage.endswith(daemon.get_workspace(self.root_dir)))
+
+        cmd_data = mvnd.run("mvn clean verify")
+        self.assertEqual(cmd_data.return_code, 0)
+        self.assertEqual(self._calls(), ["--status", "verify"])
+
+        # Unhealthy, then crashed.
+        utils.export_file(os.path.join(self.temp_dir, "status.txt"), "1")
+        utils.export_file(os.path.join(self.temp_dir, "crash.txt"), "")
+        cmd_data = mvnd.run("mvn clean verify")
+        self.assertEqual(cmd_data.return_code, 0)
+        self.assertEqual(
+            self._calls()[2:], ["--status", "--stop", "verify", "--stop", "verify"]
+        )
+        self.assertEqual((mvnd.num_builds, mvnd.num_restarts), (3, 1))
+
+    @parameterized.expand(
+        (
+            # Exceeded during the build.
+            (1, ["--status", "verify", "--stop"]),
+            # Exceeded before the build.
+            (-1, ["--status", "--stop"]),
+        )
+    )
+    def test_run_timeout(self, seconds, expected_calls):
+        """Unit tests run: Daemons are stopped after the deadline is exceeded."""
+        utils.export_file(os.path.join(self.temp_dir, "hang.txt"), "")
+        mvnd = daemon.MavenDaemon(self.root_dir, self.config)
+
+        with deadline_lib.scope(seconds, name="debug") as deadline:
+            cmd_data = mvnd.run("mvn clean verify")
+            self.assertTrue(deadline.expired)
+
+        self.assertTrue(utils.is_timeout(cmd_data))
+        self.assertEqual(self._calls(), expected_calls)
+        self.assertEqual(mvnd.num_restarts, 1)
+
+    def test_pool(self):
+        """Unit tests MavenDaemonPool: Capped by workspaces."""
+        pool = daemon.MavenDaemonPool(max_daemons=2)
+        first = pool.get(os.path.join(self.temp_dir, "a"), self.config)
+        pool.get(os.path.join(self.temp_dir, "b"), self.config)
+        self.assertIs(pool.get(os.path.join(self.temp_dir, "a"), self.config), first)
+
+        pool.get(os.path.join(self.temp_dir, "c"), self.config)
+        self.assertEqual(len(pool), 2)
+        # `b` is the least recently used one.
+        self.assertIn(
+            daemon.get_workspace(os.path.join(self.temp_dir, "b")),
+            utils.load_file(os.path.join(self.temp_dir, "calls.txt")),
+        )
+        self.assertEqual(self._calls(), ["--stop"])
+
+        pool.stop_all()
+        self.assertEqual(len(pool), 0)
+        self.assertEqual(self._calls(), ["--stop"] * 3)
+
+    @parameterized.expand(
+        (
+            ("testdata/xmpp-light-01.txt", 1),
+            ("testdata/xmpp-light-02-pom.txt", 1),
+            ("testdata/xmpp-light-03-success.txt", 0),
+        )
+    )
+    def test_builder(self, filename, return_code):
+        """Unit tests MavenBuilder with a daemon: Same build errors."""
+        self._set_output(filename, return_code)
+        mvn_builder = builder.MavenBuilder(
+            "<JDK_PATH>",
+            "/Users/sliuxl/xmpp-light/",
+            require_maven_installed=False,
+            build_command="cd " + self.root_dir + "; mvn clean verify",
+            backend=builder_pb2.MavenBuilder.MVND,
+            maven_daemon=self.config,
+        )
+
+        errors = mvn_builder.build()
+        self.assertEqual(
+            errors,
+            mvn_builder.extract_build_errors(
+                base_builder.CmdData(
+                    stdout=utils.load_file(os.path.join(_PWD, filename)),
+                    return_code=return_code,
+                )
+            )
+            if return_code
+            else (),
+        )
+        self.assertEqual(self._calls(), ["--status", "verify"])
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
@@ -0,0 +1,206 @@
+"""Unit tests for impact_analyzer.py."""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from parameterized import parameterized
+
+from self_debug.common import utils
+from self_debug.lang.base import builder as base_builder
+from self_debug.lang.java.maven import builder, impact_analyzer
+
+FILES = {
+    "src/main/java/com/app/Dao.java": """package com.app;
+
+public class Dao {}
+""",
+    "src/main/java/com/app/Service.java": """package com.app;
+
+public class Service {
+    private final Dao dao = new Dao();
+}
+""",
+    "src/main/java/com/app/util/Strings.java": """package com.app.util;
+
+public final class Strings {
+    public static String trim(String value) { return value; }
+}
+""",
+    "src/main/java/com/app/Unused.java": """package com.app;
+
+public class Unused {}
+""",
+    "src/test/java/com/app/ServiceTest.java": """package com.app;
+
+import org.junit.jupiter.api.Test;
+
+public class ServiceTest {
+    @Test
+    public void test() { new Service(); }
+}
+""",
+    "src/test/java/com/other/StringsTest.java": """package com.other;
+
+import static com.app.util.Strings.trim;
+
+public class StringsTest {}
+""",
+    "src/test/java/com/other/WildcardTest.java": """package com.other;
+
+import com.app.util.*;
+
+public class WildcardTest {
+    // Strings.trim(" ");
+    Object value = Strings.class;
+}
+""",
+    "src/test/java/com/other/QualifiedTest.java": """package com.other;
+
+public class QualifiedTest {
+    Object value = new com.app.Dao();
+}
+""",
+    "src/test/java/com/other/NoneTest.java": """package com.other;
+
+public class NoneTest {}
+""",
+}
+
+
+class TestImpactAnalyzer(unittest.TestCase):
+    """Unit tests for impact_analyzer.py."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root_dir = os.path.join(self.temp_dir, "repo")
+        for filename, content in FILES.items():
+            utils.export_file(os.path.join(self.root_dir, filename), content, log=False)
+        utils.export_file(os.path.join(self.root_dir, "pom.xml"), "<project/>")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    @parameterized.expand(
+        (
+            (
+                ("src/main/java/com/app/Dao.java",),
+                (),
+                ["com.app.ServiceTest", "com.other.QualifiedTest"],
+            ),
+            (
+                ("src/main/java/com/app/Service.java",),
+                (),
+                ["com.app.ServiceTest"],
+            ),
+            (
+                ("src/main/java/com/app/util/Strings.java",),
+                (),
+                ["com.other.StringsTest", "com.other.WildcardTest"],
+            ),
+            (
+                ("src/main/java/com/app/Unused.java",),
+                (),
+                [],
+            ),
+            (
+                (
+                    "src/main/java/com/app/Unused.java",
+                    "src/test/java/com/other/NoneTest.java",
+                ),
+                ("Tests run: 1, Failures: 1 in com.other.QualifiedTest",),
+                ["com.other.NoneTest", "com.other.QualifiedTest"],
+            ),
+            (
+                ("src/main/java/com/app/Dao.java", "pom.xml"),
+                (),
+                None,
+            ),
+            (
+                ("src/main/java/com/app/Deleted.java",),
+                (),
+                None,
+            ),
+        )
+    )
+    def test_select_tests(self, changed_files, texts, expected_tests):
+        """Unit tests select_tests."""
+        analyzer = impact_analyzer.ImpactAnalyzer(self.root_dir)
+        self.assertEqual(analyzer.select_tests(changed_files, texts), expected_tests)
+
+    def test_cache(self):
+        """Unit tests select_tests: Only changed files are parsed again."""
+        analyzer = impact_analyzer.get_analyzer(self.root_dir)
+        self.assertIs(impact_analyzer.get_analyzer(self.root_dir + "/"), analyzer)
+
+        changed_files = ("src/main/java/com/app/Unused.java",)
+        self.assertEqual(analyzer.select_tests(changed_files), [])
+        self.assertEqual(analyzer.num_parsed, len(FILES))
+        self.assertEqual(analyzer.select_tests(changed_files), [])
+        self.assertEqual(analyzer.num_parsed, len(FILES))
+
+        utils.export_file(
+            os.path.join(self.root_dir, "src/test/java/com/other/NoneTest.java"),
+            FILES["src/test/java/com/other/NoneTest.java"].replace(
+                "{}", "{ Object value = new com.app.Unused(); }"
+            ),
+        )
+        self.assertEqual(analyzer.select_tests(changed_files), ["com.other.NoneTest"])
+        self.assertEqual(analyzer.num_parsed, len(FILES) + 1)
+
+    @parameterized.expand(
+        (
+            (
+                "cd {root_dir}; mvn clean verify",
+                ("src/main/java/com/app/Service.java",),
+                "cd {root_dir}; mvn -Dtest=com.app.ServiceTest "
+                "-Dsurefire.failIfNoSpecifiedTests=false clean verify",
+            ),
+            (
+                "cd {root_dir}; mvn clean verify -Dtest={{test}}",
+                ("src/main/java/com/app/Service.java",),
+                "cd {root_dir}; mvn clean verify -Dtest=com.app.ServiceTest",
+            ),
+            (
+                "cd {root_dir}; mvn clean verify",
+                ("src/main/java/com/app/Unused.java",),
+                "cd {root_dir}; mvn -DskipTests clean verify",
+            ),
+            (
+                "cd {root_dir}; mvn clean verify",
+                ("pom.xml",),
+                "cd {root_dir}; mvn clean verify",
+            ),
+        )
+    )
+    def test_maven_builder(self, build_command, changed_files, expected_command):
+        """Unit tests MavenBuilder.select_tests and build with `{test}`."""
+        mvn_builder = builder.MavenBuilder(
+            "",
+            self.root_dir,
+            require_maven_installed=False,
+            show_deprecation=False,
+            build_command=build_command,
+            select_impacted_tests=True,
+        )
+
+        test = mvn_builder.select_tests(changed_files)
+        cmd_data = base_builder.CmdData(stdout="[INFO] BUILD SUCCESS", return_code=0)
+        with mock.patch.object(utils, "do_run_command", return_value=cmd_data) as run:
+            self.assertEqual(mvn_builder.build(test=test), ())
+
+        self.assertEqual(
+            run.call_args[0][0], expected_command.format(root_dir=self.root_dir)
+        )
+        self.assertEqual(mvn_builder.last_build_partial, test is not None)
+        self.assertEqual(
+            mvn_builder.command, build_command.format(root_dir=self.root_dir)
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
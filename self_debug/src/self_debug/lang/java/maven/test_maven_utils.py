@@ -181,6 +181,36 @@ class TestMavenUtils(unittest.TestCase):
             NEW_LINE.join(_maybe_load(expected_text)),
         )
 
+    @parameterized.expand(
+        (
+            ("", 0),
+            (
+                "[WARNING] A.java:[1,2] foo() in A has been deprecated\n"
+                "[WARNING] B.java:[3,4] bar() in B has been deprecated",
+                2,
+            ),
+            (
+                NEW_LINE.join(
+                    (
+                        "[INFO] --- maven-compiler-plugin:3.1:compile (default-compile) @ x ---",  # pylint: disable=line-too-long
+                        "[WARNING] A.java:[1,2] foo() in A has been deprecated",
+                        "[INFO] --- maven-resources-plugin:2.6:testResources (default-testResources) @ x ---",  # pylint: disable=line-too-long
+                        "[WARNING] Using platform encoding, has been deprecated",
+                        "[INFO] --- compiler:3.11.0:testCompile (default-testCompile) @ x ---",  # pylint: disable=line-too-long
+                        "[WARNING] ATest.java:[5,6] foo() in A has been deprecated",
+                        "[INFO] --- compiler:3.11.0:compile (default-compile) @ y ---",
+                        "[WARNING] B.java:[3,4] bar() in B has been deprecated",
+                        "[INFO] BUILD SUCCESS",
+                    )
+                ),
+                2,
+            ),
+        )
+    )
+    def test_count_deprecation_warnings(self, stdout, expected_count):
+        """Unit tests for count_deprecation_warnings."""
+        self.assertEqual(maven_utils.count_deprecation_warnings(stdout), expected_count)
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
@@ -3,14 +3,16 @@
 import abc
 import json
 import logging
-import time
+import os
 from typing import Any, Tuple
 
-import boto3
-import botocore
 from self_debug.proto import llm_agent_pb2, model_pb2
 
-from self_debug.common import utils
+from self_debug.common import deadline as deadline_lib
+from self_debug.common import lazy_import, utils, warm_pool
+
+boto3 = lazy_import.lazy_module("boto3")
+botocore_exceptions = lazy_import.lazy_module("botocore.exceptions", "botocore")
 
 
 # https://aws.amazon.com/blogs/aws/amazon-bedrock-now-provides-access-to-anthropics-latest-model-claude-2-1/
@@ -99,7 +101,11 @@ class BaseLlmAgent(abc.ABC):
 
     @abc.abstractmethod
     def run(
-        self, prompt: str, system_prompt: str = "", messages: Tuple[Any] = None
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        messages: Tuple[Any] = None,
+        deadline: deadline_lib.Deadline = None,
     ) -> str:
         """LLM call."""
 
@@ -175,18 +181,25 @@ class BedrockRuntimeLlmAgent(BaseLlmAgent):
 
         return BedrockRuntimeLlmAgent(**kwargs)
 
-    def _init_runtime(self):
-        """Init runtime."""
+    def _create_runtime(self):
         endpoint_url = f"https://bedrock-runtime.{self.region}.amazonaws.com"
 
         session = boto3.Session()
-        self.runtime = session.client(
+        return session.client(
             # https://github.com/boto/boto3/issues/3881
             service_name="bedrock-runtime",
             region_name=self.region,
             endpoint_url=endpoint_url,
         )
 
+    def _init_runtime(self):
+        """Init runtime: Shared in a warm pool scope, per region and credentials."""
+        self.runtime = warm_pool.get_or_create(
+            ("bedrock-runtime", self.region, os.environ.get("AWS_ACCESS_KEY_ID")),
+            self._create_runtime,
+            close=lambda runtime: runtime.close(),
+        )
+
     def _parse_body(self, body):
         if self.model_catalog == "anthropic":
             return body
@@ -218,9 +231,17 @@ class BedrockRuntimeLlmAgent(BaseLlmAgent):
             return body
 
     def run(
-        self, prompt: str, system_prompt: str = "", messages: Tuple[Any] = None
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        messages: Tuple[Any] = None,
+        deadline: deadline_lib.Deadline = None,
     ) -> str:
-        """LLM Call."""
+        """LLM Call: Retries are bounded by the deadline (the current one by default)."""
+        deadline = deadline or deadline_lib.get_deadline()
+        if deadline is not None:
+            deadline.check(f"llm:{self.model_id}")
+
         if self.runtime is None:
             self._init_runtime()
 
@@ -280,7 +301,7 @@ class BedrockRuntimeLlmAgent(BaseLlmAgent):
                     return response_body["generation"]
                 if self.model_catalog == "mistral":
                     return response["choices"][0]["message"]["content"]
-            except botocore.exceptions.ClientError as error:
+            except botocore_exceptions.ClientError as error:
                 msg = str(error)
                 logging.exception(
                     "Unable to get LLM response: <<<%s>>>. `%s`", msg, type(error)
@@ -304,8 +325,8 @@ class BedrockRuntimeLlmAgent(BaseLlmAgent):
 
             # Wait a few seconds, and retry.
             logging.warning("Wait %f seconds ...", seconds)
-            if seconds > 0:
-                time.sleep(seconds)
+            if seconds > 0 and not deadline_lib.sleep(seconds, deadline):
+                raise deadline_lib.DeadlineExceeded(deadline, f"llm:{self.model_id}")
 
             # What to use in the next round.
             seconds *= seconds_factor
@@ -2,11 +2,12 @@
 
 import logging
 import unittest
+from unittest import mock
 
 from parameterized import parameterized
 from self_debug.proto import llm_agent_pb2
 
-from self_debug.common import utils
+from self_debug.common import utils, warm_pool
 from self_debug.lm import llm_agent_factory
 
 
@@ -84,6 +85,40 @@ class TestBedrockRuntimeLlmAgent(unittest.TestCase):
         self.assertIsNone(agent.runtime)
         self.assertEqual(agent.region, expected_region)
 
+    @parameterized.expand(
+        (
+            (False, ("us-east-1", "us-east-1", "us-west-2"), 3),
+            (True, ("us-east-1", "us-east-1", "us-west-2"), 2),
+        )
+    )
+    def test_init_runtime(self, warm, regions, expected_num_runtimes):
+        """Unit test for _init_runtime: Shared per region in a warm pool scope."""
+        with mock.patch.object(
+            llm_agent_factory.BedrockRuntimeLlmAgent,
+            "_create_runtime",
+            side_effect=lambda: mock.MagicMock(),
+        ) as mock_create:
+            pool = warm_pool.WarmPool()
+            with mock.patch.object(warm_pool, "get_pool", return_value=pool):
+                if warm:
+                    pool.acquire()
+
+                runtimes = []
+                for region in regions:
+                    agent = llm_agent_factory.create_llm_agent(
+                        "bedrock_runtime_llm_agent", model_id="id", region=region
+                    )
+                    agent._init_runtime()
+                    runtimes.append(agent.runtime)
+
+                if warm:
+                    pool.release()
+
+        self.assertEqual(mock_create.call_count, expected_num_runtimes)
+        self.assertEqual(len({id(r) for r in runtimes}), expected_num_runtimes)
+        for runtime in runtimes:
+            self.assertEqual(runtime.close.call_count, int(warm))
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
@@ -6,9 +6,9 @@ import logging
 import sys
 from typing import Any, Dict, Sequence
 
-import boto3
+from self_debug.common import lazy_import, send_email, utils
 
-from self_debug.common import send_email, utils
+boto3 = lazy_import.lazy_module("boto3")
 
 DEFAULT_NAMESPACE = "aws"
 NAMESPACE = "namespace"
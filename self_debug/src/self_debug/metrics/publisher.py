@@ -0,0 +1,306 @@
+"""Batched CloudWatch publisher: Aggregate locally, split by API limits, flush async.
+
+Datapoints are queued by `add` without any API call, and a background thread flushes
+them every `flush_seconds`:
+- Aggregate datapoints into a StatisticSet per (namespace, name, unit, dimensions).
+- Split `put_metric_data` requests by the # datapoints and the payload size limits.
+- Retry failed requests with exponential backoff, e.g. when throttled.
+
+With `JsonlSink` as the client, requests are appended to a local JSONL file instead,
+so that the pipeline runs offline.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from self_debug.metrics import cloud_watch
+
+
+# https://docs.aws.amazon.com/AmazonCloudWatch/latest/APIReference/API_PutMetricData.html
+MAX_METRIC_DATA = 1000
+MAX_REQUEST_BYTES = 1000 * 1000
+
+FLUSH_SECONDS = 10.0
+MAX_RETRIES = 3
+RETRY_SECONDS = 1.0
+
+STATISTIC_VALUES = "StatisticValues"
+
+_VALUE_FIELDS = ("Value", "Values", "Counts", STATISTIC_VALUES)
+
+
+def _dimensions_key(dimensions: Optional[Sequence[Dict[str, str]]]) -> Tuple:
+    return tuple(sorted((d["Name"], str(d["Value"])) for d in dimensions or ()))
+
+
+def _to_statistics(metric: Dict[str, Any]) -> Optional[Dict[str, float]]:
+    """StatisticSet of a datapoint, if any: Non numeric values are skipped."""
+    if STATISTIC_VALUES in metric:
+        return dict(metric[STATISTIC_VALUES])
+
+    values = metric.get("Values")
+    if values is None:
+        values = () if metric.get("Value") is None else (metric["Value"],)
+    values = [v for v in values if isinstance(v, (int, float))]
+    if not values:
+        return None
+
+    return {
+        "SampleCount": len(values),
+        "Sum": sum(values),
+        "Minimum": min(values),
+        "Maximum": max(values),
+    }
+
+
+def aggregate_metrics(metrics: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Aggregate datapoints into a StatisticSet per name, unit and dimensions."""
+    aggregated = {}
+    for metric in metrics:
+        stats = _to_statistics(metric)
+        if stats is None:
+            logging.warning("Skip metric without numeric values: `%s`.", metric)
+            continue
+
+        key = (
+            metric["MetricName"],
+            metric.get("Unit"),
+            _dimensions_key(metric.get("Dimensions")),
+        )
+        datum = aggregated.get(key)
+        if datum is None:
+            datum = {k: v for k, v in metric.items() if k not in _VALUE_FIELDS}
+            datum[STATISTIC_VALUES] = stats
+            aggregated[key] = datum
+            continue
+
+        lhs = datum[STATISTIC_VALUES]
+        lhs["SampleCount"] += stats["SampleCount"]
+        lhs["Sum"] += stats["Sum"]
+        lhs["Minimum"] = min(lhs["Minimum"], stats["Minimum"])
+        lhs["Maximum"] = max(lhs["Maximum"], stats["Maximum"])
+        if cloud_watch.TIMESTAMP in metric:
+            datum[cloud_watch.TIMESTAMP] = max(
+                datum.get(cloud_watch.TIMESTAMP, metric[cloud_watch.TIMESTAMP]),
+                metric[cloud_watch.TIMESTAMP],
+            )
+
+    return list(aggregated.values())
+
+
+def _size(metric: Dict[str, Any]) -> int:
+    return len(json.dumps(metric, default=str))
+
+
+def split_metrics(
+    metrics: Sequence[Dict[str, Any]],
+    max_metric_data: int = MAX_METRIC_DATA,
+    max_bytes: int = MAX_REQUEST_BYTES,
+) -> List[List[Dict[str, Any]]]:
+    """Split datapoints into requests by the # datapoints and the (estimated) size."""
+    requests, request, size = [], [], 0
+    for metric in metrics:
+        metric_size = _size(metric)
+        full = len(request) >= max_metric_data or size + metric_size > max_bytes
+        if request and full:
+            requests.append(request)
+            request, size = [], 0
+        request.append(metric)
+        size += metric_size
+
+    if request:
+        requests.append(request)
+    return requests
+
+
+class JsonlSink:
+    """Local sink with the API of a boto3 client: A JSON line per request."""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._lock = threading.Lock()
+
+    def put_metric_data(self, **kwargs) -> Dict[str, Any]:
+        """Append a request."""
+        line = json.dumps(kwargs, default=str, sort_keys=True)
+        with self._lock:
+            dirname = os.path.dirname(self.filename)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            with open(self.filename, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        return {}
+
+
+def load_jsonl(filename: str) -> List[Dict[str, Any]]:
+    """Requests from a JSONL sink."""
+    with open(filename, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class BatchPublisher:  # pylint: disable=too-many-instance-attributes
+    """Publish datapoints in batches from a background thread."""
+
+    def __init__(
+        self,
+        client: cloud_watch.CloudWatch,
+        flush_seconds: float = FLUSH_SECONDS,
+        max_retries: int = MAX_RETRIES,
+        retry_seconds: float = RETRY_SECONDS,
+        dry_run: bool = False,
+        **kwargs,
+    ):
+        self.client = client
+        self.flush_seconds = flush_seconds
+        self.max_retries = max_retries
+        self.retry_seconds = retry_seconds
+        self.dry_run = dry_run
+
+        self.max_metric_data = kwargs.get("max_metric_data", MAX_METRIC_DATA)
+        self.max_bytes = kwargs.get("max_bytes", MAX_REQUEST_BYTES)
+
+        # Stats.
+        self.num_requests = 0
+        self.num_retries = 0
+        self.num_failed = 0
+
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        # Only one flush at a time: Requests are sent in order.
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def num_pending(self) -> int:
+        """# datapoints not flushed yet."""
+        with self._lock:
+            return len(self._pending)
+
+    def start(self):
+        """Start the background thread, if not yet."""
+        with self._lock:
+            if self._thread is None and not self._closed.is_set():
+                self._thread = threading.Thread(
+                    target=self._run, name="BatchPublisher", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def add(self, metrics: Sequence[Dict[str, Any]]):
+        """Queue datapoints: Flushed by the background thread."""
+        with self._lock:
+            self._pending.extend(metrics)
+            full = len(self._pending) >= self.max_metric_data
+        if full:
+            self._wakeup.set()
+        return self
+
+    def _run(self):
+        while not self._closed.is_set():
+            self._wakeup.wait(self.flush_seconds)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as error:  # pylint: disable=broad-except
+                logging.exception("Unable to flush metrics: <<<%s>>>", error)
+
+    def _send(self, metrics: List[Dict[str, Any]]) -> bool:
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.num_retries += 1
+                time.sleep(self.retry_seconds * 2 ** (attempt - 1))
+            try:
+                self.client.publish(metrics, dry_run=self.dry_run)
+                self.num_requests += 1
+                return True
+            except Exception as error:  # pylint: disable=broad-except
+                logging.warning(
+                    "Unable to publish %d metrics (attempt %d/ %d): <<<%s>>>",
+                    len(metrics),
+                    attempt,
+                    self.max_retries,
+                    error,
+                )
+
+        self.num_failed += len(metrics)
+        return False
+
+    def flush(self) -> int:
+        """Aggregate and publish pending datapoints: Return # requests sent."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return 0
+
+            requests = split_metrics(
+                aggregate_metrics(pending), self.max_metric_data, self.max_bytes
+            )
+            logging.info(
+                "Flush %d datapoints in %d requests to `%s`.",
+                len(pending),
+                len(requests),
+                self.client.namespace,
+            )
+            return sum(self._send(request) for request in requests)
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop the background thread and flush."""
+        self._closed.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self.flush()
+
+
+_PUBLISHERS: Dict[Tuple, BatchPublisher] = {}
+_PUBLISHERS_LOCK = threading.Lock()
+
+
+def get_publisher(
+    region: Optional[str] = None,
+    namespace: Optional[str] = None,
+    jsonl_file: Optional[str] = None,
+    dry_run: bool = False,
+    **kwargs,
+) -> BatchPublisher:
+    """Shared publisher per process, e.g. for all tasks in a Spark executor."""
+    key = (region, namespace, jsonl_file, dry_run)
+    with _PUBLISHERS_LOCK:
+        publisher = _PUBLISHERS.get(key)
+        if publisher is None:
+            client_kwargs = {"client": JsonlSink(jsonl_file)} if jsonl_file else {}
+            client = cloud_watch.CloudWatch(
+                region=region, namespace=namespace, **client_kwargs
+            )
+            publisher = _PUBLISHERS[key] = BatchPublisher(
+                client, dry_run=dry_run, **kwargs
+            ).start()
+        return publisher
+
+
+def close_publishers():
+    """Flush all shared publishers."""
+    with _PUBLISHERS_LOCK:
+        publishers = list(_PUBLISHERS.values())
+        _PUBLISHERS.clear()
+
+    for publisher in publishers:
+        publisher.close()
+
+
+atexit.register(close_publishers)
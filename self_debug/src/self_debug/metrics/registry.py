@@ -0,0 +1,296 @@
+"""Metrics registry: Typed metrics keyed by `(name, labels)`, mergeable in place.
+
+Counters, gauges and histograms (t-digests) replace string encoded keys, e.g.
+
+```
+registry.inc("Debugger::01--11--success-project-iter", success=True, project=p, iter=3)
+```
+
+is rendered as `Debugger::01--11--success-project-iter=<True,p,3>` by `to_legacy`, so
+that email reports and `metric_utils.show_metrics` keep the same format.
+
+Registries are merged in place, e.g. `rdd.reduce(registry.merge)`, instead of building
+a new dict over the key union in every reduce.
+"""
+
+import json
+import zlib
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+from self_debug.metrics import tdigest
+
+
+# Labels are ordered as given: It's the order of values in a legacy key.
+Labels = Tuple[Tuple[str, str], ...]
+Key = Tuple[str, Labels]
+
+KIND_COUNTER = "counter"
+KIND_GAUGE = "gauge"
+KIND_HISTOGRAM = "histogram"
+
+# Rendered for histograms by `to_legacy`.
+HISTOGRAM_PERCENTILES = (50, 95)
+
+LEGACY_LABEL_SEP = ","
+
+# Keys which predate `name=<v0,v1>`: Rendered by format, with the name and labels.
+LEGACY_FORMATS = {
+    "Debugger::00--02--project-iter": "{name}=<{project}, {max}>",
+    "Debugger::01--00--error": "{name}--{project}--{error}",
+}
+
+SERIALIZATION_VERSION = 1
+
+
+class Counter:
+    """Counter: Merged by sum."""
+
+    __slots__ = ("value",)
+
+    kind = KIND_COUNTER
+
+    def __init__(self, value: float = 0):
+        self.value = value
+
+    def inc(self, value: float = 1):
+        """Increment."""
+        self.value += value
+
+    def merge(self, other: "Counter"):
+        """Merge in place."""
+        self.value += other.value
+
+    def to_data(self) -> Any:
+        """Compact form."""
+        return self.value
+
+    @classmethod
+    def from_data(cls, data: Any) -> "Counter":
+        """Inverse of `to_data`."""
+        return cls(data)
+
+
+class Gauge(Counter):
+    """Gauge: The last value set, merged by max, e.g. peak memory or walltime."""
+
+    __slots__ = ()
+
+    kind = KIND_GAUGE
+
+    def set(self, value: float):
+        """Set value."""
+        self.value = value
+
+    def merge(self, other: "Gauge"):
+        """Merge in place."""
+        self.value = max(self.value, other.value)
+
+
+class Histogram:
+    """Histogram: A t-digest, for distributions of e.g. latency or # errors."""
+
+    __slots__ = ("digest",)
+
+    kind = KIND_HISTOGRAM
+
+    def __init__(self, digest: Optional[tdigest.TDigest] = None):
+        self.digest = digest if digest is not None else tdigest.TDigest()
+
+    @property
+    def value(self) -> float:
+        """Count of observations."""
+        return self.digest.count
+
+    def observe(self, value: float):
+        """Add an observation."""
+        self.digest.add(value)
+
+    def merge(self, other: "Histogram"):
+        """Merge in place."""
+        self.digest.merge(other.digest)
+
+    def to_data(self) -> Any:
+        """Compact form."""
+        return self.digest.to_dict()
+
+    @classmethod
+    def from_data(cls, data: Any) -> "Histogram":
+        """Inverse of `to_data`."""
+        return cls(tdigest.TDigest.from_dict(data))
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+_KINDS = {cls.kind: cls for cls in (Counter, Gauge, Histogram)}
+
+
+def to_labels(labels: Dict[str, Any]) -> Labels:
+    """Labels as a hashable tuple: Values are strings."""
+    return tuple((str(key), str(value)) for key, value in labels.items())
+
+
+class MetricsRegistry:
+    """Metrics keyed by `(name, labels)`."""
+
+    def __init__(self):
+        self._metrics: Dict[Key, Metric] = {}
+
+    def __len__(self) -> int:
+        return len(self._metrics)
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._metrics
+
+    def __iter__(self) -> Iterator[Tuple[Key, Metric]]:
+        return iter(self._metrics.items())
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, MetricsRegistry) and self.to_dict() == other.to_dict()
+
+    def _get(self, cls, name: str, labels: Dict[str, Any]) -> Metric:
+        key = (name, to_labels(labels))
+        metric = self._metrics.get(key)
+        if metric is None:
+            metric = self._metrics[key] = cls()
+        elif metric.kind != cls.kind:
+            raise TypeError(f"Metric `{key}` is a {metric.kind}, not a {cls.kind}.")
+        return metric
+
+    def get(self, name: str, **labels) -> Optional[Metric]:
+        """Get a metric, if any."""
+        return self._metrics.get((name, to_labels(labels)))
+
+    def counter(self, name: str, **labels) -> Counter:
+        """Get or create a counter."""
+        return self._get(Counter, name, labels)
+
+    def gauge(self, name: str, **labels) -> Gauge:
+        """Get or create a gauge."""
+        return self._get(Gauge, name, labels)
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        """Get or create a histogram."""
+        return self._get(Histogram, name, labels)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increment a counter."""
+        self.counter(name, **labels).inc(value)
+        return self
+
+    def set(self, name: str, value: float, **labels):
+        """Set a gauge."""
+        self.gauge(name, **labels).set(value)
+        return self
+
+    def observe(self, name: str, value: float, **labels):
+        """Add an observation to a histogram."""
+        self.histogram(name, **labels).observe(value)
+        return self
+
+    def merge(self, other: Optional["MetricsRegistry"]):
+        """Merge another registry in place: Metrics of `other` are not shared."""
+        if other is None:
+            return self
+        if isinstance(other, dict):
+            other = from_legacy(other)
+
+        for key, metric in other:
+            existing = self._metrics.get(key)
+            if existing is None:
+                self._metrics[key] = _copy(metric)
+            elif existing.kind != metric.kind:
+                raise TypeError(
+                    f"Metric `{key}` is a {existing.kind}, not a {metric.kind}."
+                )
+            else:
+                existing.merge(metric)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact form: `[kind, name, flattened labels, data]` per metric."""
+        return {
+            "version": SERIALIZATION_VERSION,
+            "metrics": [
+                [
+                    metric.kind,
+                    name,
+                    [value for label in labels for value in label],
+                    metric.to_data(),
+                ]
+                for (name, labels), metric in sorted(
+                    self._metrics.items(), key=lambda item: item[0]
+                )
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MetricsRegistry":
+        """Inverse of `to_dict`."""
+        registry = cls()
+        for kind, name, flat, metric_data in data.get("metrics", ()):
+            labels = tuple((flat[i], flat[i + 1]) for i in range(0, len(flat), 2))
+            registry._metrics[(name, labels)] = _KINDS[kind].from_data(metric_data)
+        return registry
+
+    def serialize(self) -> bytes:
+        """Compressed JSON."""
+        return zlib.compress(
+            json.dumps(self.to_dict(), separators=(",", ":")).encode("utf-8")
+        )
+
+    @classmethod
+    def deserialize(cls, data: bytes) -> "MetricsRegistry":
+        """Inverse of `serialize`."""
+        return cls.from_dict(json.loads(zlib.decompress(data).decode("utf-8")))
+
+    def __reduce__(self):
+        # Pickled compactly, e.g. between Spark executors and the driver.
+        return (self.__class__.deserialize, (self.serialize(),))
+
+    def to_legacy(self) -> Dict[str, float]:
+        """Render as string encoded keys, e.g. for email reports."""
+        result = {}
+        for (name, labels), metric in self._metrics.items():
+            key = legacy_key(name, labels)
+            if metric.kind != KIND_HISTOGRAM:
+                result[key] = result.get(key, 0) + metric.value
+                continue
+
+            if not metric.value:
+                continue
+            result[f"{key}::count"] = metric.value
+            for pct in HISTOGRAM_PERCENTILES:
+                result[f"{key}::p{pct}"] = metric.digest.percentile(pct)
+            result[f"{key}::max"] = metric.digest.max
+        return result
+
+
+def _copy(metric: Metric) -> Metric:
+    return type(metric).from_data(metric.to_data())
+
+
+def legacy_key(name: str, labels: Labels) -> str:
+    """Legacy key, e.g. `name=<value_0,value_1>`."""
+    if not labels:
+        return name
+    if name in LEGACY_FORMATS:
+        return LEGACY_FORMATS[name].format(name=name, **dict(labels))
+    return f"{name}=<{LEGACY_LABEL_SEP.join(value for _, value in labels)}>"
+
+
+def from_legacy(metrics: Optional[Dict[str, float]]) -> MetricsRegistry:
+    """Counters from string encoded keys, e.g. `BaseBuilder.run_metrics`."""
+    registry = MetricsRegistry()
+    for key, value in (metrics or {}).items():
+        registry.inc(key, value)
+    return registry
+
+
+def merge(
+    lhs: Optional[Union[MetricsRegistry, Dict[str, float]]],
+    rhs: Optional[Union[MetricsRegistry, Dict[str, float]]],
+) -> MetricsRegistry:
+    """Merge `rhs` into `lhs` in place, e.g. as a Spark reduce function."""
+    if not isinstance(lhs, MetricsRegistry):
+        lhs = from_legacy(lhs)
+    return lhs.merge(rhs)
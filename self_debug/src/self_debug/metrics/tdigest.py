@@ -0,0 +1,191 @@
+"""T-digest: A mergeable sketch of a distribution for approximate quantiles.
+
+It keeps at most ~`compression` centroids, which are smaller near both tails, so that
+p50/p95/p99 are accurate with constant memory; digests from different executors are
+merged without the raw values.
+
+https://github.com/tdunning/t-digest/blob/main/docs/t-digest-paper/histo.pdf
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+COMPRESSION = 100
+
+# Values are buffered before being merged into centroids.
+BUFFER_FACTOR = 5
+
+
+class TDigest:
+    """Merging t-digest: Centroids are `[mean, weight]`, sorted by mean."""
+
+    __slots__ = (
+        "compression",
+        "count",
+        "total",
+        "min",
+        "max",
+        "_centroids",
+        "_buffer",
+    )
+
+    def __init__(self, compression: int = COMPRESSION):
+        self.compression = compression
+
+        self.count = 0.0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+        self._centroids: List[List[float]] = []
+        self._buffer: List[List[float]] = []
+
+    def __len__(self) -> int:
+        return int(self.count)
+
+    @property
+    def centroids(self) -> List[List[float]]:
+        """Centroids after merging buffered values."""
+        self._compress()
+        return self._centroids
+
+    def add(self, value: float, weight: float = 1.0):
+        """Add a value."""
+        if weight <= 0:
+            return self
+
+        value = float(value)
+        self.count += weight
+        self.total += value * weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        self._buffer.append([value, float(weight)])
+        if len(self._buffer) > BUFFER_FACTOR * self.compression:
+            self._compress()
+        return self
+
+    def update(self, values: Sequence[float]):
+        """Add values."""
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: "TDigest"):
+        """Merge another digest in place."""
+        if other is None or not other.count:
+            return self
+
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+        self._buffer.extend([mean, weight] for mean, weight in other._centroids)
+        self._buffer.extend([mean, weight] for mean, weight in other._buffer)
+        self._compress()
+        return self
+
+    def _compress(self):
+        if not self._buffer:
+            return
+
+        points = sorted(self._centroids + self._buffer)
+        self._buffer = []
+
+        merged = []
+        # Weight of centroids before the last one.
+        cumulative = 0.0
+        for mean, weight in points:
+            if merged:
+                last = merged[-1]
+                new_weight = last[1] + weight
+                q_lhs = cumulative / self.count
+                q_rhs = min((cumulative + new_weight) / self.count, 1.0)
+                if self._scale(q_rhs) - self._scale(q_lhs) <= 1.0:
+                    last[0] += (mean - last[0]) * weight / new_weight
+                    last[1] = new_weight
+                    continue
+                cumulative += last[1]
+            merged.append([mean, weight])
+
+        self._centroids = merged
+
+    def _scale(self, q: float) -> float:
+        # Scale function k_1: Smaller centroids near both tails.
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate quantile in [0, 1], interpolated between centroids."""
+        centroids = self.centroids
+        if not centroids:
+            return None
+        if len(centroids) == 1 or q <= 0:
+            return self.min if q <= 0 else centroids[0][0]
+        if q >= 1:
+            return self.max
+
+        target = q * self.count
+        # (cumulative weight, mean) at the middle of the previous centroid.
+        prev = (0.0, self.min)
+        cumulative = 0.0
+        for mean, weight in centroids:
+            mid = cumulative + weight / 2.0
+            if target < mid:
+                return _interpolate(prev, (mid, mean), target)
+            prev = (mid, mean)
+            cumulative += weight
+
+        return _interpolate(prev, (self.count, self.max), target)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Approximate percentile in [0, 100]."""
+        return self.quantile(pct / 100.0)
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Mean."""
+        return self.total / self.count if self.count else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact form: Centroids are flattened."""
+        return {
+            "compression": self.compression,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "centroids": [value for centroid in self.centroids for value in centroid],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TDigest":
+        """Inverse of `to_dict`."""
+        digest = cls(data.get("compression", COMPRESSION))
+        if not data.get("count"):
+            return digest
+
+        digest.count = data["count"]
+        digest.total = data["total"]
+        digest.min = data["min"]
+        digest.max = data["max"]
+
+        flat = data["centroids"]
+        digest._centroids = [[flat[i], flat[i + 1]] for i in range(0, len(flat), 2)]
+        return digest
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, TDigest) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return (
+            f"TDigest(count={self.count}, min={self.min}, max={self.max}, "
+            f"centroids={len(self.centroids)})"
+        )
+
+
+def _interpolate(lhs, rhs, x: float) -> float:
+    (x0, y0), (x1, y1) = lhs, rhs
+    if x1 <= x0:
+        return y1
+    return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
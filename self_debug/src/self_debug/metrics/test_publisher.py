@@ -0,0 +1,170 @@
+"""Unit tests for publisher.py."""
+
+import logging
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from parameterized import parameterized
+
+from self_debug.common import utils
+from self_debug.metrics import cloud_watch, publisher
+
+DIMENSIONS = [{"Name": "job", "Value": "qct"}]
+
+
+def _metric(name: str, value, **kwargs):
+    return cloud_watch.build_metric(name, value, cloud_watch.UNIT_COUNT, **kwargs)
+
+
+class _FlakyClient(cloud_watch.CloudWatch):
+    """Fail the first few requests."""
+
+    def __init__(self, num_failures: int):
+        super().__init__(client=None)
+        self.num_failures = num_failures
+        self.requests = []
+
+    def publish(self, metrics, dry_run: bool = False):
+        if self.num_failures > 0:
+            self.num_failures -= 1
+            raise RuntimeError("Throttling")
+        self.requests.append(list(metrics))
+        return {}
+
+
+class TestPublisher(unittest.TestCase):
+    """Unit tests for publisher.py."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.jsonl_file = os.path.join(self.temp_dir, "metrics", "cw.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_aggregate_metrics(self):
+        """Unit tests aggregate_metrics: A StatisticSet per name and dimensions."""
+        metrics = [
+            _metric("n", 3, dry_run=True),
+            _metric("n", [1, 5], dry_run=True),
+            _metric("n", 2, Dimensions=DIMENSIONS, dry_run=True),
+            _metric("n", "str", dry_run=True),
+            _metric("m", [], dry_run=True),
+        ]
+
+        self.assertEqual(
+            publisher.aggregate_metrics(metrics),
+            [
+                {
+                    "MetricName": "n",
+                    "Unit": cloud_watch.UNIT_COUNT,
+                    "StatisticValues": {
+                        "SampleCount": 3,
+                        "Sum": 9,
+                        "Minimum": 1,
+                        "Maximum": 5,
+                    },
+                },
+                {
+                    "MetricName": "n",
+                    "Unit": cloud_watch.UNIT_COUNT,
+                    "Dimensions": DIMENSIONS,
+                    "StatisticValues": {
+                        "SampleCount": 1,
+                        "Sum": 2,
+                        "Minimum": 2,
+                        "Maximum": 2,
+                    },
+                },
+            ],
+        )
+
+    @parameterized.expand(
+        (
+            (0, {}, []),
+            (5, {}, [5]),
+            (5, {"max_metric_data": 2}, [2, 2, 1]),
+            (5, {"max_bytes": 60}, [1, 1, 1, 1, 1]),
+            (2500, {}, [1000, 1000, 500]),
+        )
+    )
+    def test_split_metrics(self, num_metrics, kwargs, expected_sizes):
+        """Unit tests split_metrics."""
+        metrics = [_metric(f"m{i}", i, dry_run=True) for i in range(num_metrics)]
+
+        requests = publisher.split_metrics(metrics, **kwargs)
+        self.assertEqual([len(r) for r in requests], expected_sizes)
+        self.assertEqual(sum(requests, []), metrics)
+
+    def test_flush_to_jsonl(self):
+        """Unit tests BatchPublisher with a JSONL sink."""
+        client = cloud_watch.CloudWatch(
+            namespace="test", client=publisher.JsonlSink(self.jsonl_file)
+        )
+        with publisher.BatchPublisher(client, max_metric_data=2) as pub:
+            pub.add([_metric("a", 1), _metric("a", 2), _metric("b", 3)])
+            pub.add([_metric("c", 4)])
+
+        self.assertEqual(pub.num_pending, 0)
+        self.assertEqual(pub.num_requests, 2)
+
+        requests = publisher.load_jsonl(self.jsonl_file)
+        self.assertEqual([r["Namespace"] for r in requests], ["test", "test"])
+        self.assertEqual(
+            [[m["MetricName"] for m in r["MetricData"]] for r in requests],
+            [["a", "b"], ["c"]],
+        )
+        self.assertEqual(requests[0]["MetricData"][0]["StatisticValues"]["Sum"], 3)
+
+    def test_background_flush(self):
+        """Unit tests BatchPublisher: Flushed by the background thread."""
+        client = _FlakyClient(num_failures=0)
+        pub = publisher.BatchPublisher(client, flush_seconds=0.01).start()
+        pub.add([_metric("a", 1)])
+
+        for _ in range(500):
+            if client.requests:
+                break
+            time.sleep(0.01)
+        pub.close()
+
+        self.assertEqual(len(client.requests), 1)
+
+    @parameterized.expand(
+        (
+            (0, 1, 0, 0),
+            (2, 1, 2, 0),
+            (5, 0, 3, 1),
+        )
+    )
+    def test_retries(
+        self, num_failures, expected_requests, expected_retries, expected_failed
+    ):
+        """Unit tests BatchPublisher: Retried with backoff."""
+        client = _FlakyClient(num_failures)
+        pub = publisher.BatchPublisher(client, retry_seconds=0.001)
+        pub.add([_metric("a", 1)])
+
+        self.assertEqual(pub.flush(), expected_requests)
+        self.assertEqual(pub.num_retries, expected_retries)
+        self.assertEqual(pub.num_failed, expected_failed)
+        self.assertEqual(pub.flush(), 0)
+
+    def test_get_publisher(self):
+        """Unit tests get_publisher: Shared per process."""
+        pub = publisher.get_publisher(namespace="test", jsonl_file=self.jsonl_file)
+        self.assertIs(
+            publisher.get_publisher(namespace="test", jsonl_file=self.jsonl_file), pub
+        )
+
+        pub.add([_metric("a", 1)])
+        publisher.close_publishers()
+        self.assertEqual(len(publisher.load_jsonl(self.jsonl_file)), 1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Unit tests for registry.py."""
+
+import logging
+import pickle
+import unittest
+
+from parameterized import parameterized
+
+from self_debug.common import utils
+from self_debug.metrics import registry
+
+
+def _registry(index: int) -> registry.MetricsRegistry:
+    metrics = registry.MetricsRegistry()
+    metrics.inc("Debugger::00--00--attemped")
+    metrics.inc("Debugger::01--00--success", success=index % 2 == 0)
+    metrics.inc("Debugger::01--02--success-iter", success=True, iter=f"{index:03d}")
+    metrics.set("#seconds::total", index * 10.0)
+    metrics.observe("Debugger::02--00--latency_seconds", index)
+    return metrics
+
+
+class TestRegistry(unittest.TestCase):
+    """Unit tests for registry.py."""
+
+    def test_metrics(self):
+        """Unit tests counters, gauges and histograms."""
+        metrics = _registry(1)
+        metrics.inc("Debugger::00--00--attemped", 2)
+        metrics.set("#seconds::total", 5.0)
+
+        self.assertEqual(len(metrics), 5)
+        self.assertEqual(metrics.get("Debugger::00--00--attemped").value, 3)
+        self.assertEqual(metrics.get("#seconds::total").value, 5.0)
+        self.assertEqual(
+            metrics.get("Debugger::01--00--success", success=False).value, 1
+        )
+        self.assertIsNone(metrics.get("Debugger::01--00--success", success=True))
+
+        with self.assertRaises(TypeError):
+            metrics.observe("Debugger::00--00--attemped", 1)
+        with self.assertRaises(TypeError):
+            metrics.inc("#seconds::total")
+
+    def test_merge(self):
+        """Unit tests merge: In place, without sharing metrics."""
+        lhs, rhs = _registry(1), _registry(2)
+        merged = registry.merge(lhs, rhs)
+        self.assertIs(merged, lhs)
+
+        self.assertEqual(merged.get("Debugger::00--00--attemped").value, 2)
+        self.assertEqual(merged.get("#seconds::total").value, 20.0)
+        self.assertEqual(
+            merged.get("Debugger::02--00--latency_seconds").digest.percentile(50), 1.5
+        )
+
+        rhs.inc("Debugger::01--00--success", success=True)
+        self.assertEqual(merged.get("Debugger::01--00--success", success=True).value, 1)
+
+        with self.assertRaises(TypeError):
+            merged.merge(registry.MetricsRegistry().observe("#seconds::total", 1))
+
+    @parameterized.expand(
+        (
+            (None, {"a": 1}, {"a": 1}),
+            ({"a": 1, "b": 2}, {"a": 3}, {"a": 4, "b": 2}),
+            ({"a": 1}, None, {"a": 1}),
+        )
+    )
+    def test_merge_legacy(self, lhs, rhs, expected):
+        """Unit tests merge: With legacy dicts."""
+        self.assertEqual(registry.merge(lhs, rhs).to_legacy(), expected)
+
+    def test_to_legacy(self):
+        """Unit tests to_legacy: String encoded keys."""
+        metrics = registry.merge(None, _registry(1)).merge(_registry(3))
+
+        self.assertEqual(
+            metrics.to_legacy(),
+            {
+                "Debugger::00--00--attemped": 2,
+                "Debugger::01--00--success=<False>": 2,
+                "Debugger::01--02--success-iter=<True,001>": 1,
+                "Debugger::01--02--success-iter=<True,003>": 1,
+                "#seconds::total": 30.0,
+                "Debugger::02--00--latency_seconds::count": 2,
+                "Debugger::02--00--latency_seconds::p50": 2.0,
+                "Debugger::02--00--latency_seconds::p95": 3.0,
+                "Debugger::02--00--latency_seconds::max": 3.0,
+            },
+        )
+
+    @parameterized.expand(
+        (
+            (
+                "Debugger::00--02--project-iter",
+                {"project": "a#=001", "max": "003"},
+                "Debugger::00--02--project-iter=<a#=001, 003>",
+            ),
+            (
+                "Debugger::01--00--error",
+                {"project": "a", "error": "timeout"},
+                "Debugger::01--00--error--a--timeout",
+            ),
+            (
+                "Debugger::00--01--project",
+                {"project": "a#=001"},
+                "Debugger::00--01--project=<a#=001>",
+            ),
+        )
+    )
+    def test_legacy_key(self, name, labels, expected):
+        """Unit tests legacy_key: Including keys with their own formats."""
+        metrics = registry.MetricsRegistry().inc(name, **labels)
+        self.assertEqual(metrics.to_legacy(), {expected: 1})
+
+    def test_serialize(self):
+        """Unit tests serialize, to_dict and pickle."""
+        metrics = _registry(1).merge(_registry(2))
+
+        self.assertEqual(
+            registry.MetricsRegistry.deserialize(metrics.serialize()), metrics
+        )
+        self.assertEqual(
+            registry.MetricsRegistry.from_dict(metrics.to_dict()).to_legacy(),
+            metrics.to_legacy(),
+        )
+        self.assertEqual(pickle.loads(pickle.dumps(metrics)), metrics)
+        self.assertLess(len(metrics.serialize()), len(pickle.dumps(metrics.to_dict())))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
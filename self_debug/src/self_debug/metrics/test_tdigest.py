@@ -0,0 +1,78 @@
+"""Unit tests for tdigest.py."""
+
+import logging
+import random
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from self_debug.common import utils
+from self_debug.metrics import tdigest
+
+
+class TestTDigest(unittest.TestCase):
+    """Unit tests for tdigest.py."""
+
+    @parameterized.expand(
+        (
+            ((), 50, None),
+            ((5,), 50, 5.0),
+            ((5,), 0, 5.0),
+            ((1, 2, 3, 4), 0, 1.0),
+            ((1, 2, 3, 4), 50, 2.5),
+            ((1, 2, 3, 4), 100, 4.0),
+        )
+    )
+    def test_percentile_small(self, values, pct, expected):
+        """Unit tests percentile: Exact for a few values."""
+        digest = tdigest.TDigest().update(values)
+
+        self.assertEqual(digest.percentile(pct), expected)
+        self.assertEqual(len(digest), len(values))
+
+    @parameterized.expand(
+        (
+            ("uniform", random.Random(0).random, 1),
+            ("exponential", lambda rng=random.Random(1): rng.expovariate(1.0), 7),
+        )
+    )
+    def test_percentile_merged(self, _, sample_fn, num_parts):
+        """Unit tests percentile: Close to exact ones, after merges."""
+        values = [sample_fn() for _ in range(20000)]
+
+        digest = tdigest.TDigest()
+        for index in range(num_parts):
+            digest.merge(tdigest.TDigest().update(values[index::num_parts]))
+
+        self.assertEqual(digest.count, len(values))
+        self.assertAlmostEqual(digest.mean, np.mean(values))
+        self.assertEqual(digest.min, min(values))
+        self.assertEqual(digest.max, max(values))
+        self.assertLessEqual(len(digest.centroids), tdigest.COMPRESSION)
+        for pct in (1, 50, 95, 99):
+            expected = np.percentile(values, pct)
+            self.assertAlmostEqual(
+                digest.percentile(pct), expected, delta=0.03 * max(expected, 0.1)
+            )
+
+    def test_to_dict(self):
+        """Unit tests to_dict and from_dict."""
+        digest = tdigest.TDigest(compression=20).update(range(1000))
+
+        data = digest.to_dict()
+        self.assertEqual(data["count"], 1000)
+        self.assertEqual(len(data["centroids"]) % 2, 0)
+
+        other = tdigest.TDigest.from_dict(data)
+        self.assertEqual(other, digest)
+        self.assertEqual(other.percentile(50), digest.percentile(50))
+
+        self.assertEqual(
+            tdigest.TDigest.from_dict(tdigest.TDigest().to_dict()), tdigest.TDigest()
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()
@@ -4,7 +4,9 @@ from collections import defaultdict
 import logging
 from typing import Any, Dict, Tuple
 
-import numpy
+from self_debug.common import lazy_import
+
+numpy = lazy_import.lazy_module("numpy")
 
 
 METRICS_FORMAT = "format"
@@ -14,7 +14,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1cself_debug/proto/batch.proto\x12\x03\x61ws\"p\n\x03\x45\x43\x32\x12\x10\n\x05\x63ores\x18\x01 \x01(\x05:\x01\x34\x12\x13\n\x06memory\x18\x02 \x01(\t:\x03\x31\x36G\x12\x12\n\x04\x64isk\x18\x03 \x01(\t:\x04\x31\x30\x30G\x12\x14\n\tinstances\x18\x04 \x01(\x05:\x01\x31\x12\x18\n\rmin_instances\x18\x05 \x01(\x05:\x01\x31\"m\n\x06Script\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0e\n\x06\x62inary\x18\x02 \x01(\t\x12\x0c\n\x04\x61rgs\x18\x03 \x03(\t\x12\x0f\n\x07\x64isable\x18\x04 \x01(\x08\x12\x0f\n\x07\x64ry_run\x18\x05 \x01(\x08\x12\x15\n\x03\x65\x63\x32\x18\x06 \x01(\x0b\x32\x08.aws.EC2\"w\n\x07Logging\x12\x1a\n\x12\x65nable_cloud_watch\x18\x01 \x01(\x08\x12\x1e\n\x06\x64river\x18\x02 \x01(\t:\x0eSTDERR, STDOUT\x12 \n\x08\x65xecutor\x18\x03 \x01(\t:\x0eSTDERR, STDOUT\x12\x0e\n\x06s3_uri\x18\x04 \x01(\t\"\x8c\x03\n\x11\x43loudWatchMetrics\x12\x1a\n\x12\x65nable_cloud_watch\x18\x01 \x01(\x08\x12 \n\tnamespace\x18\x02 \x01(\t:\rEMRServerless\x12\x10\n\x08prefixes\x18\x03 \x03(\t\x12\x41\n\x14shared_cw_dimensions\x18\x04 \x01(\x0b\x32#.aws.CloudWatchMetrics.CwDimensions\x12@\n\x13\x65xtra_cw_dimensions\x18\x05 \x03(\x0b\x32#.aws.CloudWatchMetrics.CwDimensions\x1a\xa1\x01\n\x0c\x43wDimensions\x12\x0e\n\x06prefix\x18\x02 \x01(\t\x12L\n\rdimension_map\x18\x01 \x03(\x0b\x32\x35.aws.CloudWatchMetrics.CwDimensions.DimensionMapEntry\x1a\x33\n\x11\x44imensionMapEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xc9\x01\n\x07Monitor\x12\x33\n\x13\x63loud_watch_metrics\x18\x07 \x01(\x0b\x32\x16.aws.CloudWatchMetrics\x12\x1a\n\x12\x65nable_cloud_watch\x18\x01 \x01(\x08\x12 \n\tnamespace\x18\x02 \x01(\t:\rEMRServerless\x12\x0e\n\x06prefix\x18\x03 \x01(\t\x12\x12\n\nast_parser\x18\x04 \x01(\x08\x12\x0f\n\x07\x62uilder\x18\x05 \x01(\x08\x12\x16\n\x08\x64\x65\x62ugger\x18\x06 \x01(\x08:\x04true\"\xea\x04\n\rEMRServerless\x12\x33\n\x0b\x61pplication\x18\x01 \x01(\x0b\x32\x1e.aws.EMRServerless.Application\x12#\n\x03job\x18\x02 \x01(\x0b\x32\x16.aws.EMRServerless.Job\x12\x1c\n\x07scripts\x18\x03 \x03(\x0b\x32\x0b.aws.Script\x1a\x91\x02\n\x0b\x41pplication\x12(\n\x04name\x18\x01 \x01(\t:\x1a\x65mrs-{user}--{date}--run00\x12\x12\n\x03new\x18\x02 \x01(\x08:\x05\x66\x61lse\x12\x1e\n\x0b\x65mr_version\x18\x03 \x01(\t:\temr-7.0.0\x12#\n\x14\x65mr_application_type\x18\x04 \x01(\t:\x05SPARK\x12\x11\n\timage_uri\x18\x05 \x01(\t\x12\x12\n\nsubnet_ids\x18\x06 \x03(\t\x12\x1a\n\x12security_group_ids\x18\x07 \x03(\t\x12\x1d\n\x07logging\x18\x08 \x01(\x0b\x32\x0c.aws.Logging\x12\x1d\n\x07monitor\x18\t \x01(\x0b\x32\x0c.aws.Monitor\x1a\xcc\x01\n\x03Job\x12\x64\n\x04name\x18\x01 \x01(\t:V{user}-{script_name}-{timestamp}--nodes{instances}m{min_instances}x{cores}-{disk}{tag}\x12\x0c\n\x04role\x18\x02 \x01(\t\x12\x1d\n\x10time_out_minutes\x18\x05 \x01(\x05:\x03\x37\x32\x30\x12\x18\n\x06\x64river\x18\x03 \x01(\x0b\x32\x08.aws.EC2\x12\x18\n\x06worker\x18\x04 \x01(\x0b\x32\x08.aws.EC2\"j\n\x08\x42\x61tchJob\x12\x0c\n\x04user\x18\x01 \x01(\t\x12\x19\n\x06region\x18\x03 \x01(\t:\tus-east-1\x12,\n\x0e\x65mr_serverless\x18\x02 \x01(\x0b\x32\x12.aws.EMRServerlessH\x00\x42\x07\n\x05\x62\x61tch')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1cself_debug/proto/batch.proto\x12\x03\x61ws\"p\n\x03\x45\x43\x32\x12\x10\n\x05\x63ores\x18\x01 \x01(\x05:\x01\x34\x12\x13\n\x06memory\x18\x02 \x01(\t:\x03\x31\x36G\x12\x12\n\x04\x64isk\x18\x03 \x01(\t:\x04\x31\x30\x30G\x12\x14\n\tinstances\x18\x04 \x01(\x05:\x01\x31\x12\x18\n\rmin_instances\x18\x05 \x01(\x05:\x01\x31\"m\n\x06Script\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0e\n\x06\x62inary\x18\x02 \x01(\t\x12\x0c\n\x04\x61rgs\x18\x03 \x03(\t\x12\x0f\n\x07\x64isable\x18\x04 \x01(\x08\x12\x0f\n\x07\x64ry_run\x18\x05 \x01(\x08\x12\x15\n\x03\x65\x63\x32\x18\x06 \x01(\x0b\x32\x08.aws.EC2\"w\n\x07Logging\x12\x1a\n\x12\x65nable_cloud_watch\x18\x01 \x01(\x08\x12\x1e\n\x06\x64river\x18\x02 \x01(\t:\x0eSTDERR, STDOUT\x12 \n\x08\x65xecutor\x18\x03 \x01(\t:\x0eSTDERR, STDOUT\x12\x0e\n\x06s3_uri\x18\x04 \x01(\t\"\xbb\x03\n\x11\x43loudWatchMetrics\x12\x1a\n\x12\x65nable_cloud_watch\x18\x01 \x01(\x08\x12 \n\tnamespace\x18\x02 \x01(\t:\rEMRServerless\x12\x10\n\x08prefixes\x18\x03 \x03(\t\x12\x41\n\x14shared_cw_dimensions\x18\x04 \x01(\x0b\x32#.aws.CloudWatchMetrics.CwDimensions\x12@\n\x13\x65xtra_cw_dimensions\x18\x05 \x03(\x0b\x32#.aws.CloudWatchMetrics.CwDimensions\x12\x12\n\njsonl_file\x18\x06 \x01(\t\x12\x19\n\rflush_seconds\x18\x07 \x01(\x02:\x02\x31\x30\x1a\xa1\x01\n\x0c\x43wDimensions\x12\x0e\n\x06prefix\x18\x02 \x01(\t\x12L\n\rdimension_map\x18\x01 \x03(\x0b\x32\x35.aws.CloudWatchMetrics.CwDimensions.DimensionMapEntry\x1a\x33\n\x11\x44imensionMapEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xc9\x01\n\x07Monitor\x12\x33\n\x13\x63loud_watch_metrics\x18\x07 \x01(\x0b\x32\x16.aws.CloudWatchMetrics\x12\x1a\n\x12\x65nable_cloud_watch\x18\x01 \x01(\x08\x12 \n\tnamespace\x18\x02 \x01(\t:\rEMRServerless\x12\x0e\n\x06prefix\x18\x03 \x01(\t\x12\x12\n\nast_parser\x18\x04 \x01(\x08\x12\x0f\n\x07\x62uilder\x18\x05 \x01(\x08\x12\x16\n\x08\x64\x65\x62ugger\x18\x06 \x01(\x08:\x04true\"\xea\x04\n\rEMRServerless\x12\x33\n\x0b\x61pplication\x18\x01 \x01(\x0b\x32\x1e.aws.EMRServerless.Application\x12#\n\x03job\x18\x02 \x01(\x0b\x32\x16.aws.EMRServerless.Job\x12\x1c\n\x07scripts\x18\x03 \x03(\x0b\x32\x0b.aws.Script\x1a\x91\x02\n\x0b\x41pplication\x12(\n\x04name\x18\x01 \x01(\t:\x1a\x65mrs-{user}--{date}--run00\x12\x12\n\x03new\x18\x02 \x01(\x08:\x05\x66\x61lse\x12\x1e\n\x0b\x65mr_version\x18\x03 \x01(\t:\temr-7.0.0\x12#\n\x14\x65mr_application_type\x18\x04 \x01(\t:\x05SPARK\x12\x11\n\timage_uri\x18\x05 \x01(\t\x12\x12\n\nsubnet_ids\x18\x06 \x03(\t\x12\x1a\n\x12security_group_ids\x18\x07 \x03(\t\x12\x1d\n\x07logging\x18\x08 \x01(\x0b\x32\x0c.aws.Logging\x12\x1d\n\x07monitor\x18\t \x01(\x0b\x32\x0c.aws.Monitor\x1a\xcc\x01\n\x03Job\x12\x64\n\x04name\x18\x01 \x01(\t:V{user}-{script_name}-{timestamp}--nodes{instances}m{min_instances}x{cores}-{disk}{tag}\x12\x0c\n\x04role\x18\x02 \x01(\t\x12\x1d\n\x10time_out_minutes\x18\x05 \x01(\x05:\x03\x37\x32\x30\x12\x18\n\x06\x64river\x18\x03 \x01(\x0b\x32\x08.aws.EC2\x12\x18\n\x06worker\x18\x04 \x01(\x0b\x32\x08.aws.EC2\"j\n\x08\x42\x61tchJob\x12\x0c\n\x04user\x18\x01 \x01(\t\x12\x19\n\x06region\x18\x03 \x01(\t:\tus-east-1\x12,\n\x0e\x65mr_serverless\x18\x02 \x01(\x0b\x32\x12.aws.EMRServerlessH\x00\x42\x07\n\x05\x62\x61tch')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -30,19 +30,19 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_LOGGING']._serialized_start=262
   _globals['_LOGGING']._serialized_end=381
   _globals['_CLOUDWATCHMETRICS']._serialized_start=384
-  _globals['_CLOUDWATCHMETRICS']._serialized_end=780
-  _globals['_CLOUDWATCHMETRICS_CWDIMENSIONS']._serialized_start=619
-  _globals['_CLOUDWATCHMETRICS_CWDIMENSIONS']._serialized_end=780
-  _globals['_CLOUDWATCHMETRICS_CWDIMENSIONS_DIMENSIONMAPENTRY']._serialized_start=729
-  _globals['_CLOUDWATCHMETRICS_CWDIMENSIONS_DIMENSIONMAPENTRY']._serialized_end=780
-  _globals['_MONITOR']._serialized_start=783
-  _globals['_MONITOR']._serialized_end=984
-  _globals['_EMRSERVERLESS']._serialized_start=987
-  _globals['_EMRSERVERLESS']._serialized_end=1605
-  _globals['_EMRSERVERLESS_APPLICATION']._serialized_start=1125
-  _globals['_EMRSERVERLESS_APPLICATION']._serialized_end=1398
-  _globals['_EMRSERVERLESS_JOB']._serialized_start=1401
-  _globals['_EMRSERVERLESS_JOB']._serialized_end=1605
-  _globals['_BATCHJOB']._serialized_start=1607
-  _globals['_BATCHJOB']._serialized_end=1713
+  _globals['_CLOUDWATCHMETRICS']._serialized_end=827
+  _globals['_CLOUDWATCHMETRICS_CWDIMENSIONS']._serialized_start=666
+  _globals['_CLOUDWATCHMETRICS_CWDIMENSIONS']._serialized_end=827
+  _globals['_CLOUDWATCHMETRICS_CWDIMENSIONS_DIMENSIONMAPENTRY']._serialized_start=776
+  _globals['_CLOUDWATCHMETRICS_CWDIMENSIONS_DIMENSIONMAPENTRY']._serialized_end=827
+  _globals['_MONITOR']._serialized_start=830
+  _globals['_MONITOR']._serialized_end=1031
+  _globals['_EMRSERVERLESS']._serialized_start=1034
+  _globals['_EMRSERVERLESS']._serialized_end=1652
+  _globals['_EMRSERVERLESS_APPLICATION']._serialized_start=1172
+  _globals['_EMRSERVERLESS_APPLICATION']._serialized_end=1445
+  _globals['_EMRSERVERLESS_JOB']._serialized_start=1448
+  _globals['_EMRSERVERLESS_JOB']._serialized_end=1652
+  _globals['_BATCHJOB']._serialized_start=1654
+  _globals['_BATCHJOB']._serialized_end=1760
 # @@protoc_insertion_point(module_scope)
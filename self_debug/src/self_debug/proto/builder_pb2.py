@@ -14,17 +14,21 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1eself_debug/proto/builder.proto\x12\x03\x61ws\"\x93\x02\n\x0cMavenBuilder\x12\x10\n\x08root_dir\x18\x01 \x01(\t\x12\x10\n\x08jdk_path\x18\x02 \x01(\t\x12\x36\n\rbuild_command\x18\x03 \x01(\t:\x1f\x63\x64 {root_dir}; mvn clean verify\x12\x31\n\x1a\x62uild_command_sanity_check\x18\x04 \x01(\t:\rmvn --version\x12%\n\x17require_maven_installed\x18\x05 \x01(\x08:\x04true\x12\x36\n(require_test_class_and_method_invariance\x18\x06 \x01(\x08:\x04true\x12\x15\n\rsource_branch\x18\x07 \x01(\t\"\x88\x03\n\x07\x42uilder\x12*\n\rmaven_builder\x18\x02 \x01(\x0b\x32\x11.aws.MavenBuilderH\x00\x12\x17\n\x0f\x65nable_feedback\x18\x03 \x01(\x08\x12\x64\n\x19\x62uild_error_change_option\x18\x04 \x01(\x0e\x32#.aws.Builder.BuildErrorChangeOption:\x1c\x45RRORS_DIFFERENT_FROM_BEFORE\x12\x19\n\x11\x65nable_reflection\x18\t \x01(\x08\x12\x19\n\x11max_context_files\x18\x0b \x01(\x05\"\x90\x01\n\x16\x42uildErrorChangeOption\x12\x0b\n\x07UNKNOWN\x10\x00\x12 \n\x1c\x45RRORS_DIFFERENT_FROM_BEFORE\x10\x01\x12\x15\n\x11\x45RRORS_NOT_A_SWAP\x10\x04\x12\x19\n\x15\x45RRORS_NON_INCREASING\x10\x02\x12\x15\n\x11\x45RRORS_DECREASING\x10\x03\x42\t\n\x07\x62uilder')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1eself_debug/proto/builder.proto\x12\x03\x61ws\"\xfd\x01\n\x0bMavenDaemon\x12\x15\n\x07\x63ommand\x18\x01 \x01(\t:\x04mvnd\x12:\n\x04\x61rgs\x18\x02 \x01(\t:,-B -Dmvnd.rawStreams=true -Dmvnd.serial=true\x12.\n\x0e\x64\x61\x65mon_storage\x18\x03 \x01(\t:\x16~/.m2/mvnd/{workspace}\x12\x16\n\x0bmax_daemons\x18\x04 \x01(\x05:\x01\x32\x12:\n\x14health_check_command\x18\x05 \x01(\t:\x1c{command} {storage} --status\x12\x17\n\x0cmax_restarts\x18\x06 \x01(\x05:\x01\x31\"\xca\x03\n\x0cMavenBuilder\x12\x10\n\x08root_dir\x18\x01 \x01(\t\x12\x10\n\x08jdk_path\x18\x02 \x01(\t\x12\x36\n\rbuild_command\x18\x03 \x01(\t:\x1f\x63\x64 {root_dir}; mvn clean verify\x12\x31\n\x1a\x62uild_command_sanity_check\x18\x04 \x01(\t:\rmvn --version\x12%\n\x17require_maven_installed\x18\x05 \x01(\x08:\x04true\x12\x36\n(require_test_class_and_method_invariance\x18\x06 \x01(\x08:\x04true\x12\x15\n\rsource_branch\x18\x07 \x01(\t\x12\x1f\n\x10show_deprecation\x18\x08 \x01(\x08:\x05\x66\x61lse\x12/\n\x07\x62\x61\x63kend\x18\t \x01(\x0e\x32\x19.aws.MavenBuilder.Backend:\x03MVN\x12&\n\x0cmaven_daemon\x18\n \x01(\x0b\x32\x10.aws.MavenDaemon\x12\x1d\n\x15select_impacted_tests\x18\x0b \x01(\x08\"\x1c\n\x07\x42\x61\x63kend\x12\x07\n\x03MVN\x10\x00\x12\x08\n\x04MVND\x10\x01\"\x88\x03\n\x07\x42uilder\x12*\n\rmaven_builder\x18\x02 \x01(\x0b\x32\x11.aws.MavenBuilderH\x00\x12\x17\n\x0f\x65nable_feedback\x18\x03 \x01(\x08\x12\x64\n\x19\x62uild_error_change_option\x18\x04 \x01(\x0e\x32#.aws.Builder.BuildErrorChangeOption:\x1c\x45RRORS_DIFFERENT_FROM_BEFORE\x12\x19\n\x11\x65nable_reflection\x18\t \x01(\x08\x12\x19\n\x11max_context_files\x18\x0b \x01(\x05\"\x90\x01\n\x16\x42uildErrorChangeOption\x12\x0b\n\x07UNKNOWN\x10\x00\x12 \n\x1c\x45RRORS_DIFFERENT_FROM_BEFORE\x10\x01\x12\x15\n\x11\x45RRORS_NOT_A_SWAP\x10\x04\x12\x19\n\x15\x45RRORS_NON_INCREASING\x10\x02\x12\x15\n\x11\x45RRORS_DECREASING\x10\x03\x42\t\n\x07\x62uilder')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'self_debug.proto.builder_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_MAVENBUILDER']._serialized_start=40
-  _globals['_MAVENBUILDER']._serialized_end=315
-  _globals['_BUILDER']._serialized_start=318
-  _globals['_BUILDER']._serialized_end=710
-  _globals['_BUILDER_BUILDERRORCHANGEOPTION']._serialized_start=555
-  _globals['_BUILDER_BUILDERRORCHANGEOPTION']._serialized_end=699
+  _globals['_MAVENDAEMON']._serialized_start=40
+  _globals['_MAVENDAEMON']._serialized_end=293
+  _globals['_MAVENBUILDER']._serialized_start=296
+  _globals['_MAVENBUILDER']._serialized_end=754
+  _globals['_MAVENBUILDER_BACKEND']._serialized_start=726
+  _globals['_MAVENBUILDER_BACKEND']._serialized_end=754
+  _globals['_BUILDER']._serialized_start=757
+  _globals['_BUILDER']._serialized_end=1149
+  _globals['_BUILDER_BUILDERRORCHANGEOPTION']._serialized_start=994
+  _globals['_BUILDER_BUILDERRORCHANGEOPTION']._serialized_end=1138
 # @@protoc_insertion_point(module_scope)
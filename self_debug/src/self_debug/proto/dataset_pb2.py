@@ -14,7 +14,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1eself_debug/proto/dataset.proto\x12\x03\x61ws\"[\n\tLocalRepo\x12\x10\n\x08root_dir\x18\x01 \x01(\t\x12\x18\n\x0e\x66ilename_pbtxt\x18\x02 \x01(\tH\x00\x12\x17\n\rfilename_json\x18\x03 \x01(\tH\x00\x42\t\n\x07\x64\x61taset\"h\n\x06S3Repo\x12\x10\n\x08root_dir\x18\x01 \x01(\t\x12\x0e\n\x06s3_dir\x18\x02 \x01(\t\x12\x18\n\x0e\x66ilename_pbtxt\x18\x03 \x01(\tH\x00\x12\x17\n\rfilename_json\x18\x04 \x01(\tH\x00\x42\t\n\x07\x64\x61taset\"\xa1\x01\n\nGithubRepo\x12\x10\n\x08root_dir\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x07 \x01(\t\x12\x12\n\ngithub_url\x18\x02 \x01(\t\x12\x0e\n\x06\x62ranch\x18\x03 \x01(\t\x12\x11\n\tcommit_id\x18\x04 \x01(\t\x12\x18\n\x0e\x66ilename_pbtxt\x18\x05 \x01(\tH\x00\x12\x17\n\rfilename_json\x18\x06 \x01(\tH\x00\x42\t\n\x07\x64\x61taset\"\xd8\x01\n\x0b\x44\x61tasetRepo\x12\x10\n\x08root_dir\x18\x01 \x01(\t\x12\x0f\n\x07project\x18\x02 \x01(\t\x12$\n\nlocal_repo\x18\x03 \x01(\x0b\x32\x0e.aws.LocalRepoH\x00\x12\x1e\n\x07s3_repo\x18\x04 \x01(\x0b\x32\x0b.aws.S3RepoH\x00\x12&\n\x0bgithub_repo\x18\x05 \x01(\x0b\x32\x0f.aws.GithubRepoH\x00\x12\x14\n\x06ported\x18\x06 \x01(\x08:\x04true\x12\x1a\n\x12\x61pply_seed_changes\x18\x07 \x01(\x08\x42\x06\n\x04repo\"\xa4\x01\n\rDatasetFilter\x12\x17\n\x0f\x64ir_start_index\x18\x01 \x01(\x05\x12\x15\n\rdir_end_index\x18\x02 \x01(\x05\x12\x11\n\x07\x66irst_n\x18\x03 \x01(\x05H\x00\x12\x10\n\x06last_n\x18\x04 \x01(\x05H\x00\x12\x11\n\x07\x65very_n\x18\x05 \x01(\x05H\x00\x12$\n\x16\x66ilter_by_project_name\x18\x06 \x01(\x08:\x04trueB\x05\n\x03\x64ir\"G\n\x10\x44\x61tasetPartition\x12\x17\n\x0fpartition_repos\x18\x01 \x01(\x05\x12\x1a\n\x12partition_projects\x18\x02 \x01(\x05\"\x8a\x03\n\x07\x44\x61taset\x12&\n\x0c\x64\x61taset_repo\x18\x01 \x01(\x0b\x32\x10.aws.DatasetRepo\x12\'\n\rdataset_repos\x18\x02 \x03(\x0b\x32\x10.aws.DatasetRepo\x12\x31\n\thf_option\x18\x06 \x01(\x0e\x32\x1e.aws.Dataset.HuggingfaceOption\x12*\n\x0e\x64\x61taset_filter\x18\x03 \x01(\x0b\x32\x12.aws.DatasetFilter\x12\x30\n\x11\x64\x61taset_partition\x18\x04 \x01(\x0b\x32\x15.aws.DatasetPartition\x12\x1a\n\x12\x61pply_seed_changes\x18\x05 \x01(\x08\"\x80\x01\n\x11HuggingfaceOption\x12\x0b\n\x07UNKNOWN\x10\x00\x12\x1d\n\x19MIGRATION_BENCH_JAVA_FULL\x10\x01\x12!\n\x1dMIGRATION_BENCH_JAVA_SELECTED\x10\x02\x12\x1c\n\x18MIGRATION_BENCH_JAVA_UTG\x10\x03')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1eself_debug/proto/dataset.proto\x12\x03\x61ws\"[\n\tLocalRepo\x12\x10\n\x08root_dir\x18\x01 \x01(\t\x12\x18\n\x0e\x66ilename_pbtxt\x18\x02 \x01(\tH\x00\x12\x17\n\rfilename_json\x18\x03 \x01(\tH\x00\x42\t\n\x07\x64\x61taset\"h\n\x06S3Repo\x12\x10\n\x08root_dir\x18\x01 \x01(\t\x12\x0e\n\x06s3_dir\x18\x02 \x01(\t\x12\x18\n\x0e\x66ilename_pbtxt\x18\x03 \x01(\tH\x00\x12\x17\n\rfilename_json\x18\x04 \x01(\tH\x00\x42\t\n\x07\x64\x61taset\"\xa1\x01\n\nGithubRepo\x12\x10\n\x08root_dir\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x07 \x01(\t\x12\x12\n\ngithub_url\x18\x02 \x01(\t\x12\x0e\n\x06\x62ranch\x18\x03 \x01(\t\x12\x11\n\tcommit_id\x18\x04 \x01(\t\x12\x18\n\x0e\x66ilename_pbtxt\x18\x05 \x01(\tH\x00\x12\x17\n\rfilename_json\x18\x06 \x01(\tH\x00\x42\t\n\x07\x64\x61taset\"\xd8\x01\n\x0b\x44\x61tasetRepo\x12\x10\n\x08root_dir\x18\x01 \x01(\t\x12\x0f\n\x07project\x18\x02 \x01(\t\x12$\n\nlocal_repo\x18\x03 \x01(\x0b\x32\x0e.aws.LocalRepoH\x00\x12\x1e\n\x07s3_repo\x18\x04 \x01(\x0b\x32\x0b.aws.S3RepoH\x00\x12&\n\x0bgithub_repo\x18\x05 \x01(\x0b\x32\x0f.aws.GithubRepoH\x00\x12\x14\n\x06ported\x18\x06 \x01(\x08:\x04true\x12\x1a\n\x12\x61pply_seed_changes\x18\x07 \x01(\x08\x42\x06\n\x04repo\"\xa4\x01\n\rDatasetFilter\x12\x17\n\x0f\x64ir_start_index\x18\x01 \x01(\x05\x12\x15\n\rdir_end_index\x18\x02 \x01(\x05\x12\x11\n\x07\x66irst_n\x18\x03 \x01(\x05H\x00\x12\x10\n\x06last_n\x18\x04 \x01(\x05H\x00\x12\x11\n\x07\x65very_n\x18\x05 \x01(\x05H\x00\x12$\n\x16\x66ilter_by_project_name\x18\x06 \x01(\x08:\x04trueB\x05\n\x03\x64ir\"w\n\x10\x44\x61tasetPartition\x12\x17\n\x0fpartition_repos\x18\x01 \x01(\x05\x12\x1a\n\x12partition_projects\x18\x02 \x01(\x05\x12\x14\n\x0c\x63ost_history\x18\x03 \x03(\t\x12\x18\n\x10isolate_heaviest\x18\x04 \x01(\x05\"\x8a\x03\n\x07\x44\x61taset\x12&\n\x0c\x64\x61taset_repo\x18\x01 \x01(\x0b\x32\x10.aws.DatasetRepo\x12\'\n\rdataset_repos\x18\x02 \x03(\x0b\x32\x10.aws.DatasetRepo\x12\x31\n\thf_option\x18\x06 \x01(\x0e\x32\x1e.aws.Dataset.HuggingfaceOption\x12*\n\x0e\x64\x61taset_filter\x18\x03 \x01(\x0b\x32\x12.aws.DatasetFilter\x12\x30\n\x11\x64\x61taset_partition\x18\x04 \x01(\x0b\x32\x15.aws.DatasetPartition\x12\x1a\n\x12\x61pply_seed_changes\x18\x05 \x01(\x08\"\x80\x01\n\x11HuggingfaceOption\x12\x0b\n\x07UNKNOWN\x10\x00\x12\x1d\n\x19MIGRATION_BENCH_JAVA_FULL\x10\x01\x12!\n\x1dMIGRATION_BENCH_JAVA_SELECTED\x10\x02\x12\x1c\n\x18MIGRATION_BENCH_JAVA_UTG\x10\x03')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -32,9 +32,9 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_DATASETFILTER']._serialized_start=622
   _globals['_DATASETFILTER']._serialized_end=786
   _globals['_DATASETPARTITION']._serialized_start=788
-  _globals['_DATASETPARTITION']._serialized_end=859
-  _globals['_DATASET']._serialized_start=862
-  _globals['_DATASET']._serialized_end=1256
-  _globals['_DATASET_HUGGINGFACEOPTION']._serialized_start=1128
-  _globals['_DATASET_HUGGINGFACEOPTION']._serialized_end=1256
+  _globals['_DATASETPARTITION']._serialized_end=907
+  _globals['_DATASET']._serialized_start=910
+  _globals['_DATASET']._serialized_end=1304
+  _globals['_DATASET_HUGGINGFACEOPTION']._serialized_start=1176
+  _globals['_DATASET_HUGGINGFACEOPTION']._serialized_end=1304
 # @@protoc_insertion_point(module_scope)
@@ -14,13 +14,15 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n!self_debug/proto/trajectory.proto\x12\x03\x61ws\"<\n\x05State\x12\x10\n\x08root_dir\x18\x01 \x01(\t\x12\x0e\n\x06\x62ranch\x18\x02 \x01(\t\x12\x11\n\tcommit_id\x18\x03 \x01(\t\"\x86\x01\n\nBuildError\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x0f\n\x07project\x18\x02 \x01(\t\x12\x12\n\nerror_code\x18\x03 \x01(\t\x12\x15\n\rerror_message\x18\x04 \x01(\t\x12\x13\n\x0bline_number\x18\x05 \x01(\x05\x12\x15\n\rcolumn_number\x18\x06 \x01(\x05\"\x9d\x01\n\x0b\x42uildAction\x12\x19\n\x05state\x18\x01 \x01(\x0b\x32\n.aws.State\x12\x0b\n\x03\x63wd\x18\x02 \x01(\t\x12\x0b\n\x03\x63md\x18\x03 \x01(\t\x12\x12\n\nnum_errors\x18\x04 \x01(\x05\x12$\n\x0b\x66irst_error\x18\x05 \x01(\x0b\x32\x0f.aws.BuildError\x12\x1f\n\x06\x65rrors\x18\x06 \x03(\x0b\x32\x0f.aws.BuildError\"F\n\nRuleAction\x12\x19\n\x05state\x18\x01 \x01(\x0b\x32\n.aws.State\x12\x1d\n\tnew_state\x18\x02 \x01(\x0b\x32\n.aws.State\"\xae\x01\n\x06Prompt\x12\x15\n\rsystem_prompt\x18\x01 \x01(\t\x12\x10\n\x06prompt\x18\x02 \x01(\tH\x00\x12\x35\n\x0fprompt_messages\x18\x03 \x01(\x0b\x32\x1a.aws.Prompt.PromptMessagesH\x00\x1a\x36\n\x0ePromptMessages\x12\x12\n\x04role\x18\x01 \x01(\t:\x04user\x12\x10\n\x08messages\x18\x02 \x03(\tB\x0c\n\nllm_prompt\"\xa9\x01\n\tLlmAction\x12\x1b\n\x06prompt\x18\x01 \x01(\x0b\x32\x0b.aws.Prompt\x12\x12\n\x08response\x18\x02 \x01(\tH\x00\x12,\n\tllm_error\x18\x03 \x01(\x0b\x32\x17.aws.LlmAction.LlmErrorH\x00\x1a-\n\x08LlmError\x12\x12\n\nerror_type\x18\x01 \x01(\t\x12\r\n\x05\x65rror\x18\x02 \x01(\tB\x0e\n\x0cllm_response\"\x85\x02\n\tGitAction\x12\x19\n\x05state\x18\x01 \x01(\x0b\x32\n.aws.State\x12\x1d\n\tnew_state\x18\x02 \x01(\x0b\x32\n.aws.State\x12\x11\n\tfilenames\x18\x03 \x03(\t\x12,\n\ngit_option\x18\x04 \x01(\x0e\x32\x18.aws.GitAction.GitOption\x12\x16\n\x0e\x63ommit_message\x18\x05 \x01(\t\x12\x16\n\x0erevert_message\x18\x06 \x01(\t\"M\n\tGitOption\x12\x0b\n\x07UNKNOWN\x10\x00\x12\x0b\n\x07\x41\x44\x44_ALL\x10\x01\x12\n\n\x06\x43OMMIT\x10\x02\x12\x0e\n\nCOMMIT_ALL\x10\x03\x12\n\n\x06REVERT\x10\x04\"\xe5\x02\n\x06\x41\x63tion\x12\x19\n\x05state\x18\x01 \x01(\x0b\x32\n.aws.State\x12\x1d\n\tnew_state\x18\x02 \x01(\x0b\x32\n.aws.State\x12/\n\raction_option\x18\x03 \x01(\x0e\x32\x18.aws.Action.ActionOption\x12(\n\x0c\x62uild_action\x18\x04 \x01(\x0b\x32\x10.aws.BuildActionH\x00\x12&\n\x0brule_action\x18\x05 \x01(\x0b\x32\x0f.aws.RuleActionH\x00\x12$\n\nllm_action\x18\x06 \x01(\x0b\x32\x0e.aws.LlmActionH\x00\x12$\n\ngit_action\x18\x07 \x01(\x0b\x32\x0e.aws.GitActionH\x00\"L\n\x0c\x41\x63tionOption\x12\x0b\n\x07UNKNOWN\x10\x00\x12\x08\n\x04NONE\x10\x01\x12\t\n\x05\x42UILD\x10\x02\x12\x08\n\x04RULE\x10\x03\x12\x07\n\x03LLM\x10\x04\x12\x07\n\x03GIT\x10\x05\x42\x04\n\x02\x61\x63\"\xa4\x01\n\nTrajectory\x12\x10\n\x08root_dir\x18\x01 \x01(\t\x12\x0f\n\x07project\x18\x02 \x01(\t\x12\x16\n\x0emax_iterations\x18\x03 \x01(\x05\x12#\n\x05steps\x18\x04 \x03(\x0b\x32\x14.aws.Trajectory.Step\x1a\x36\n\x04Step\x12\x11\n\titeration\x18\x01 \x01(\x05\x12\x1b\n\x06\x61\x63tion\x18\x02 \x01(\x0b\x32\x0b.aws.Action')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n!self_debug/proto/trajectory.proto\x12\x03\x61ws\"<\n\x05State\x12\x10\n\x08root_dir\x18\x01 \x01(\t\x12\x0e\n\x06\x62ranch\x18\x02 \x01(\t\x12\x11\n\tcommit_id\x18\x03 \x01(\t\"\x86\x01\n\nBuildError\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x0f\n\x07project\x18\x02 \x01(\t\x12\x12\n\nerror_code\x18\x03 \x01(\t\x12\x15\n\rerror_message\x18\x04 \x01(\t\x12\x13\n\x0bline_number\x18\x05 \x01(\x05\x12\x15\n\rcolumn_number\x18\x06 \x01(\x05\"\x9d\x01\n\x0b\x42uildAction\x12\x19\n\x05state\x18\x01 \x01(\x0b\x32\n.aws.State\x12\x0b\n\x03\x63wd\x18\x02 \x01(\t\x12\x0b\n\x03\x63md\x18\x03 \x01(\t\x12\x12\n\nnum_errors\x18\x04 \x01(\x05\x12$\n\x0b\x66irst_error\x18\x05 \x01(\x0b\x32\x0f.aws.BuildError\x12\x1f\n\x06\x65rrors\x18\x06 \x03(\x0b\x32\x0f.aws.BuildError\"F\n\nRuleAction\x12\x19\n\x05state\x18\x01 \x01(\x0b\x32\n.aws.State\x12\x1d\n\tnew_state\x18\x02 \x01(\x0b\x32\n.aws.State\"\xc7\x01\n\x06Prompt\x12\x15\n\rsystem_prompt\x18\x01 \x01(\t\x12\x10\n\x06prompt\x18\x02 \x01(\tH\x00\x12\x35\n\x0fprompt_messages\x18\x03 \x01(\x0b\x32\x1a.aws.Prompt.PromptMessagesH\x00\x1aO\n\x0ePromptMessages\x12\x12\n\x04role\x18\x01 \x01(\t:\x04user\x12\x10\n\x08messages\x18\x02 \x03(\t\x12\x17\n\x0bmessage_ids\x18\x03 \x03(\x05\x42\x02\x10\x01\x42\x0c\n\nllm_prompt\"\xa9\x01\n\tLlmAction\x12\x1b\n\x06prompt\x18\x01 \x01(\x0b\x32\x0b.aws.Prompt\x12\x12\n\x08response\x18\x02 \x01(\tH\x00\x12,\n\tllm_error\x18\x03 \x01(\x0b\x32\x17.aws.LlmAction.LlmErrorH\x00\x1a-\n\x08LlmError\x12\x12\n\nerror_type\x18\x01 \x01(\t\x12\r\n\x05\x65rror\x18\x02 \x01(\tB\x0e\n\x0cllm_response\"\x85\x02\n\tGitAction\x12\x19\n\x05state\x18\x01 \x01(\x0b\x32\n.aws.State\x12\x1d\n\tnew_state\x18\x02 \x01(\x0b\x32\n.aws.State\x12\x11\n\tfilenames\x18\x03 \x03(\t\x12,\n\ngit_option\x18\x04 \x01(\x0e\x32\x18.aws.GitAction.GitOption\x12\x16\n\x0e\x63ommit_message\x18\x05 \x01(\t\x12\x16\n\x0erevert_message\x18\x06 \x01(\t\"M\n\tGitOption\x12\x0b\n\x07UNKNOWN\x10\x00\x12\x0b\n\x07\x41\x44\x44_ALL\x10\x01\x12\n\n\x06\x43OMMIT\x10\x02\x12\x0e\n\nCOMMIT_ALL\x10\x03\x12\n\n\x06REVERT\x10\x04\"^\n\rTimeoutAction\x12\x0c\n\x04step\x18\x01 \x01(\t\x12\r\n\x05\x65rror\x18\x02 \x01(\t\x12\x17\n\x0ftimeout_seconds\x18\x03 \x01(\x02\x12\x17\n\x0f\x65lapsed_seconds\x18\x04 \x01(\x02\"\xa0\x03\n\x06\x41\x63tion\x12\x19\n\x05state\x18\x01 \x01(\x0b\x32\n.aws.State\x12\x1d\n\tnew_state\x18\x02 \x01(\x0b\x32\n.aws.State\x12/\n\raction_option\x18\x03 \x01(\x0e\x32\x18.aws.Action.ActionOption\x12(\n\x0c\x62uild_action\x18\x04 \x01(\x0b\x32\x10.aws.BuildActionH\x00\x12&\n\x0brule_action\x18\x05 \x01(\x0b\x32\x0f.aws.RuleActionH\x00\x12$\n\nllm_action\x18\x06 \x01(\x0b\x32\x0e.aws.LlmActionH\x00\x12$\n\ngit_action\x18\x07 \x01(\x0b\x32\x0e.aws.GitActionH\x00\x12,\n\x0etimeout_action\x18\x08 \x01(\x0b\x32\x12.aws.TimeoutActionH\x00\"Y\n\x0c\x41\x63tionOption\x12\x0b\n\x07UNKNOWN\x10\x00\x12\x08\n\x04NONE\x10\x01\x12\t\n\x05\x42UILD\x10\x02\x12\x08\n\x04RULE\x10\x03\x12\x07\n\x03LLM\x10\x04\x12\x07\n\x03GIT\x10\x05\x12\x0b\n\x07TIMEOUT\x10\x06\x42\x04\n\x02\x61\x63\"}\n\x04Span\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x11\n\titeration\x18\x02 \x01(\x05\x12\r\n\x05\x64\x65pth\x18\x03 \x01(\x05\x12\x0e\n\x06parent\x18\x04 \x01(\t\x12\x15\n\rstart_seconds\x18\x05 \x01(\x02\x12\x0f\n\x07seconds\x18\x06 \x01(\x02\x12\r\n\x05\x65rror\x18\x07 \x01(\x08\"\xbe\x01\n\nTrajectory\x12\x10\n\x08root_dir\x18\x01 \x01(\t\x12\x0f\n\x07project\x18\x02 \x01(\t\x12\x16\n\x0emax_iterations\x18\x03 \x01(\x05\x12#\n\x05steps\x18\x04 \x03(\x0b\x32\x14.aws.Trajectory.Step\x12\x18\n\x05spans\x18\x05 \x03(\x0b\x32\t.aws.Span\x1a\x36\n\x04Step\x12\x11\n\titeration\x18\x01 \x01(\x05\x12\x1b\n\x06\x61\x63tion\x18\x02 \x01(\x0b\x32\x0b.aws.Action\"J\n\x11\x43ompactTrajectory\x12\x10\n\x08messages\x18\x01 \x03(\t\x12#\n\ntrajectory\x18\x02 \x01(\x0b\x32\x0f.aws.Trajectory')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'self_debug.proto.trajectory_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_PROMPT_PROMPTMESSAGES'].fields_by_name['message_ids']._loaded_options = None
+  _globals['_PROMPT_PROMPTMESSAGES'].fields_by_name['message_ids']._serialized_options = b'\020\001'
   _globals['_STATE']._serialized_start=42
   _globals['_STATE']._serialized_end=102
   _globals['_BUILDERROR']._serialized_start=105
@@ -30,23 +32,29 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_RULEACTION']._serialized_start=401
   _globals['_RULEACTION']._serialized_end=471
   _globals['_PROMPT']._serialized_start=474
-  _globals['_PROMPT']._serialized_end=648
+  _globals['_PROMPT']._serialized_end=673
   _globals['_PROMPT_PROMPTMESSAGES']._serialized_start=580
-  _globals['_PROMPT_PROMPTMESSAGES']._serialized_end=634
-  _globals['_LLMACTION']._serialized_start=651
-  _globals['_LLMACTION']._serialized_end=820
-  _globals['_LLMACTION_LLMERROR']._serialized_start=759
-  _globals['_LLMACTION_LLMERROR']._serialized_end=804
-  _globals['_GITACTION']._serialized_start=823
-  _globals['_GITACTION']._serialized_end=1084
-  _globals['_GITACTION_GITOPTION']._serialized_start=1007
-  _globals['_GITACTION_GITOPTION']._serialized_end=1084
-  _globals['_ACTION']._serialized_start=1087
-  _globals['_ACTION']._serialized_end=1444
-  _globals['_ACTION_ACTIONOPTION']._serialized_start=1362
-  _globals['_ACTION_ACTIONOPTION']._serialized_end=1438
-  _globals['_TRAJECTORY']._serialized_start=1447
-  _globals['_TRAJECTORY']._serialized_end=1611
-  _globals['_TRAJECTORY_STEP']._serialized_start=1557
-  _globals['_TRAJECTORY_STEP']._serialized_end=1611
+  _globals['_PROMPT_PROMPTMESSAGES']._serialized_end=659
+  _globals['_LLMACTION']._serialized_start=676
+  _globals['_LLMACTION']._serialized_end=845
+  _globals['_LLMACTION_LLMERROR']._serialized_start=784
+  _globals['_LLMACTION_LLMERROR']._serialized_end=829
+  _globals['_GITACTION']._serialized_start=848
+  _globals['_GITACTION']._serialized_end=1109
+  _globals['_GITACTION_GITOPTION']._serialized_start=1032
+  _globals['_GITACTION_GITOPTION']._serialized_end=1109
+  _globals['_TIMEOUTACTION']._serialized_start=1111
+  _globals['_TIMEOUTACTION']._serialized_end=1205
+  _globals['_ACTION']._serialized_start=1208
+  _globals['_ACTION']._serialized_end=1624
+  _globals['_ACTION_ACTIONOPTION']._serialized_start=1529
+  _globals['_ACTION_ACTIONOPTION']._serialized_end=1618
+  _globals['_SPAN']._serialized_start=1626
+  _globals['_SPAN']._serialized_end=1751
+  _globals['_TRAJECTORY']._serialized_start=1754
+  _globals['_TRAJECTORY']._serialized_end=1944
+  _globals['_TRAJECTORY_STEP']._serialized_start=1890
+  _globals['_TRAJECTORY_STEP']._serialized_end=1944
+  _globals['_COMPACTTRAJECTORY']._serialized_start=1946
+  _globals['_COMPACTTRAJECTORY']._serialized_end=2020
 # @@protoc_insertion_point(module_scope)
@@ -6,24 +6,28 @@ import logging
 import tempfile
 import glob
 import os
-import re
 import time
 from pathlib import Path
 
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 from self_debug.proto import config_pb2, llm_parser_pb2, metrics_pb2, trajectory_pb2
 
+from self_debug.common import deadline as deadline_lib
 from self_debug.common import (
     eval_utils,
     filesystem_writer_factory,
     git_repo,
     maven_utils,
-    pom_utils,
+    pom_transformer,
+    profiler,
     prompt_manager_factory,
+    trajectory_utils,
     utils,
+    warm_pool,
 )
 from self_debug.eval import final_eval
 from self_debug.lang.base import ast_helper, ast_parser_factory, builder_factory
+from self_debug.lang.java.maven import maven_utils as maven_log_utils
 from self_debug.lm import (
     grouped_llm_parser_factory,
     llm_agent_factory,
@@ -53,9 +57,14 @@ FILE_PREFIX = "FILE__"
 ROOT_DIR = "root_dir"
 PROJECT = "project"
 SOURCE_BRANCH = "source_branch"
+# Same as `maven.builder.BUILD_CMD_KEY_TEST`.
+BUILD_CMD_KEY_TEST = "test"
 
 DEBUG_TIMEOUT = 1.5 * 60 * 60
 
+# Chrome trace of spans, next to the trajectory file.
+TRACE_SUFFIX = ".trace.json"
+
 
 def prepare_prompt(
     root_dir: str,
@@ -249,6 +258,9 @@ class SelfDebugging:
         # {error_code: {error_msg: list($FIND_REPLACE)}}: The list is dedupped/ essentially a set.
         self.examples_by_code = defaultdict(lambda: defaultdict(list))
         self.traj = trajectory_pb2.Trajectory()
+        # Prompt messages in `traj` are ids in the table.
+        self.traj_messages = trajectory_utils.MessageTable()
+        self.profiler = profiler.Profiler()
         self.max_migration = max_migration
         self.enable_reflection = enable_reflection
         self.show_deprecation_cmd = "mvn clean compile -Dmaven.compiler.showDeprecation=true -Dmaven.compiler.showWarnings=true"
@@ -364,6 +376,7 @@ class SelfDebugging:
         for build_error in build_errors:
             self._show_single_ast_info(build_error)
 
+    @profiler.traced("traj")
     def _update_build_action(
         self, traj, iteration: int, build_errors: Tuple[BuildData]
     ):
@@ -388,6 +401,7 @@ class SelfDebugging:
 
         return traj
 
+    @profiler.traced("traj")
     def _update_git_commit_action(self, traj, iteration: int, commit_msg: str):
         step = traj.steps.add()
 
@@ -397,6 +411,7 @@ class SelfDebugging:
 
         return traj
 
+    @profiler.traced("traj")
     def _update_git_revert_action(self, traj, iteration: int, revert_msg: str):
         step = traj.steps.add()
 
@@ -406,6 +421,57 @@ class SelfDebugging:
 
         return traj
 
+    @profiler.traced("traj")
+    def _update_timeout_action(
+        self,
+        traj,
+        iteration: int,
+        error: Any,
+        timeout_seconds: Optional[float],
+        start_time: float,
+    ):
+        step = traj.steps.add()
+
+        step.iteration = iteration
+        timeout_action = step.action.timeout_action
+        if isinstance(error, deadline_lib.DeadlineExceeded):
+            timeout_action.step = error.step
+            timeout_action.error = str(error)
+        else:
+            timeout_action.step = str(error)
+        if timeout_seconds is not None:
+            timeout_action.timeout_seconds = timeout_seconds
+        timeout_action.elapsed_seconds = time.time() - start_time
+        logging.warning("Timeout @%d: <<<%s>>>", iteration, timeout_action)
+
+        return traj
+
+    def _cancel_iteration(
+        self,
+        iteration: int,
+        error: deadline_lib.DeadlineExceeded,
+        timeout_seconds: Optional[float],
+        start_time: float,
+    ):
+        """Cancelled: Back to the last commit, which has been built."""
+        self.traj = self._update_timeout_action(
+            self.traj, iteration, error, timeout_seconds, start_time
+        )
+        if not self.repo:
+            return
+
+        # Git commands are skipped under the exceeded deadline.
+        with deadline_lib.unbounded(name="cancel"):
+            restored = self.repo.restore()
+        if restored:
+            self.traj = self._update_git_revert_action(
+                self.traj, iteration, str(error)
+            )
+        else:
+            logging.error(
+                "Unable to revert changes @%d: `%s`.", iteration, self.repo.root_dir
+            )
+
     def update_jdk_related(self):
         root_dir = self.repo.root_dir
         if not Path(os.path.join(root_dir, "pom.xml")).exists():
@@ -419,12 +485,14 @@ class SelfDebugging:
         logging.warning(
             "Number of pom.xml files to update = %d: `%s`.", len(pom_files), pom_files
         )
-        for pom_file in pom_files:
-            pom_utils.update_jdk_related(pom_file, pom_file)
+        pom_transformer.transform_poms(pom_files, jdk=True)
 
     def update_dependency_version(self):
         root_dir = self.repo.root_dir
-        dependency_version = utils.load_json(eval_utils.DEPENDENCY_VERSION)
+        dependency_version = warm_pool.get_or_create(
+            ("json", str(eval_utils.DEPENDENCY_VERSION)),
+            lambda: utils.load_json(eval_utils.DEPENDENCY_VERSION),
+        )
 
         if not Path(os.path.join(root_dir, "pom.xml")).exists():
             raise ValueError(
@@ -437,14 +505,28 @@ class SelfDebugging:
         logging.warning(
             "Number of pom.xml files to update = %d: `%s`.", len(pom_files), pom_files
         )
-        for pom_file in pom_files:
-            pom_utils.apply_selected_notes(pom_file, dependency_version)
+        pom_transformer.transform_poms(pom_files, candidate=dependency_version)
 
     def run(
-        self, max_iterations: int = 1, dry_run: bool = False
+        self,
+        max_iterations: int = 1,
+        dry_run: bool = False,
+        timeout_seconds: Optional[float] = DEBUG_TIMEOUT,
+    ) -> Tuple[metrics_pb2.Metrics, Tuple[BuildData]]:
+        """Run llm until success or reaching max iterations, within a timeout."""
+        self.profiler = profiler.Profiler(name=self.builder.project or "")
+        with profiler.scope(self.profiler):
+            return self._run(max_iterations, dry_run, timeout_seconds)
+
+    def _run(
+        self,
+        max_iterations: int,
+        dry_run: bool,
+        timeout_seconds: Optional[float],
     ) -> Tuple[metrics_pb2.Metrics, Tuple[BuildData]]:
-        """Run llm until success or reaching max iterations."""
+        """Run llm with spans recorded by the profiler."""
         self.traj = trajectory_pb2.Trajectory()
+        self.traj_messages = trajectory_utils.MessageTable()
 
         proto = metrics_pb2.Metrics()
         proto.final_state_metrics.h_min_iterations = self.min_iterations
@@ -455,6 +537,7 @@ class SelfDebugging:
         input_iterations = max_iterations
 
         iteration = -1
+        self.profiler.iteration = iteration
         if self.max_migration:
             self.update_dependency_version()
             self.repo.commit_all("update dependency versions")
@@ -499,6 +582,7 @@ class SelfDebugging:
                 )
 
             iteration = 0
+            self.profiler.iteration = iteration
 
             state = proto.intermediate_state_metrics.add()
             state.success = not bool(build_errors)
@@ -543,52 +627,91 @@ class SelfDebugging:
 
         success = not bool(build_errors)
         start_time = time.time()
-        while not success and iteration < max_iterations:
-            if time.time() - start_time > DEBUG_TIMEOUT:
-                break
-            if iteration == 0:
-                self.builder.previous_build_errors = build_errors
-
-            iteration += 1
+        # Builds and LLM calls pick up the deadline, to bound their runtime.
+        with deadline_lib.scope(timeout_seconds, name="debug") as deadline:
+            while not success and iteration < max_iterations:
+                if deadline.expired:
+                    self.traj = self._update_timeout_action(
+                        self.traj, iteration, "iteration", timeout_seconds, start_time
+                    )
+                    break
+                if iteration == 0:
+                    self.builder.previous_build_errors = build_errors
 
-            logging.info(
-                "Migration iteration %d: errors = %d ...", iteration, len(build_errors)
-            )
-            build_errors, iter_success = self.run_iteration(
-                build_errors, max_iterations, iteration, dry_run
-            )
-            self.traj = self._update_build_action(self.traj, iteration, build_errors)
+                iteration += 1
+                self.profiler.iteration = iteration
 
-            if not isinstance(build_errors, (tuple, list)):
-                copy_errors = build_errors
-                build_errors = self._pre_llm(max_iterations, iteration)[0]
+                logging.info(
+                    "Migration iteration %d: errors = %d ...",
+                    iteration,
+                    len(build_errors),
+                )
+                previous_build_errors = build_errors
+                build_errors, iter_success = self.run_iteration(
+                    build_errors, max_iterations, iteration, dry_run
+                )
+                if isinstance(build_errors, deadline_lib.DeadlineExceeded):
+                    self._cancel_iteration(
+                        iteration, build_errors, timeout_seconds, start_time
+                    )
+                    build_errors = previous_build_errors
+                    break
                 self.traj = self._update_build_action(
                     self.traj, iteration, build_errors
                 )
 
-                # Unrecoverable errors.
-                if isinstance(copy_errors, Exception):
-                    success = not bool(build_errors)
-                    break
+                if not isinstance(build_errors, (tuple, list)):
+                    copy_errors = build_errors
+                    try:
+                        build_errors = self._pre_llm(max_iterations, iteration)[0]
+                    except deadline_lib.DeadlineExceeded as error:
+                        self._cancel_iteration(
+                            iteration, error, timeout_seconds, start_time
+                        )
+                        build_errors = previous_build_errors
+                        break
+                    self.traj = self._update_build_action(
+                        self.traj, iteration, build_errors
+                    )
 
-            if iter_success:
-                success = True
-                break
+                    # Unrecoverable errors.
+                    if isinstance(copy_errors, Exception):
+                        success = not bool(build_errors)
+                        break
 
-            if iteration >= max_iterations:
-                logging.warning(
-                    "Job is unable to finish successfully, ending with %d errors: <<<%s>>>",
-                    len(build_errors),
-                    build_errors,
-                )
-                for index, build_error in enumerate(build_errors):
-                    logging.info(
-                        "[%02d/%02d] Build Error: <<<%s>>",
-                        index,
+                if iter_success and getattr(self.builder, "last_build_partial", False):
+                    # Impacted tests only: Success requires all tests.
+                    try:
+                        build_errors = self._pre_llm(max_iterations, iteration)[0]
+                    except deadline_lib.DeadlineExceeded as error:
+                        self._cancel_iteration(
+                            iteration, error, timeout_seconds, start_time
+                        )
+                        build_errors = previous_build_errors
+                        break
+                    self.traj = self._update_build_action(
+                        self.traj, iteration, build_errors
+                    )
+                    iter_success = not build_errors
+
+                if iter_success:
+                    success = True
+                    break
+
+                if iteration >= max_iterations:
+                    logging.warning(
+                        "Job is unable to finish successfully, ending with %d errors: <<<%s>>>",  # pylint: disable=line-too-long
                         len(build_errors),
-                        build_error,
+                        build_errors,
                     )
-                break
+                    for index, build_error in enumerate(build_errors):
+                        logging.info(
+                            "[%02d/%02d] Build Error: <<<%s>>",
+                            index,
+                            len(build_errors),
+                            build_error,
+                        )
+                    break
 
         java_job = self.config.builder.HasField("maven_builder")
         # Final eval for success
@@ -634,13 +757,14 @@ class SelfDebugging:
                     else:
                         maven_command = maven_utils.MVN_CLEAN_VERIFY
                         eval_kwargs = {}
-                    final_success = (not java_job) or final_eval.run_eval(
-                        github_url,
-                        git_diff_file,
-                        require_maximal_migration=self.max_migration,
-                        maven_command=maven_command,
-                        **eval_kwargs,
-                    )
+                    with profiler.span("final_eval"):
+                        final_success = (not java_job) or final_eval.run_eval(
+                            github_url,
+                            git_diff_file,
+                            require_maximal_migration=self.max_migration,
+                            maven_command=maven_command,
+                            **eval_kwargs,
+                        )
             else:
                 logging.warning(
                     "Unable to get the right commit id from `%s`.", self.config.repo
@@ -655,15 +779,26 @@ class SelfDebugging:
         proto.final_state_metrics.iterations = iteration
         proto.final_state_metrics.deprecated_api = deprecated_api
 
+        self.profiler.update_metrics(proto)
+        self.traj = self.profiler.update_trajectory(self.traj)
+        logging.info("Profile by phase: <<<%s>>>", self.profiler.summary())
+
         if self.repo:
             _, filename = tempfile.mkstemp(
-                dir=self.builder.root_dir, prefix="trajectory--", suffix=".pbtxt"
+                dir=self.builder.root_dir,
+                prefix="trajectory--",
+                suffix=trajectory_utils.COMPACT_SUFFIX,
             )
         else:
             filename = None
         try:
             if self.repo:
-                utils.export_proto(self.traj, filename)
+                trajectory_utils.export_trajectory(
+                    self.traj, filename, self.traj_messages
+                )
+                self.profiler.export_chrome_trace(
+                    filename[: -len(trajectory_utils.COMPACT_SUFFIX)] + TRACE_SUFFIX
+                )
 
                 commit_msg = (
                     f"nit: Add trajectory file at iteration {iteration} {filename}."
@@ -684,32 +819,41 @@ class SelfDebugging:
         return dep_meet_requirement
 
     def count_deprecated_apis(self):
-        result = utils.do_run_command(self.show_deprecation_cmd, cwd=self.repo.root_dir)
-        mvn_build_log = result.stdout
-        if mvn_build_log is not None:
-            matches = re.findall(self.warning_pattern, mvn_build_log)
+        """Count deprecated APIs, reusing the last build log if possible."""
+        result = self.builder.deprecation_build_data
+        if result is None:
+            result = utils.do_run_command(
+                self.show_deprecation_cmd, cwd=self.repo.root_dir
+            )
         else:
-            matches = []
-        if result.return_code == 0 or len(matches) > 0:
-            return len(matches)
+            logging.info("Count deprecated APIs from the last build log.")
+
+        num_matches = maven_log_utils.count_deprecation_warnings(
+            result.stdout, self.warning_pattern
+        )
+        if result.return_code == 0 or num_matches > 0:
+            return num_matches
         return self.INVALID_DEPRECATED_API_COUNT
 
+    @profiler.traced("pre_llm")
     def _pre_llm(
         self,
         max_iterations: int,
         iteration: int,
         max_rounds: int = 10,
         update_errors: bool = True,
+        build_kwargs: Optional[Dict[str, Any]] = None,
     ) -> Tuple[Tuple[Any], bool]:
-        """Before LLM: Build."""
+        """Before LLM: Build, with `build_kwargs` if any."""
         if iteration <= 0 and max_rounds != 10:
             logging.info(
                 "Rerun build (iteration, max_rounds) = (%d, %d).", iteration, max_rounds
             )
 
+        build_kwargs = build_kwargs or {}
         rules_applied = False
         if _APPLY_RULES:
-            build_errors = self.builder.run(update_errors=False)
+            build_errors = self.builder.run(update_errors=False, **build_kwargs)
             # Maybe upgrade packages.
             if self.ast_helper and self.ast_helper.enabled_for_package_upgrade:
 
@@ -721,11 +865,15 @@ class SelfDebugging:
                 ):
                     rules_applied = True
                     build_errors, _ = self._pre_llm(
-                        max_iterations, iteration, max_rounds - 1, update_errors=False
+                        max_iterations,
+                        iteration,
+                        max_rounds - 1,
+                        update_errors=False,
+                        build_kwargs=build_kwargs,
                     )
 
         # TODO(sliuxl): Dedup `build` runs.
-        build_errors = self.builder.run(update_errors=update_errors)
+        build_errors = self.builder.run(update_errors=update_errors, **build_kwargs)
         if isinstance(build_errors, str):
             logging.fatal("Failing with: %s.", build_errors)
             raise ValueError(build_errors)
@@ -739,6 +887,7 @@ class SelfDebugging:
 
         return tuple(build_errors), rules_applied
 
+    @profiler.traced("llm")
     def _llm(
         self, iteration: int, build_data: builder_factory.BuildData, context_files=None
     ) -> str:
@@ -829,20 +978,24 @@ class SelfDebugging:
                 )
                 reflection = f"You've tried a fix before and was incorrect. Below are the feedbacks\n<feedback>\n{reflection}\n</feedback>"
 
-        prompt, self.last_prompt_messages = prepare_prompt(
-            self.builder.root_dir,
-            self.prompt_manager,
-            build_data,
-            self.builder.project,
-            self.last_prompt_messages,
-            self.last_llm_response,
-            self.feedback,
-            self.config.prompt_manager.restart_messages_len_gt,
-            context_files or (),
-            context_kwargs,
-            reflection,
-        )
-        response = self.llm_agent.run(prompt, messages=self.last_prompt_messages[:])
+        with profiler.span("llm:prompt"):
+            prompt, self.last_prompt_messages = prepare_prompt(
+                self.builder.root_dir,
+                self.prompt_manager,
+                build_data,
+                self.builder.project,
+                self.last_prompt_messages,
+                self.last_llm_response,
+                self.feedback,
+                self.config.prompt_manager.restart_messages_len_gt,
+                context_files or (),
+                context_kwargs,
+                reflection,
+            )
+        with profiler.span("llm:call"):
+            response = self.llm_agent.run(
+                prompt, messages=self.last_prompt_messages[:]
+            )
 
         # Update  trajectory.
         llm_step = self.traj.steps.add()
@@ -852,8 +1005,10 @@ class SelfDebugging:
             llm_ac.prompt.prompt_messages.role = self.last_prompt_messages[0].get(
                 "role", "user"
             )
-            llm_ac.prompt.prompt_messages.messages.extend(
-                [
+            # Each message is stored once, as all previous ones are in the prompt.
+            llm_ac.prompt.prompt_messages.message_ids.extend(
+                self.traj_messages.add(message)
+                for message in [
                     self._extract_string_from_content(msg.get("content", ""))
                     for msg in self.last_prompt_messages
                 ]
@@ -941,6 +1096,7 @@ There is not such a file `{fn}`, but I provide all files with the same names und
             f"Not sure how to extract context from `{type(content)}`: <<<{content}>>>"
         )
 
+    @profiler.traced("post_llm")
     def _post_llm(
         self,
         build_data: builder_factory.BuildData,
@@ -951,7 +1107,10 @@ There is not such a file `{fn}`, but I provide all files with the same names und
     ) -> Tuple[BuildData]:
         """After LLM: Patch changes if any."""
         # Parse changes.
-        grouped_changes, parsed_llm_response = self.grouped_llm_parser.run(llm_response)
+        with profiler.span("post_llm:parse"):
+            grouped_changes, parsed_llm_response = self.grouped_llm_parser.run(
+                llm_response
+            )
         logging.info("Files to change: # = %d.", len(grouped_changes))
         feedback = self.grouped_llm_parser.collect_feedback(reset=True)
         if feedback is not None:
@@ -962,7 +1121,8 @@ There is not such a file `{fn}`, but I provide all files with the same names und
             return build_errors
 
         # Patch changes.
-        patched = self.file_writer.run(grouped_changes)
+        with profiler.span("post_llm:patch"):
+            patched = self.file_writer.run(grouped_changes)
         feedback = self.file_writer.collect_feedback(reset=True)
         if any(patched.values()):
             if feedback is not None:
@@ -985,7 +1145,12 @@ There is not such a file `{fn}`, but I provide all files with the same names und
             )
             return build_errors
 
-        new_build_errors = self._pre_llm(max_iterations, iteration)[0]
+        changed_files = [filename for filename, ok in patched.items() if ok]
+        new_build_errors = self._pre_llm(
+            max_iterations,
+            iteration,
+            build_kwargs=self._build_kwargs(changed_files, build_errors),
+        )[0]
 
         feedback = self.builder.collect_feedback()
         # Build errors change.
@@ -1032,6 +1197,19 @@ There is not such a file `{fn}`, but I provide all files with the same names und
 
         return build_errors
 
+    def _build_kwargs(
+        self, changed_files: Sequence[str], build_errors: Tuple[BuildData]
+    ) -> Dict[str, Any]:
+        """Build kwargs of an intermediate build: Impacted tests only, if enabled."""
+        select_tests = getattr(self.builder, "select_tests", None)
+        if select_tests is None:
+            return {}
+
+        test = select_tests(changed_files, build_errors)
+        if test is None:
+            return {}
+        return {BUILD_CMD_KEY_TEST: test}
+
     def run_iteration(
         self,
         build_errors: Tuple[BuildData],
@@ -1064,6 +1242,9 @@ There is not such a file `{fn}`, but I provide all files with the same names und
             )
 
             return build_errors, not bool(build_errors)
+        except deadline_lib.DeadlineExceeded as error:
+            logging.warning("Iteration is cancelled @%d: <<<%s>>>", iteration, error)
+            maybe_error = error
         except Exception as error:
             logging.exception("Unable to run iteration successfully: <<<%s>>>", error)
             maybe_error = error
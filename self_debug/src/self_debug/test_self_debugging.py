@@ -0,0 +1,156 @@
+"""Unit tests for self_debugging.py."""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from parameterized import parameterized
+from self_debug.proto import config_pb2
+
+from self_debug.benchmark import fakes, run_benchmark, synthetic_repo
+from self_debug.common import deadline as deadline_lib
+from self_debug.common import utils
+
+# Long enough for the builds before the one to time out.
+TIMEOUT_SECONDS = 2
+
+
+class TestSelfDebugging(unittest.TestCase):
+    """Unit tests for self_debugging.py."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _create_runner(self, commands, timeout_after: int = 0, **kwargs):
+        """Self debugging on a synthetic repo, timing out at a build if any."""
+        repo = synthetic_repo.SyntheticRepo(
+            os.path.join(self.temp_dir, "bench"),
+            num_files=4,
+            num_errors=3,
+            num_methods=1,
+            num_log_lines=1,
+        )
+        utils.export_file(
+            os.path.join(repo.root_dir, "src/test/java/bench/p0/C00000Test.java"),
+            "package bench.p0;\n\npublic class C00000Test { C00000 value; }\n",
+        )
+
+        config = utils.load_proto(run_benchmark.CONFIG_FILE, config_pb2.Config)
+        runner = run_benchmark.create_runner(config, repo)
+
+        def _build_log(root_dir):
+            if timeout_after and len(commands) >= timeout_after:
+                # Until the deadline of the run is exceeded.
+                deadline_lib.sleep(TIMEOUT_SECONDS * 10)
+                deadline_lib.get_deadline().check("build")
+            commands.append(runner.builder.command)
+            return repo.build_log(root_dir)
+
+        runner.builder = fakes.ReplayMavenBuilder(repo.root_dir, _build_log, **kwargs)
+        return runner
+
+    def _assert_reverted(self, runner):
+        """Nothing but the trajectory is committed after the last build."""
+        status, _ = runner.repo.status("--porcelain")
+        self.assertEqual(status, "")
+
+        files, _ = runner.repo.log(1, ["--name-only", "--format="])
+        self.assertTrue(files)
+        for filename in files.splitlines():
+            self.assertTrue(filename.startswith("trajectory--"), filename)
+
+    def _timeout_steps(self, runner):
+        return [
+            step.action.timeout_action.step
+            for step in runner.traj.steps
+            if step.action.HasField("timeout_action")
+        ]
+
+    def test_run_impacted_tests(self):
+        """Unit tests SelfDebugging.run: Impacted tests only, until the final build."""
+        commands = []
+        runner = self._create_runner(commands, select_impacted_tests=True)
+        proto, build_errors = runner.run(max_iterations=5)
+
+        self.assertTrue(proto.final_state_metrics.state.success)
+        self.assertEqual(build_errors, ())
+        options = [
+            command.split(" mvn ")[-1].replace(" clean verify", "")
+            for command in commands
+        ]
+        self.assertEqual(
+            options,
+            [
+                # Initial builds: All tests.
+                "clean verify",
+                "clean verify",
+                "clean verify",
+                "clean verify",
+                "-Dtest=bench.p0.C00000Test -Dsurefire.failIfNoSpecifiedTests=false",
+                "-Dtest=bench.p0.C00000Test -Dsurefire.failIfNoSpecifiedTests=false",
+                "-DskipTests",
+                "-DskipTests",
+                "-DskipTests",
+                "-DskipTests",
+                # Success requires all tests.
+                "clean verify",
+                "clean verify",
+            ],
+        )
+
+    @parameterized.expand(
+        (
+            # The first build with impacted tests, after LLM changes.
+            (4, 3),
+            # The final build with all tests.
+            (10, 1),
+        )
+    )
+    def test_run_impacted_tests_timeout(self, timeout_after, expected_num_errors):
+        """Unit tests SelfDebugging.run: Impacted tests with a build timing out."""
+        commands = []
+        runner = self._create_runner(
+            commands, timeout_after=timeout_after, select_impacted_tests=True
+        )
+        proto, build_errors = runner.run(
+            max_iterations=5, timeout_seconds=TIMEOUT_SECONDS
+        )
+
+        self.assertEqual(len(commands), timeout_after)
+        self.assertFalse(proto.final_state_metrics.state.success)
+        self.assertEqual(len(build_errors), expected_num_errors)
+        self.assertEqual(self._timeout_steps(runner), ["build"])
+        self._assert_reverted(runner)
+
+    def test_run_timeout(self):
+        """Unit tests SelfDebugging.run: Changes are reverted after the deadline."""
+        commands = []
+        # The first build after LLM changes: Four builds before the loop.
+        runner = self._create_runner(commands, timeout_after=4)
+        proto, build_errors = runner.run(
+            max_iterations=5, timeout_seconds=TIMEOUT_SECONDS
+        )
+
+        self.assertEqual(len(commands), 4)
+        self.assertFalse(proto.final_state_metrics.state.success)
+        self.assertEqual(len(build_errors), 3)
+        self.assertEqual(self._timeout_steps(runner), ["build"])
+        self.assertEqual(
+            [
+                step.action.git_action.revert_message
+                for step in runner.traj.steps
+                if step.action.git_action.revert_message
+            ],
+            ["Exceeded debug at step `build`."],
+        )
+        self._assert_reverted(runner)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=utils.LOGGING_FORMAT)
+    unittest.main()